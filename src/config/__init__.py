@@ -15,8 +15,8 @@ This module re-exports configuration constants from smaller modules:
 from .cli import PACKAGE_MIN_ARGS
 from .secrets import TEXT_API_KEY
 from .gpu import KV_DTYPE, GPU_SM_ARCH, CHAT_GPU_FRAC, TOOL_GPU_FRAC
-from .deploy import CHAT_MODEL, TOOL_MODEL, DEPLOY_CHAT, DEPLOY_MODE, DEPLOY_TOOL, HF_REPO_PATTERN
 from .tool import TOOL_COMPILE, TOOL_HISTORY_TOKENS, TOOL_DECISION_THRESHOLD, TOOL_MODEL_BATCH_CONFIG
+from .deploy import CHAT_MODEL, TOOL_MODEL, DEPLOY_CHAT, DEPLOY_MODE, DEPLOY_TOOL, HF_REPO_PATTERN, TOKENIZER_CACHE_DIR
 from .quantization import (
     TRT_FP8_SM_ARCHS,
     SUPPORTED_ENGINES,
@@ -48,6 +48,7 @@ from .models import (
     ALLOWED_VLLM_QUANT_CHAT_MODELS,
 )
 from .chat import (
+    STREAM_SENTENCE_EVENTS,
     DEFAULT_CHECK_SCREEN_PREFIX,
     CACHE_RESET_INTERVAL_SECONDS,
     CHAT_TEMPLATE_ENABLE_THINKING,
@@ -70,15 +71,22 @@ from .trt import (
     TRT_RUNTIME_BATCH_SIZE,
 )
 from .websocket import (
+    WS_RESUME_TTL_S,
     WS_IDLE_TIMEOUT_S,
     WS_CLOSE_BUSY_CODE,
     WS_CLOSE_IDLE_CODE,
+    WS_REGISTRY_SHARDS,
     WS_WATCHDOG_TICK_S,
     WS_CLOSE_IDLE_REASON,
     WS_RATE_LIMIT_WINDOW,
+    WS_RESUME_SPILL_PATH,
+    WS_SESSION_SPILL_PATH,
+    WS_RESUME_MAX_SESSIONS,
+    WS_SESSION_PARK_IDLE_S,
     WS_MAX_CANCELS_PER_WINDOW,
     WS_CLOSE_UNAUTHORIZED_CODE,
     WS_MAX_MESSAGES_PER_WINDOW,
+    WS_SESSION_MEMORY_MAX_BYTES,
     WS_CLOSE_CLIENT_REQUEST_CODE,
     WS_HANDSHAKE_ACQUIRE_TIMEOUT_S,
     WS_MAX_AUTH_FAILURES_PER_WINDOW,
@@ -95,11 +103,13 @@ from .limits import (
     STREAM_FLUSH_MS,
     GPU_BASELINE_TIERS,
     PERSONALITY_MAX_LEN,
+    TOKENIZER_POOL_SIZE,
     USER_UTT_MAX_TOKENS,
     BATCH_SCALE_MIN_SEQS,
     CHAT_TEMPERATURE_MAX,
     CHAT_TEMPERATURE_MIN,
     DOWNLOAD_MAX_RETRIES,
+    TOKEN_MEMO_MAX_BYTES,
     BATCH_SCALE_MIN_RATIO,
     HISTORY_RETENTION_PCT,
     MAX_NUM_SEQS_BASELINE,
@@ -124,6 +134,7 @@ from .limits import (
     DOWNLOAD_BACKOFF_MAX_SECONDS,
     MAX_NUM_SEQS_BASELINE_MEDIUM,
     MAX_NUM_SEQS_BASELINE_XLARGE,
+    CHAT_TEMPLATE_CACHE_MAX_BYTES,
     MOE_CALIBRATION_SAMPLES_LIMIT,
     MAX_NUM_SEQS_GPU_THRESHOLD_LARGE,
     MAX_NUM_SEQS_GPU_THRESHOLD_SMALL,
@@ -144,6 +155,7 @@ __all__ = [
     "DEPLOY_TOOL",
     "CHAT_MODEL",
     "TOOL_MODEL",
+    "TOKENIZER_CACHE_DIR",
     # gpu
     "CHAT_GPU_FRAC",
     "TOOL_GPU_FRAC",
@@ -175,6 +187,7 @@ __all__ = [
     "DEFAULT_CHECK_SCREEN_PREFIX",
     "DEFAULT_SCREEN_CHECKED_PREFIX",
     "CHAT_TEMPLATE_ENABLE_THINKING",
+    "STREAM_SENTENCE_EVENTS",
     "CACHE_RESET_INTERVAL_SECONDS",
     "CACHE_RESET_MIN_SESSION_SECONDS",
     # tool
@@ -202,6 +215,9 @@ __all__ = [
     "TRIMMED_HISTORY_LENGTH",
     "USER_UTT_MAX_TOKENS",
     "MAX_CONCURRENT_CONNECTIONS",
+    "TOKENIZER_POOL_SIZE",
+    "TOKEN_MEMO_MAX_BYTES",
+    "CHAT_TEMPLATE_CACHE_MAX_BYTES",
     "BATCH_SCALE_GPU_FRAC_CAP",
     "CHAT_TEMPERATURE_MIN",
     "CHAT_TEMPERATURE_MAX",
@@ -251,6 +267,13 @@ __all__ = [
     "WS_MAX_MESSAGES_PER_WINDOW",
     "WS_MAX_CANCELS_PER_WINDOW",
     "WS_MAX_AUTH_FAILURES_PER_WINDOW",
+    "WS_RESUME_MAX_SESSIONS",
+    "WS_RESUME_TTL_S",
+    "WS_RESUME_SPILL_PATH",
+    "WS_SESSION_MEMORY_MAX_BYTES",
+    "WS_SESSION_PARK_IDLE_S",
+    "WS_SESSION_SPILL_PATH",
+    "WS_REGISTRY_SHARDS",
     "WS_CLOSE_UNAUTHORIZED_CODE",
     "WS_CLOSE_BUSY_CODE",
     "WS_CLOSE_IDLE_CODE",
@@ -24,6 +24,13 @@ DEFAULT_SCREEN_CHECKED_PREFIX = os.getenv("SCREEN_CHECKED_PREFIX", "ON THE SCREE
 # Enable thinking mode in chat templates
 CHAT_TEMPLATE_ENABLE_THINKING = env_flag("CHAT_TEMPLATE_ENABLE_THINKING", False)
 
+# ============================================================================
+# STREAM EVENTS
+# ============================================================================
+
+# Emit a "sentence" frame after each completed sentence in the chat stream
+STREAM_SENTENCE_EVENTS = env_flag("STREAM_SENTENCE_EVENTS", False)
+
 # ============================================================================
 # CACHE MANAGEMENT
 # ============================================================================
@@ -66,6 +73,7 @@ __all__ = [
     "DEFAULT_CHECK_SCREEN_PREFIX",
     "DEFAULT_SCREEN_CHECKED_PREFIX",
     "CHAT_TEMPLATE_ENABLE_THINKING",
+    "STREAM_SENTENCE_EVENTS",
     "CACHE_RESET_INTERVAL_SECONDS",
     "CACHE_RESET_MIN_SESSION_SECONDS",
     "MESSAGE_RATE_LIMIT_MESSAGES",
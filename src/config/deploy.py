@@ -20,6 +20,9 @@ Environment Variables:
 
     TOOL_MODEL: HuggingFace model ID or local path for tool model
         Example: "yapwithai/yap-modernbert-screenshot-intent"
+
+    TOKENIZER_CACHE_DIR: Directory for serialized fast tokenizers keyed by
+        their source file hashes (default: unset, no disk cache)
 """
 
 from __future__ import annotations
@@ -50,6 +53,9 @@ DEPLOY_TOOL = DEPLOY_MODE in ("both", "tool")  # Enable tool model
 CHAT_MODEL = os.getenv("CHAT_MODEL")  # Required if DEPLOY_CHAT=True
 TOOL_MODEL = os.getenv("TOOL_MODEL")  # Required if DEPLOY_TOOL=True
 
+# Serialized fast tokenizers are reused across process starts from here
+TOKENIZER_CACHE_DIR = os.getenv("TOKENIZER_CACHE_DIR", "")
+
 
 __all__ = [
     "HF_REPO_PATTERN",
@@ -58,4 +64,5 @@ __all__ = [
     "DEPLOY_TOOL",
     "CHAT_MODEL",
     "TOOL_MODEL",
+    "TOKENIZER_CACHE_DIR",
 ]
@@ -292,6 +292,50 @@ EMAIL_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Sentence segmentation (runs on sanitized stream output)
+# Terminal punctuation + optional closers, confirmed once the next visible char arrives
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"([.!?\u2026]+)([\"'\u201d\u2019)\]]*)\s+(?=(\S))")
+# Two or more dots (or the ellipsis char) trail off rather than end a sentence
+SENTENCE_ELLIPSIS_PATTERN = re.compile(r"\.{2,}|\u2026")
+# Lowercased words that take a period without ending the sentence
+SENTENCE_ABBREVIATIONS: frozenset[str] = frozenset(
+    {
+        "mr",
+        "mrs",
+        "ms",
+        "dr",
+        "prof",
+        "sr",
+        "jr",
+        "st",
+        "mt",
+        "vs",
+        "etc",
+        "approx",
+        "dept",
+        "inc",
+        "ltd",
+        "co",
+        "corp",
+        "fig",
+        "jan",
+        "feb",
+        "mar",
+        "apr",
+        "jun",
+        "jul",
+        "aug",
+        "sep",
+        "sept",
+        "oct",
+        "nov",
+        "dec",
+    }
+)
+
+# Whitespace-delimited tokens for the tokenizer-less fallback counter
+WHITESPACE_TOKEN_PATTERN = re.compile(r"\S+")
+
 __all__ = [
     # HuggingFace progress bar groups
     "HF_DOWNLOAD_GROUPS",
@@ -338,4 +382,10 @@ __all__ = [
     "DEGREE_SYMBOL_PATTERN",
     "PERCENT_PATTERN",
     "EMAIL_PATTERN",
+    # Sentence segmentation
+    "SENTENCE_BOUNDARY_PATTERN",
+    "SENTENCE_ELLIPSIS_PATTERN",
+    "SENTENCE_ABBREVIATIONS",
+    # Token fallback
+    "WHITESPACE_TOKEN_PATTERN",
 ]
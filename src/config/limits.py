@@ -11,6 +11,12 @@ Context Limits:
     - USER_UTT_MAX_TOKENS: Maximum user utterance (tokens)
     - CHAT_PROMPT_MAX_TOKENS: Maximum persona prompt (tokens)
 
+Concurrency Limits:
+    - MAX_CONCURRENT_CONNECTIONS: WebSocket connection cap
+    - TOKENIZER_POOL_SIZE: Tokenizer instances shared by all sessions
+    - TOKEN_MEMO_MAX_BYTES: Byte cap for memoized token counts/ids
+    - CHAT_TEMPLATE_CACHE_MAX_BYTES: Byte cap for cached chat template fragments
+
 Most values can be overridden via environment variables.
 """
 
@@ -52,6 +58,17 @@ STREAM_FLUSH_MS = float(_LIMIT_VALUES["STREAM_FLUSH_MS"])
 _max_concurrent_value = _LIMIT_VALUES["MAX_CONCURRENT_CONNECTIONS"]
 MAX_CONCURRENT_CONNECTIONS: int | None = None if _max_concurrent_value is None else int(_max_concurrent_value)
 
+# Independent tokenizer instances per FastTokenizer; concurrent count/trim
+# calls beyond this many wait for a free instance.
+TOKENIZER_POOL_SIZE = int(_LIMIT_VALUES["TOKENIZER_POOL_SIZE"])
+
+# Byte cap for each tokenizer's content-addressed count/ids memo (0 = off)
+TOKEN_MEMO_MAX_BYTES = int(_LIMIT_VALUES["TOKEN_MEMO_MAX_BYTES"])
+
+# Byte cap for each tokenizer's rendered chat template fragments (0 = always
+# render the full template)
+CHAT_TEMPLATE_CACHE_MAX_BYTES = int(_LIMIT_VALUES["CHAT_TEMPLATE_CACHE_MAX_BYTES"])
+
 # GPU fraction cap for batching: matches CHAT_GPU_FRAC based on deployment mode.
 # Prevents pushing memory allocation beyond the configured GPU fraction.
 BATCH_SCALE_GPU_FRAC_CAP = resolve_batch_scale_gpu_frac_cap(DEPLOY_CHAT, DEPLOY_TOOL)
@@ -128,6 +145,9 @@ __all__ = [
     "HISTORY_RETENTION_PCT",
     "CONTEXT_BUFFER",
     "MAX_CONCURRENT_CONNECTIONS",
+    "TOKENIZER_POOL_SIZE",
+    "TOKEN_MEMO_MAX_BYTES",
+    "CHAT_TEMPLATE_CACHE_MAX_BYTES",
     "BATCH_SCALE_GPU_FRAC_CAP",
     # Sampling clamps
     "CHAT_TEMPERATURE_MIN",
@@ -57,6 +57,7 @@ METRIC_TOOL_CLASSIFICATION_LATENCY = (
 )
 METRIC_PHASE_LATENCY = ("text_inference.phase_latency", "s", "Latency by execution phase")
 METRIC_WS_SEND_LATENCY = ("text_inference.ws_send_latency", "s", "WebSocket frame send latency")
+METRIC_TOKENIZER_POOL_WAIT = ("text_inference.tokenizer_pool_wait", "s", "Tokenizer instance checkout wait")
 
 # Counters
 METRIC_REQUESTS_TOTAL = ("text_inference.requests_total", "{request}", "Total requests")
@@ -107,11 +108,23 @@ METRIC_ENGINE_ABORT_RETRYABLE_TOTAL = (
     "{abort}",
     "Retryable abort calls issued to engine",
 )
+METRIC_TOKEN_MEMO_HITS_TOTAL = ("text_inference.token_memo_hits_total", "{lookup}", "Token memo hits")
+METRIC_TOKEN_MEMO_MISSES_TOTAL = ("text_inference.token_memo_misses_total", "{lookup}", "Token memo misses")
+METRIC_TOKEN_ESTIMATE_CHECKS_TOTAL = (
+    "text_inference.token_estimate_checks_total",
+    "{check}",
+    "Token limit checks by estimate or exact count",
+)
+METRIC_SESSION_RESUMES_TOTAL = ("text_inference.session_resumes_total", "{resume}", "Session resume attempts")
+METRIC_SESSION_PARKS_TOTAL = ("text_inference.session_parks_total", "{session}", "Idle session histories parked")
 
 # UpDown counters
 METRIC_ACTIVE_CONNECTIONS = ("text_inference.active_connections", "{connection}", "Current WebSocket connections")
 METRIC_ACTIVE_GENERATIONS = ("text_inference.active_generations", "{generation}", "Currently running generations")
 
+# Session observables
+METRIC_SESSION_MEMORY = ("text_inference.session.memory", "By", "Persona, meta and history bytes of live sessions")
+
 # GPU observables
 METRIC_GPU_MEMORY_USED = ("text_inference.gpu.memory_used", "By", "GPU memory in use")
 METRIC_GPU_MEMORY_FREE = ("text_inference.gpu.memory_free", "By", "GPU memory available")
@@ -165,6 +178,7 @@ __all__ = [
     "METRIC_TOOL_CLASSIFICATION_LATENCY",
     "METRIC_PHASE_LATENCY",
     "METRIC_WS_SEND_LATENCY",
+    "METRIC_TOKENIZER_POOL_WAIT",
     # Counters
     "METRIC_REQUESTS_TOTAL",
     "METRIC_TOKENS_GENERATED_TOTAL",
@@ -182,9 +196,16 @@ __all__ = [
     "METRIC_CANCEL_PRE_FIRST_TOKEN_TOTAL",
     "METRIC_EMPTY_MODEL_OUTPUT_TOTAL",
     "METRIC_ENGINE_ABORT_RETRYABLE_TOTAL",
+    "METRIC_TOKEN_MEMO_HITS_TOTAL",
+    "METRIC_TOKEN_MEMO_MISSES_TOTAL",
+    "METRIC_TOKEN_ESTIMATE_CHECKS_TOTAL",
+    "METRIC_SESSION_RESUMES_TOTAL",
+    "METRIC_SESSION_PARKS_TOTAL",
     # UpDown counters
     "METRIC_ACTIVE_CONNECTIONS",
     "METRIC_ACTIVE_GENERATIONS",
+    # Session observables
+    "METRIC_SESSION_MEMORY",
     # GPU observables
     "METRIC_GPU_MEMORY_USED",
     "METRIC_GPU_MEMORY_FREE",
@@ -13,6 +13,30 @@ Timeouts:
         If the server is at capacity, connections wait this long before
         being rejected.
 
+Session Resume:
+    WS_RESUME_MAX_SESSIONS: Dropped sessions kept in memory for ``resume``;
+        0 disables resume tokens entirely.
+
+    WS_RESUME_TTL_S: How long a dropped session stays resumable.
+
+    WS_RESUME_SPILL_PATH: Optional SQLite file that receives sessions evicted
+        from the in-memory store instead of discarding them.
+
+Session Memory:
+    WS_SESSION_MEMORY_MAX_BYTES: Process-wide budget for the persona, meta
+        and history bytes of live sessions; 0 only measures them.
+
+    WS_SESSION_PARK_IDLE_S: Seconds without activity after which a session's
+        history may be parked to bring the process back under budget.
+
+    WS_SESSION_SPILL_PATH: Optional SQLite file that receives parked
+        histories; without it they are kept zlib-compressed in memory.
+
+Bookkeeping:
+    WS_REGISTRY_SHARDS: Shards (rounded up to a power of two) of the
+        process-wide connection and auth-failure registries, each with its
+        own lock.
+
 Close Codes (RFC 6455):
     1000: Normal closure (client requested)
     1008: Policy violation (auth failure)
@@ -41,6 +65,13 @@ WS_RATE_LIMIT_WINDOW = float(os.getenv("WS_RATE_LIMIT_WINDOW", "60"))
 WS_MAX_MESSAGES_PER_WINDOW = int(os.getenv("WS_MAX_MESSAGES_PER_WINDOW", "20"))
 WS_MAX_CANCELS_PER_WINDOW = int(os.getenv("WS_MAX_CANCELS_PER_WINDOW", "20"))
 WS_MAX_AUTH_FAILURES_PER_WINDOW = int(os.getenv("WS_MAX_AUTH_FAILURES_PER_WINDOW", "10"))
+WS_RESUME_MAX_SESSIONS = int(os.getenv("WS_RESUME_MAX_SESSIONS", "0"))
+WS_RESUME_TTL_S = float(os.getenv("WS_RESUME_TTL_S", "300"))
+WS_RESUME_SPILL_PATH = os.getenv("WS_RESUME_SPILL_PATH", "")
+WS_SESSION_MEMORY_MAX_BYTES = int(os.getenv("WS_SESSION_MEMORY_MAX_BYTES", "0"))
+WS_SESSION_PARK_IDLE_S = float(os.getenv("WS_SESSION_PARK_IDLE_S", "60"))
+WS_SESSION_SPILL_PATH = os.getenv("WS_SESSION_SPILL_PATH", "")
+WS_REGISTRY_SHARDS = int(os.getenv("WS_REGISTRY_SHARDS", "16"))
 _allowed_origins_raw = os.getenv("WS_ALLOWED_ORIGINS", "")
 WS_ALLOWED_ORIGINS = tuple(origin.strip() for origin in _allowed_origins_raw.split(",") if origin.strip())
 
@@ -71,6 +102,7 @@ WS_TYPE_MESSAGE = "message"
 WS_TYPE_PING = "ping"
 WS_TYPE_PONG = "pong"
 WS_TYPE_END = "end"
+WS_TYPE_RESUME = "resume"
 WS_TYPE_ERROR = "error"
 WS_TYPE_TOKEN = "token"  # noqa: S105  # nosec B105
 WS_TYPE_FINAL = "final"
@@ -92,6 +124,7 @@ WS_ERROR_QUEUE_FULL = "queue_full"
 WS_ERROR_TEXT_TOO_LONG = "text_too_long"
 WS_ERROR_INVALID_VOICE = "invalid_voice"
 WS_ERROR_INTERNAL = "internal_error"
+WS_ERROR_RESUME_UNAVAILABLE = "resume_unavailable"
 
 # ============================================================================
 # HTTP-Style Status Codes
@@ -100,6 +133,7 @@ WS_ERROR_INTERNAL = "internal_error"
 WS_STATUS_OK = 200
 WS_STATUS_BAD_REQUEST = 400
 WS_STATUS_UNAUTHORIZED = 401
+WS_STATUS_NOT_FOUND = 404
 WS_STATUS_RATE_LIMITED = 429
 WS_STATUS_INTERNAL = 500
 WS_STATUS_UNAVAILABLE = 503
@@ -116,6 +150,7 @@ ERROR_CODE_TO_STATUS: dict[str, int] = {
     WS_ERROR_TEXT_TOO_LONG: WS_STATUS_BAD_REQUEST,
     WS_ERROR_INVALID_VOICE: WS_STATUS_BAD_REQUEST,
     WS_ERROR_INTERNAL: WS_STATUS_INTERNAL,
+    WS_ERROR_RESUME_UNAVAILABLE: WS_STATUS_NOT_FOUND,
 }
 
 __all__ = [
@@ -128,6 +163,13 @@ __all__ = [
     "WS_MAX_MESSAGES_PER_WINDOW",
     "WS_MAX_CANCELS_PER_WINDOW",
     "WS_MAX_AUTH_FAILURES_PER_WINDOW",
+    "WS_RESUME_MAX_SESSIONS",
+    "WS_RESUME_TTL_S",
+    "WS_RESUME_SPILL_PATH",
+    "WS_SESSION_MEMORY_MAX_BYTES",
+    "WS_SESSION_PARK_IDLE_S",
+    "WS_SESSION_SPILL_PATH",
+    "WS_REGISTRY_SHARDS",
     "WS_ALLOWED_ORIGINS",
     "WS_CLOSE_UNAUTHORIZED_CODE",
     "WS_CLOSE_BUSY_CODE",
@@ -141,6 +183,7 @@ __all__ = [
     "WS_TYPE_PING",
     "WS_TYPE_PONG",
     "WS_TYPE_END",
+    "WS_TYPE_RESUME",
     "WS_TYPE_ERROR",
     "WS_TYPE_TOKEN",
     "WS_TYPE_FINAL",
@@ -157,9 +200,11 @@ __all__ = [
     "WS_ERROR_TEXT_TOO_LONG",
     "WS_ERROR_INVALID_VOICE",
     "WS_ERROR_INTERNAL",
+    "WS_ERROR_RESUME_UNAVAILABLE",
     "WS_STATUS_OK",
     "WS_STATUS_BAD_REQUEST",
     "WS_STATUS_UNAUTHORIZED",
+    "WS_STATUS_NOT_FOUND",
     "WS_STATUS_RATE_LIMITED",
     "WS_STATUS_INTERNAL",
     "WS_STATUS_UNAVAILABLE",
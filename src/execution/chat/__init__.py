@@ -2,7 +2,7 @@
 
 from .runner import run_chat_generation
 from .controller import ChatStreamConfig, ChatStreamController
-from .template_builder import build_chat_warm_prompt, build_chat_prompt_with_prefix
+from .template_builder import build_chat_warm_prompt, build_chat_prompt_with_prefix, verify_chat_template_segments
 
 __all__ = [
     "run_chat_generation",
@@ -10,4 +10,5 @@ __all__ = [
     "ChatStreamController",
     "build_chat_prompt_with_prefix",
     "build_chat_warm_prompt",
+    "verify_chat_template_segments",
 ]
@@ -159,11 +159,11 @@ class ChatStreamController:
             elapsed_ms,
         )
 
-    def _completion_token_count(self) -> int:
+    async def _completion_token_count(self) -> int:
         counter = self._cfg.count_completion_tokens
         if counter is None:
             return max(0, len(self._full_text.split()))
-        return max(0, int(counter(self._full_text)))
+        return max(0, int(await counter(self._full_text)))
 
     async def iter_text(self) -> AsyncGenerator[str, None]:
         """Main streaming loop with buffering, timeout, and cancellation.
@@ -187,7 +187,7 @@ class ChatStreamController:
                         m.token_latency.record(now - last_emit)
                     last_emit = now
                     yield chunk
-                gspan.set_attribute("completion_tokens", self._completion_token_count())
+                gspan.set_attribute("completion_tokens", await self._completion_token_count())
                 gspan.set_attribute("finish_reason", "complete")
         except StreamCancelledError:
             self._cancelled = True
@@ -210,7 +210,7 @@ class ChatStreamController:
             elapsed = time.perf_counter() - start
             m.request_latency.record(elapsed)
             record_phase_latency("chat_generation", elapsed)
-            completion_tokens = self._completion_token_count()
+            completion_tokens = await self._completion_token_count()
             m.completion_tokens.record(completion_tokens)
             if completion_tokens > 0:
                 m.tokens_generated_total.add(completion_tokens)
@@ -1,12 +1,21 @@
-"""Exact chat prompt budgeting helpers."""
+"""Exact chat prompt budgeting helpers.
+
+The user turn is fitted as two segments: an optional screen prefix and the
+utterance. Only the utterance is trimmed; the prefix is joined ahead of it
+when a candidate prompt is rendered, and its cached token count is taken
+off the user budget, so the fitted utterance can go to history unchanged.
+"""
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+from collections.abc import Sequence
+from src.state.turn import ScreenPrefix
 from src.state.session import ChatMessage
 from src.tokens.tokenizer import FastTokenizer
+from src.tokens.history import iter_token_counts, prepare_token_cut
+from src.helpers.chat_history import group_chat_turns, flatten_chat_turns
 from src.execution.chat.template_builder import build_chat_prompt_with_prefix
-from src.helpers.chat_history import group_chat_turns, copy_chat_messages, flatten_chat_turns
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,25 +28,60 @@ class PromptFitResult:
     prompt_tokens: int
 
 
+def _render_user(user_prefix: ScreenPrefix | None, chat_user_utt: str) -> str:
+    if user_prefix is None or not user_prefix.text:
+        return chat_user_utt
+    return f"{user_prefix.text} {chat_user_utt}".strip()
+
+
 def _build_prompt(
     static_prefix: str,
     runtime_text: str,
     history_turns: list[list[ChatMessage]],
     chat_user_utt: str,
     chat_tokenizer: FastTokenizer,
+    *,
+    user_prefix: ScreenPrefix | None = None,
 ) -> tuple[str, int]:
     prompt = build_chat_prompt_with_prefix(
         static_prefix,
         runtime_text,
         flatten_chat_turns(history_turns),
-        chat_user_utt,
+        _render_user(user_prefix, chat_user_utt),
         chat_tokenizer,
     )
     return prompt, len(chat_tokenizer.encode_ids(prompt))
 
 
-def _count_user_tokens(chat_user_utt: str, chat_tokenizer: FastTokenizer) -> int:
-    return len(chat_tokenizer.encode_ids((chat_user_utt or "").strip()))
+def _drop_oldest_turns(
+    static_prefix: str,
+    runtime_text: str,
+    history_turns: list[list[ChatMessage]],
+    chat_user_utt: str,
+    chat_tokenizer: FastTokenizer,
+    *,
+    max_prompt_tokens: int,
+    user_prefix: ScreenPrefix | None,
+) -> tuple[list[list[ChatMessage]], str, int]:
+    """Drop oldest turns until the prompt fits, or no history remains."""
+    rendered_user = _render_user(user_prefix, chat_user_utt)
+    prompts = (
+        build_chat_prompt_with_prefix(
+            static_prefix,
+            runtime_text,
+            flatten_chat_turns(history_turns[start:]),
+            rendered_user,
+            chat_tokenizer,
+        )
+        for start in range(1, len(history_turns) + 1)
+    )
+    for start, (prompt, prompt_tokens) in enumerate(iter_token_counts(prompts, chat_tokenizer.count_many), start=1):
+        if prompt_tokens <= max_prompt_tokens or start == len(history_turns):
+            return history_turns[start:], prompt, prompt_tokens
+    prompt, prompt_tokens = _build_prompt(
+        static_prefix, runtime_text, [], chat_user_utt, chat_tokenizer, user_prefix=user_prefix
+    )
+    return [], prompt, prompt_tokens
 
 
 def _max_candidate_user(
@@ -47,22 +91,12 @@ def _max_candidate_user(
     max_user_tokens: int | None,
 ) -> str:
     candidate = (raw_chat_user_utt or "").strip()
-    if not candidate:
-        return ""
-    token_count = _count_user_tokens(candidate, chat_tokenizer)
-    capped_token_count = token_count if max_user_tokens is None else min(token_count, max(1, int(max_user_tokens)))
-    return _trim_raw_user(candidate, capped_token_count, chat_tokenizer)
-
-
-def _trim_raw_user(
-    raw_chat_user_utt: str,
-    remaining_tokens: int,
-    chat_tokenizer: FastTokenizer,
-) -> str:
-    candidate = (raw_chat_user_utt or "").strip()
-    if remaining_tokens <= 0 or not candidate:
-        return ""
-    return chat_tokenizer.trim(candidate, max_tokens=remaining_tokens, keep="start").strip()
+    if not candidate or max_user_tokens is None:
+        return candidate
+    max_tokens = max(1, int(max_user_tokens))
+    if chat_tokenizer.fits(candidate, max_tokens):
+        return candidate
+    return chat_tokenizer.trim(candidate, max_tokens=max_tokens, keep="start").strip()
 
 
 def _fit_user_from_raw(
@@ -74,6 +108,7 @@ def _fit_user_from_raw(
     *,
     max_prompt_tokens: int,
     max_user_tokens: int | None,
+    user_prefix: ScreenPrefix | None,
 ) -> tuple[str, str, int]:
     candidate = (raw_chat_user_utt or "").strip()
     if not candidate:
@@ -83,23 +118,25 @@ def _fit_user_from_raw(
             history_turns,
             "",
             chat_tokenizer,
+            user_prefix=user_prefix,
         )
         return "", prompt, prompt_tokens
 
-    token_count = _count_user_tokens(candidate, chat_tokenizer)
+    token_count, cut_user = prepare_token_cut(candidate, chat_tokenizer, keep="start")
     capped_token_count = token_count if max_user_tokens is None else min(token_count, max(1, int(max_user_tokens)))
     lo = 1
     hi = capped_token_count
     best_fit: tuple[str, str, int] | None = None
     while lo <= hi:
         remaining = (lo + hi) // 2
-        trimmed = _trim_raw_user(candidate, remaining, chat_tokenizer)
+        trimmed = cut_user(remaining)
         prompt, prompt_tokens = _build_prompt(
             static_prefix,
             runtime_text,
             history_turns,
             trimmed,
             chat_tokenizer,
+            user_prefix=user_prefix,
         )
         if prompt_tokens <= max_prompt_tokens:
             best_fit = (trimmed, prompt, prompt_tokens)
@@ -116,15 +153,23 @@ def _fit_user_from_raw(
 def fit_chat_prompt_to_budget(
     static_prefix: str,
     runtime_text: str,
-    history_messages: list[ChatMessage],
+    history_messages: Sequence[ChatMessage],
     chat_user_utt: str,
     chat_tokenizer: FastTokenizer,
     *,
     max_prompt_tokens: int,
     max_user_tokens: int | None = None,
+    user_prefix: ScreenPrefix | None = None,
 ) -> PromptFitResult:
-    """Fit the exact templated prompt to budget with one raw-user fit path."""
-    effective_history = group_chat_turns(copy_chat_messages(history_messages))
+    """Fit the exact templated prompt to budget with one raw-user fit path.
+
+    ``user_prefix`` is rendered ahead of the user turn and its tokens are
+    reserved from ``max_user_tokens``; the result carries the fitted
+    utterance without it.
+    """
+    effective_history = group_chat_turns(history_messages)
+    if user_prefix is not None and max_user_tokens is not None:
+        max_user_tokens = max(1, int(max_user_tokens) - user_prefix.tokens)
     max_candidate_user = _max_candidate_user(
         chat_user_utt,
         chat_tokenizer,
@@ -136,16 +181,18 @@ def fit_chat_prompt_to_budget(
         effective_history,
         max_candidate_user,
         chat_tokenizer,
+        user_prefix=user_prefix,
     )
 
-    while effective_history and prompt_tokens > max_prompt_tokens:
-        effective_history = effective_history[1:]
-        prompt, prompt_tokens = _build_prompt(
+    if effective_history and prompt_tokens > max_prompt_tokens:
+        effective_history, prompt, prompt_tokens = _drop_oldest_turns(
             static_prefix,
             runtime_text,
             effective_history,
             max_candidate_user,
             chat_tokenizer,
+            max_prompt_tokens=max_prompt_tokens,
+            user_prefix=user_prefix,
         )
 
     effective_user, prompt, prompt_tokens = _fit_user_from_raw(
@@ -156,6 +203,7 @@ def fit_chat_prompt_to_budget(
         chat_tokenizer,
         max_prompt_tokens=max_prompt_tokens,
         max_user_tokens=max_user_tokens,
+        user_prefix=user_prefix,
     )
 
     if prompt_tokens > max_prompt_tokens:
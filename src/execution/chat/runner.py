@@ -6,7 +6,8 @@ handling:
 1. Sampling Parameter Resolution
 2. Prompt validation / metrics
 3. Stream Processing with optional sanitization
-4. Cancellation checks
+4. Optional sentence boundary events on the sanitized output
+5. Cancellation checks
 """
 
 from __future__ import annotations
@@ -14,8 +15,8 @@ from __future__ import annotations
 import uuid
 from typing import Any
 from opentelemetry import trace
+from src.state import ChatStreamItem
 from src.engines.base import BaseEngine
-from src.text import StreamingSanitizer
 from collections.abc import AsyncGenerator
 from src.state.session import SessionState
 from ...config.timeouts import CHAT_TIMEOUT_S
@@ -23,9 +24,10 @@ from ...engines import create_sampling_params
 from src.tokens.tokenizer import FastTokenizer
 from src.telemetry.instruments import get_metrics
 from src.telemetry.phases import record_phase_latency
+from src.text import SentenceSegmenter, StreamingSanitizer
 from .controller import ChatStreamConfig, ChatStreamController
 from src.handlers.session.requests import is_request_cancelled
-from ...config import CHAT_MAX_LEN, CHAT_MAX_OUT, STREAM_FLUSH_MS
+from ...config import CHAT_MAX_LEN, CHAT_MAX_OUT, STREAM_FLUSH_MS, STREAM_SENTENCE_EVENTS
 from ...config.sampling import (
     CHAT_MIN_P,
     CHAT_TOP_K,
@@ -109,6 +111,22 @@ async def _stream_with_optional_sanitizer(
             yield tail
 
 
+async def _stream_with_sentence_events(
+    stream: ChatStreamController,
+    chunks: AsyncGenerator[str, None],
+) -> AsyncGenerator[ChatStreamItem, None]:
+    segmenter = SentenceSegmenter()
+    async for chunk in chunks:
+        yield chunk
+        for boundary in segmenter.push(chunk):
+            yield boundary
+    if stream.was_cancelled:
+        return
+    last = segmenter.flush()
+    if last is not None:
+        yield last
+
+
 async def run_chat_generation(
     state: SessionState,
     prompt: str,
@@ -118,8 +136,12 @@ async def run_chat_generation(
     request_id: str | None = None,
     sampling_overrides: dict[str, float | int | bool] | None = None,
     prompt_token_count: int | None = None,
-) -> AsyncGenerator[str, None]:
-    """Stream chat generation with optional micro-coalescing."""
+) -> AsyncGenerator[ChatStreamItem, None]:
+    """Stream chat generation with optional micro-coalescing.
+
+    Yields text deltas; when ``STREAM_SENTENCE_EVENTS`` is enabled, a
+    ``SentenceBoundary`` follows the delta that completed each sentence.
+    """
     req_id = request_id or f"chat-{uuid.uuid4()}"
 
     overrides = _resolve_sampling_overrides(sampling_overrides or {})
@@ -128,7 +150,7 @@ async def run_chat_generation(
     record_phase_latency("prompt_build", 0.0)
     resolved_prompt_token_count = prompt_token_count
     if resolved_prompt_token_count is None:
-        resolved_prompt_token_count = len(chat_tokenizer.encode_ids(prompt))
+        resolved_prompt_token_count = len(await chat_tokenizer.aencode_ids(prompt))
     if resolved_prompt_token_count > CHAT_MAX_LEN:
         raise ValueError(
             f"prompt exceeds exact context budget before engine call ({resolved_prompt_token_count} > {CHAT_MAX_LEN})"
@@ -150,11 +172,16 @@ async def run_chat_generation(
             timeout_s=float(CHAT_TIMEOUT_S),
             flush_ms=float(STREAM_FLUSH_MS),
             cancel_check=lambda: is_request_cancelled(state, req_id),
-            count_completion_tokens=chat_tokenizer.count,
+            count_completion_tokens=chat_tokenizer.acount,
         )
     )
-    async for chunk in _stream_with_optional_sanitizer(stream, sanitize_output=bool(overrides["sanitize_output"])):
-        yield chunk
+    chunks = _stream_with_optional_sanitizer(stream, sanitize_output=bool(overrides["sanitize_output"]))
+    if not STREAM_SENTENCE_EVENTS:
+        async for chunk in chunks:
+            yield chunk
+        return
+    async for item in _stream_with_sentence_events(stream, chunks):
+        yield item
 
 
 __all__ = ["run_chat_generation"]
@@ -82,6 +82,20 @@ def _compose_system_prompt(static_prefix: str, runtime_text: str) -> str:
     return "\n\n".join(parts)
 
 
+def verify_chat_template_segments(chat_tokenizer: FastTokenizer) -> bool:
+    """Startup self-check that enables fragment-cached prompt rendering.
+
+    Renders probe conversations both ways with the deployed template kwargs;
+    prompts are only assembled from cached fragments when they match.
+    """
+    separable = chat_tokenizer.verify_chat_template(**_CHAT_TEMPLATE_DEFAULT_KWARGS)
+    if separable:
+        logger.info("chat template is segment-separable; caching rendered message fragments")
+    else:
+        logger.info("chat template is not segment-separable; rendering full prompts")
+    return separable
+
+
 def build_chat_prompt_with_prefix(
     static_prefix: str,
     runtime_text: str,
@@ -107,4 +121,4 @@ def build_chat_warm_prompt(
     return _apply_chat_template(chat_tokenizer, messages, add_generation_prompt=True)
 
 
-__all__ = ["build_chat_prompt_with_prefix", "build_chat_warm_prompt"]
+__all__ = ["build_chat_prompt_with_prefix", "build_chat_warm_prompt", "verify_chat_template_segments"]
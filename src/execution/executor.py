@@ -24,7 +24,6 @@ from fastapi import WebSocket
 from .chat import run_chat_generation
 from src.engines.base import BaseEngine
 from src.tool.adapter import ToolAdapter
-from collections.abc import AsyncIterator
 from .tool.parser import parse_tool_result
 from ..config.timeouts import TOOL_TIMEOUT_S
 from .tool.runner import launch_tool_request
@@ -32,18 +31,19 @@ from src.tokens.tokenizer import FastTokenizer
 from src.telemetry.sentry import add_breadcrumb
 from src.telemetry.instruments import get_metrics
 from ..handlers.websocket.errors import send_error
+from src.state import ScreenPrefix, ChatStreamItem
+from collections.abc import Sequence, AsyncIterator
 from ..config.websocket import WS_ERROR_TEXT_TOO_LONG
 from ..config import CHAT_MAX_LEN, USER_UTT_MAX_TOKENS
 from src.handlers.session.manager import SessionHandler
 from src.state.session import ChatMessage, SessionState
-from src.handlers.session.config import resolve_screen_prefix
+from src.handlers.session.config import screen_prefix_segment
 from .chat.prompt_budget import PromptFitResult, fit_chat_prompt_to_budget
-from src.config import DEFAULT_CHECK_SCREEN_PREFIX, DEFAULT_SCREEN_CHECKED_PREFIX
 from ..handlers.websocket.helpers import cancel_task, send_toolcall, stream_chat_response
 
 logger = logging.getLogger(__name__)
 
-PromptContext = tuple[str, str, list[ChatMessage]]
+PromptContext = tuple[str, str, Sequence[ChatMessage]]
 StreamContext = tuple[str, dict[str, float | int] | None, BaseEngine, FastTokenizer]
 
 
@@ -84,7 +84,7 @@ async def _send_toolcall_status(
     logger.info("sequential_exec: sent toolcall %s", "yes" if is_tool else "no")
 
 
-def _prepare_tool_turn(
+async def _prepare_tool_turn(
     state: SessionState,
     chat_user_utt: str,
     *,
@@ -93,7 +93,7 @@ def _prepare_tool_turn(
     session_handler: SessionHandler,
 ) -> tuple[str, str]:
     effective_tool_user_utt = (tool_user_utt or chat_user_utt).strip()
-    return session_handler.prepare_tool_turn(state, effective_tool_user_utt, turn_id=history_turn_id)
+    return await session_handler.aprepare_tool_turn(state, effective_tool_user_utt, turn_id=history_turn_id)
 
 
 async def _resolve_tool_decision_and_send_status(
@@ -114,38 +114,37 @@ async def _resolve_tool_decision_and_send_status(
     return is_tool
 
 
-def _resolve_user_utterance_for_chat(
+def _resolve_chat_user_prefix(
     state: SessionState,
-    chat_user_utt: str,
     is_tool: bool,
-    apply_screen_checked_prefix: bool,
+    screen_checked_prefix: ScreenPrefix | None,
     *,
     session_handler: SessionHandler,
-) -> str:
+) -> ScreenPrefix | None:
     if is_tool:
         session_handler.set_screen_followup_pending(state, True)
-        prefix = resolve_screen_prefix(state, DEFAULT_CHECK_SCREEN_PREFIX, is_checked=False)
-        return f"{prefix} {chat_user_utt}".strip()
+        return screen_prefix_segment(state, is_checked=False)
 
-    if apply_screen_checked_prefix:
+    if screen_checked_prefix is not None:
         session_handler.set_screen_followup_pending(state, False)
-        prefix = resolve_screen_prefix(state, DEFAULT_SCREEN_CHECKED_PREFIX, is_checked=True)
-        return f"{prefix} {chat_user_utt}".strip()
+        return screen_checked_prefix
 
-    return chat_user_utt
+    return None
 
 
 async def _fit_chat_prompt_or_send_error(
     ws: WebSocket,
     static_prefix: str,
     runtime_text: str,
-    history_messages: list[ChatMessage],
+    history_messages: Sequence[ChatMessage],
     chat_user_utt: str,
     *,
+    user_prefix: ScreenPrefix | None,
     chat_tokenizer: FastTokenizer,
 ) -> PromptFitResult | None:
     try:
-        return fit_chat_prompt_to_budget(
+        return await chat_tokenizer.offload(
+            fit_chat_prompt_to_budget,
             static_prefix,
             runtime_text,
             history_messages,
@@ -153,6 +152,7 @@ async def _fit_chat_prompt_or_send_error(
             chat_tokenizer,
             max_prompt_tokens=CHAT_MAX_LEN,
             max_user_tokens=USER_UTT_MAX_TOKENS,
+            user_prefix=user_prefix,
         )
     except ValueError as exc:
         await send_error(ws, code=WS_ERROR_TEXT_TOO_LONG, message=str(exc))
@@ -166,16 +166,15 @@ async def _resolve_prompt_fit(
     chat_user_utt: str,
     is_tool: bool,
     *,
-    apply_screen_checked_prefix: bool,
+    screen_checked_prefix: ScreenPrefix | None,
     session_handler: SessionHandler,
     chat_tokenizer: FastTokenizer,
 ) -> PromptFitResult | None:
     static_prefix, runtime_text, history_messages = prompt_context
-    chat_user_utt_for_chat = _resolve_user_utterance_for_chat(
+    user_prefix = _resolve_chat_user_prefix(
         state,
-        chat_user_utt,
         is_tool,
-        apply_screen_checked_prefix=apply_screen_checked_prefix,
+        screen_checked_prefix,
         session_handler=session_handler,
     )
     return await _fit_chat_prompt_or_send_error(
@@ -183,28 +182,27 @@ async def _resolve_prompt_fit(
         static_prefix,
         runtime_text,
         history_messages,
-        chat_user_utt_for_chat,
+        chat_user_utt,
+        user_prefix=user_prefix,
         chat_tokenizer=chat_tokenizer,
     )
 
 
 async def _stream_chat_turn(
     ws: WebSocket,
-    stream: AsyncIterator[str],
+    stream: AsyncIterator[ChatStreamItem],
     state: SessionState,
     prompt_fit: PromptFitResult,
     *,
     history_turn_id: str | None,
     session_handler: SessionHandler,
 ) -> None:
-    history_user_utt, _ = session_handler.normalize_user_utterances(state, prompt_fit.chat_user_utt)
     final_text = await stream_chat_response(
         ws,
         stream,
         state,
         prompt_fit.chat_user_utt,
         history_turn_id=history_turn_id,
-        history_user_utt=history_user_utt,
         session_handler=session_handler,
     )
     logger.info("sequential_exec: done chars=%s", len(final_text))
@@ -214,7 +212,7 @@ def _build_chat_stream(
     state: SessionState,
     prompt_fit: PromptFitResult,
     stream_context: StreamContext,
-) -> AsyncIterator[str]:
+) -> AsyncIterator[ChatStreamItem]:
     request_id, sampling_overrides, chat_engine, chat_tokenizer = stream_context
     return run_chat_generation(
         state,
@@ -252,13 +250,13 @@ async def run_execution(
     request_id: str,
     static_prefix: str,
     runtime_text: str,
-    history_messages: list[ChatMessage],
+    history_messages: Sequence[ChatMessage],
     chat_user_utt: str,
     *,
     tool_user_utt: str | None = None,
     history_turn_id: str | None = None,
     sampling_overrides: dict[str, float | int] | None = None,
-    apply_screen_checked_prefix: bool = False,
+    screen_checked_prefix: ScreenPrefix | None = None,
     session_handler: SessionHandler,
     chat_engine: BaseEngine,
     chat_tokenizer: FastTokenizer,
@@ -267,7 +265,7 @@ async def run_execution(
     """Execute sequential tool-then-chat workflow."""
     prompt_context: PromptContext = (static_prefix, runtime_text, history_messages)
     stream_context: StreamContext = (request_id, sampling_overrides, chat_engine, chat_tokenizer)
-    effective_tool_user_utt, tool_user_history = _prepare_tool_turn(
+    effective_tool_user_utt, tool_user_history = await _prepare_tool_turn(
         state,
         chat_user_utt,
         tool_user_utt=tool_user_utt,
@@ -287,7 +285,7 @@ async def run_execution(
         prompt_context,
         chat_user_utt,
         is_tool,
-        apply_screen_checked_prefix=apply_screen_checked_prefix,
+        screen_checked_prefix=screen_checked_prefix,
         session_handler=session_handler,
         chat_tokenizer=chat_tokenizer,
     )
@@ -4,7 +4,16 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from dataclasses import dataclass
-from src.tokens.history import count_tool_tokens
+from src.tokens.history import (
+    count_tool_tokens,
+    iter_token_counts,
+    prepare_token_cut,
+    verify_fitting_join,
+    count_fitting_suffix,
+    count_tool_tokens_many,
+    joined_separator_tokens,
+    special_tokens_overhead,
+)
 
 if TYPE_CHECKING:
     from src.tokens.tokenizer import FastTokenizer
@@ -17,6 +26,8 @@ class ToolFitResult:
     tool_user_history: str
     tool_user_utt: str
     input_tokens: int
+    # Count of ``tool_user_utt`` without special tokens, when it was computed.
+    tool_user_tokens: int | None = None
 
 
 def _normalize_user_texts(user_texts: list[str]) -> list[str]:
@@ -46,20 +57,23 @@ def _count_input_tokens(
     )
 
 
-def _count_user_tokens(tool_user_utt: str, tool_tokenizer: FastTokenizer | None) -> int:
-    return count_tool_tokens(tool_user_utt, tool_tokenizer, include_special_tokens=False)
-
-
-def _trim_tool_user(tool_user_utt: str, remaining_tokens: int, tool_tokenizer: FastTokenizer | None) -> str:
-    user = (tool_user_utt or "").strip()
-    if remaining_tokens <= 0 or not user:
-        return ""
-    if tool_tokenizer is not None:
-        return tool_tokenizer.trim(user, max_tokens=remaining_tokens, keep="end").strip()
-    tokens = user.split()
-    if len(tokens) <= remaining_tokens:
-        return user
-    return " ".join(tokens[-remaining_tokens:])
+def _drop_oldest_history(
+    history_lines: list[str],
+    tool_user_utt: str,
+    tool_tokenizer: FastTokenizer | None,
+    *,
+    max_input_tokens: int,
+) -> tuple[list[str], int]:
+    """Drop oldest history lines until the input fits, or none remain."""
+    candidates = (_join_tool_input(history_lines[start:], tool_user_utt) for start in range(1, len(history_lines) + 1))
+    counted = iter_token_counts(
+        candidates,
+        lambda batch: count_tool_tokens_many(batch, tool_tokenizer, include_special_tokens=True),
+    )
+    for start, (_candidate, input_tokens) in enumerate(counted, start=1):
+        if input_tokens <= max_input_tokens or start == len(history_lines):
+            return history_lines[start:], input_tokens
+    return [], _count_input_tokens([], tool_user_utt, tool_tokenizer)
 
 
 def _fit_current_user_to_budget(
@@ -73,13 +87,13 @@ def _fit_current_user_to_budget(
     if not candidate:
         return "", _count_input_tokens(history_lines, "", tool_tokenizer)
 
-    token_count = _count_user_tokens(candidate, tool_tokenizer)
+    token_count, cut_user = prepare_token_cut(candidate, tool_tokenizer, keep="end")
     lo = 1
     hi = token_count
     best_fit: tuple[str, int] | None = None
     while lo <= hi:
         remaining = (lo + hi) // 2
-        trimmed = _trim_tool_user(candidate, remaining, tool_tokenizer)
+        trimmed = cut_user(remaining)
         input_tokens = _count_input_tokens(history_lines, trimmed, tool_tokenizer)
         if input_tokens <= max_input_tokens:
             best_fit = (trimmed, input_tokens)
@@ -93,23 +107,89 @@ def _fit_current_user_to_budget(
     raise ValueError("tool input exceeds exact budget even after removing all history and trimming the user turn")
 
 
+def _fit_history_from_counts(
+    history_lines: list[str],
+    history_tokens: list[int],
+    tool_user_utt: str,
+    tool_tokenizer: FastTokenizer | None,
+    *,
+    max_input_tokens: int,
+) -> ToolFitResult | None:
+    """Fit history by summing known per-line counts; ``None`` when the user text alone overflows.
+
+    Only the new utterance is tokenized to pick the window. The input is the
+    history lines and the utterance joined by newlines, so its size is about
+    the per-line sum plus one separator per history line plus the
+    special-token overhead; the chosen input is then counted exactly once,
+    and fewer lines are searched exactly if the sum undercounted.
+    """
+    if not tool_user_utt:
+        return None
+    user_tokens = count_tool_tokens(tool_user_utt, tool_tokenizer)
+    user_cost = user_tokens + special_tokens_overhead(tool_tokenizer)
+    if user_cost > max_input_tokens:
+        return None
+    separator = joined_separator_tokens("\n", lambda texts: count_tool_tokens_many(texts, tool_tokenizer))
+    kept = count_fitting_suffix(
+        history_tokens,
+        max_input_tokens,
+        separator_tokens=separator,
+        overhead_tokens=user_cost + separator,
+    )
+    newest_first = [tool_user_utt, *reversed(history_lines)]
+    kept_texts, input_tokens = verify_fitting_join(newest_first, kept + 1, max_input_tokens, tool_tokenizer)
+    if not kept_texts:
+        return None
+    kept_lines = history_lines[len(history_lines) - (kept_texts - 1) :]
+    return ToolFitResult(
+        tool_user_history="\n".join(kept_lines),
+        tool_user_utt=tool_user_utt,
+        input_tokens=input_tokens,
+        tool_user_tokens=user_tokens,
+    )
+
+
 def fit_tool_input_to_budget(
     prior_user_texts: list[str],
     tool_user_utt: str,
     tool_tokenizer: FastTokenizer | None,
     *,
     max_input_tokens: int,
+    prior_tokens: list[int] | None = None,
 ) -> ToolFitResult:
-    """Fit the exact combined tool input to ``max_input_tokens`` before backend call."""
+    """Fit the exact combined tool input to ``max_input_tokens`` before backend call.
+
+    ``prior_tokens`` optionally carries per-text token counts (without
+    special tokens) aligned with ``prior_user_texts``. History is then fitted
+    from those counts, and the exact search below only runs when the new
+    utterance does not fit on its own.
+    """
     if max_input_tokens <= 0:
         raise ValueError("tool input exceeds exact budget before backend call")
     effective_history = _normalize_user_texts(prior_user_texts)
     raw_user = (tool_user_utt or "").strip()
+    if prior_tokens is not None:
+        history_tokens = [
+            tokens for text, tokens in zip(prior_user_texts, prior_tokens, strict=True) if (text or "").strip()
+        ]
+        fitted = _fit_history_from_counts(
+            effective_history,
+            history_tokens,
+            raw_user,
+            tool_tokenizer,
+            max_input_tokens=max_input_tokens,
+        )
+        if fitted is not None:
+            return fitted
     input_tokens = _count_input_tokens(effective_history, raw_user, tool_tokenizer)
 
-    while effective_history and input_tokens > max_input_tokens:
-        effective_history = effective_history[1:]
-        input_tokens = _count_input_tokens(effective_history, raw_user, tool_tokenizer)
+    if effective_history and input_tokens > max_input_tokens:
+        effective_history, input_tokens = _drop_oldest_history(
+            effective_history,
+            raw_user,
+            tool_tokenizer,
+            max_input_tokens=max_input_tokens,
+        )
 
     effective_user = raw_user
     if input_tokens > max_input_tokens:
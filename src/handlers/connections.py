@@ -10,10 +10,11 @@ the MAX_CONCURRENT_CONNECTIONS limit. It provides:
 
 The connection handler uses a two-stage approach:
 1. Semaphore acquisition (with timeout) to reserve a slot
-2. Lock-protected set addition to track the connection
+2. Registration in a sharded registry to track the connection
 
-This prevents both over-admission (too many connections) and race
-conditions during connection/disconnection.
+The semaphore prevents over-admission; the registry locks only the
+connection's shard, so connect and disconnect storms do not serialize on
+one structure. The active count is summed from the shards when read.
 
 Example:
     handler = ConnectionHandler(max_connections=100)
@@ -32,6 +33,7 @@ import time
 import asyncio
 import logging
 from fastapi import WebSocket
+from .registry import ShardedRegistry
 from ..config import MAX_CONCURRENT_CONNECTIONS
 from ..telemetry.instruments import get_metrics
 from ..config.websocket import WS_HANDSHAKE_ACQUIRE_TIMEOUT_S
@@ -50,7 +52,8 @@ class ConnectionHandler:
     Attributes:
         max_connections: Maximum allowed concurrent connections.
         acquire_timeout: Max seconds to wait for a connection slot.
-        active_connections: Set of currently connected WebSocket instances.
+        active_connections: Sharded registry of connected WebSocket instances,
+            mapped to their monotonic admission time.
     """
 
     def __init__(
@@ -71,8 +74,7 @@ class ConnectionHandler:
             max_connections = MAX_CONCURRENT_CONNECTIONS
         self.max_connections = max_connections
         self.acquire_timeout = acquire_timeout
-        self.active_connections: set[WebSocket] = set()
-        self._lock = asyncio.Lock()  # Protects active_connections set
+        self.active_connections: ShardedRegistry[WebSocket, float] = ShardedRegistry()
         self._semaphore = asyncio.Semaphore(max_connections)  # Limits concurrency
 
     async def connect(self, websocket: WebSocket) -> bool:
@@ -97,20 +99,17 @@ class ConnectionHandler:
                 self.max_connections,
             )
             return False
-        m.connection_semaphore_wait.record(time.monotonic() - t0)
-
-        try:
-            async with self._lock:
-                self.active_connections.add(websocket)
-                logger.info(
-                    "Connection accepted: %s/%s active",
-                    len(self.active_connections),
-                    self.max_connections,
-                )
-                return True
-        except Exception:
-            self._semaphore.release()
-            raise
+        admitted_at = time.monotonic()
+        m.connection_semaphore_wait.record(admitted_at - t0)
+
+        if not self.active_connections.add(websocket, admitted_at):
+            self._semaphore.release()  # already tracked; keep one slot per connection
+        logger.info(
+            "Connection accepted: %s/%s active",
+            len(self.active_connections),
+            self.max_connections,
+        )
+        return True
 
     async def disconnect(self, websocket: WebSocket) -> None:
         """Remove a WebSocket connection.
@@ -118,18 +117,13 @@ class ConnectionHandler:
         Args:
             websocket: WebSocket connection to remove
         """
-        should_release = False
-        async with self._lock:
-            if websocket in self.active_connections:
-                self.active_connections.remove(websocket)
-                should_release = True
-                logger.info(
-                    "Connection removed: %s/%s active",
-                    len(self.active_connections),
-                    self.max_connections,
-                )
-        if should_release:
+        if self.active_connections.discard(websocket):
             self._semaphore.release()
+            logger.info(
+                "Connection removed: %s/%s active",
+                len(self.active_connections),
+                self.max_connections,
+            )
 
     def get_capacity_info(self) -> dict:
         """Get capacity information.
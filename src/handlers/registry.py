@@ -0,0 +1,94 @@
+"""Sharded mapping for process-wide per-session bookkeeping.
+
+Connection tracking and auth-failure throttling are touched on every
+connect, disconnect and auth attempt. Keeping each in one dict behind one
+lock makes every one of those calls contend on the same structure, so the
+registry splits keys across hash-selected shards, each with its own lock.
+Each shard's dict length doubles as its counter; aggregate views such as
+the total size are computed only when read, by summing the shards.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TypeVar
+from src.config.websocket import WS_REGISTRY_SHARDS
+from collections.abc import Iterator, MutableMapping
+
+_KeyT = TypeVar("_KeyT")
+_ValueT = TypeVar("_ValueT")
+_MISSING = object()
+
+
+class ShardedRegistry(MutableMapping[_KeyT, _ValueT]):
+    """Mapping split into hash-keyed shards with per-shard locks.
+
+    Single-key operations lock only the key's shard. Compound updates made
+    from the event loop need no extra locking, while the shard locks keep
+    reads from worker threads consistent. ``len()`` and iteration visit
+    every shard and are meant for aggregate views, not per-call paths.
+    """
+
+    __slots__ = ("_mask", "_shards", "_locks")
+
+    def __init__(self, shards: int = WS_REGISTRY_SHARDS) -> None:
+        """Create a registry with ``shards`` rounded up to a power of two."""
+        count = 1 << (max(1, int(shards)) - 1).bit_length()
+        self._mask = count - 1
+        self._shards: list[dict[_KeyT, _ValueT]] = [{} for _ in range(count)]
+        self._locks = [threading.Lock() for _ in range(count)]
+
+    def _slot(self, key: _KeyT) -> int:
+        return hash(key) & self._mask
+
+    def __getitem__(self, key: _KeyT) -> _ValueT:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            return self._shards[slot][key]
+
+    def __setitem__(self, key: _KeyT, value: _ValueT) -> None:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            self._shards[slot][key] = value
+
+    def __delitem__(self, key: _KeyT) -> None:
+        slot = self._slot(key)
+        with self._locks[slot]:
+            del self._shards[slot][key]
+
+    def __contains__(self, key: object) -> bool:
+        slot = hash(key) & self._mask
+        with self._locks[slot]:
+            return key in self._shards[slot]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self) -> Iterator[_KeyT]:
+        for slot, shard in enumerate(self._shards):
+            with self._locks[slot]:
+                keys = list(shard)
+            yield from keys
+
+    def add(self, key: _KeyT, value: _ValueT) -> bool:
+        """Insert ``key`` unless present; return whether it was inserted."""
+        slot = self._slot(key)
+        with self._locks[slot]:
+            shard = self._shards[slot]
+            if key in shard:
+                return False
+            shard[key] = value
+            return True
+
+    def discard(self, key: _KeyT) -> bool:
+        """Remove ``key`` if present; return whether it was removed."""
+        slot = self._slot(key)
+        with self._locks[slot]:
+            return self._shards[slot].pop(key, _MISSING) is not _MISSING
+
+    def shard_sizes(self) -> list[int]:
+        """Entries per shard, for checking key spread."""
+        return [len(shard) for shard in self._shards]
+
+
+__all__ = ["ShardedRegistry"]
@@ -15,13 +15,17 @@ This module handles the mutable persona configuration for sessions:
    - screen_checked_prefix: Prefix for follow-up messages after screenshot
 
 Each field is only updated if explicitly provided (not None), allowing
-partial updates while preserving other configuration values.
+partial updates while preserving other configuration values. SessionMeta
+is immutable: updates are staged and committed as one replacement record,
+so a turn can keep the record it started with as a free snapshot.
 """
 
 from __future__ import annotations
 
+from dataclasses import replace
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
+from src.state.turn import ScreenPrefix
 from src.config import DEFAULT_CHECK_SCREEN_PREFIX, DEFAULT_SCREEN_CHECKED_PREFIX
 
 if TYPE_CHECKING:
@@ -42,7 +46,8 @@ def update_session_config(
     """Update mutable persona configuration for a session.
 
     Only fields that are explicitly provided (not None) are updated.
-    Other fields retain their current values.
+    Other fields retain their current values. Nothing is applied unless
+    every prefix token count succeeds.
 
     Args:
         state: The session state to update.
@@ -56,45 +61,51 @@ def update_session_config(
     Returns:
         Dict of field names to their new values (only changed fields).
     """
-    meta = state.meta
+    delta: dict[str, Any] = {}
     changed: dict[str, Any] = {}
 
     if chat_gender is not None:
-        meta["chat_gender"] = chat_gender
+        delta["chat_gender"] = chat_gender
         changed["chat_gender"] = chat_gender
 
     if chat_personality is not None:
         # chat_personality is already normalized/lowercased by validators
-        meta["chat_personality"] = chat_personality or None
+        delta["chat_personality"] = chat_personality or None
         changed["chat_personality"] = chat_personality or None
 
     if chat_prompt is not None:
         cp = chat_prompt or None
-        meta["chat_prompt"] = cp
+        delta["chat_prompt"] = cp
         changed["chat_prompt"] = bool(cp)
 
     if chat_sampling is not None:
+        # SessionMeta keeps its own read-only copy of the overrides
         sampling = chat_sampling or None
-        sampling_copy = sampling.copy() if isinstance(sampling, dict) else None
-        meta["chat_sampling"] = sampling_copy
-        changed["chat_sampling"] = sampling_copy.copy() if isinstance(sampling_copy, dict) else None
+        delta["chat_sampling"] = sampling
+        changed["chat_sampling"] = dict(sampling) if sampling else None
 
+    check_screen_tokens = state.check_screen_prefix_tokens
     if check_screen_prefix is not None:
         normalized = (check_screen_prefix or "").strip() or None
-        meta["check_screen_prefix"] = normalized
+        delta["check_screen_prefix"] = normalized
         changed["check_screen_prefix"] = normalized
         # Recompute token count: use custom prefix or fall back to default
-        effective_prefix = normalized or DEFAULT_CHECK_SCREEN_PREFIX
-        state.check_screen_prefix_tokens = count_prefix_tokens_fn(effective_prefix)
+        check_screen_tokens = count_prefix_tokens_fn(normalized or DEFAULT_CHECK_SCREEN_PREFIX)
 
+    screen_checked_tokens = state.screen_checked_prefix_tokens
     if screen_checked_prefix is not None:
         normalized_checked = (screen_checked_prefix or "").strip() or None
-        meta["screen_checked_prefix"] = normalized_checked
+        delta["screen_checked_prefix"] = normalized_checked
         changed["screen_checked_prefix"] = normalized_checked
         # Recompute token count: use custom prefix or fall back to default
-        effective_prefix = normalized_checked or DEFAULT_SCREEN_CHECKED_PREFIX
-        state.screen_checked_prefix_tokens = count_prefix_tokens_fn(effective_prefix)
-
+        screen_checked_tokens = count_prefix_tokens_fn(normalized_checked or DEFAULT_SCREEN_CHECKED_PREFIX)
+
+    # Commit the staged fields as one new meta record; readers holding the
+    # previous record keep a consistent snapshot.
+    if delta:
+        state.meta = replace(state.meta, **delta)
+    state.check_screen_prefix_tokens = check_screen_tokens
+    state.screen_checked_prefix_tokens = screen_checked_tokens
     return changed
 
 
@@ -119,9 +130,27 @@ def resolve_screen_prefix(
     if not state:
         return resolved_default
 
-    key = "screen_checked_prefix" if is_checked else "check_screen_prefix"
-    prefix = (state.meta.get(key) or "").strip()
+    prefix = state.meta.screen_checked_prefix if is_checked else state.meta.check_screen_prefix
+    prefix = (prefix or "").strip()
     return prefix or resolved_default
 
 
-__all__ = ["update_session_config", "resolve_screen_prefix"]
+def screen_prefix_segment(state: SessionState, *, is_checked: bool) -> ScreenPrefix:
+    """Return the session's screen prefix with its cached token count.
+
+    Args:
+        state: The session state holding prefix overrides and counts.
+        is_checked: If True, use screen_checked_prefix.
+            If False, use check_screen_prefix.
+
+    Returns:
+        The prefix segment to render ahead of the user utterance.
+    """
+    if is_checked:
+        text = resolve_screen_prefix(state, DEFAULT_SCREEN_CHECKED_PREFIX, is_checked=True)
+        return ScreenPrefix(text=text, tokens=state.screen_checked_prefix_tokens)
+    text = resolve_screen_prefix(state, DEFAULT_CHECK_SCREEN_PREFIX, is_checked=False)
+    return ScreenPrefix(text=text, tokens=state.check_screen_prefix_tokens)
+
+
+__all__ = ["update_session_config", "resolve_screen_prefix", "screen_prefix_segment"]
@@ -1,18 +1,33 @@
 """Session history package with explicit runtime configuration."""
 
 from .controller import HistoryController
+from .counts import tool_turn_tokens, chat_message_tokens
 from .settings import HistoryRuntimeConfig, build_history_runtime_config
 from src.tokens.history import count_chat_tokens, count_tool_tokens, build_tool_history
-from .ops import get_user_texts, render_history, trim_chat_history, trim_tool_history, render_tool_history_text
+from .ops import (
+    get_user_texts,
+    plan_chat_trim,
+    plan_tool_trim,
+    render_history,
+    fit_tool_window,
+    trim_chat_history,
+    trim_tool_history,
+    render_tool_history_text,
+)
 
 __all__ = [
     "HistoryRuntimeConfig",
     "build_history_runtime_config",
     "render_history",
+    "plan_chat_trim",
+    "plan_tool_trim",
     "trim_chat_history",
     "trim_tool_history",
+    "fit_tool_window",
     "render_tool_history_text",
     "get_user_texts",
+    "chat_message_tokens",
+    "tool_turn_tokens",
     "count_chat_tokens",
     "count_tool_tokens",
     "build_tool_history",
@@ -3,16 +3,37 @@
 from __future__ import annotations
 
 import uuid
+from .counts import tool_turn_tokens
 from typing import TYPE_CHECKING, Literal
 from .settings import HistoryRuntimeConfig
-from src.tokens.history import build_tool_history
+from src.state.history import HistoryStore
+from collections.abc import Sequence, MutableSequence
+from .totals import apply_trim, shared_view, covered_total
 from src.state.session import ChatMessage, HistoryTurn, SessionState
-from .ops import get_user_texts, render_history, trim_chat_history, trim_tool_history, render_tool_history_text
+from src.tokens.history import build_tool_history, offload_token_work
+from .imports import import_tool_texts, import_chat_entries, build_imported_tool_turns
+from .ops import (
+    get_user_texts,
+    render_history,
+    trim_chat_history,
+    trim_tool_history,
+    plan_chat_eviction,
+    plan_tool_eviction,
+    render_tool_history_text,
+)
 
 if TYPE_CHECKING:
     from src.tokens.tokenizer import FastTokenizer
 
 
+def _same_entries(current: Sequence[object], snapshot: Sequence[object]) -> bool:
+    """Whether a store still holds exactly the entries of ``snapshot``.
+
+    Stored entries are replaced, never edited, so identity is a full check.
+    """
+    return len(current) == len(snapshot) and all(a is b for a, b in zip(current, snapshot, strict=True))
+
+
 def _normalize_chat_role(role: str) -> Literal["user", "assistant"] | None:
     if role == "user":
         return "user"
@@ -40,26 +61,26 @@ class HistoryController:
     def _sync_mode_storage(self, state: SessionState) -> None:
         if self._config.deploy_chat:
             if state.chat_history_messages is None:
-                state.chat_history_messages = []
+                state.chat_history_messages = HistoryStore()
         else:
             state.chat_history_messages = None
 
         if self._config.deploy_tool:
             if state.tool_history_turns is None:
-                state.tool_history_turns = []
+                state.tool_history_turns = HistoryStore()
         else:
             state.tool_history_turns = None
 
     def initialize_mode_state(self, state: SessionState) -> None:
         self._sync_mode_storage(state)
 
-    def _chat_messages(self, state: SessionState) -> list[ChatMessage]:
+    def _chat_messages(self, state: SessionState) -> HistoryStore[ChatMessage]:
         messages = state.chat_history_messages
-        return messages if messages is not None else []
+        return messages if messages is not None else HistoryStore()
 
-    def _tool_turns(self, state: SessionState) -> list[HistoryTurn]:
+    def _tool_turns(self, state: SessionState) -> HistoryStore[HistoryTurn]:
         turns = state.tool_history_turns
-        return turns if turns is not None else []
+        return turns if turns is not None else HistoryStore()
 
     def _trim_chat_store_eager(self, state: SessionState, *, import_mode: bool = False) -> None:
         if not self._config.deploy_chat:
@@ -83,13 +104,54 @@ class HistoryController:
             return
         trim_tool_history(state, self._tool_budget, tool_tokenizer=self._tool_tokenizer)
 
-    def _append_chat_message_to_list(self, messages: list[ChatMessage], role: str, content: str) -> None:
+    async def _trim_chat_store_offloaded(self, state: SessionState) -> None:
+        """Plan the chat trim on the tokenizer executor and commit it on the loop.
+
+        The plan carries the store's running total, so an append under the
+        trigger only counts its own messages and an eviction is committed in
+        place. The plan is dropped if the store changed while it was
+        computed, or if the awaiting turn is cancelled; the next append
+        trims again.
+        """
+        if not self._config.deploy_chat:
+            return
+        messages = self._chat_messages(state)
+        snapshot = list(messages)
+        trim = await offload_token_work(
+            self._chat_tokenizer,
+            plan_chat_eviction,
+            snapshot,
+            covered_total(state.chat_history_total, messages),
+            config=self._config,
+            chat_tokenizer=self._chat_tokenizer,
+        )
+        if state.chat_history_messages is messages and _same_entries(messages, snapshot):
+            state.chat_history_messages, state.chat_history_total = apply_trim(messages, trim)
+
+    async def _trim_tool_store_offloaded(self, state: SessionState) -> None:
+        """Tool-history counterpart of ``_trim_chat_store_offloaded``."""
+        if not self._config.deploy_tool or not self._tool_budget:
+            return
+        turns = self._tool_turns(state)
+        snapshot = list(turns)
+        trim = await offload_token_work(
+            self._tool_tokenizer,
+            plan_tool_eviction,
+            snapshot,
+            covered_total(state.tool_history_total, turns),
+            self._tool_budget,
+            tool_tokenizer=self._tool_tokenizer,
+        )
+        if state.tool_history_turns is turns and _same_entries(turns, snapshot):
+            state.tool_history_turns, state.tool_history_total = apply_trim(turns, trim)
+
+    def _append_chat_message_to_list(self, messages: MutableSequence[ChatMessage], role: str, content: str) -> None:
         normalized_content = (content or "").strip()
         normalized_role = _normalize_chat_role(role)
         if normalized_role is None or not normalized_content or not self._config.deploy_chat:
             return
         if normalized_role == "user" and messages and messages[-1].role == "user":
-            messages[-1].content = f"{messages[-1].content}\n\n{normalized_content}"
+            messages[-1] = ChatMessage(role="user", content=f"{messages[-1].content}\n\n{normalized_content}")
             return
         messages.append(ChatMessage(role=normalized_role, content=normalized_content))
 
@@ -103,30 +165,12 @@ class HistoryController:
         return normalized_chat_messages
 
     def _set_chat_history_store(self, state: SessionState, chat_messages: list[ChatMessage]) -> None:
-        state.chat_history_messages = chat_messages if self._config.deploy_chat else None
+        state.chat_history_messages = HistoryStore(chat_messages) if self._config.deploy_chat else None
         self._trim_chat_store_eager(state, import_mode=True)
 
     def set_exact_chat_messages(self, state: SessionState, chat_messages: list[ChatMessage]) -> None:
         """Replace chat history with an already-fitted exact message list."""
-        state.chat_history_messages = chat_messages if self._config.deploy_chat else None
-
-    def _build_imported_tool_turns(
-        self,
-        normalized_chat_messages: list[ChatMessage],
-        tool_turns: list[HistoryTurn] | None,
-    ) -> list[HistoryTurn]:
-        source_turns = tool_turns
-        if source_turns is None:
-            source_turns = [
-                HistoryTurn(turn_id=uuid.uuid4().hex, user=msg.content, assistant="")
-                for msg in normalized_chat_messages
-                if msg.role == "user"
-            ]
-        return [
-            HistoryTurn(turn_id=turn.turn_id, user=turn.user, assistant="")
-            for turn in source_turns
-            if (turn.user or "").strip()
-        ]
+        state.chat_history_messages = HistoryStore(chat_messages) if self._config.deploy_chat else None
 
     def _set_tool_history_store(
         self,
@@ -136,7 +180,7 @@ class HistoryController:
     ) -> None:
         if not self._config.deploy_tool:
             return
-        state.tool_history_turns = self._build_imported_tool_turns(normalized_chat_messages, tool_turns)
+        state.tool_history_turns = HistoryStore(build_imported_tool_turns(normalized_chat_messages, tool_turns))
         self._trim_tool_store_eager(state)
 
     def get_text(self, state: SessionState) -> str:
@@ -144,16 +188,29 @@ class HistoryController:
         self._sync_mode_storage(state)
         return render_history(self._chat_messages(state))
 
-    def get_chat_messages(self, state: SessionState) -> list[ChatMessage]:
-        """Get a copy of committed chat history messages."""
+    def get_chat_messages(self, state: SessionState) -> tuple[ChatMessage, ...]:
+        """Get a snapshot of committed chat history messages.
+
+        The snapshot is a tuple of the stored, frozen messages, shared by
+        every read until the store changes.
+        """
         self._sync_mode_storage(state)
-        return [ChatMessage(role=msg.role, content=msg.content) for msg in self._chat_messages(state)]
+        messages = state.chat_history_messages
+        if messages is None:
+            return ()
+        state.chat_history_view = view = shared_view(state.chat_history_view, messages)
+        return view.entries
 
     def get_tool_user_texts(self, state: SessionState) -> list[str]:
         """Get raw user texts from the tool-history store."""
         self._sync_mode_storage(state)
         return get_user_texts(self._tool_turns(state))
 
+    def get_tool_turns(self, state: SessionState) -> list[HistoryTurn]:
+        """Get the stored tool-history window, oldest first."""
+        self._sync_mode_storage(state)
+        return list(self._tool_turns(state))
+
     def get_tool_history_text(
         self,
         state: SessionState,
@@ -163,16 +220,18 @@ class HistoryController:
         """Get user-only history for the tool model."""
         self._sync_mode_storage(state)
         if self._config.deploy_tool:
-            user_texts = get_user_texts(self._tool_turns(state))
+            turns = self._tool_turns(state)
+            user_texts = get_user_texts(turns)
             if not user_texts:
                 return ""
             if max_tokens is None:
                 return "\n".join(user_texts)
             return build_tool_history(
-                user_texts,
+                [turn.user for turn in turns],
                 max(1, int(max_tokens)),
                 self._tool_tokenizer,
                 oversize_policy="trim_latest_tail",
+                text_tokens=tool_turn_tokens(turns, self._tool_tokenizer),
             )
 
         return render_tool_history_text(
@@ -196,6 +255,23 @@ class HistoryController:
         self._set_tool_history_store(state, normalized_chat_messages, tool_turns)
         return render_history(self._chat_messages(state))
 
+    def import_mode_histories(
+        self,
+        state: SessionState,
+        *,
+        chat_entries: Sequence[tuple[Literal["user", "assistant"], str]],
+        tool_texts: Sequence[str],
+    ) -> None:
+        """Import parsed start history, building records only for the kept suffix."""
+        self._sync_mode_storage(state)
+        if self._config.deploy_chat:
+            chat_budget = self._config.chat_trigger_tokens
+            self._set_chat_history_store(state, import_chat_entries(chat_entries, self._chat_tokenizer, chat_budget))
+        if self._config.deploy_tool:
+            turns = import_tool_texts(tool_texts, self._tool_tokenizer, self._tool_budget)
+            state.tool_history_turns = HistoryStore(turns)
+            self._trim_tool_store_eager(state)
+
     def reserve_turn_id(
         self,
         *,
@@ -208,49 +284,99 @@ class HistoryController:
             return uuid.uuid4().hex
         return None
 
-    def append_tool_turn(
+    def _store_tool_turn(
         self,
         state: SessionState,
         tool_user_utt: str,
-        *,
-        turn_id: str | None = None,
+        turn_id: str | None,
+        user_tokens: int | None = None,
     ) -> str | None:
-        """Append a user-only tool-history turn exactly once."""
+        """Record a tool turn without trimming; ``None`` when nothing was stored.
+
+        ``user_tokens`` seeds the turn's cached count when the caller already
+        tokenized the text.
+        """
         self._sync_mode_storage(state)
         user = (tool_user_utt or "").strip()
         if not self._config.deploy_tool or not user:
-            return turn_id
+            return None
 
+        tool_tokens = (user, user_tokens) if user_tokens is not None else None
         tool_turns = self._tool_turns(state)
         if turn_id:
-            target = next((t for t in tool_turns if t.turn_id == turn_id), None)
-            if target is not None:
-                target.user = user
-                self._trim_tool_store_eager(state)
+            index = next((i for i, t in enumerate(tool_turns) if t.turn_id == turn_id), None)
+            if index is not None:
+                state.tool_history_total = None
+                tool_turns[index] = HistoryTurn(turn_id=turn_id, user=user, assistant="", tool_tokens=tool_tokens)
                 return turn_id
 
         new_turn_id = turn_id or uuid.uuid4().hex
-        tool_turns.append(HistoryTurn(turn_id=new_turn_id, user=user, assistant=""))
-        self._trim_tool_store_eager(state)
+        tool_turns.append(HistoryTurn(turn_id=new_turn_id, user=user, assistant="", tool_tokens=tool_tokens))
         return new_turn_id
 
-    def append_chat_response(
-        self,
-        state: SessionState,
-        chat_user_utt: str,
-        assistant_text: str,
-    ) -> str:
-        """Append one chat response as stored user+assistant messages."""
+    def _store_chat_response(self, state: SessionState, chat_user_utt: str, assistant_text: str) -> bool:
+        """Record a user+assistant exchange without trimming; False when skipped."""
         self._sync_mode_storage(state)
         user = (chat_user_utt or "").strip()
         assistant = (assistant_text or "").strip()
         if not user:
-            return render_history(self._chat_messages(state))
+            return False
 
         self._append_chat_message(state, "user", user)
         if assistant:
             self._append_chat_message(state, "assistant", assistant)
-        self._trim_chat_store_eager(state)
+        return True
+
+    def append_tool_turn(
+        self,
+        state: SessionState,
+        tool_user_utt: str,
+        *,
+        turn_id: str | None = None,
+        user_tokens: int | None = None,
+    ) -> str | None:
+        """Append a user-only tool-history turn exactly once."""
+        stored_turn_id = self._store_tool_turn(state, tool_user_utt, turn_id, user_tokens)
+        if stored_turn_id is None:
+            return turn_id
+        self._trim_tool_store_eager(state)
+        return stored_turn_id
+
+    async def aappend_tool_turn(
+        self,
+        state: SessionState,
+        tool_user_utt: str,
+        *,
+        turn_id: str | None = None,
+        user_tokens: int | None = None,
+    ) -> str | None:
+        """Async ``append_tool_turn`` that trims on the tokenizer executor."""
+        stored_turn_id = self._store_tool_turn(state, tool_user_utt, turn_id, user_tokens)
+        if stored_turn_id is None:
+            return turn_id
+        await self._trim_tool_store_offloaded(state)
+        return stored_turn_id
+
+    def append_chat_response(
+        self,
+        state: SessionState,
+        chat_user_utt: str,
+        assistant_text: str,
+    ) -> str:
+        """Append one chat response as stored user+assistant messages."""
+        if self._store_chat_response(state, chat_user_utt, assistant_text):
+            self._trim_chat_store_eager(state)
+        return render_history(self._chat_messages(state))
+
+    async def aappend_chat_response(
+        self,
+        state: SessionState,
+        chat_user_utt: str,
+        assistant_text: str,
+    ) -> str:
+        """Async ``append_chat_response`` that trims on the tokenizer executor."""
+        if self._store_chat_response(state, chat_user_utt, assistant_text):
+            await self._trim_chat_store_offloaded(state)
         return render_history(self._chat_messages(state))
 
 
@@ -0,0 +1,110 @@
+"""Per-entry token counts cached on stored chat messages and tool turns.
+
+Each stored entry carries the token count of its rendered text, tagged with
+the exact string it was computed for. A cached count is used only while that
+string is still the entry's text, so edits invalidate it without hooks, and
+counts written from the tokenizer executor can never be attached to text they
+were not computed for. History budgets then become sums of cached integers,
+and each stored entry is tokenized once for as long as its text is unchanged.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from collections.abc import Sequence
+from src.state.session import ChatMessage, HistoryTurn
+from src.tokens.history import count_chat_tokens_many, count_tool_tokens_many, joined_separator_tokens
+
+if TYPE_CHECKING:
+    from src.tokens.tokenizer import FastTokenizer
+
+_PROBE_TEXT = "Probe text."
+
+
+def _chat_line(role: str, content: str) -> str:
+    return f"{role.title()}: {content.strip()}"
+
+
+def chat_line(message: ChatMessage) -> str:
+    """Render one message as its line of the role-labelled transcript."""
+    return _chat_line(message.role, message.content)
+
+
+def chat_message_tokens(messages: Sequence[ChatMessage], chat_tokenizer: FastTokenizer | None) -> list[int]:
+    """Return each message's transcript-line token count, tokenizing only misses.
+
+    Empty messages are not rendered and count as 0. Misses are counted in one
+    batched call and cached on their message.
+    """
+    counts = [0] * len(messages)
+    missing: list[tuple[int, ChatMessage, str]] = []
+    for index, message in enumerate(messages):
+        content = message.content
+        cached = message.chat_tokens
+        if cached is not None and cached[0] is content:
+            counts[index] = cached[1]
+        elif content.strip():
+            missing.append((index, message, content))
+    if missing:
+        lines = [_chat_line(message.role, content) for _index, message, content in missing]
+        for (index, message, content), tokens in zip(
+            missing, count_chat_tokens_many(lines, chat_tokenizer), strict=True
+        ):
+            object.__setattr__(message, "chat_tokens", (content, tokens))
+            counts[index] = tokens
+    return counts
+
+
+def chat_entry_tokens(entries: Sequence[tuple[str, str]], chat_tokenizer: FastTokenizer | None) -> list[int]:
+    """Return transcript-line token counts of ``(role, content)`` pairs not yet stored.
+
+    Counts match what ``chat_message_tokens`` caches for the same message.
+    """
+    return count_chat_tokens_many([_chat_line(role, content) for role, content in entries], chat_tokenizer)
+
+
+def tool_turn_tokens(turns: Sequence[HistoryTurn], tool_tokenizer: FastTokenizer | None) -> list[int]:
+    """Return each turn's stripped user-text token count, tokenizing only misses.
+
+    Counts exclude special tokens; turns without user text count as 0.
+    """
+    counts = [0] * len(turns)
+    missing: list[tuple[int, HistoryTurn, str]] = []
+    for index, turn in enumerate(turns):
+        user = turn.user
+        cached = turn.tool_tokens
+        if cached is not None and cached[0] is user:
+            counts[index] = cached[1]
+        elif user and user.strip():
+            missing.append((index, turn, user))
+    if missing:
+        texts = [user.strip() for _index, _turn, user in missing]
+        for (index, turn, user), tokens in zip(missing, count_tool_tokens_many(texts, tool_tokenizer), strict=True):
+            object.__setattr__(turn, "tool_tokens", (user, tokens))
+            counts[index] = tokens
+    return counts
+
+
+def chat_separator_tokens(chat_tokenizer: FastTokenizer | None) -> int:
+    """Tokens the blank line between two transcript lines adds."""
+    return joined_separator_tokens(
+        "\n\n",
+        lambda texts: count_chat_tokens_many(texts, chat_tokenizer),
+        left=_chat_line("user", _PROBE_TEXT),
+        right=_chat_line("assistant", _PROBE_TEXT),
+    )
+
+
+def tool_separator_tokens(tool_tokenizer: FastTokenizer | None) -> int:
+    """Tokens the newline between two tool-history texts adds."""
+    return joined_separator_tokens("\n", lambda texts: count_tool_tokens_many(texts, tool_tokenizer))
+
+
+__all__ = [
+    "chat_line",
+    "chat_message_tokens",
+    "chat_entry_tokens",
+    "tool_turn_tokens",
+    "chat_separator_tokens",
+    "tool_separator_tokens",
+]
@@ -0,0 +1,136 @@
+"""Import of client-supplied history at session start.
+
+A ``start`` history can be far longer than what a session keeps. Parsed
+entries are counted back from the newest in doubling batches, and the scan
+stops once the running transcript size passes the budget, so only entries
+that could still be kept are tokenized. Records are built for the kept
+suffix only, each seeded with the count it was scanned with, so the import
+trim that follows works on cached counts.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import TYPE_CHECKING, Literal
+from collections.abc import Callable, Sequence
+from src.state.session import ChatMessage, HistoryTurn
+from src.tokens.history import count_tool_tokens_many, special_tokens_overhead
+from .counts import chat_entry_tokens, chat_separator_tokens, tool_separator_tokens
+
+if TYPE_CHECKING:
+    from src.tokens.tokenizer import FastTokenizer
+
+# Entries counted by the first backward batch; later batches double.
+_COUNT_WINDOW = 32
+
+
+def _fitting_start(
+    size: int,
+    count_range: Callable[[int, int], list[int]],
+    is_start: Callable[[int], bool],
+    *,
+    separator: int,
+    overhead: int,
+    budget: int,
+) -> tuple[int, list[int]]:
+    """Oldest boundary whose suffix fits ``budget``, scanning back from the newest entry.
+
+    A suffix costs its entry counts plus one separator between neighbours
+    plus ``overhead``. When no suffix fits, the newest boundary is returned.
+    Counts are filled in from the returned index on.
+    """
+    counts = [0] * size
+    running = overhead - separator
+    best: int | None = None
+    newest: int | None = None
+    end = size
+    window = _COUNT_WINDOW
+    while end > 0 and (running <= budget or newest is None):
+        begin = max(0, end - window)
+        batch = count_range(begin, end)
+        for index in range(end - 1, begin - 1, -1):
+            counts[index] = batch[index - begin]
+            running += counts[index] + separator
+            if is_start(index):
+                newest = index if newest is None else newest
+                best = index if running <= budget else best
+        end = begin
+        window *= 2
+    start = best if best is not None else newest
+    return start or 0, counts
+
+
+def build_imported_tool_turns(
+    chat_messages: Sequence[ChatMessage],
+    tool_turns: Sequence[HistoryTurn] | None,
+) -> list[HistoryTurn]:
+    """Return user-only tool turns from ``tool_turns``, or from the chat user messages."""
+    source_turns = tool_turns
+    if source_turns is None:
+        source_turns = [
+            HistoryTurn(turn_id=uuid.uuid4().hex, user=msg.content, assistant="")
+            for msg in chat_messages
+            if msg.role == "user"
+        ]
+    return [
+        HistoryTurn(turn_id=turn.turn_id, user=turn.user, assistant="")
+        for turn in source_turns
+        if (turn.user or "").strip()
+    ]
+
+
+def import_chat_entries(
+    entries: Sequence[tuple[Literal["user", "assistant"], str]],
+    chat_tokenizer: FastTokenizer | None,
+    budget: int,
+) -> list[ChatMessage]:
+    """Build messages for the newest whole turns of ``entries`` that fit ``budget``.
+
+    Turns start at user messages, as in ``group_chat_turns``; the newest
+    turn is kept even when it alone is over budget.
+    """
+    if not entries:
+        return []
+    start, counts = _fitting_start(
+        len(entries),
+        lambda begin, end: chat_entry_tokens(entries[begin:end], chat_tokenizer),
+        lambda index: index == 0 or entries[index][0] == "user",
+        separator=chat_separator_tokens(chat_tokenizer),
+        overhead=0,
+        budget=max(1, int(budget)),
+    )
+    return [
+        ChatMessage(role=role, content=content, chat_tokens=(content, counts[index]))
+        for index, (role, content) in enumerate(entries[start:], start)
+    ]
+
+
+def import_tool_texts(
+    texts: Sequence[str],
+    tool_tokenizer: FastTokenizer | None,
+    budget: int | None,
+) -> list[HistoryTurn]:
+    """Build tool turns for the newest ``texts`` that fit ``budget`` once joined.
+
+    With no budget every text is kept. When the newest text alone is over
+    budget it is kept whole, for the import trim to clip.
+    """
+    if not texts:
+        return []
+    if not budget:
+        return [HistoryTurn(turn_id=uuid.uuid4().hex, user=text, assistant="") for text in texts]
+    start, counts = _fitting_start(
+        len(texts),
+        lambda begin, end: count_tool_tokens_many(list(texts[begin:end]), tool_tokenizer),
+        lambda _index: True,
+        separator=tool_separator_tokens(tool_tokenizer),
+        overhead=special_tokens_overhead(tool_tokenizer),
+        budget=max(1, int(budget)),
+    )
+    return [
+        HistoryTurn(turn_id=uuid.uuid4().hex, user=text, assistant="", tool_tokens=(text, counts[index]))
+        for index, text in enumerate(texts[start:], start)
+    ]
+
+
+__all__ = ["build_imported_tool_turns", "import_chat_entries", "import_tool_texts"]
@@ -2,58 +2,225 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING
+from collections.abc import Sequence
 from .settings import HistoryRuntimeConfig
-from src.state.session import ChatMessage, HistoryTurn, SessionState
-from src.helpers.chat_history import group_chat_turns, flatten_chat_turns
-from src.tokens.history import count_chat_tokens, count_tool_tokens, build_tool_history, trim_tool_text_to_budget
+from src.helpers.chat_history import normalize_chat_messages
+from src.state.session import ChatMessage, HistoryTurn, HistoryTotal, SessionState
+from src.execution.tool.prompt_budget import ToolFitResult, fit_tool_input_to_budget
+from .totals import HistoryTrim, apply_trim, extend_total, covered_total, chat_head_eviction, tool_head_eviction
+from .counts import chat_line, tool_turn_tokens, chat_message_tokens, chat_separator_tokens, tool_separator_tokens
+from src.tokens.history import (
+    count_chat_tokens,
+    count_tool_tokens,
+    build_tool_history,
+    verify_fitting_join,
+    count_fitting_suffix,
+    special_tokens_overhead,
+    trim_tool_text_to_budget,
+)
 
 if TYPE_CHECKING:
     from src.tokens.tokenizer import FastTokenizer
 
-T = TypeVar("T")
 
+# Messages counted by the first backward window of a chat trim; later
+# windows double so an import of any size needs few batched calls.
+_COUNT_WINDOW = 32
 
-def _trim_oldest_items(
-    items: list[T],
-    *,
-    target_tokens: int,
-    count_tokens: Callable[[list[T]], int],
-) -> list[T]:
-    """Drop oldest items until ``count_tokens(items) <= target_tokens``."""
-    tokens = count_tokens(items)
-    if tokens <= target_tokens:
-        return items
-
-    tokens_to_remove = tokens - target_tokens
-    avg_tokens_per_item = tokens // len(items)
-    estimated_drops = max(1, tokens_to_remove // max(1, avg_tokens_per_item))
-    drops = min(estimated_drops, len(items) - 1)
-    trimmed = items[drops:] if drops > 0 else items
-
-    tokens = count_tokens(trimmed)
-    while len(trimmed) > 1 and tokens > target_tokens:
-        trimmed.pop(0)
-        tokens = count_tokens(trimmed)
-    return trimmed
-
-
-def render_history(messages: list[ChatMessage] | None) -> str:
+
+def _turn_starts(messages: Sequence[ChatMessage]) -> list[int]:
+    """Indices where trim-safe turns begin, matching ``group_chat_turns``."""
+    starts = [index for index, message in enumerate(messages) if message.role == "user"]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return starts
+
+
+def _suffix_costs(
+    messages: Sequence[ChatMessage],
+    chat_tokenizer: FastTokenizer | None,
+    separator: int,
+    limit: int,
+) -> tuple[int, list[int]]:
+    """Transcript tokens of ``messages[i:]``, scanning back from the newest message.
+
+    Messages are counted in doubling windows and the scan stops once the
+    suffix exceeds ``limit``, so a long import only tokenizes the messages
+    that could still be kept. Returns the first scanned index and the costs;
+    ``costs[i]`` is only meaningful for ``i`` at or after that index.
+    """
+    costs = [0] * len(messages)
+    running = -separator
+    end = len(messages)
+    window = _COUNT_WINDOW
+    while end > 0 and running <= limit:
+        begin = max(0, end - window)
+        window_tokens = chat_message_tokens(messages[begin:end], chat_tokenizer)
+        for index in range(end - 1, begin - 1, -1):
+            running += window_tokens[index - begin] + separator
+            costs[index] = running
+        end = begin
+        window *= 2
+    return end, costs
+
+
+def _verified_start(
+    messages: Sequence[ChatMessage],
+    starts: list[int],
+    position: int,
+    costs: list[int],
+    target: int,
+    chat_tokenizer: FastTokenizer | None,
+) -> int:
+    """Check the kept transcript with one exact count; drop more turns if it overshoots."""
+    start = starts[position]
+    excess = count_chat_tokens(render_history(messages[start:]), chat_tokenizer) - target
+    if excess <= 0:
+        return start
+    for later in starts[position + 1 :]:
+        if costs[start] - costs[later] >= excess:
+            return later
+    return starts[-1]
+
+
+def _chat_bounds(
+    config: HistoryRuntimeConfig,
+    trigger_tokens: int | None,
+    target_tokens: int | None,
+) -> tuple[int, int]:
+    """Effective ``(trigger, target)`` of a chat trim, with the target capped at the trigger."""
+    trigger = max(1, int(trigger_tokens) if trigger_tokens is not None else config.chat_trigger_tokens)
+    target = int(target_tokens) if target_tokens is not None else config.chat_target_tokens
+    return trigger, max(1, min(target, trigger))
+
+
+def _chat_head_start(
+    messages: Sequence[ChatMessage],
+    tokens: int,
+    chat_tokenizer: FastTokenizer | None,
+    separator: int,
+    target: int,
+) -> tuple[int, int]:
+    """First kept index of an over-trigger store of ``tokens``, confirmed by one exact count."""
+    counts = chat_message_tokens(messages, chat_tokenizer)
+    start, tokens = chat_head_eviction(messages, counts, separator, tokens, target)
+    excess = count_chat_tokens(render_history(messages[start:]), chat_tokenizer) - target
+    if excess > 0:
+        start, tokens = chat_head_eviction(messages, counts, separator, tokens, tokens - excess, begin=start)
+    return start, tokens
+
+
+def _tool_head_start(
+    turns: Sequence[HistoryTurn],
+    total: HistoryTotal,
+    budget: int,
+    tool_tokenizer: FastTokenizer | None,
+    separator: int,
+) -> HistoryTrim | None:
+    """Evict head turns against the running total; ``None`` when no whole turn fits.
+
+    An eviction is confirmed by counting the kept join exactly once; if the
+    summed total undercounted it, ``None`` hands the store to the exact
+    search in ``plan_tool_trim``.
+    """
+    tokens = extend_total(
+        total.tokens, total.length, tool_turn_tokens(turns[total.length :], tool_tokenizer), separator
+    )
+    overhead = special_tokens_overhead(tool_tokenizer)
+    if tokens + overhead <= budget:
+        return HistoryTrim(start=0, replacement=None, tokens=tokens)
+    eviction = tool_head_eviction(tool_turn_tokens(turns, tool_tokenizer), separator, tokens + overhead, budget)
+    if eviction is None:
+        return None
+    evicted, tokens = eviction
+    kept_texts = [user for turn in turns[evicted:] if (user := (turn.user or "").strip())]
+    if count_tool_tokens("\n".join(kept_texts), tool_tokenizer, include_special_tokens=True) > budget:
+        return None
+    return HistoryTrim(start=evicted, replacement=None, tokens=tokens - overhead)
+
+
+def render_history(messages: Sequence[ChatMessage] | None) -> str:
     """Render stored chat history as a role-labelled transcript."""
     if not messages:
         return ""
-    chunks = [f"{message.role.title()}: {message.content.strip()}" for message in messages if message.content.strip()]
+    chunks = [chat_line(message) for message in messages if message.content.strip()]
     return "\n\n".join(chunks)
 
 
-def get_user_texts(turns: list[HistoryTurn] | None) -> list[str]:
+def get_user_texts(turns: Sequence[HistoryTurn] | None) -> list[str]:
     """Extract raw user texts from tool-history entries."""
     if not turns:
         return []
     return [s for turn in turns if turn.user and (s := turn.user.strip())]
 
 
+def plan_chat_trim(
+    messages: Sequence[ChatMessage] | None,
+    *,
+    config: HistoryRuntimeConfig,
+    chat_tokenizer: FastTokenizer | None = None,
+    trigger_tokens: int | None = None,
+    target_tokens: int | None = None,
+) -> list[ChatMessage] | None:
+    """Return the trimmed chat messages, or ``None`` when no trim is needed.
+
+    Pure counterpart of ``trim_chat_history`` that never touches session
+    state, so it can run on the tokenization executor. Transcript size is
+    the sum of cached per-message counts plus the separators between them,
+    so picking the oldest kept turn is one backward suffix-sum scan that
+    stops past the trigger; the kept transcript is then counted exactly
+    once to confirm the fit.
+    """
+    if not messages:
+        return None
+    effective_trigger, effective_target = _chat_bounds(config, trigger_tokens, target_tokens)
+    first, costs = _suffix_costs(messages, chat_tokenizer, chat_separator_tokens(chat_tokenizer), effective_trigger)
+    if first == 0 and costs[0] <= effective_trigger:
+        return None
+    starts = _turn_starts(messages)
+    position = next(
+        (index for index, start in enumerate(starts) if start >= first and costs[start] <= effective_target),
+        len(starts) - 1,
+    )
+    start = _verified_start(messages, starts, position, costs, effective_target, chat_tokenizer)
+    return normalize_chat_messages(messages[start:])
+
+
+def plan_chat_eviction(
+    messages: Sequence[ChatMessage],
+    total: HistoryTotal | None,
+    *,
+    config: HistoryRuntimeConfig,
+    chat_tokenizer: FastTokenizer | None = None,
+    trigger_tokens: int | None = None,
+    target_tokens: int | None = None,
+) -> HistoryTrim:
+    """Plan the chat trim of ``messages`` and the running total it leaves.
+
+    With a running ``total`` covering a prefix of ``messages``, an append
+    only counts its own messages, and past the trigger the oldest whole
+    turns are evicted from the head. Without one (imported, restored or
+    replaced stores) the trim is ``plan_chat_trim``. Never touches session
+    state, so it can run on the tokenization executor against a snapshot.
+    """
+    trigger, target = _chat_bounds(config, trigger_tokens, target_tokens)
+    separator = chat_separator_tokens(chat_tokenizer)
+    if total is not None:
+        appended = chat_message_tokens(messages[total.length :], chat_tokenizer)
+        tokens = extend_total(total.tokens, total.length, appended, separator)
+        if tokens <= trigger:
+            return HistoryTrim(start=0, replacement=None, tokens=tokens)
+        start, tokens = _chat_head_start(messages, tokens, chat_tokenizer, separator, target)
+        return HistoryTrim(start=start, replacement=None, tokens=tokens)
+    trimmed = plan_chat_trim(
+        messages, config=config, chat_tokenizer=chat_tokenizer, trigger_tokens=trigger, target_tokens=target
+    )
+    kept = trimmed if trimmed is not None else messages
+    tokens = extend_total(0, 0, chat_message_tokens(kept, chat_tokenizer), separator)
+    return HistoryTrim(start=0, replacement=trimmed, tokens=tokens)
+
+
 def trim_chat_history(
     state: SessionState,
     *,
@@ -62,31 +229,92 @@ def trim_chat_history(
     trigger_tokens: int | None = None,
     target_tokens: int | None = None,
 ) -> None:
-    """Trim stored chat messages when the transcript exceeds the trigger threshold."""
+    """Evict the oldest whole turns once the transcript exceeds the trigger threshold.
+
+    Plans with ``plan_chat_eviction`` against the store's running total and
+    commits in place: evicted turns are deleted from the head of the list
+    and the total is re-tagged for the next append.
+    """
     messages = state.chat_history_messages
     if not messages:
+        state.chat_history_total = None
         return
-    turns = group_chat_turns(messages)
-    if not turns:
-        state.chat_history_messages = []
-        return
+    trim = plan_chat_eviction(
+        messages,
+        covered_total(state.chat_history_total, messages),
+        config=config,
+        chat_tokenizer=chat_tokenizer,
+        trigger_tokens=trigger_tokens,
+        target_tokens=target_tokens,
+    )
+    state.chat_history_messages, state.chat_history_total = apply_trim(messages, trim)
 
-    effective_trigger = int(trigger_tokens) if trigger_tokens is not None else config.chat_trigger_tokens
-    effective_target = int(target_tokens) if target_tokens is not None else config.chat_target_tokens
-    effective_trigger = max(1, effective_trigger)
-    effective_target = max(1, min(effective_target, effective_trigger))
 
-    def _count(candidate_turns: list[list[ChatMessage]]) -> int:
-        return count_chat_tokens(render_history(flatten_chat_turns(candidate_turns)), chat_tokenizer)
+def plan_tool_trim(
+    turns: Sequence[HistoryTurn] | None,
+    budget: int,
+    *,
+    tool_tokenizer: FastTokenizer | None = None,
+) -> list[HistoryTurn] | None:
+    """Return tool-history turns fitted to ``budget``, or ``None`` when they already fit.
 
-    if _count(turns) <= effective_trigger:
-        return
-    trimmed_turns = _trim_oldest_items(
-        turns,
-        target_tokens=effective_target,
-        count_tokens=_count,
+    The window is picked from cached per-turn counts and its join is then
+    counted exactly once, as ``plan_chat_trim`` does for the transcript.
+    """
+    if not turns:
+        return None
+
+    effective_budget = max(1, int(budget))
+    texted = [
+        (turn, tokens)
+        for turn, tokens in zip(turns, tool_turn_tokens(turns, tool_tokenizer), strict=True)
+        if (turn.user or "").strip()
+    ]
+    kept = count_fitting_suffix(
+        [tokens for _turn, tokens in texted],
+        effective_budget,
+        separator_tokens=tool_separator_tokens(tool_tokenizer),
+        overhead_tokens=special_tokens_overhead(tool_tokenizer),
+    )
+    newest_first = [turn.user.strip() for turn, _tokens in reversed(texted)]
+    kept, _joined_tokens = verify_fitting_join(newest_first, kept, effective_budget, tool_tokenizer)
+    if kept == len(texted):
+        return None
+    if kept:
+        return [turn for turn, _tokens in texted[-kept:]]
+    last_turn = texted[-1][0]
+    clipped_user = trim_tool_text_to_budget(
+        last_turn.user,
+        effective_budget,
+        tool_tokenizer,
+        keep="end",
+        include_special_tokens=True,
     )
-    state.chat_history_messages = flatten_chat_turns(trimmed_turns)
+    return [HistoryTurn(turn_id=last_turn.turn_id, user=clipped_user, assistant="")] if clipped_user else []
+
+
+def plan_tool_eviction(
+    turns: Sequence[HistoryTurn],
+    total: HistoryTotal | None,
+    budget: int,
+    *,
+    tool_tokenizer: FastTokenizer | None = None,
+) -> HistoryTrim:
+    """Tool-history counterpart of ``plan_chat_eviction``.
+
+    A newest turn that alone exceeds the budget goes through
+    ``plan_tool_trim`` like a store without a running total.
+    """
+    effective_budget = max(1, int(budget))
+    separator = tool_separator_tokens(tool_tokenizer)
+    if total is not None:
+        trim = _tool_head_start(turns, total, effective_budget, tool_tokenizer, separator)
+        if trim is not None:
+            return trim
+    trimmed = plan_tool_trim(turns, effective_budget, tool_tokenizer=tool_tokenizer)
+    kept = trimmed if trimmed is not None else turns
+    tokens = extend_total(0, 0, tool_turn_tokens(kept, tool_tokenizer), separator)
+    return HistoryTrim(start=0, replacement=trimmed, tokens=tokens)
 
 
 def trim_tool_history(
@@ -95,39 +323,40 @@ def trim_tool_history(
     *,
     tool_tokenizer: FastTokenizer | None = None,
 ) -> None:
-    """Trim tool-history entries to fit within ``budget`` tokens."""
+    """Trim tool-history entries to fit within ``budget`` tokens.
+
+    Like ``trim_chat_history``, commits a ``plan_tool_eviction`` plan in place.
+    """
     turns = state.tool_history_turns
     if not turns:
+        state.tool_history_total = None
         return
+    trim = plan_tool_eviction(
+        turns, covered_total(state.tool_history_total, turns), budget, tool_tokenizer=tool_tokenizer
+    )
+    state.tool_history_turns, state.tool_history_total = apply_trim(turns, trim)
 
-    effective_budget = max(1, int(budget))
-
-    def _count(candidate_turns: list[HistoryTurn]) -> int:
-        texts = get_user_texts(candidate_turns)
-        return count_tool_tokens("\n".join(texts), tool_tokenizer, include_special_tokens=True)
 
-    if _count(turns) <= effective_budget:
-        return
-    trimmed_turns = _trim_oldest_items(turns, target_tokens=effective_budget, count_tokens=_count)
-    if trimmed_turns:
-        remaining_tokens = _count(trimmed_turns)
-        if remaining_tokens > effective_budget and len(trimmed_turns) == 1:
-            last_turn = trimmed_turns[0]
-            clipped_user = trim_tool_text_to_budget(
-                last_turn.user,
-                effective_budget,
-                tool_tokenizer,
-                keep="end",
-                include_special_tokens=True,
-            )
-            trimmed_turns = (
-                [HistoryTurn(turn_id=last_turn.turn_id, user=clipped_user, assistant="")] if clipped_user else []
-            )
-    state.tool_history_turns = trimmed_turns
+def fit_tool_window(
+    turns: Sequence[HistoryTurn] | None,
+    tool_user_utt: str,
+    tool_tokenizer: FastTokenizer | None = None,
+    *,
+    max_input_tokens: int,
+) -> ToolFitResult:
+    """Fit the tool input from stored turns, reusing their cached token counts."""
+    window = turns or []
+    return fit_tool_input_to_budget(
+        [turn.user for turn in window],
+        tool_user_utt,
+        tool_tokenizer,
+        max_input_tokens=max_input_tokens,
+        prior_tokens=tool_turn_tokens(window, tool_tokenizer),
+    )
 
 
 def render_tool_history_text(
-    turns: list[HistoryTurn] | None,
+    turns: Sequence[HistoryTurn] | None,
     *,
     config: HistoryRuntimeConfig,
     max_tokens: int | None = None,
@@ -152,8 +381,13 @@ def render_tool_history_text(
 
 __all__ = [
     "render_history",
+    "plan_chat_trim",
+    "plan_tool_trim",
+    "plan_chat_eviction",
+    "plan_tool_eviction",
     "trim_chat_history",
     "trim_tool_history",
+    "fit_tool_window",
     "render_tool_history_text",
     "get_user_texts",
 ]
@@ -0,0 +1,128 @@
+"""Running token totals and head eviction for the history stores.
+
+Each store keeps a ``HistoryTotal``: the joined size of its entries (cached
+per-entry counts plus one separator between neighbours). An append that
+keeps the store under its limit only sums the new entries' counts. Once the
+limit is crossed, whole turns are evicted from the head of the
+``HistoryStore`` in place, walking forward from the oldest entry until the
+remaining suffix fits; the ring-buffer store drops them without shifting
+the kept entries.
+
+Trims are planned as a ``HistoryTrim`` against a snapshot, which may run on
+the tokenizer executor, and committed with ``apply_trim`` on the loop.
+"""
+
+from __future__ import annotations
+
+from typing import Any, TypeVar
+from dataclasses import dataclass
+from collections.abc import Sequence
+from src.state.history import HistoryStore
+from src.state.session import ChatMessage, HistoryView, HistoryTotal
+
+EntryT = TypeVar("EntryT")
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryTrim:
+    """Planned trim of one history store and the running total it leaves.
+
+    Attributes:
+        start: Leading entries to delete in place.
+        replacement: Entries that replace the store instead, when not ``None``.
+        tokens: Joined size of the kept entries.
+    """
+
+    start: int
+    replacement: list[Any] | None
+    tokens: int
+
+
+def covered_total(total: HistoryTotal | None, store: HistoryStore[Any]) -> HistoryTotal | None:
+    """Return ``total`` if it still describes a prefix of ``store``, else ``None``."""
+    if total is None or total.store is not store or not 0 < total.length <= len(store):
+        return None
+    return total if store[total.length - 1] is total.last else None
+
+
+def shared_view(view: HistoryView | None, store: HistoryStore[Any]) -> HistoryView:
+    """Return ``view`` while it still mirrors ``store``, else a fresh view of ``store``.
+
+    Reads between two changes of the store share one tuple, so a snapshot
+    costs O(1) instead of a copy per read.
+    """
+    if view is not None and view.store is store and len(view.entries) == len(store):
+        entries = view.entries
+        if not entries or (store[0] is entries[0] and store[-1] is entries[-1]):
+            return view
+    return HistoryView(store=store, entries=tuple(store))
+
+
+def extend_total(tokens: int, covered: int, counts: Sequence[int], separator: int) -> int:
+    """Joined tokens after appending entries with ``counts`` to ``covered`` entries."""
+    added = sum(counts) + separator * len(counts)
+    return tokens + added if covered else added - separator
+
+
+def tag_total(store: HistoryStore[Any], tokens: int) -> HistoryTotal | None:
+    """Record ``tokens`` as the running total of ``store``; ``None`` for an empty store."""
+    return HistoryTotal(store=store, length=len(store), last=store[-1], tokens=tokens) if store else None
+
+
+def apply_trim(store: HistoryStore[EntryT], trim: HistoryTrim) -> tuple[HistoryStore[EntryT], HistoryTotal | None]:
+    """Commit ``trim`` to ``store`` and return the kept store with its running total."""
+    if trim.replacement is not None:
+        store = HistoryStore(trim.replacement)
+    elif trim.start:
+        del store[: trim.start]
+    return store, tag_total(store, trim.tokens)
+
+
+def chat_head_eviction(
+    messages: Sequence[ChatMessage],
+    counts: Sequence[int],
+    separator: int,
+    tokens: int,
+    target: int,
+    *,
+    begin: int = 0,
+) -> tuple[int, int]:
+    """Return the first turn start after ``begin`` whose suffix fits ``target``.
+
+    ``tokens`` is the joined size of ``messages[begin:]``. Turns start at
+    user messages, as in ``group_chat_turns``; when no suffix fits, the
+    newest turn is kept. Returns the start index and the kept suffix size.
+    """
+    start, kept = begin, tokens
+    for index in range(begin + 1, len(messages)):
+        tokens -= counts[index - 1] + separator
+        if messages[index].role == "user":
+            start, kept = index, tokens
+            if tokens <= target:
+                break
+    return start, kept
+
+
+def tool_head_eviction(counts: Sequence[int], separator: int, tokens: int, budget: int) -> tuple[int, int] | None:
+    """Return how many oldest turns to evict so the rest fit ``budget``, and their size.
+
+    ``tokens`` is the joined size of all turns including fixed overhead.
+    ``None`` means even the newest turn alone does not fit.
+    """
+    for evicted in range(1, len(counts)):
+        tokens -= counts[evicted - 1] + separator
+        if tokens <= budget:
+            return evicted, tokens
+    return None
+
+
+__all__ = [
+    "HistoryTrim",
+    "apply_trim",
+    "covered_total",
+    "shared_view",
+    "extend_total",
+    "tag_total",
+    "chat_head_eviction",
+    "tool_head_eviction",
+]
@@ -4,14 +4,17 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-from typing import TYPE_CHECKING, Any
+from collections.abc import Sequence
+from .memory import SessionMemoryBudget
 from .config import resolve_screen_prefix
+from typing import TYPE_CHECKING, Literal
 from .time import format_session_timestamp
+from .snapshots import restore_session_snapshot
+from ...tokens.history import offload_token_work
 from ...tokens.prefix import strip_screen_prefix
-from src.state.session import ChatMessage, HistoryTurn, SessionState
-from src.execution.tool.prompt_budget import fit_tool_input_to_budget
 from src.execution.chat.prompt_budget import fit_chat_prompt_to_budget
-from .history import HistoryController, HistoryRuntimeConfig, build_history_runtime_config
+from src.state.session import ChatMessage, HistoryTurn, SessionMeta, SessionState, SessionSnapshot
+from .history import HistoryController, HistoryRuntimeConfig, fit_tool_window, build_history_runtime_config
 from src.config import CHAT_MODEL, TOOL_MODEL, CHAT_MAX_LEN, DEFAULT_CHECK_SCREEN_PREFIX, DEFAULT_SCREEN_CHECKED_PREFIX
 from .requests import (
     attach_request_task,
@@ -42,8 +45,10 @@ class SessionHandler:
         chat_tokenizer: FastTokenizer | None = None,
         tool_tokenizer: FastTokenizer | None = None,
         history_config: HistoryRuntimeConfig | None = None,
+        memory_budget: SessionMemoryBudget | None = None,
     ):
         self._chat_engine = chat_engine
+        self._memory = memory_budget
         self._chat_tokenizer = chat_tokenizer
         self._tool_tokenizer = tool_tokenizer
         self._tool_history_budget = tool_history_budget
@@ -65,33 +70,51 @@ class SessionHandler:
     # Session metadata / lifecycle
     # ============================================================================
 
-    def initialize_session(self, state: SessionState) -> dict[str, Any]:
+    def _deployed_models(self) -> tuple[str | None, str | None]:
+        return (
+            CHAT_MODEL if self._history_config.deploy_chat else None,
+            TOOL_MODEL if self._history_config.deploy_tool else None,
+        )
+
+    def initialize_session(self, state: SessionState) -> SessionMeta:
         """Populate a fresh session state with default metadata."""
         self._history.initialize_mode_state(state)
         timestamp = format_session_timestamp()
-        meta = state.meta
-        meta.update(
-            {
-                "now_iso": timestamp.iso,
-                "now_str": timestamp.display,
-                "now_classification": timestamp.classification,
-                "now_tz": timestamp.tz,
-                "chat_gender": None,
-                "chat_personality": None,
-                "chat_prompt": None,
-                "chat_sampling": None,
-                "chat_model": CHAT_MODEL if self._history_config.deploy_chat else None,
-                "tool_model": TOOL_MODEL if self._history_config.deploy_tool else None,
-                "check_screen_prefix": None,
-                "screen_checked_prefix": None,
-            }
+        chat_model, tool_model = self._deployed_models()
+        meta = SessionMeta(
+            client_id=state.meta.client_id,
+            now_iso=timestamp.iso,
+            now_str=timestamp.display,
+            now_classification=timestamp.classification,
+            now_tz=timestamp.tz,
+            chat_model=chat_model,
+            tool_model=tool_model,
         )
+        state.meta = meta
         # Cache default prefix token counts
         state.check_screen_prefix_tokens = self.count_prefix_tokens(DEFAULT_CHECK_SCREEN_PREFIX)
         state.screen_checked_prefix_tokens = self.count_prefix_tokens(DEFAULT_SCREEN_CHECKED_PREFIX)
         state.screen_followup_pending = False
         return meta
 
+    def account_session_memory(self, state: SessionState) -> None:
+        """Re-measure ``state`` against the session memory budget, if one is configured."""
+        if self._memory is not None:
+            self._memory.account(state)
+
+    def restore_session(self, state: SessionState, snapshot: SessionSnapshot) -> bool:
+        """Restore a snapshot into a fresh connection's state without re-tokenizing.
+
+        Returns False, leaving ``state`` untouched, when the snapshot was
+        taken under different deployed models.
+        """
+        if (snapshot.meta.chat_model, snapshot.meta.tool_model) != self._deployed_models():
+            return False
+        restore_session_snapshot(state, snapshot)
+        self._history.initialize_mode_state(state)
+        self.account_session_memory(state)
+        return True
+
     def set_screen_followup_pending(self, state: SessionState | None, pending: bool) -> None:
         """Mark whether the next message turn should use screen_checked_prefix."""
         if state is None:
@@ -105,7 +128,11 @@ class SessionHandler:
         *,
         tool_user_utt: str | None = None,
     ) -> tuple[str, str | None]:
-        """Strip internal screen prefixes from chat/tool user variants."""
+        """Strip screen prefixes a client echoed into its chat/tool user variants.
+
+        Applied once when a turn is planned; the server's own prefix travels
+        beside the utterance and never needs stripping.
+        """
         check_screen_prefix = resolve_screen_prefix(state, DEFAULT_CHECK_SCREEN_PREFIX, is_checked=False)
         screen_checked_prefix = resolve_screen_prefix(state, DEFAULT_SCREEN_CHECKED_PREFIX, is_checked=True)
         normalized_chat = strip_screen_prefix(
@@ -132,14 +159,10 @@ class SessionHandler:
         tool_user_utt: str | None = None,
     ) -> str | None:
         """Reserve a stable tool-history id without mutating either history store."""
-        normalized_chat, normalized_tool = self.normalize_user_utterances(
-            state,
-            chat_user_utt,
-            tool_user_utt=tool_user_utt,
-        )
+        _ = state
         return self._history.reserve_turn_id(
-            chat_user_utt=normalized_chat,
-            tool_user_utt=normalized_tool,
+            chat_user_utt=chat_user_utt,
+            tool_user_utt=tool_user_utt,
         )
 
     def prepare_tool_turn(
@@ -150,30 +173,66 @@ class SessionHandler:
         turn_id: str | None = None,
     ) -> tuple[str, str]:
         """Fit/store the tool-side user text exactly once and return prior fitted history."""
-        normalized_chat, normalized_tool = self.normalize_user_utterances(
-            state,
+        prompt_fit = fit_tool_window(
+            self._history.get_tool_turns(state),
             tool_user_utt,
-            tool_user_utt=tool_user_utt,
+            self._tool_tokenizer,
+            max_input_tokens=self._resolve_tool_input_budget(),
         )
-        tool_user = normalized_tool if normalized_tool is not None else normalized_chat
-        prompt_fit = fit_tool_input_to_budget(
-            self._history.get_tool_user_texts(state),
-            tool_user,
+        if prompt_fit.tool_user_utt:
+            self._history.append_tool_turn(
+                state,
+                prompt_fit.tool_user_utt,
+                turn_id=turn_id,
+                user_tokens=prompt_fit.tool_user_tokens,
+            )
+            self.account_session_memory(state)
+        return prompt_fit.tool_user_utt, prompt_fit.tool_user_history
+
+    async def aprepare_tool_turn(
+        self,
+        state: SessionState,
+        tool_user_utt: str,
+        *,
+        turn_id: str | None = None,
+    ) -> tuple[str, str]:
+        """Async ``prepare_tool_turn`` that tokenizes on the tool tokenizer's executor."""
+        prompt_fit = await offload_token_work(
+            self._tool_tokenizer,
+            fit_tool_window,
+            self._history.get_tool_turns(state),
+            tool_user_utt,
             self._tool_tokenizer,
             max_input_tokens=self._resolve_tool_input_budget(),
         )
         if prompt_fit.tool_user_utt:
-            self._history.append_tool_turn(state, prompt_fit.tool_user_utt, turn_id=turn_id)
+            await self._history.aappend_tool_turn(
+                state,
+                prompt_fit.tool_user_utt,
+                turn_id=turn_id,
+                user_tokens=prompt_fit.tool_user_tokens,
+            )
+            self.account_session_memory(state)
         return prompt_fit.tool_user_utt, prompt_fit.tool_user_history
 
     def append_chat_turn(
         self, state: SessionState, chat_user_utt: str, assistant_text: str, *, turn_id: str | None = None
     ) -> str:
-        normalized_user, _ = self.normalize_user_utterances(state, chat_user_utt)
         _ = turn_id
-        return self._history.append_chat_response(state, normalized_user, assistant_text)
+        stored = self._history.append_chat_response(state, chat_user_utt, assistant_text)
+        self.account_session_memory(state)
+        return stored
 
-    def fit_start_chat_history(
+    async def aappend_chat_turn(
+        self, state: SessionState, chat_user_utt: str, assistant_text: str, *, turn_id: str | None = None
+    ) -> str:
+        """Async ``append_chat_turn`` that trims history on the chat tokenizer's executor."""
+        _ = turn_id
+        stored = await self._history.aappend_chat_response(state, chat_user_utt, assistant_text)
+        self.account_session_memory(state)
+        return stored
+
+    async def fit_start_chat_history(
         self,
         state: SessionState,
         *,
@@ -190,7 +249,8 @@ class SessionHandler:
         if not original_history:
             return []
 
-        prompt_fit = fit_chat_prompt_to_budget(
+        prompt_fit = await self._chat_tokenizer.offload(
+            fit_chat_prompt_to_budget,
             static_prefix,
             runtime_text,
             original_history,
@@ -208,8 +268,8 @@ class SessionHandler:
     # History accessors
     # ============================================================================
 
-    def get_chat_messages(self, state: SessionState) -> list[ChatMessage]:
-        """Get a copy of committed chat history messages."""
+    def get_chat_messages(self, state: SessionState) -> tuple[ChatMessage, ...]:
+        """Get a snapshot of committed chat history messages."""
         return self._history.get_chat_messages(state)
 
     def set_mode_histories(
@@ -226,6 +286,16 @@ class SessionHandler:
             tool_turns=tool_turns,
         )
 
+    def import_mode_histories(
+        self,
+        state: SessionState,
+        *,
+        chat_entries: Sequence[tuple[Literal["user", "assistant"], str]],
+        tool_texts: Sequence[str],
+    ) -> None:
+        """Import start history parsed by ``parse_history_payload``."""
+        self._history.import_mode_histories(state, chat_entries=chat_entries, tool_texts=tool_texts)
+
     # ============================================================================
     # Request/task tracking
     # ============================================================================
@@ -293,11 +363,11 @@ class SessionHandler:
     # Token helpers
     # ============================================================================
 
-    def count_chat_tokens(self, text: str) -> int:
-        """Count chat tokens using the configured runtime chat tokenizer."""
+    def chat_text_fits(self, text: str, max_tokens: int) -> bool:
+        """Whether ``text`` fits ``max_tokens`` chat tokens, counting unless the length bound clears it."""
         if self._chat_tokenizer is None:
             raise RuntimeError("Chat tokenizer is not configured")
-        return self._chat_tokenizer.count(text)
+        return self._chat_tokenizer.fits(text, max_tokens)
 
     def count_prefix_tokens(self, prefix: str | None) -> int:
         """Count prefix tokens using the configured runtime chat tokenizer."""
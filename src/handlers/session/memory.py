@@ -0,0 +1,301 @@
+"""Per-session memory accounting under a process-wide budget.
+
+Token limits bound each field of a session, but nothing bounded how much
+all live sessions hold together, and an idle session kept everything
+resident until its connection timed out. Each session's persona, meta and
+history bytes are re-measured when its history is appended to or its meta
+is updated, and the running process total is exposed as a gauge.
+
+When the total passes the budget, the histories of sessions that have been
+idle longest are parked: serialized with their cached token counts and
+either kept zlib-compressed in memory or spilled to a local SQLite file.
+A parked session is restored on its next turn, or before its resume
+snapshot is taken on disconnect.
+
+Budget calls run on the event loop. Spill-file I/O runs on one worker
+thread: parking hands the write off and keeps the body until it lands,
+and the async ``arestore``/``arelease`` await reads instead of blocking.
+The spill file is scratch space for this process only, so writes skip
+fsync. While nothing can be parked, relief is not retried before the
+next session could have been idle for the idle window, so appends under
+memory pressure do not rescan every session.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import zlib
+import asyncio
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from dataclasses import fields
+from operator import attrgetter
+from collections.abc import Sequence
+from src.state.history import HistoryStore
+from src.telemetry.instruments import get_metrics
+from .snapshots import decode_histories, encode_histories
+from concurrent.futures import Future, ThreadPoolExecutor
+from src.state.session import ChatMessage, HistoryTurn, SessionState
+
+logger = logging.getLogger(__name__)
+
+# Slotted records all have the same size, so only their strings are walked.
+_CONTENT = attrgetter("content")
+_USER = attrgetter("user")
+_TURN_ID = attrgetter("turn_id")
+_SCHEMA = "CREATE TABLE IF NOT EXISTS histories (session_id TEXT PRIMARY KEY, body BLOB NOT NULL)"
+
+
+def _chat_bytes(messages: Sequence[ChatMessage] | None) -> int:
+    if not messages:
+        return 0
+    records = sys.getsizeof(messages) + sys.getsizeof(messages[0]) * len(messages)
+    return records + sum(map(sys.getsizeof, map(_CONTENT, messages)))
+
+
+def _tool_bytes(turns: Sequence[HistoryTurn] | None) -> int:
+    if not turns:
+        return 0
+    records = sys.getsizeof(turns) + sys.getsizeof(turns[0]) * len(turns)
+    return records + sum(map(sys.getsizeof, map(_USER, turns))) + sum(map(sys.getsizeof, map(_TURN_ID, turns)))
+
+
+def session_bytes(state: SessionState) -> int:
+    """Resident bytes of a session's meta record and history stores.
+
+    Strings and records are measured with ``sys.getsizeof``; cached token
+    counts share their text and are not counted again.
+    """
+    meta = state.meta
+    total = sys.getsizeof(meta) + sum(sys.getsizeof(getattr(meta, f.name)) for f in fields(meta))
+    return total + _chat_bytes(state.chat_history_messages) + _tool_bytes(state.tool_history_turns)
+
+
+class SessionMemoryBudget:
+    """Byte accounting for live sessions, parking idle histories over budget.
+
+    Sessions join on their first ``account`` and leave on ``release``. A
+    budget of 0 only measures. ``total_bytes`` may be read from any thread.
+    """
+
+    __slots__ = (
+        "_budget",
+        "_idle_s",
+        "_sessions",
+        "_total",
+        "_parked",
+        "_next_relieve",
+        "_spill",
+        "_spill_io",
+        "_pending",
+        "_pending_lock",
+    )
+
+    def __init__(self, *, budget_bytes: int, idle_s: float, spill_path: str = "") -> None:
+        """Create a budget of ``budget_bytes`` for all live sessions.
+
+        Rows left in ``spill_path`` by an earlier process are dropped.
+
+        Raises:
+            sqlite3.Error: If ``spill_path`` cannot be opened as a SQLite database.
+        """
+        self._budget = max(0, int(budget_bytes))
+        self._idle_s = max(0.0, float(idle_s))
+        self._sessions: dict[str, SessionState] = {}
+        self._total = 0
+        self._parked: dict[str, bytes] = {}
+        self._next_relieve = 0.0
+        self._spill: sqlite3.Connection | None = None
+        self._spill_io: ThreadPoolExecutor | None = None
+        self._pending: dict[str, bytes] = {}
+        self._pending_lock = threading.Lock()
+        if spill_path:
+            Path(spill_path).parent.mkdir(parents=True, exist_ok=True)
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False, isolation_level=None)
+            self._spill.execute("PRAGMA synchronous=OFF")
+            self._spill.execute(_SCHEMA)
+            self._spill.execute("DELETE FROM histories")
+            self._spill_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-spill")
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held by all live sessions, compressed parked histories included."""
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _measure(self, state: SessionState) -> None:
+        size = session_bytes(state) + len(self._parked.get(state.session_id, b""))
+        previous = state.memory_bytes if state.session_id in self._sessions else 0
+        self._sessions[state.session_id] = state
+        self._total += size - previous
+        state.memory_bytes = size
+
+    @staticmethod
+    def _holds_history(state: SessionState) -> bool:
+        return not state.history_parked and bool(state.chat_history_messages or state.tool_history_turns)
+
+    def _idle_from(self, state: SessionState, now: float) -> float:
+        """Earliest time ``state`` could be parked; a busy session is touched again when its turn ends."""
+        return (state.memory_touched_at if state.lifecycle_state == "idle" else now) + self._idle_s
+
+    def _parkable(self, state: SessionState, now: float) -> bool:
+        return self._holds_history(state) and state.lifecycle_state == "idle" and self._idle_from(state, now) <= now
+
+    def _write_spilled(self, spill: sqlite3.Connection, session_id: str, body: bytes) -> None:
+        """Write a parked body on the spill worker; it stays in ``_pending`` if the write fails."""
+        try:
+            spill.execute("INSERT OR REPLACE INTO histories VALUES (?, ?)", (session_id, body))
+        except sqlite3.Error as exc:
+            logger.warning("session memory: spill failed, history kept in memory: %s", exc)
+            return
+        with self._pending_lock:
+            if self._pending.get(session_id) is body:
+                del self._pending[session_id]
+
+    @staticmethod
+    def _read_spilled(spill: sqlite3.Connection, session_id: str) -> bytes | None:
+        try:
+            row = spill.execute("SELECT body FROM histories WHERE session_id = ?", (session_id,)).fetchone()
+            spill.execute("DELETE FROM histories WHERE session_id = ?", (session_id,))
+        except sqlite3.Error as exc:
+            logger.warning("session memory: unreadable spilled history: %s", exc)
+            return None
+        return row[0] if row is not None else None
+
+    @staticmethod
+    def _drop_spilled(spill: sqlite3.Connection, session_id: str) -> None:
+        try:
+            spill.execute("DELETE FROM histories WHERE session_id = ?", (session_id,))
+        except sqlite3.Error as exc:
+            logger.warning("session memory: could not drop spilled history: %s", exc)
+
+    def _store_parked(self, session_id: str, body: bytes) -> None:
+        if self._spill is None or self._spill_io is None:
+            self._parked[session_id] = zlib.compress(body)
+            return
+        with self._pending_lock:
+            self._pending[session_id] = body
+        self._spill_io.submit(self._write_spilled, self._spill, session_id, body)
+
+    def _take_pending(self, session_id: str) -> bytes | None:
+        """Pop a body whose spill write has not landed; its row, if any, is dropped after it."""
+        with self._pending_lock:
+            body = self._pending.pop(session_id, None)
+        if body is not None and self._spill is not None and self._spill_io is not None:
+            self._spill_io.submit(self._drop_spilled, self._spill, session_id)
+        return body
+
+    def _read_parked(self, session_id: str) -> Future[bytes | None]:
+        """Read and drop a spilled body on the spill worker."""
+        if self._spill is None or self._spill_io is None:
+            raise RuntimeError("session memory has no spill file")
+        return self._spill_io.submit(self._read_spilled, self._spill, session_id)
+
+    def _discard_parked(self, session_id: str) -> None:
+        if self._spill is None or self._spill_io is None:
+            self._parked.pop(session_id, None)
+        elif self._take_pending(session_id) is None:
+            self._spill_io.submit(self._drop_spilled, self._spill, session_id)
+
+    def _park(self, state: SessionState) -> None:
+        chat, tool = state.chat_history_messages, state.tool_history_turns
+        self._store_parked(state.session_id, encode_histories(chat, tool).encode())
+        state.chat_history_messages = HistoryStore() if chat is not None else None
+        state.tool_history_turns = HistoryStore() if tool is not None else None
+        state.chat_history_total = state.tool_history_total = None
+        state.history_parked = True
+        self._measure(state)
+        get_metrics().session_parks_total.add(1)
+
+    def _relieve(self, current: SessionState, now: float) -> None:
+        candidates = [s for s in self._sessions.values() if s is not current and self._parkable(s, now)]
+        for state in sorted(candidates, key=lambda s: s.memory_touched_at):
+            if self._total <= self._budget:
+                return
+            self._park(state)
+        if self._total > self._budget:
+            self._next_relieve = min(
+                (self._idle_from(s, now) for s in self._sessions.values() if self._holds_history(s)),
+                default=now + self._idle_s,
+            )
+
+    def _unpark(self, state: SessionState, body: bytes | None) -> None:
+        state.history_parked = False
+        if body is None:
+            logger.warning("session memory: parked history lost for session %s", state.session_id)
+        else:
+            try:
+                state.chat_history_messages, state.tool_history_turns = decode_histories(body.decode())
+            except (ValueError, KeyError, TypeError) as exc:
+                logger.warning("session memory: unreadable parked history: %s", exc)
+        self.account(state)
+
+    def account(self, state: SessionState) -> None:
+        """Re-measure ``state`` and park idle sessions while over budget."""
+        self._measure(state)
+        state.memory_touched_at = now = time.monotonic()
+        if self._budget and self._total > self._budget and now >= self._next_relieve:
+            self._relieve(state, now)
+
+    def restore(self, state: SessionState) -> None:
+        """Bring a parked session's history back before it is used.
+
+        A history that cannot be read back is dropped with a warning and the
+        session continues with empty stores. Waits for a spilled read, so
+        callers on the event loop use ``arestore``.
+        """
+        if not state.history_parked:
+            return
+        session_id = state.session_id
+        if self._spill_io is None:
+            blob = self._parked.pop(session_id, None)
+            self._unpark(state, zlib.decompress(blob) if blob is not None else None)
+            return
+        body = self._take_pending(session_id)
+        self._unpark(state, body if body is not None else self._read_parked(session_id).result())
+
+    async def arestore(self, state: SessionState) -> None:
+        """Async ``restore`` that awaits a spilled read on the spill worker."""
+        if not state.history_parked or self._spill_io is None:
+            self.restore(state)
+            return
+        body = self._take_pending(state.session_id)
+        if body is None:
+            body = await asyncio.wrap_future(self._read_parked(state.session_id))
+        if state.history_parked:
+            self._unpark(state, body)
+
+    def release(self, state: SessionState, *, keep_history: bool = False) -> None:
+        """Stop tracking a closed session, restoring its history if ``keep_history``."""
+        if keep_history:
+            self.restore(state)
+        elif state.history_parked:
+            self._discard_parked(state.session_id)
+        if self._sessions.pop(state.session_id, None) is state:
+            self._total -= state.memory_bytes
+
+    async def arelease(self, state: SessionState, *, keep_history: bool = False) -> None:
+        """Async ``release`` that awaits a spilled read on the spill worker."""
+        if keep_history:
+            await self.arestore(state)
+        self.release(state)
+
+    def close(self) -> None:
+        """Drop parked histories, finish pending spill I/O and close the spill file."""
+        self._parked.clear()
+        if self._spill_io is not None:
+            self._spill_io.shutdown(wait=True)
+            self._spill_io = None
+        with self._pending_lock:
+            self._pending.clear()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+__all__ = ["SessionMemoryBudget", "session_bytes"]
@@ -37,7 +37,7 @@ def _append_chat_message(messages: list[ChatMessage], role: str, content: str) -
     if normalized_role is None or not normalized_content:
         return
     if normalized_role == "user" and messages and messages[-1].role == "user":
-        messages[-1].content = f"{messages[-1].content}\n\n{normalized_content}"
+        messages[-1] = ChatMessage(role="user", content=f"{messages[-1].content}\n\n{normalized_content}")
         return
     messages.append(ChatMessage(role=normalized_role, content=normalized_content))
 
@@ -119,6 +119,34 @@ def parse_history_for_chat(messages: Sequence[object]) -> list[ChatMessage]:
     return parsed
 
 
+def parse_history_payload(
+    messages: Sequence[object],
+) -> tuple[list[tuple[Literal["user", "assistant"], str]], list[str]]:
+    """Parse client history in one pass into chat entries and tool user texts.
+
+    Chat entries are ``(role, content)`` pairs merged like
+    ``parse_history_for_chat``; tool texts are the user contents, unmerged,
+    like ``parse_history_for_tool``. No history records are built.
+    """
+    chat_entries: list[tuple[Literal["user", "assistant"], str]] = []
+    tool_texts: list[str] = []
+    for item in messages or ():
+        validated = _validate_message_item(item)
+        if validated is None:
+            continue
+        role = _normalize_chat_role(validated[0])
+        content = validated[1]
+        if role is None:
+            continue
+        if role == "user":
+            tool_texts.append(content)
+            if chat_entries and chat_entries[-1][0] == "user":
+                chat_entries[-1] = ("user", f"{chat_entries[-1][1]}\n\n{content}")
+                continue
+        chat_entries.append((role, content))
+    return chat_entries, tool_texts
+
+
 def parse_history_as_tuples(history_text: str) -> list[tuple[str, str]]:
     """Convert a transcript string into ``(user, assistant)`` pairs."""
     messages = parse_history_text(history_text)
@@ -146,5 +174,6 @@ __all__ = [
     "parse_history_text",
     "parse_history_for_tool",
     "parse_history_for_chat",
+    "parse_history_payload",
     "parse_history_as_tuples",
 ]
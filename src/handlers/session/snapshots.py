@@ -0,0 +1,285 @@
+"""Resumable snapshots of dropped sessions, keyed by resume token.
+
+When a connection drops without ``end``, its session is kept here under
+the resume token issued in the start ack, so a reconnecting client can
+send ``resume`` instead of replaying persona and history in ``start``.
+
+Snapshots live in an in-memory LRU of ``capacity`` sessions. When a spill
+path is configured, sessions evicted from the LRU are written to a local
+SQLite file instead of being discarded, and ``take`` falls back to it.
+Each token is redeemable once and expires ``ttl_s`` seconds after the
+disconnect. Cached per-message token counts are kept (and re-attached to
+their text when read back from disk), so a resumed session is not
+tokenized again.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import asyncio
+import logging
+import secrets
+import sqlite3
+import threading
+from typing import Any
+from pathlib import Path
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import fields, replace
+from src.state.history import HistoryStore
+from src.state.session import ChatMessage, HistoryTurn, SessionMeta, SessionState, SessionSnapshot
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_BYTES = 24
+_SCHEMA = "CREATE TABLE IF NOT EXISTS snapshots (token TEXT PRIMARY KEY, saved_at REAL NOT NULL, body TEXT NOT NULL)"
+
+
+def _cached_count(cache: tuple[str, int] | None, text: str) -> int | None:
+    return cache[1] if cache is not None and cache[0] is text else None
+
+
+def _chat_rows(chat: Sequence[ChatMessage] | None) -> list[list[Any]] | None:
+    if chat is None:
+        return None
+    return [[m.role, m.content, _cached_count(m.chat_tokens, m.content)] for m in chat]
+
+
+def _tool_rows(tool: Sequence[HistoryTurn] | None) -> list[list[Any]] | None:
+    if tool is None:
+        return None
+    return [[t.turn_id, t.user, _cached_count(t.tool_tokens, t.user)] for t in tool]
+
+
+def _meta_row(meta: SessionMeta) -> dict[str, Any]:
+    row = {f.name: getattr(meta, f.name) for f in fields(meta)}
+    if meta.chat_sampling is not None:
+        row["chat_sampling"] = dict(meta.chat_sampling)
+    return row
+
+
+def _encode_snapshot(snapshot: SessionSnapshot) -> str:
+    body = {
+        "meta": _meta_row(snapshot.meta),
+        "chat": _chat_rows(snapshot.chat_history_messages),
+        "tool": _tool_rows(snapshot.tool_history_turns),
+        "prefix_tokens": [snapshot.check_screen_prefix_tokens, snapshot.screen_checked_prefix_tokens],
+        "followup": snapshot.screen_followup_pending,
+    }
+    return json.dumps(body, separators=(",", ":"))
+
+
+def _decode_chat(rows: list[list[Any]] | None) -> tuple[ChatMessage, ...] | None:
+    if rows is None:
+        return None
+    return tuple(
+        ChatMessage(
+            role="user" if role == "user" else "assistant",
+            content=content,
+            chat_tokens=(content, tokens) if tokens is not None else None,
+        )
+        for role, content, tokens in rows
+    )
+
+
+def _decode_tool(rows: list[list[Any]] | None) -> tuple[HistoryTurn, ...] | None:
+    if rows is None:
+        return None
+    return tuple(
+        HistoryTurn(
+            turn_id=turn_id, user=user, assistant="", tool_tokens=(user, tokens) if tokens is not None else None
+        )
+        for turn_id, user, tokens in rows
+    )
+
+
+def _decode_snapshot(body: str, saved_at: float) -> SessionSnapshot:
+    data = json.loads(body)
+    check_tokens, checked_tokens = data["prefix_tokens"]
+    return SessionSnapshot(
+        meta=SessionMeta(**data["meta"]),
+        chat_history_messages=_decode_chat(data["chat"]),
+        tool_history_turns=_decode_tool(data["tool"]),
+        check_screen_prefix_tokens=check_tokens,
+        screen_checked_prefix_tokens=checked_tokens,
+        screen_followup_pending=data["followup"],
+        saved_at=saved_at,
+    )
+
+
+def encode_histories(chat: Sequence[ChatMessage] | None, tool: Sequence[HistoryTurn] | None) -> str:
+    """Serialize history stores with their cached counts, as snapshots are spilled."""
+    return json.dumps({"chat": _chat_rows(chat), "tool": _tool_rows(tool)}, separators=(",", ":"))
+
+
+def decode_histories(body: str) -> tuple[HistoryStore[ChatMessage] | None, HistoryStore[HistoryTurn] | None]:
+    """Rebuild history stores written by ``encode_histories``.
+
+    Raises:
+        ValueError: If ``body`` is not valid JSON.
+        KeyError, TypeError: If it does not hold history rows.
+    """
+    data = json.loads(body)
+    chat = _decode_chat(data["chat"])
+    tool = _decode_tool(data["tool"])
+    return (HistoryStore(chat) if chat is not None else None), (HistoryStore(tool) if tool is not None else None)
+
+
+def same_client(first: str, second: str) -> bool:
+    """Whether two connection client ids belong to the same client.
+
+    Client ids are ``host:port`` and a reconnect gets a new ephemeral port,
+    so only the host is compared.
+    """
+    return (first.rpartition(":")[0] or first) == (second.rpartition(":")[0] or second)
+
+
+def capture_session_snapshot(state: SessionState) -> SessionSnapshot:
+    """Capture a session's meta, histories and cached counts for ``resume``.
+
+    Stored history entries are shared, not copied; they are never edited
+    in place.
+    """
+    chat_messages = state.chat_history_messages
+    tool_turns = state.tool_history_turns
+    return SessionSnapshot(
+        meta=state.meta,
+        chat_history_messages=tuple(chat_messages) if chat_messages is not None else None,
+        tool_history_turns=tuple(tool_turns) if tool_turns is not None else None,
+        check_screen_prefix_tokens=state.check_screen_prefix_tokens,
+        screen_checked_prefix_tokens=state.screen_checked_prefix_tokens,
+        screen_followup_pending=state.screen_followup_pending,
+        saved_at=time.time(),
+    )
+
+
+def restore_session_snapshot(state: SessionState, snapshot: SessionSnapshot) -> None:
+    """Load ``snapshot`` into ``state``, keeping the new connection's client id."""
+    chat_messages = snapshot.chat_history_messages
+    tool_turns = snapshot.tool_history_turns
+    state.meta = replace(snapshot.meta, client_id=state.meta.client_id)
+    state.chat_history_messages = HistoryStore(chat_messages) if chat_messages is not None else None
+    state.tool_history_turns = HistoryStore(tool_turns) if tool_turns is not None else None
+    state.check_screen_prefix_tokens = snapshot.check_screen_prefix_tokens
+    state.screen_checked_prefix_tokens = snapshot.screen_checked_prefix_tokens
+    state.screen_followup_pending = snapshot.screen_followup_pending
+
+
+class SessionSnapshotStore:
+    """Token-keyed LRU of dropped sessions with optional SQLite spill.
+
+    Thread-safe. ``asave`` and ``atake`` move to a worker thread only when
+    a spill file is configured, since only then can they touch disk.
+    """
+
+    __slots__ = ("_capacity", "_ttl_s", "_entries", "_lock", "_spill")
+
+    def __init__(self, *, capacity: int, ttl_s: float, spill_path: str = "") -> None:
+        """Create a store holding up to ``capacity`` sessions in memory.
+
+        Raises:
+            ValueError: If ``capacity`` is not positive.
+            sqlite3.Error: If ``spill_path`` cannot be opened as a SQLite database.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self._capacity = capacity
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[str, SessionSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+        self._spill: sqlite3.Connection | None = None
+        if spill_path:
+            Path(spill_path).parent.mkdir(parents=True, exist_ok=True)
+            self._spill = sqlite3.connect(spill_path, check_same_thread=False, isolation_level=None)
+            self._spill.execute(_SCHEMA)
+
+    @property
+    def spills(self) -> bool:
+        """Whether evicted sessions are written to disk."""
+        return self._spill is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def issue_token(self) -> str:
+        """Return a new unguessable resume token."""
+        return secrets.token_urlsafe(_TOKEN_BYTES)
+
+    def _expired(self, snapshot: SessionSnapshot, now: float) -> bool:
+        return now - snapshot.saved_at > self._ttl_s
+
+    def _spill_evicted(self, evicted: list[tuple[str, SessionSnapshot]], now: float) -> None:
+        if self._spill is None:
+            return
+        rows = [
+            (token, snap.saved_at, _encode_snapshot(snap)) for token, snap in evicted if not self._expired(snap, now)
+        ]
+        try:
+            self._spill.execute("DELETE FROM snapshots WHERE saved_at < ?", (now - self._ttl_s,))
+            self._spill.executemany("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)", rows)
+        except sqlite3.Error as exc:
+            logger.warning("session snapshots: spill failed, %d sessions dropped: %s", len(rows), exc)
+
+    def _take_spilled(self, token: str) -> SessionSnapshot | None:
+        if self._spill is None:
+            return None
+        try:
+            row = self._spill.execute("SELECT saved_at, body FROM snapshots WHERE token = ?", (token,)).fetchone()
+            if row is None:
+                return None
+            self._spill.execute("DELETE FROM snapshots WHERE token = ?", (token,))
+            return _decode_snapshot(row[1], row[0])
+        except (sqlite3.Error, ValueError, KeyError, TypeError) as exc:
+            logger.warning("session snapshots: unreadable spilled session: %s", exc)
+            return None
+
+    def save(self, token: str, snapshot: SessionSnapshot) -> None:
+        """Keep ``snapshot`` under ``token``, evicting the least recently saved."""
+        with self._lock:
+            self._entries[token] = snapshot
+            self._entries.move_to_end(token)
+            evicted = [self._entries.popitem(last=False) for _ in range(len(self._entries) - self._capacity)]
+            if evicted:
+                self._spill_evicted(evicted, time.time())
+
+    def take(self, token: str) -> SessionSnapshot | None:
+        """Remove and return the live snapshot for ``token``, if any."""
+        with self._lock:
+            snapshot = self._entries.pop(token, None)
+            if snapshot is None:
+                snapshot = self._take_spilled(token)
+        if snapshot is None or self._expired(snapshot, time.time()):
+            return None
+        return snapshot
+
+    async def asave(self, token: str, snapshot: SessionSnapshot) -> None:
+        """Async ``save`` that runs on a worker thread when it may spill to disk."""
+        if self._spill is None:
+            self.save(token, snapshot)
+            return
+        await asyncio.to_thread(self.save, token, snapshot)
+
+    async def atake(self, token: str) -> SessionSnapshot | None:
+        """Async ``take`` that runs on a worker thread when it may read from disk."""
+        if self._spill is None:
+            return self.take(token)
+        return await asyncio.to_thread(self.take, token)
+
+    def close(self) -> None:
+        """Drop in-memory sessions and close the spill file."""
+        with self._lock:
+            self._entries.clear()
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+
+__all__ = [
+    "SessionSnapshotStore",
+    "encode_histories",
+    "decode_histories",
+    "capture_session_snapshot",
+    "restore_session_snapshot",
+    "same_client",
+]
@@ -8,8 +8,9 @@ import logging
 from collections import deque
 from dataclasses import dataclass
 from ...config import TEXT_API_KEY
-from collections.abc import Callable
+from ..registry import ShardedRegistry
 from fastapi.security.api_key import APIKeyHeader
+from collections.abc import Callable, MutableMapping
 from fastapi import Request, Security, WebSocket, HTTPException
 from ...config.websocket import WS_ALLOWED_ORIGINS, WS_RATE_LIMIT_WINDOW, WS_MAX_AUTH_FAILURES_PER_WINDOW
 
@@ -17,7 +18,9 @@ logger = logging.getLogger(__name__)
 
 # API Key can be provided via explicit header or Authorization bearer token.
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
-_AUTH_FAILURES: dict[str, deque[float]] = {}
+# Failure timestamps per client host, sharded so auth storms from many hosts
+# do not contend on one dict; hosts without recent failures have no entry.
+_AUTH_FAILURES: ShardedRegistry[str, deque[float]] = ShardedRegistry()
 
 
 @dataclass(frozen=True)
@@ -78,40 +81,48 @@ def _prune_failures(
     now: float,
     *,
     auth_config: AuthRuntimeConfig,
-    auth_failures: dict[str, deque[float]],
-) -> deque[float]:
-    entries = auth_failures.setdefault(client_key, deque())
+    auth_failures: MutableMapping[str, deque[float]],
+) -> deque[float] | None:
+    """Drop failures outside the window; forget the client once none remain."""
+    entries = auth_failures.get(client_key)
+    if entries is None:
+        return None
     cutoff = now - auth_config.rate_limit_window_seconds
     while entries and entries[0] <= cutoff:
         entries.popleft()
-    return entries
+    if entries:
+        return entries
+    auth_failures.pop(client_key, None)
+    return None
 
 
 def _is_auth_throttled(
     client_key: str,
     *,
     auth_config: AuthRuntimeConfig,
-    auth_failures: dict[str, deque[float]],
+    auth_failures: MutableMapping[str, deque[float]],
     now_fn: Callable[[], float],
 ) -> bool:
     now = now_fn()
     entries = _prune_failures(client_key, now, auth_config=auth_config, auth_failures=auth_failures)
-    return len(entries) >= auth_config.max_auth_failures_per_window
+    return entries is not None and len(entries) >= auth_config.max_auth_failures_per_window
 
 
 def _record_auth_failure(
     client_key: str,
     *,
     auth_config: AuthRuntimeConfig,
-    auth_failures: dict[str, deque[float]],
+    auth_failures: MutableMapping[str, deque[float]],
     now_fn: Callable[[], float],
 ) -> None:
     now = now_fn()
     entries = _prune_failures(client_key, now, auth_config=auth_config, auth_failures=auth_failures)
+    if entries is None:
+        entries = auth_failures.setdefault(client_key, deque())
     entries.append(now)
 
 
-def _clear_auth_failures(client_key: str, *, auth_failures: dict[str, deque[float]]) -> None:
+def _clear_auth_failures(client_key: str, *, auth_failures: MutableMapping[str, deque[float]]) -> None:
     auth_failures.pop(client_key, None)
 
 
@@ -159,7 +170,7 @@ async def get_api_key(
     api_key_header: str | None = Security(api_key_header),
     *,
     auth_config: AuthRuntimeConfig = DEFAULT_AUTH_RUNTIME_CONFIG,
-    auth_failures: dict[str, deque[float]] | None = None,
+    auth_failures: MutableMapping[str, deque[float]] | None = None,
     now_fn: Callable[[], float] = time.monotonic,
 ) -> str:
     """FastAPI dependency to extract and validate API key from request."""
@@ -189,7 +200,7 @@ async def authenticate_websocket(
     websocket: WebSocket,
     *,
     auth_config: AuthRuntimeConfig = DEFAULT_AUTH_RUNTIME_CONFIG,
-    auth_failures: dict[str, deque[float]] | None = None,
+    auth_failures: MutableMapping[str, deque[float]] | None = None,
     now_fn: Callable[[], float] = time.monotonic,
 ) -> bool:
     """Authenticate WebSocket connection using API key.
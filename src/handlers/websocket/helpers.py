@@ -9,7 +9,7 @@ and streaming chat responses. It handles:
 
 2. Streaming Infrastructure:
    - Forwarding async chat streams to WebSocket clients
-   - Sending token/final/done message frames
+   - Sending token/sentence/final/done message frames
    - Recording conversation history on completion
 
 3. Task Management:
@@ -28,13 +28,13 @@ import asyncio
 import logging
 import contextlib
 from typing import Any
-from src.state import _ChatStreamState
 from collections.abc import AsyncIterator
 from src.state.session import SessionState
 from ...config.websocket import WS_STATUS_OK
 from src.telemetry.instruments import get_metrics
 from fastapi import WebSocket, WebSocketDisconnect
 from src.handlers.session.manager import SessionHandler
+from src.state import ChatStreamItem, SentenceBoundary, _ChatStreamState
 from src.telemetry.phases import record_phase_error, record_phase_latency
 
 logger = logging.getLogger(__name__)
@@ -62,10 +62,15 @@ async def _send_initial_text(
 
 async def _forward_stream_chunks(
     ws: WebSocket,
-    stream: AsyncIterator[str],
+    stream: AsyncIterator[ChatStreamItem],
     state: _ChatStreamState,
 ) -> None:
     async for chunk in stream:
+        if isinstance(chunk, SentenceBoundary):
+            if not await safe_send_flat(ws, "sentence", index=chunk.index, text=chunk.text):
+                state.interrupted = True
+                break
+            continue
         sent = await safe_send_flat(ws, "token", text=chunk)
         if not sent:
             state.interrupted = True
@@ -84,14 +89,14 @@ async def _send_completion_frames(ws: WebSocket, state: _ChatStreamState) -> Non
         state.interrupted = True
 
 
-def _append_history(
+async def _append_history(
     session_handler: SessionHandler,
     conn_state: SessionState,
     history_user: str,
     final_text: str,
     history_turn_id: str | None,
 ) -> None:
-    session_handler.append_chat_turn(
+    await session_handler.aappend_chat_turn(
         conn_state,
         history_user,
         final_text,
@@ -179,7 +184,7 @@ async def cancel_task(task: asyncio.Task | None) -> None:
 
 async def stream_chat_response(
     ws: WebSocket,
-    stream: AsyncIterator[str],
+    stream: AsyncIterator[ChatStreamItem],
     conn_state: SessionState,
     chat_user_utt: str,
     *,
@@ -197,12 +202,12 @@ async def stream_chat_response(
     )
     history_committed = False
 
-    def _commit_history_once() -> None:
+    async def _commit_history_once() -> None:
         nonlocal history_committed
         if history_committed or not _should_commit_visible_history(state):
             return
-        _append_history(session_handler, conn_state, history_user, state.final_text, history_turn_id)
         history_committed = True
+        await _append_history(session_handler, conn_state, history_user, state.final_text, history_turn_id)
 
     try:
         await _send_initial_text(ws, initial_text, initial_text_already_sent, state)
@@ -214,13 +219,13 @@ async def stream_chat_response(
                 return state.final_text
             await _send_completion_frames(ws, state)
     except asyncio.CancelledError:
-        _commit_history_once()
+        await _commit_history_once()
         raise
     except Exception:
-        _commit_history_once()
+        await _commit_history_once()
         raise
 
-    _commit_history_once()
+    await _commit_history_once()
     return state.final_text
 
 
@@ -25,6 +25,7 @@ from fastapi import WebSocket, WebSocketDisconnect
 from ...config import CACHE_RESET_MIN_SESSION_SECONDS
 from ...logging import set_log_context, reset_log_context
 from ...telemetry.sentry import capture_error, add_breadcrumb
+from src.handlers.session.snapshots import capture_session_snapshot
 from ...telemetry.phases import record_phase_error, record_phase_latency
 from ...config.websocket import (
     WS_ERROR_INTERNAL,
@@ -85,6 +86,12 @@ async def _cleanup_session(runtime_deps: RuntimeDeps, state: SessionState) -> fl
     duration = max(0.0, time.monotonic() - state.created_at)
     await session_handler.abort_session_requests(state)
     await session_handler.mark_session_closed(state)
+    snapshots = runtime_deps.session_snapshots
+    keep_history = snapshots is not None and state.resume_token is not None
+    if runtime_deps.session_memory is not None:
+        await runtime_deps.session_memory.arelease(state, keep_history=keep_history)
+    if snapshots is not None and state.resume_token is not None:
+        await snapshots.asave(state.resume_token, capture_session_snapshot(state))
     record_phase_latency("cleanup", time.perf_counter() - t0)
     return duration
 
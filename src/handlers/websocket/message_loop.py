@@ -12,7 +12,6 @@ from ...logging import log_context
 from .helpers import safe_send_flat
 from .parser import parse_client_message
 from .lifecycle import WebSocketLifecycle
-from src.state.session import SessionState
 from ..limits import SlidingWindowRateLimiter
 from ...messages.turn import handle_turn_message
 from ...telemetry.instruments import get_metrics
@@ -20,6 +19,7 @@ from src.runtime.dependencies import RuntimeDeps
 from .disconnects import is_expected_ws_disconnect
 from ...messages.cancel import handle_cancel_message
 from src.handlers.session.manager import SessionHandler
+from src.state.session import SessionMeta, SessionState
 from .limits import consume_limiter, select_rate_limiter
 from src.handlers.session.requests import has_running_task
 from ...telemetry.phases import record_phase_error, record_phase_latency
@@ -83,15 +83,25 @@ async def _handle_turn_command(
     session_handler: SessionHandler,
     runtime_deps: RuntimeDeps,
 ) -> bool:
-    """Handle start/message commands and return updated started flag."""
-    if msg_type == "start":
+    """Handle start/resume/message commands and return updated started flag."""
+    if msg_type in {"start", "resume"}:
         if started:
             await send_error(
                 ws,
                 code=WS_ERROR_INVALID_MESSAGE,
-                message="start may only be sent once per connection; use 'message' for subsequent turns.",
+                message=f"{msg_type} may only be sent once per connection; use 'message' for subsequent turns.",
             )
             return True
+        if msg_type == "resume":
+            get_metrics().requests_total.add(1, {"status": "resumed"})
+            return await handle_turn_message(
+                ws,
+                msg,
+                state,
+                msg_type="resume",
+                session_handler=session_handler,
+                runtime_deps=runtime_deps,
+            )
         get_metrics().requests_total.add(1, {"status": "started"})
         return await handle_turn_message(
             ws,
@@ -138,7 +148,7 @@ async def _dispatch_session_message(
     runtime_deps: RuntimeDeps,
 ) -> bool:
     """Dispatch a session message. Returns the new 'started' flag."""
-    if msg_type in {"start", "message"}:
+    if msg_type in {"start", "resume", "message"}:
         return await _handle_turn_command(
             ws,
             msg_type,
@@ -175,7 +185,7 @@ async def run_message_loop(
     """
     client = ws.client
     client_id = f"{client.host}:{client.port}" if client else "unknown"
-    state = SessionState(meta={"client_id": client_id})
+    state = SessionState(meta=SessionMeta(client_id=client_id))
     started = False
     session_handler = runtime_deps.session_handler
 
@@ -199,6 +209,8 @@ async def run_message_loop(
                 continue
             if msg_type in {"ping", "pong", "end"}:
                 if await _handle_control_message(ws, msg_type):
+                    # A client that ends the session does not come back for it.
+                    state.resume_token = None
                     break
                 continue
             started = await _dispatch_session_message(
@@ -92,6 +92,13 @@ class _MessageMessage(_VersionedMessage):
     sanitize_output: Any | None = None
 
 
+class _ResumeMessage(_VersionedMessage):
+    """Strict schema for resume payloads."""
+
+    type: Literal["resume"]
+    resume_token: str = Field(min_length=1, max_length=128)
+
+
 class _CancelMessage(_VersionedMessage):
     """Strict schema for cancel payloads."""
 
@@ -117,7 +124,7 @@ class _EndMessage(_VersionedMessage):
 
 
 _ClientMessage = Annotated[
-    _StartMessage | _MessageMessage | _CancelMessage | _PingMessage | _PongMessage | _EndMessage,
+    _StartMessage | _ResumeMessage | _MessageMessage | _CancelMessage | _PingMessage | _PongMessage | _EndMessage,
     Field(discriminator="type"),
 ]
 _CLIENT_MESSAGE_ADAPTER = TypeAdapter(_ClientMessage)
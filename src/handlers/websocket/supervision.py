@@ -32,8 +32,8 @@ async def _run_with_supervision(
     session_handler: SessionHandler,
 ) -> None:
     t0 = time.perf_counter()
-    model = str(state.meta.get("chat_model") or state.meta.get("tool_model") or "")
-    client_id = str(state.meta.get("client_id") or "")
+    model = state.meta.chat_model or state.meta.tool_model or ""
+    client_id = state.meta.client_id
     with request_span(
         request_id=request_id,
         session_id=state.session_id,
@@ -6,15 +6,21 @@ from collections.abc import Sequence
 from src.state.session import ChatMessage
 
 
-def copy_chat_messages(messages: Sequence[ChatMessage]) -> list[ChatMessage]:
-    """Return normalized copies of non-empty chat messages."""
-    copied: list[ChatMessage] = []
+def normalize_chat_messages(messages: Sequence[ChatMessage]) -> list[ChatMessage]:
+    """Return the non-empty chat messages with stripped content.
+
+    Stored messages are never edited in place, so a message whose content
+    is already stripped is shared rather than copied; only messages that
+    need stripping are rebuilt.
+    """
+    normalized: list[ChatMessage] = []
     for message in messages:
         content = (message.content or "").strip()
         if not content:
             continue
-        copied.append(ChatMessage(role=message.role, content=content))
-    return copied
+        shared = content is message.content
+        normalized.append(message if shared else ChatMessage(role=message.role, content=content))
+    return normalized
 
 
 def group_chat_turns(messages: Sequence[ChatMessage]) -> list[list[ChatMessage]]:
@@ -29,7 +35,7 @@ def group_chat_turns(messages: Sequence[ChatMessage]) -> list[list[ChatMessage]]
     current_turn: list[ChatMessage] | None = None
     leading_assistants: list[ChatMessage] = []
 
-    for message in copy_chat_messages(messages):
+    for message in normalize_chat_messages(messages):
         if message.role == "user":
             if leading_assistants:
                 turns.append(leading_assistants)
@@ -55,11 +61,11 @@ def group_chat_turns(messages: Sequence[ChatMessage]) -> list[list[ChatMessage]]
 
 def flatten_chat_turns(turns: Sequence[Sequence[ChatMessage]]) -> list[ChatMessage]:
     """Flatten grouped turns back into normalized chat messages."""
-    return copy_chat_messages([message for turn in turns for message in turn])
+    return normalize_chat_messages([message for turn in turns for message in turn])
 
 
 __all__ = [
-    "copy_chat_messages",
+    "normalize_chat_messages",
     "group_chat_turns",
     "flatten_chat_turns",
 ]
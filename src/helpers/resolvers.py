@@ -26,6 +26,9 @@ class LimitValues(TypedDict):
     STREAM_FLUSH_MS: float
     CHAT_MAX_OUT: int
     MAX_CONCURRENT_CONNECTIONS: int | None
+    TOKENIZER_POOL_SIZE: int
+    TOKEN_MEMO_MAX_BYTES: int
+    CHAT_TEMPLATE_CACHE_MAX_BYTES: int
 
 
 def _resolve_env_value(
@@ -134,6 +137,9 @@ def resolve_limit_values(*, env: Mapping[str, str] | None = None) -> LimitValues
 
     max_concurrent_raw = _resolve_env_value("MAX_CONCURRENT_CONNECTIONS", "", env=env)
     max_concurrent_connections: int | None = int(max_concurrent_raw) if max_concurrent_raw else None
+    tokenizer_pool_size = max(1, int(_resolve_env_value("TOKENIZER_POOL_SIZE", "4", env=env)))
+    token_memo_max_bytes = max(0, int(_resolve_env_value("TOKEN_MEMO_MAX_BYTES", "8388608", env=env)))
+    template_cache_max_bytes = max(0, int(_resolve_env_value("CHAT_TEMPLATE_CACHE_MAX_BYTES", "4194304", env=env)))
 
     return {
         "CHAT_PROMPT_MAX_TOKENS": chat_prompt_max_tokens,
@@ -146,6 +152,9 @@ def resolve_limit_values(*, env: Mapping[str, str] | None = None) -> LimitValues
         "STREAM_FLUSH_MS": stream_flush_ms,
         "CHAT_MAX_OUT": chat_max_out,
         "MAX_CONCURRENT_CONNECTIONS": max_concurrent_connections,
+        "TOKENIZER_POOL_SIZE": tokenizer_pool_size,
+        "TOKEN_MEMO_MAX_BYTES": token_memo_max_bytes,
+        "CHAT_TEMPLATE_CACHE_MAX_BYTES": template_cache_max_bytes,
     }
 
 
@@ -3,11 +3,14 @@
 This package provides handlers for different WebSocket message types:
 
 turn.py:
-    Unified public entrypoint for both 'start' and 'message' turn commands.
+    Unified public entrypoint for 'start', 'resume' and 'message' turn commands.
 
 start.py:
     Session bootstrap for the initial start payload.
 
+resume.py:
+    Session restore from a resume token after a dropped connection.
+
 message.py:
     Message-turn planning for follow-up user turns.
 
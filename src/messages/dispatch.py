@@ -48,7 +48,7 @@ async def _run_sequential(ws: WebSocket, plan: TurnPlan, runtime_deps: RuntimeDe
         tool_user_utt=plan.tool_user_utt,
         history_turn_id=plan.history_turn_id,
         sampling_overrides=plan.sampling_overrides,
-        apply_screen_checked_prefix=plan.apply_screen_checked_prefix,
+        screen_checked_prefix=plan.screen_checked_prefix,
         session_handler=runtime_deps.session_handler,
         chat_engine=runtime_deps.chat_engine,
         chat_tokenizer=runtime_deps.chat_tokenizer,
@@ -62,7 +62,8 @@ async def _run_chat_only(ws: WebSocket, plan: TurnPlan, runtime_deps: RuntimeDep
         raise RuntimeError("Chat-only execution requires chat engine and chat tokenizer")
     chat_user_utt = plan.chat_user_utt or ""
     try:
-        prompt_fit = fit_chat_prompt_to_budget(
+        prompt_fit = await runtime_deps.chat_tokenizer.offload(
+            fit_chat_prompt_to_budget,
             plan.static_prefix,
             plan.runtime_text,
             plan.history_messages,
@@ -75,7 +76,6 @@ async def _run_chat_only(ws: WebSocket, plan: TurnPlan, runtime_deps: RuntimeDep
         await send_error(ws, code=WS_ERROR_TEXT_TOO_LONG, message=str(exc))
         return
     logger.info("turn_dispatch: chat-only streaming")
-    history_user_utt, _ = runtime_deps.session_handler.normalize_user_utterances(plan.state, prompt_fit.chat_user_utt)
     final_text = await stream_chat_response(
         ws,
         run_chat_generation(
@@ -90,7 +90,6 @@ async def _run_chat_only(ws: WebSocket, plan: TurnPlan, runtime_deps: RuntimeDep
         plan.state,
         prompt_fit.chat_user_utt,
         history_turn_id=plan.history_turn_id,
-        history_user_utt=history_user_utt,
         session_handler=runtime_deps.session_handler,
     )
     logger.info("turn_dispatch: chat-only done chars=%s", len(final_text))
@@ -102,7 +101,7 @@ async def _run_tool_only(ws: WebSocket, plan: TurnPlan, runtime_deps: RuntimeDep
         raise RuntimeError("Tool-only execution requires tool adapter")
     logger.info("turn_dispatch: tool-only routing")
     try:
-        tool_user_utt, tool_user_history = runtime_deps.session_handler.prepare_tool_turn(
+        tool_user_utt, tool_user_history = await runtime_deps.session_handler.aprepare_tool_turn(
             plan.state,
             plan.tool_user_utt or plan.chat_user_utt or "",
             turn_id=plan.history_turn_id,
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from typing import Any
+from collections.abc import Sequence
 from src.handlers.session.manager import SessionHandler
 from src.state.session import ChatMessage, SessionState
-from src.handlers.session.parsing import parse_history_for_chat, parse_history_for_tool
+from src.handlers.session.parsing import parse_history_payload
 
 
 def _history_turn_count(state: SessionState) -> int:
@@ -20,12 +21,12 @@ def resolve_history(
     session_handler: SessionHandler,
     state: SessionState,
     msg: dict[str, Any],
-) -> list[ChatMessage]:
+) -> Sequence[ChatMessage]:
     """Resolve and trim history payload into runtime state.
 
     History is only accepted when the session has no turns yet.
-    Uses mode-specific parsing: parse_history_for_tool for tool-only,
-    parse_history_for_chat otherwise.
+    The payload is parsed in one pass and only the newest messages that
+    fit the history budgets become stored records.
     """
     if _history_turn_count(state) > 0:
         return session_handler.get_chat_messages(state)
@@ -34,17 +35,8 @@ def resolve_history(
     if not isinstance(history_messages, list):
         return session_handler.get_chat_messages(state)
 
-    history_config = session_handler.history_config
-    if history_config.deploy_chat and history_config.deploy_tool:
-        chat_messages = parse_history_for_chat(history_messages)
-        tool_turns = parse_history_for_tool(history_messages)
-        session_handler.set_mode_histories(state, chat_messages=chat_messages, tool_turns=tool_turns)
-    elif history_config.deploy_tool and not history_config.deploy_chat:
-        tool_turns = parse_history_for_tool(history_messages)
-        session_handler.set_mode_histories(state, tool_turns=tool_turns)
-    else:
-        chat_messages = parse_history_for_chat(history_messages)
-        session_handler.set_mode_histories(state, chat_messages=chat_messages)
+    chat_entries, tool_texts = parse_history_payload(history_messages)
+    session_handler.import_mode_histories(state, chat_entries=chat_entries, tool_texts=tool_texts)
     return session_handler.get_chat_messages(state)
 
 
@@ -2,20 +2,19 @@
 
 from __future__ import annotations
 
-import copy
 import time
 import uuid
 from typing import Any
 from fastapi import WebSocket
-from src.state import TurnPlan
 from .validators import ValidationError
+from src.state import TurnPlan, SessionMeta
 from .history import resolve_user_utterances
 from .sampling import extract_sampling_overrides
 from src.handlers.websocket.errors import send_error
 from src.handlers.session.manager import SessionHandler
-from src.handlers.session.config import update_session_config
 from src.telemetry.phases import record_phase_error, record_phase_latency
 from src.config.websocket import WS_ERROR_INVALID_MESSAGE, WS_ERROR_INVALID_PAYLOAD
+from src.handlers.session.config import screen_prefix_segment, update_session_config
 
 
 async def _send_turn_error(ws: WebSocket, *, code: str, message: str, close: bool = False) -> None:
@@ -26,7 +25,7 @@ async def _send_turn_error(ws: WebSocket, *, code: str, message: str, close: boo
 
 def _build_message_turn_plan(
     state,
-    cfg: dict[str, Any],
+    cfg: SessionMeta,
     incoming_user_utt: str,
     *,
     deploy_chat: bool,
@@ -34,7 +33,7 @@ def _build_message_turn_plan(
     session_handler: SessionHandler,
     sampling_overrides: dict[str, Any],
 ) -> TurnPlan:
-    apply_screen_checked_prefix = bool(state.screen_followup_pending)
+    screen_checked_prefix = screen_prefix_segment(state, is_checked=True) if state.screen_followup_pending else None
     chat_user_utt, tool_user_utt = resolve_user_utterances(
         session_handler,
         state,
@@ -49,7 +48,7 @@ def _build_message_turn_plan(
     return TurnPlan(
         state=state,
         request_id=f"msg-{uuid.uuid4().hex}",
-        static_prefix=cfg.get("chat_prompt") or "",
+        static_prefix=cfg.chat_prompt or "",
         runtime_text="",
         history_messages=history_messages,
         deploy_chat=deploy_chat,
@@ -58,7 +57,7 @@ def _build_message_turn_plan(
         tool_user_utt=tool_user_utt if deploy_tool else None,
         history_turn_id=history_turn_id,
         sampling_overrides=(sampling_overrides or None) if deploy_chat else None,
-        apply_screen_checked_prefix=apply_screen_checked_prefix,
+        screen_checked_prefix=screen_checked_prefix,
     )
 
 
@@ -80,8 +79,9 @@ async def plan_message_turn(
             await _send_turn_error(ws, code=WS_ERROR_INVALID_PAYLOAD, message="user_utterance is required")
             return None
 
-        cfg = copy.deepcopy(state.meta)
-        if not cfg:
+        # SessionMeta is immutable; sampling updates below swap in a new record.
+        cfg = state.meta
+        if not cfg.now_iso:
             record_phase_error("validate", "missing_session")
             await _send_turn_error(ws, code=WS_ERROR_INVALID_MESSAGE, message="no active session; send 'start' first")
             return None
@@ -99,6 +99,7 @@ async def plan_message_turn(
                 count_prefix_tokens_fn=session_handler.count_prefix_tokens,
                 chat_sampling=sampling_overrides,
             )
+            session_handler.account_session_memory(state)
 
         return _build_message_turn_plan(
             state,
@@ -0,0 +1,76 @@
+"""Resume bootstrap for reconnecting to a dropped session."""
+
+from __future__ import annotations
+
+import time
+import logging
+from typing import Any
+from fastapi import WebSocket
+from src.telemetry.instruments import get_metrics
+from src.handlers.websocket.errors import send_error
+from src.handlers.session.manager import SessionHandler
+from src.handlers.websocket.helpers import safe_send_flat
+from src.state.session import SessionState, SessionSnapshot
+from src.telemetry.phases import record_phase_error, record_phase_latency
+from src.config.websocket import WS_STATUS_OK, WS_ERROR_RESUME_UNAVAILABLE
+from src.handlers.session.snapshots import SessionSnapshotStore, same_client
+
+logger = logging.getLogger(__name__)
+
+
+async def _take_owned_snapshot(
+    session_snapshots: SessionSnapshotStore,
+    token: str,
+    client_id: str,
+) -> SessionSnapshot | None:
+    """Take the snapshot under ``token`` if it was saved by ``client_id``'s client.
+
+    A snapshot from another client is put back for its owner, so a leaked
+    token can neither take the session over nor use it up.
+    """
+    snapshot = await session_snapshots.atake(token)
+    if snapshot is None or same_client(snapshot.meta.client_id, client_id):
+        return snapshot
+    await session_snapshots.asave(token, snapshot)
+    return None
+
+
+async def bootstrap_resume_turn(
+    ws: WebSocket,
+    msg: dict[str, Any],
+    state: SessionState,
+    *,
+    session_handler: SessionHandler,
+    session_snapshots: SessionSnapshotStore | None,
+) -> bool:
+    """Restore a dropped session from its resume token instead of a start payload.
+
+    The restored history keeps its cached token counts and is not re-fitted;
+    it already passed ``start`` validation on the original connection. An
+    unknown, expired or already-used token, or one saved by another client,
+    leaves the connection open so the client can fall back to ``start``.
+    """
+    t0 = time.perf_counter()
+    try:
+        snapshot = None
+        if session_snapshots is not None:
+            snapshot = await _take_owned_snapshot(session_snapshots, msg["resume_token"], state.meta.client_id)
+        if session_snapshots is None or snapshot is None or not session_handler.restore_session(state, snapshot):
+            get_metrics().session_resumes_total.add(1, {"result": "unavailable"})
+            record_phase_error("validate", "resume_unavailable")
+            await send_error(
+                ws,
+                code=WS_ERROR_RESUME_UNAVAILABLE,
+                message="session cannot be resumed; send 'start' with persona and history",
+            )
+            return False
+        get_metrics().session_resumes_total.add(1, {"result": "restored"})
+        state.resume_token = session_snapshots.issue_token()
+        logger.info("WS recv: resume len(history)=%s", len(state.chat_history_messages or []))
+        await safe_send_flat(ws, "done", status=WS_STATUS_OK, resume_token=state.resume_token)
+        return True
+    finally:
+        record_phase_latency("validate", time.perf_counter() - t0)
+
+
+__all__ = ["bootstrap_resume_turn"]
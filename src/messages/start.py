@@ -15,6 +15,7 @@ from src.handlers.websocket.errors import send_error
 from src.handlers.session.manager import SessionHandler
 from src.handlers.websocket.helpers import safe_send_flat
 from src.handlers.session.config import update_session_config
+from src.handlers.session.snapshots import SessionSnapshotStore
 from src.telemetry.phases import record_phase_error, record_phase_latency
 from src.config.websocket import (
     WS_STATUS_OK,
@@ -96,7 +97,7 @@ def _validate_persona(msg: dict[str, Any], *, deploy_chat: bool) -> tuple[str |
 def _extract_chat_prompt(
     msg: dict[str, Any],
     *,
-    count_tokens_fn: Callable[[str], int],
+    fits_tokens_fn: Callable[[str, int], bool],
     deploy_chat: bool,
 ) -> str | None:
     raw_chat_prompt = msg.get("chat_prompt")
@@ -113,7 +114,7 @@ def _extract_chat_prompt(
         invalid_error_code="invalid_chat_prompt",
         too_long_error_code="chat_prompt_too_long",
         max_tokens=CHAT_PROMPT_MAX_TOKENS,
-        count_tokens_fn=count_tokens_fn,
+        fits_tokens_fn=fits_tokens_fn,
     )
 
 
@@ -134,7 +135,7 @@ def _extract_screen_prefixes(msg: dict[str, Any]) -> tuple[str | None, str | Non
 def _resolve_start_inputs(
     msg: dict[str, Any],
     *,
-    count_tokens_fn: Callable[[str], int],
+    fits_tokens_fn: Callable[[str, int], bool],
     deploy_chat: bool,
 ) -> tuple[
     str | None,
@@ -146,7 +147,7 @@ def _resolve_start_inputs(
 ]:
     _validate_tool_only_start_fields(msg, deploy_chat=deploy_chat)
     gender, personality = _validate_persona(msg, deploy_chat=deploy_chat)
-    chat_prompt = _extract_chat_prompt(msg, count_tokens_fn=count_tokens_fn, deploy_chat=deploy_chat)
+    chat_prompt = _extract_chat_prompt(msg, fits_tokens_fn=fits_tokens_fn, deploy_chat=deploy_chat)
     sampling_overrides = extract_sampling_overrides(msg, deploy_chat=deploy_chat)
     check_screen_prefix, screen_checked_prefix = _extract_screen_prefixes(msg)
     return gender, personality, chat_prompt, sampling_overrides, check_screen_prefix, screen_checked_prefix
@@ -162,7 +163,7 @@ async def _resolve_start_inputs_or_reject(
     try:
         return _resolve_start_inputs(
             msg,
-            count_tokens_fn=session_handler.count_chat_tokens,
+            fits_tokens_fn=session_handler.chat_text_fits,
             deploy_chat=deploy_chat,
         )
     except ValidationError as err:
@@ -178,8 +179,13 @@ async def bootstrap_start_turn(
     state,
     *,
     session_handler: SessionHandler,
+    session_snapshots: SessionSnapshotStore | None = None,
 ) -> bool:
-    """Initialize a fresh session from a start payload."""
+    """Initialize a fresh session from a start payload.
+
+    When ``session_snapshots`` is set, the ack carries a ``resume_token``
+    the client can send in ``resume`` after a dropped connection.
+    """
     t0 = time.perf_counter()
     try:
         session_handler.initialize_session(state)
@@ -216,7 +222,7 @@ async def bootstrap_start_turn(
         resolve_history(session_handler, state, msg)
         if deploy_chat:
             try:
-                session_handler.fit_start_chat_history(
+                await session_handler.fit_start_chat_history(
                     state,
                     static_prefix=chat_prompt or "",
                     runtime_text="",
@@ -225,7 +231,12 @@ async def bootstrap_start_turn(
                 record_phase_error("validate", "seed_history_too_long")
                 await _send_turn_error(ws, code=WS_ERROR_TEXT_TOO_LONG, message=str(exc), close=True)
                 return False
-        await safe_send_flat(ws, "done", status=WS_STATUS_OK)
+        session_handler.account_session_memory(state)
+        if session_snapshots is None:
+            await safe_send_flat(ws, "done", status=WS_STATUS_OK)
+            return True
+        state.resume_token = session_snapshots.issue_token()
+        await safe_send_flat(ws, "done", status=WS_STATUS_OK, resume_token=state.resume_token)
         return True
     finally:
         record_phase_latency("validate", time.perf_counter() - t0)
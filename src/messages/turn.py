@@ -1,4 +1,4 @@
-"""Unified turn handler for both ``start`` and ``message`` payloads."""
+"""Unified turn handler for ``start``, ``resume`` and ``message`` payloads."""
 
 from __future__ import annotations
 
@@ -10,6 +10,7 @@ from src.handlers.session.manager import SessionHandler
 from .message import plan_message_turn as _plan_message_turn
 from .start import bootstrap_start_turn as _bootstrap_start_turn
 from src.handlers.websocket.supervision import spawn_session_task
+from .resume import bootstrap_resume_turn as _bootstrap_resume_turn
 
 
 async def handle_turn_message(
@@ -17,14 +18,30 @@ async def handle_turn_message(
     msg: dict[str, Any],
     state,
     *,
-    msg_type: Literal["start", "message"],
+    msg_type: Literal["start", "resume", "message"],
     session_handler: SessionHandler,
     runtime_deps: RuntimeDeps,
 ) -> bool:
     """Handle one session turn message by planning + dispatching execution."""
     if msg_type == "start":
-        return await _bootstrap_start_turn(ws, msg, state, session_handler=session_handler)
-
+        return await _bootstrap_start_turn(
+            ws,
+            msg,
+            state,
+            session_handler=session_handler,
+            session_snapshots=runtime_deps.session_snapshots,
+        )
+    if msg_type == "resume":
+        return await _bootstrap_resume_turn(
+            ws,
+            msg,
+            state,
+            session_handler=session_handler,
+            session_snapshots=runtime_deps.session_snapshots,
+        )
+
+    if runtime_deps.session_memory is not None:
+        await runtime_deps.session_memory.arestore(state)
     plan = await _plan_message_turn(ws, msg, state, session_handler=session_handler)
     if plan is None:
         return False
@@ -93,14 +93,14 @@ def sanitize_prompt_with_limit(
     invalid_error_code: str,
     too_long_error_code: str,
     max_tokens: int,
-    count_tokens_fn: Callable[[str], int],
+    fits_tokens_fn: Callable[[str, int], bool],
 ) -> str:
     try:
         prompt = sanitize_prompt(raw_prompt)
     except ValueError as exc:
         raise ValidationError(invalid_error_code, str(exc)) from exc
 
-    if count_tokens_fn(prompt) > max_tokens:
+    if not fits_tokens_fn(prompt, max_tokens):
         raise ValidationError(
             too_long_error_code,
             f"{field_label} exceeds token limit ({max_tokens})",
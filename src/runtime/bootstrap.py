@@ -9,11 +9,28 @@ from __future__ import annotations
 
 import asyncio
 from .dependencies import RuntimeDeps
+from src.tokens.registry import load_tokenizer
 from src.tokens.tokenizer import FastTokenizer
 from src.tool.factory import create_tool_adapter
 from src.handlers.connections import ConnectionHandler
 from src.handlers.session.manager import SessionHandler
-from src.config import CHAT_MODEL, TOOL_MODEL, DEPLOY_CHAT, DEPLOY_TOOL, INFERENCE_ENGINE
+from src.handlers.session.memory import SessionMemoryBudget
+from src.handlers.session.snapshots import SessionSnapshotStore
+from src.telemetry.sessions import register_session_memory_gauge
+from src.execution.chat.template_builder import verify_chat_template_segments
+from src.config import (
+    CHAT_MODEL,
+    TOOL_MODEL,
+    DEPLOY_CHAT,
+    DEPLOY_TOOL,
+    WS_RESUME_TTL_S,
+    INFERENCE_ENGINE,
+    WS_RESUME_SPILL_PATH,
+    WS_SESSION_SPILL_PATH,
+    WS_RESUME_MAX_SESSIONS,
+    WS_SESSION_PARK_IDLE_S,
+    WS_SESSION_MEMORY_MAX_BYTES,
+)
 
 
 async def _build_chat_engine():
@@ -35,7 +52,9 @@ async def _build_chat_tokenizer() -> FastTokenizer | None:
         return None
     if not CHAT_MODEL:
         raise RuntimeError("CHAT_MODEL is required when DEPLOY_CHAT is enabled")
-    return await asyncio.to_thread(FastTokenizer, CHAT_MODEL)
+    tokenizer = await asyncio.to_thread(load_tokenizer, CHAT_MODEL)
+    await asyncio.to_thread(verify_chat_template_segments, tokenizer)
+    return tokenizer
 
 
 async def _build_tool_tokenizer() -> FastTokenizer | None:
@@ -43,7 +62,7 @@ async def _build_tool_tokenizer() -> FastTokenizer | None:
         return None
     if not TOOL_MODEL:
         raise RuntimeError("TOOL_MODEL is required when DEPLOY_TOOL is enabled")
-    return await asyncio.to_thread(FastTokenizer, TOOL_MODEL)
+    return await asyncio.to_thread(load_tokenizer, TOOL_MODEL)
 
 
 async def _build_tool_adapter():
@@ -52,6 +71,26 @@ async def _build_tool_adapter():
     return await asyncio.to_thread(create_tool_adapter)
 
 
+def _build_session_snapshots() -> SessionSnapshotStore | None:
+    if WS_RESUME_MAX_SESSIONS <= 0:
+        return None
+    return SessionSnapshotStore(
+        capacity=WS_RESUME_MAX_SESSIONS,
+        ttl_s=WS_RESUME_TTL_S,
+        spill_path=WS_RESUME_SPILL_PATH,
+    )
+
+
+def _build_session_memory() -> SessionMemoryBudget:
+    session_memory = SessionMemoryBudget(
+        budget_bytes=WS_SESSION_MEMORY_MAX_BYTES,
+        idle_s=WS_SESSION_PARK_IDLE_S,
+        spill_path=WS_SESSION_SPILL_PATH,
+    )
+    register_session_memory_gauge(lambda: session_memory.total_bytes)
+    return session_memory
+
+
 async def build_runtime_deps() -> RuntimeDeps:
     """Build runtime dependencies eagerly for configured deployment modes."""
     chat_engine, chat_tokenizer, tool_tokenizer, tool_adapter = await asyncio.gather(
@@ -63,12 +102,14 @@ async def build_runtime_deps() -> RuntimeDeps:
 
     tool_history_budget = tool_adapter.max_history_tokens if tool_adapter else None
     tool_input_budget = tool_adapter.max_input_tokens if tool_adapter else None
+    session_memory = _build_session_memory()
     session_handler = SessionHandler(
         chat_engine=chat_engine,
         tool_history_budget=tool_history_budget,
         tool_input_budget=tool_input_budget,
         chat_tokenizer=chat_tokenizer,
         tool_tokenizer=tool_tokenizer,
+        memory_budget=session_memory,
     )
     connections = ConnectionHandler()
     cache_reset_manager = None
@@ -85,6 +126,8 @@ async def build_runtime_deps() -> RuntimeDeps:
         tool_adapter=tool_adapter,
         chat_tokenizer=chat_tokenizer,
         tool_tokenizer=tool_tokenizer,
+        session_snapshots=_build_session_snapshots(),
+        session_memory=session_memory,
     )
 
 
@@ -18,6 +18,8 @@ if TYPE_CHECKING:
     from src.engines.vllm.cache import CacheResetManager
     from src.handlers.connections import ConnectionHandler
     from src.handlers.session.manager import SessionHandler
+    from src.handlers.session.memory import SessionMemoryBudget
+    from src.handlers.session.snapshots import SessionSnapshotStore
 
 
 CacheResetFn = Callable[[str, bool], Awaitable[bool]]
@@ -34,6 +36,8 @@ class RuntimeDeps:
     tool_adapter: ToolAdapter | None
     chat_tokenizer: FastTokenizer | None
     tool_tokenizer: FastTokenizer | None
+    session_snapshots: SessionSnapshotStore | None = None
+    session_memory: SessionMemoryBudget | None = None
 
     def supports_cache_reset(self) -> bool:
         return (
@@ -65,3 +69,10 @@ class RuntimeDeps:
     async def shutdown(self) -> None:
         if self.chat_engine is not None:
             await self.chat_engine.shutdown()
+        for tokenizer in (self.chat_tokenizer, self.tool_tokenizer):
+            if tokenizer is not None:
+                tokenizer.shutdown()
+        if self.session_snapshots is not None:
+            self.session_snapshots.close()
+        if self.session_memory is not None:
+            self.session_memory.close()
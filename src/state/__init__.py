@@ -4,18 +4,20 @@ This module re-exports all state definitions from their respective modules,
 providing a single import point for state types.
 """
 
-from .turn import TurnPlan
 from .engines import EngineOutput
+from .history import HistoryStore
 from .profiles import ModelProfile
 from .time import SessionTimestamp
 from .hf import AWQPushJob, TRTPushJob
 from .websocket import _ChatStreamState
+from .turn import TurnPlan, ScreenPrefix
 from .calibration import TotalLengthPolicy
 from .tool import RequestItem, ToolModelInfo
 from .tokens import TokenizerValidationResult
-from .session import ChatMessage, HistoryTurn, SessionState
+from .sentence import ChatStreamItem, SentenceBoundary
 from .execution import CancelCheck, ChatStreamConfig, CompletionCounter
 from .quantization import EnvironmentInfo, CalibrationConfig, _DatasetInfo
+from .session import ChatMessage, HistoryTurn, HistoryView, SessionMeta, HistoryTotal, SessionState, SessionSnapshot
 
 __all__ = [
     "AWQPushJob",
@@ -26,11 +28,19 @@ __all__ = [
     "EnvironmentInfo",
     "ChatMessage",
     "HistoryTurn",
+    "HistoryStore",
+    "HistoryTotal",
+    "HistoryView",
     "ModelProfile",
     "RequestItem",
+    "SessionMeta",
     "SessionState",
+    "SessionSnapshot",
     "SessionTimestamp",
+    "SentenceBoundary",
+    "ChatStreamItem",
     "TurnPlan",
+    "ScreenPrefix",
     "TokenizerValidationResult",
     "TotalLengthPolicy",
     "TRTPushJob",
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
     from src.engines.base import BaseEngine
 
 CancelCheck = Callable[[], bool | Awaitable[bool]] | None
-CompletionCounter = Callable[[str], int] | None
+CompletionCounter = Callable[[str], Awaitable[int]] | None
 
 
 @dataclass(slots=True)
@@ -0,0 +1,107 @@
+"""Ring-buffer backing store for the session history stores."""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, TypeVar, overload
+from collections.abc import Iterable, Iterator, MutableSequence
+
+EntryT = TypeVar("EntryT")
+
+
+class HistoryStore(MutableSequence[EntryT]):
+    """List-like history store with amortized O(1) eviction from the head.
+
+    Entries live in a backing list after ``_head`` cleared slots. Deleting a
+    leading slice (``del store[:n]``) only clears those slots and advances
+    ``_head``; the cleared prefix is compacted once it outgrows the live
+    entries, so each evicted entry costs O(1) amortized instead of shifting
+    every kept entry. Appends, indexing and replacing the newest entry stay
+    O(1); other inserts and deletes compact first and behave like ``list``.
+    """
+
+    __slots__ = ("_head", "_items")
+
+    def __init__(self, entries: Iterable[EntryT] = ()) -> None:
+        self._items: list[Any] = list(entries)
+        self._head = 0
+
+    def _live(self, index: int) -> int:
+        """Backing-list position of live ``index``; raises ``IndexError`` like ``list``."""
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        return self._head + index
+
+    def _compact(self) -> None:
+        if self._head:
+            del self._items[: self._head]
+            self._head = 0
+
+    def _evict(self, count: int) -> None:
+        end = self._head + count
+        self._items[self._head : end] = [None] * count
+        self._head = end
+        if self._head >= len(self):
+            self._compact()
+
+    def __len__(self) -> int:
+        return len(self._items) - self._head
+
+    def __iter__(self) -> Iterator[EntryT]:
+        return islice(self._items, self._head, None)
+
+    @overload
+    def __getitem__(self, index: int) -> EntryT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[EntryT]: ...
+
+    def __getitem__(self, index: int | slice) -> EntryT | list[EntryT]:
+        if isinstance(index, slice):
+            return [self._items[self._head + i] for i in range(*index.indices(len(self)))]
+        return self._items[self._live(index)]
+
+    @overload
+    def __setitem__(self, index: int, value: EntryT) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[EntryT]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        if isinstance(index, slice):
+            self._compact()
+            self._items[index] = value
+            return
+        self._items[self._live(index)] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if start == 0 and step == 1:
+                self._evict(max(stop, 0))
+                return
+        self._compact()
+        del self._items[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HistoryStore | list):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"HistoryStore({list(self)!r})"
+
+    def append(self, value: EntryT) -> None:
+        self._items.append(value)
+
+    def insert(self, index: int, value: EntryT) -> None:
+        self._compact()
+        self._items.insert(index, value)
+
+
+__all__ = ["HistoryStore"]
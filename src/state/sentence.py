@@ -0,0 +1,19 @@
+"""Sentence segmentation event dataclasses."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class SentenceBoundary:
+    """A completed sentence detected in the outgoing chat stream."""
+
+    index: int
+    text: str
+
+
+# Items yielded by the chat stream: text deltas, optionally interleaved with sentence boundaries
+ChatStreamItem = str | SentenceBoundary
+
+__all__ = ["SentenceBoundary", "ChatStreamItem"]
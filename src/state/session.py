@@ -2,31 +2,150 @@
 
 from __future__ import annotations
 
+import sys
 import time
 import uuid
 import asyncio
 from typing import Any, Literal
+from .history import HistoryStore
+from types import MappingProxyType
+from collections.abc import Mapping
 from dataclasses import field, dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class SessionMeta:
+    """Per-session configuration and identity fields.
+
+    Immutable: updates replace ``SessionState.meta`` with a new record, so
+    a reference taken at the start of a turn is a stable snapshot.
+
+    Attributes:
+        client_id: Authenticated client identifier for this connection.
+        now_iso: Session start time in ISO format; empty until ``start``.
+        now_str: Human-readable session start time.
+        now_classification: Time-of-day bucket for the session start.
+        now_tz: Timezone name the timestamps were formatted in.
+        chat_gender: Persona gender, if set.
+        chat_personality: Persona personality, if set.
+        chat_prompt: Custom system prompt, if set.
+        chat_sampling: Session-level sampling overrides, if set; a read-only
+            view of a private copy taken when the record is built.
+        chat_model: Chat model name when chat is deployed.
+        tool_model: Tool model name when tool is deployed.
+        check_screen_prefix: Custom "check_screen" prefix, if set.
+        screen_checked_prefix: Custom "screen_checked" prefix, if set.
+    """
+
+    client_id: str = ""
+    now_iso: str = ""
+    now_str: str = ""
+    now_classification: str = ""
+    now_tz: str = ""
+    chat_gender: str | None = None
+    chat_personality: str | None = None
+    chat_prompt: str | None = None
+    chat_sampling: Mapping[str, Any] | None = None
+    chat_model: str | None = None
+    tool_model: str | None = None
+    check_screen_prefix: str | None = None
+    screen_checked_prefix: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.chat_sampling is not None:
+            object.__setattr__(self, "chat_sampling", MappingProxyType(dict(self.chat_sampling)))
+
+
+@dataclass(frozen=True, slots=True)
 class ChatMessage:
-    """One stored chat-history message."""
+    """One stored chat-history message.
+
+    Stored messages are shared with history snapshots, so they are frozen
+    and edits replace the message in the store. Only the ``chat_tokens``
+    cache is written in place, through ``object.__setattr__``. ``role`` is
+    interned, so messages decoded from client payloads or parked histories
+    share the two role strings.
+
+    Attributes:
+        role: Message author.
+        content: Message text.
+        chat_tokens: Cached chat-tokenizer count of this message's transcript
+            line, tagged with the ``content`` string it was computed for. The
+            cache is stale as soon as ``content`` is replaced.
+    """
 
     role: Literal["user", "assistant"]
     content: str
+    chat_tokens: tuple[str, int] | None = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "role", sys.intern(self.role))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HistoryTurn:
-    """One stored tool-history entry."""
+    """One stored tool-history entry.
+
+    Stored turns are shared with history snapshots, so they are frozen and
+    edits replace the turn in the store. Only the ``tool_tokens`` cache is
+    written in place, through ``object.__setattr__``.
+
+    Attributes:
+        turn_id: Stable id reserved for the turn.
+        user: Tool-side user text.
+        assistant: Assistant text (unused by the tool model).
+        tool_tokens: Cached tool-tokenizer count of the stripped ``user`` text
+            without special tokens, tagged with the ``user`` string it was
+            computed for. The cache is stale as soon as ``user`` is replaced.
+    """
 
     turn_id: str
     user: str
     assistant: str
+    tool_tokens: tuple[str, int] | None = field(default=None, compare=False, repr=False)
+
 
+@dataclass(slots=True)
+class HistoryTotal:
+    """Running joined-token total of one history store.
 
-@dataclass
+    The total covers ``store[:length]`` and stays valid while ``store`` is
+    still the session's store and ``store[length - 1]`` is still ``last``:
+    appends only add their own counts, while replacing the store or its
+    newest entry falls back to a recount from cached per-entry counts.
+
+    Attributes:
+        store: History store the total was computed for.
+        length: Number of leading entries covered.
+        last: Entry at ``length - 1`` when the total was taken.
+        tokens: Entry token counts plus one separator between neighbours.
+    """
+
+    store: HistoryStore[Any]
+    length: int
+    last: object
+    tokens: int
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryView:
+    """Read-only snapshot of one history store, shared by readers until it changes.
+
+    Stores only grow at the tail, lose entries from the head or replace the
+    newest entry, and entries are frozen, so the view still mirrors ``store``
+    while ``store`` is the session's store with the same length, first entry
+    and last entry.
+
+    Attributes:
+        store: History store the view was taken from.
+        entries: The store's entries when the view was taken.
+    """
+
+    store: HistoryStore[Any]
+    entries: tuple[Any, ...]
+
+
+@dataclass(slots=True)
 class SessionState:
     """Container for all mutable session-scoped data.
 
@@ -35,12 +154,22 @@ class SessionState:
     Created per-connection; the connection IS the session identity.
 
     Attributes:
-        meta: Extensible metadata dictionary containing session configuration.
-        session_id: Stable server-generated ID for this websocket session.
+        meta: Session identity and persona configuration.
+        session_id: Stable server-generated ID for this websocket session,
+            drawn on first read.
         chat_history_messages: Chat history store, active only when chat
-            deployment is enabled.
+            deployment is enabled. Trims evict from its head in amortized
+            O(1) per message.
         tool_history_turns: Tool history store (user-only turns), active only
             when tool deployment is enabled.
+        chat_history_total: Running token total of ``chat_history_messages``
+            kept by eager trims; None until the first one.
+        tool_history_total: Running token total of ``tool_history_turns``.
+        chat_history_view: Cached ``HistoryView`` of ``chat_history_messages``
+            shared by ``get_chat_messages`` reads; None until the first read.
+            It stays valid only while the store is appended to, trimmed from
+            the head or has its newest entry replaced; any other edit must
+            replace the store.
         active_request_task: Reference to the currently running asyncio.Task
             for this session.
         active_request_id: Tracks the current chat/generation request. Used
@@ -49,27 +178,88 @@ class SessionState:
         lifecycle_state: Request lifecycle state for transition safety:
             'idle' | 'running' | 'cancelling' | 'closed'.
         cancel_requested: Cooperative cancellation flag for in-flight streams.
-        request_lock: Lock guarding lifecycle/request mutation transitions.
+        request_lock: Lock guarding lifecycle/request mutation transitions,
+            created on first use.
         created_at: Monotonic timestamp when the session was first created.
         check_screen_prefix_tokens: Cached token count for the "check_screen" prefix.
         screen_checked_prefix_tokens: Cached token count for the "screen_checked" prefix.
         screen_followup_pending: Whether the next client message should be
             prefixed with screen_checked_prefix for chat generation.
+        resume_token: Token issued in the start ack under which the session
+            is kept for ``resume`` after a dropped connection; None when
+            resume is disabled or the client ended the session.
+        memory_bytes: Persona, meta and history bytes last measured for the
+            process-wide session memory budget.
+        memory_touched_at: Monotonic time of the last measured update; the
+            budget parks the longest-untouched idle sessions first.
+        history_parked: Whether both history stores are emptied while their
+            entries wait, compressed or on disk, for the next turn.
     """
 
-    meta: dict[str, Any]
-    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
-    chat_history_messages: list[ChatMessage] | None = None
-    tool_history_turns: list[HistoryTurn] | None = None
+    meta: SessionMeta = field(default_factory=SessionMeta)
+    _session_id: str | None = field(default=None, repr=False)
+    chat_history_messages: HistoryStore[ChatMessage] | None = None
+    tool_history_turns: HistoryStore[HistoryTurn] | None = None
+    chat_history_total: HistoryTotal | None = None
+    tool_history_total: HistoryTotal | None = None
+    chat_history_view: HistoryView | None = None
     active_request_task: asyncio.Task | None = None
     active_request_id: str | None = None
     lifecycle_state: Literal["idle", "running", "cancelling", "closed"] = "idle"
     cancel_requested: bool = False
-    request_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    _request_lock: asyncio.Lock | None = field(default=None, repr=False)
     created_at: float = field(default_factory=time.monotonic)
     check_screen_prefix_tokens: int = 0
     screen_checked_prefix_tokens: int = 0
     screen_followup_pending: bool = False
+    resume_token: str | None = None
+    memory_bytes: int = 0
+    memory_touched_at: float = 0.0
+    history_parked: bool = False
+
+    @property
+    def session_id(self) -> str:
+        if self._session_id is None:
+            self._session_id = uuid.uuid4().hex
+        return self._session_id
+
+    @property
+    def request_lock(self) -> asyncio.Lock:
+        if self._request_lock is None:
+            self._request_lock = asyncio.Lock()
+        return self._request_lock
+
+
+@dataclass(frozen=True, slots=True)
+class SessionSnapshot:
+    """Resumable copy of a dropped session.
+
+    Attributes:
+        meta: Session metadata at disconnect.
+        chat_history_messages: Stored chat history, shared with the closed
+            session together with its cached token counts.
+        tool_history_turns: Stored tool history, shared likewise.
+        check_screen_prefix_tokens: Cached "check_screen" prefix token count.
+        screen_checked_prefix_tokens: Cached "screen_checked" prefix token count.
+        screen_followup_pending: Pending screen follow-up flag at disconnect.
+        saved_at: Wall-clock time the snapshot was taken.
+    """
+
+    meta: SessionMeta
+    chat_history_messages: tuple[ChatMessage, ...] | None
+    tool_history_turns: tuple[HistoryTurn, ...] | None
+    check_screen_prefix_tokens: int
+    screen_checked_prefix_tokens: int
+    screen_followup_pending: bool
+    saved_at: float
 
 
-__all__ = ["ChatMessage", "HistoryTurn", "SessionState"]
+__all__ = [
+    "SessionMeta",
+    "ChatMessage",
+    "HistoryTurn",
+    "HistoryTotal",
+    "HistoryView",
+    "SessionState",
+    "SessionSnapshot",
+]
@@ -6,9 +6,23 @@ from typing import TYPE_CHECKING
 from dataclasses import dataclass
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from .session import ChatMessage, SessionState
 
 
+@dataclass(frozen=True, slots=True)
+class ScreenPrefix:
+    """Screen prefix rendered ahead of the user utterance in the chat prompt.
+
+    Kept apart from the utterance so the prompt builder joins the two only
+    when rendering and history stores the utterance as it came in.
+    ``tokens`` is the session's cached count for ``text`` plus its space.
+    """
+
+    text: str
+    tokens: int
+
+
 @dataclass(slots=True)
 class TurnPlan:
     """Validated plan for executing one start/message turn."""
@@ -17,14 +31,14 @@ class TurnPlan:
     request_id: str
     static_prefix: str
     runtime_text: str
-    history_messages: list[ChatMessage]
+    history_messages: Sequence[ChatMessage]
     deploy_chat: bool = False
     deploy_tool: bool = False
     chat_user_utt: str | None = None
     tool_user_utt: str | None = None
     history_turn_id: str | None = None
     sampling_overrides: dict[str, float | int | bool] | None = None
-    apply_screen_checked_prefix: bool = False
+    screen_checked_prefix: ScreenPrefix | None = None
 
 
-__all__ = ["TurnPlan"]
+__all__ = ["ScreenPrefix", "TurnPlan"]
@@ -25,8 +25,13 @@ from ..config.telemetry import (
     METRIC_CONNECTION_DURATION,
     METRIC_PROMPT_TOKENS_TOTAL,
     METRIC_SESSION_CHURN_TOTAL,
+    METRIC_SESSION_PARKS_TOTAL,
+    METRIC_TOKENIZER_POOL_WAIT,
+    METRIC_SESSION_RESUMES_TOTAL,
+    METRIC_TOKEN_MEMO_HITS_TOTAL,
     METRIC_TOKENS_GENERATED_TOTAL,
     METRIC_GENERATIONS_PER_SESSION,
+    METRIC_TOKEN_MEMO_MISSES_TOTAL,
     METRIC_EMPTY_MODEL_OUTPUT_TOTAL,
     METRIC_CONNECTION_SEMAPHORE_WAIT,
     METRIC_TIMEOUT_DISCONNECTS_TOTAL,
@@ -34,6 +39,7 @@ from ..config.telemetry import (
     METRIC_TOOL_CLASSIFICATIONS_TOTAL,
     METRIC_DISCONNECT_MID_STREAM_TOTAL,
     METRIC_RATE_LIMIT_VIOLATIONS_TOTAL,
+    METRIC_TOKEN_ESTIMATE_CHECKS_TOTAL,
     METRIC_TOOL_CLASSIFICATION_LATENCY,
     METRIC_CANCEL_PRE_FIRST_TOKEN_TOTAL,
     METRIC_ENGINE_ABORT_RETRYABLE_TOTAL,
@@ -73,6 +79,7 @@ class MetricInstruments:
         "tool_classification_latency",
         "phase_latency",
         "ws_send_latency",
+        "tokenizer_pool_wait",
         "requests_total",
         "tokens_generated_total",
         "prompt_tokens_total",
@@ -89,6 +96,11 @@ class MetricInstruments:
         "cancel_pre_first_token_total",
         "empty_model_output_total",
         "engine_abort_retryable_total",
+        "token_memo_hits_total",
+        "token_memo_misses_total",
+        "token_estimate_checks_total",
+        "session_resumes_total",
+        "session_parks_total",
         "active_connections",
         "active_generations",
     )
@@ -107,6 +119,7 @@ class MetricInstruments:
         self.tool_classification_latency = _histogram(meter, METRIC_TOOL_CLASSIFICATION_LATENCY)
         self.phase_latency = _histogram(meter, METRIC_PHASE_LATENCY)
         self.ws_send_latency = _histogram(meter, METRIC_WS_SEND_LATENCY)
+        self.tokenizer_pool_wait = _histogram(meter, METRIC_TOKENIZER_POOL_WAIT)
         # Counters
         self.requests_total = _counter(meter, METRIC_REQUESTS_TOTAL)
         self.tokens_generated_total = _counter(meter, METRIC_TOKENS_GENERATED_TOTAL)
@@ -124,6 +137,11 @@ class MetricInstruments:
         self.cancel_pre_first_token_total = _counter(meter, METRIC_CANCEL_PRE_FIRST_TOKEN_TOTAL)
         self.empty_model_output_total = _counter(meter, METRIC_EMPTY_MODEL_OUTPUT_TOTAL)
         self.engine_abort_retryable_total = _counter(meter, METRIC_ENGINE_ABORT_RETRYABLE_TOTAL)
+        self.token_memo_hits_total = _counter(meter, METRIC_TOKEN_MEMO_HITS_TOTAL)
+        self.token_memo_misses_total = _counter(meter, METRIC_TOKEN_MEMO_MISSES_TOTAL)
+        self.token_estimate_checks_total = _counter(meter, METRIC_TOKEN_ESTIMATE_CHECKS_TOTAL)
+        self.session_resumes_total = _counter(meter, METRIC_SESSION_RESUMES_TOTAL)
+        self.session_parks_total = _counter(meter, METRIC_SESSION_PARKS_TOTAL)
         # UpDown counters
         self.active_connections = _updown(meter, METRIC_ACTIVE_CONNECTIONS)
         self.active_generations = _updown(meter, METRIC_ACTIVE_GENERATIONS)
@@ -0,0 +1,27 @@
+"""Session memory observable gauge for OpenTelemetry."""
+
+from __future__ import annotations
+
+from functools import partial
+from opentelemetry import metrics
+from collections.abc import Callable
+from opentelemetry.metrics import Observation, CallbackOptions
+from ..config.telemetry import OTEL_SERVICE_NAME, METRIC_SESSION_MEMORY
+
+
+def _observe_bytes(read_bytes: Callable[[], int], _options: CallbackOptions | None = None) -> list[Observation]:
+    return [Observation(read_bytes())]
+
+
+def register_session_memory_gauge(read_bytes: Callable[[], int]) -> None:
+    """Register the live-session memory gauge, reporting ``read_bytes()`` on each collection."""
+    name, unit, desc = METRIC_SESSION_MEMORY
+    metrics.get_meter(OTEL_SERVICE_NAME).create_observable_gauge(
+        name,
+        callbacks=[partial(_observe_bytes, read_bytes)],
+        unit=unit,
+        description=desc,
+    )
+
+
+__all__ = ["register_session_memory_gauge"]
@@ -2,5 +2,7 @@
 
 from .prompt import sanitize_prompt
 from .stream import StreamingSanitizer
+from .sentences import SentenceSegmenter
+from .document import sanitize_many, sanitize_text
 
-__all__ = ["sanitize_prompt", "StreamingSanitizer"]
+__all__ = ["sanitize_prompt", "StreamingSanitizer", "sanitize_text", "sanitize_many", "SentenceSegmenter"]
@@ -0,0 +1,74 @@
+"""Stateless document sanitization for offline workloads.
+
+The streaming sanitizer exists to emit stable deltas while text is still
+arriving. Offline callers (history imports, evaluation replays, persona
+example preparation) already hold complete documents, so this module runs
+the same streaming pipeline once per document instead:
+
+    - sanitize_text(): one-shot sanitization of a complete document
+    - sanitize_many(): ordered bulk sanitization, optionally fanned out
+      over a process pool
+
+Both produce exactly what a StreamingSanitizer would emit for the same
+document after ``flush()``, regardless of how the stream was chunked.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from .stream import _sanitize_stream_chunk
+from concurrent.futures import ProcessPoolExecutor
+
+# Target number of map chunks handed to each worker. Larger values balance
+# uneven document sizes better; smaller values cut per-task pickling overhead.
+_CHUNKS_PER_WORKER = 4
+
+
+def sanitize_text(text: str) -> str:
+    """Sanitize a complete document in a single pass.
+
+    Args:
+        text: Raw model or transcript text.
+
+    Returns:
+        The sanitized document, identical to streaming the same text through
+        ``StreamingSanitizer`` and concatenating every delta plus the flush.
+    """
+    if not text:
+        return ""
+    sanitized, _prefix_pending, _capital_pending = _sanitize_stream_chunk(
+        text,
+        prefix_pending=True,
+        capital_pending=True,
+        strip_leading_ws=True,
+    )
+    return sanitized.rstrip()
+
+
+def sanitize_many(texts: Iterable[str], *, workers: int = 1) -> list[str]:
+    """Sanitize many documents, preserving input order.
+
+    Args:
+        texts: Documents to sanitize.
+        workers: Number of worker processes. ``1`` runs in the calling
+            process; larger values fan documents out over a process pool.
+
+    Returns:
+        Sanitized documents in the same order as ``texts``.
+
+    Raises:
+        ValueError: If ``workers`` is smaller than 1.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    documents = list(texts)
+    pool_size = min(workers, len(documents))
+    if pool_size <= 1:
+        return [sanitize_text(text) for text in documents]
+
+    chunksize = max(1, len(documents) // (pool_size * _CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=pool_size) as executor:
+        return list(executor.map(sanitize_text, documents, chunksize=chunksize))
+
+
+__all__ = ["sanitize_text", "sanitize_many"]
@@ -0,0 +1,90 @@
+"""Incremental sentence segmentation for streamed chat output.
+
+Runs after StreamingSanitizer on the deltas it emits and reports each
+sentence as soon as it is complete. A terminal mark only closes a sentence
+once the next visible character has arrived, which lets the segmenter skip
+the usual false positives without waiting for the end of the stream:
+
+    - ellipses ("...", "…") trail off instead of ending a sentence
+    - abbreviations ("Dr.", "etc.") and initials ("J. R. R.") keep going
+    - decimals the sanitizer spaced out ("3. 5") stay in one sentence
+    - a bare list number ("1.") attaches to the text that follows
+    - a lowercase continuation means the period was not terminal
+"""
+
+from __future__ import annotations
+
+import re
+from src.state import SentenceBoundary
+from ..config.filters import SENTENCE_ABBREVIATIONS, SENTENCE_BOUNDARY_PATTERN, SENTENCE_ELLIPSIS_PATTERN
+
+_LEADING_OPENERS = "\"'([“‘"
+
+
+class SentenceSegmenter:
+    """Track sentence boundaries across streamed text deltas."""
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Number of sentences reported so far."""
+        return self._count
+
+    def push(self, delta: str) -> list[SentenceBoundary]:
+        """Feed a delta and return the sentences it completed, in order."""
+        if not delta:
+            return []
+        self._pending += delta
+        completed: list[SentenceBoundary] = []
+        start = 0
+        for match in SENTENCE_BOUNDARY_PATTERN.finditer(self._pending):
+            if match.start() < start or not _is_sentence_end(self._pending, start, match):
+                continue
+            completed.append(self._complete(self._pending[start : match.end(2)]))
+            start = match.end()
+        if start:
+            self._pending = self._pending[start:]
+        return completed
+
+    def flush(self) -> SentenceBoundary | None:
+        """Close out the trailing sentence once the stream has finished."""
+        tail = self._pending.strip()
+        self._pending = ""
+        if not tail:
+            return None
+        return self._complete(tail)
+
+    def _complete(self, text: str) -> SentenceBoundary:
+        boundary = SentenceBoundary(index=self._count, text=text.strip())
+        self._count += 1
+        return boundary
+
+
+def _preceding_word(text: str, end: int) -> str:
+    word_start = max(text.rfind(" ", 0, end), text.rfind("\n", 0, end)) + 1
+    return text[word_start:end].lstrip(_LEADING_OPENERS)
+
+
+def _is_sentence_end(text: str, sentence_start: int, match: re.Match[str]) -> bool:
+    punct = match.group(1)
+    next_char = match.group(3)
+    if SENTENCE_ELLIPSIS_PATTERN.search(punct) or next_char.islower():
+        return False
+    if punct != ".":
+        return True
+
+    word = _preceding_word(text, match.start())
+    if word.lower() in SENTENCE_ABBREVIATIONS:
+        return False
+    if len(word) == 1 and word.isalpha():
+        return False
+    if word[-1:].isdigit() and next_char.isdigit():
+        return False
+    is_list_marker = word.isdigit() and not text[sentence_start : match.start() - len(word)].strip()
+    return not is_list_marker
+
+
+__all__ = ["SentenceSegmenter"]
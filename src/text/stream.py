@@ -152,6 +152,8 @@ def _ensure_leading_capital_stream(text: str, capital_pending: bool) -> tuple[st
     """
     if not capital_pending:
         return text, False
+    if not _needs_leading_capital(text):
+        return text, False
     for idx, char in enumerate(text):
         if char.isalpha():
             if char.islower():
@@ -241,6 +243,8 @@ def _common_prefix_len(a: str, b: str) -> int:
 
 OH_MAX_O_COUNT = 2
 OH_MAX_H_COUNT = 1
+# Non-whitespace characters that can open a literal "\\n" or "/n" newline token
+_NEWLINE_TOKEN_LEADS = ("\\", "/")
 
 
 def _normalize_exaggerated_oh(match: re.Match[str]) -> str:
@@ -253,10 +257,34 @@ def _normalize_exaggerated_oh(match: re.Match[str]) -> str:
     return replacement
 
 
+# Fast-path probes: each answers "could this pass change the text?" with a
+# constant-time or memchr-speed check so clean text skips the regex engine.
+
+
+def _needs_leading_capital(text: str) -> bool:
+    first = text[:1]
+    return not (first.isascii() and first.isupper())
+
+
+def _needs_newline_token_strip(text: str) -> bool:
+    first = text[:1]
+    return first.isspace() or first in _NEWLINE_TOKEN_LEADS
+
+
+def _needs_space_collapse(text: str) -> bool:
+    return "\t" in text or "  " in text
+
+
+def _needs_asterisk_strip(text: str) -> bool:
+    return "*" in text
+
+
 def _strip_leading_newline_tokens(text: str) -> str:
     """Remove leading newline tokens without inserting padding."""
     if not text:
         return ""
+    if not _needs_newline_token_strip(text):
+        return text
     return LEADING_NEWLINE_TOKENS_PATTERN.sub("", text)
 
 
@@ -264,6 +292,8 @@ def _collapse_spaces(text: str) -> str:
     """Collapse runs of spaces/tabs into a single space."""
     if not text:
         return ""
+    if not _needs_space_collapse(text):
+        return text
     return COLLAPSE_SPACES_PATTERN.sub(" ", text)
 
 
@@ -271,6 +301,8 @@ def _strip_asterisks(text: str) -> str:
     """Remove asterisk markers used for emphasis."""
     if not text:
         return ""
+    if not _needs_asterisk_strip(text):
+        return text
     return text.replace("*", " ")
 
 
@@ -11,6 +11,10 @@ buffered to avoid emitting incomplete patterns:
 
 By retaining these suffixes, the StreamingSanitizer can process
 boundary-sensitive patterns across chunk boundaries.
+
+The individual ``*_suffix_len`` detectors document each rule;
+compute_stable_and_tail_lengths() evaluates all of them together with a
+bounded reverse scan driven by a character-class table built at import.
 """
 
 from __future__ import annotations
@@ -18,6 +22,181 @@ from __future__ import annotations
 import re
 from ..config.filters import EMAIL_PATTERN, TRAILING_STREAM_UNSTABLE_CHARS
 
+# Character classes for the reverse suffix scan, looked up once per character
+_CLS_EMAIL_DOMAIN = 1  # [A-Za-z0-9.-]
+_CLS_EMAIL_LOCAL = 2  # [A-Za-z0-9._%+-]
+_CLS_PHONE = 4  # [\d \-\(\)]
+_CLS_DIGIT = 8  # \d
+_ASCII_SUFFIX_CLASSES: tuple[int, ...] = tuple(
+    (_CLS_EMAIL_DOMAIN * (ch.isalnum() or ch in ".-"))
+    | (_CLS_EMAIL_LOCAL * (ch.isalnum() or ch in "._%+-"))
+    | (_CLS_PHONE * (ch.isdigit() or ch in " -()"))
+    | (_CLS_DIGIT * ch.isdigit())
+    for ch in map(chr, range(128))
+)
+_NON_ASCII_DIGIT_CLASSES = _CLS_PHONE | _CLS_DIGIT
+_EMOTICON_EYES = ":=;8"
+_EMOTICON_SINGLE = ":=;8<xX^tT"
+_HTML_TAG_CAP = 256
+_HTML_ENTITY_MAX_NAME = 10
+_EMAIL_PARTIAL_CAP = 256
+_EMAIL_FULL_GUARD = 16
+_PHONE_CAP = 64
+
+# Reverse-scan phases for the partial email and phone runs
+_RUN_TAIL = 0  # inside the trailing run
+_RUN_LOCAL = 1  # email only: inside the local part before '@'
+_RUN_DONE = 2
+
+
+def _suffix_class(ch: str) -> int:
+    if ch.isascii():
+        return _ASCII_SUFFIX_CLASSES[ord(ch)]
+    return _NON_ASCII_DIGIT_CLASSES if ch.isdecimal() else 0
+
+
+def _anchor_ends(text: str) -> tuple[int, ...]:
+    """Positions where the ``$``-anchored guards may end (``$`` also matches before a final newline)."""
+    end = len(text)
+    return (end, end - 1) if text.endswith("\n") else (end,)
+
+
+def _html_entity_start(text: str, anchor: int) -> int | None:
+    idx = anchor
+    while idx > 0 and anchor - idx <= _HTML_ENTITY_MAX_NAME and text[idx - 1].isascii() and text[idx - 1].isalpha():
+        idx -= 1
+    if anchor - idx <= _HTML_ENTITY_MAX_NAME and idx > 0 and text[idx - 1] == "&":
+        return idx - 1
+    return None
+
+
+def _sanitized_suffix_guard(text: str, limit: int) -> int:
+    """Unstable-character and partial-entity guard, capped at ``limit``."""
+    end = len(text)
+    floor = max(0, end - limit)
+    idx = end
+    while idx > floor and text[idx - 1] in TRAILING_STREAM_UNSTABLE_CHARS:
+        idx -= 1
+    while idx > floor and text[idx - 1] == ".":
+        idx -= 1
+    guard = end - idx
+    for anchor in _anchor_ends(text):
+        entity_start = _html_entity_start(text, anchor)
+        if entity_start is not None:
+            guard = max(guard, end - entity_start)
+    return min(guard, limit)
+
+
+def _scan_email_and_phone_runs(raw: str, anchor: int, floor: int) -> tuple[int, int, bool]:
+    """Reverse-scan the email/phone runs ending at ``anchor`` down to ``floor``.
+
+    Returns the leftmost match starts (``anchor`` when nothing matched) and
+    whether the phone run was still open when the scan reached ``floor``.
+    """
+    email_start = phone_start = anchor
+    email_phase = phone_phase = _RUN_TAIL
+    email_tail_is_domain = True
+    idx = anchor - 1
+    while idx >= floor and (email_phase != _RUN_DONE or phone_phase != _RUN_DONE):
+        ch = raw[idx]
+        cls = _suffix_class(ch)
+        if email_phase != _RUN_DONE:
+            if cls & _CLS_EMAIL_LOCAL:
+                email_start = idx
+                email_tail_is_domain = email_tail_is_domain and bool(cls & _CLS_EMAIL_DOMAIN)
+            elif ch == "@" and email_phase == _RUN_TAIL and email_tail_is_domain:
+                email_phase = _RUN_LOCAL
+            else:
+                email_phase = _RUN_DONE
+        if phone_phase != _RUN_DONE:
+            if cls & _CLS_PHONE:
+                phone_start = idx if cls & _CLS_DIGIT else phone_start
+            else:
+                phone_start = idx if ch == "+" else phone_start
+                phone_phase = _RUN_DONE
+        idx -= 1
+    return email_start, phone_start, phone_phase != _RUN_DONE
+
+
+def _phone_run_start(raw: str, idx: int, phone_start: int) -> int:
+    """Finish a phone run that extends past the bounded scan window."""
+    while idx >= 0:
+        ch = raw[idx]
+        cls = _suffix_class(ch)
+        if not cls & _CLS_PHONE:
+            return idx if ch == "+" else phone_start
+        if cls & _CLS_DIGIT:
+            phone_start = idx
+        idx -= 1
+    return phone_start
+
+
+def _run_guards(raw: str, limit: int) -> tuple[int, int]:
+    """Partial email and phone guards over the raw tail."""
+    end = len(raw)
+    email_start = phone_start = end
+    for anchor in _anchor_ends(raw):
+        # One extra character so a run touching the window edge still reads as >= limit
+        floor = max(0, anchor - limit - 1)
+        email_at, phone_at, phone_open = _scan_email_and_phone_runs(raw, anchor, floor)
+        if phone_open and end - phone_at < limit:
+            phone_at = _phone_run_start(raw, floor - 1, phone_at)
+        if email_at < anchor:
+            email_start = min(email_start, email_at)
+        if phone_at < anchor:
+            phone_start = min(phone_start, phone_at)
+    return min(end - email_start, _EMAIL_PARTIAL_CAP), min(end - phone_start, _PHONE_CAP)
+
+
+def _html_tag_guard(raw: str, start: int) -> int | None:
+    """Unclosed-tag guard from ``raw[start:]``; None when it holds no '<' or '>'."""
+    end = len(raw)
+    last_lt = raw.rfind("<", start)
+    last_gt = raw.rfind(">", start)
+    if last_lt == -1 and last_gt == -1:
+        return None
+    if last_lt == -1 or last_gt > last_lt:
+        return 0
+    if last_lt + 1 < end and raw[last_lt + 1].isdigit():
+        return 0
+    return min(end - last_lt, _HTML_TAG_CAP)
+
+
+def _emoticon_guard(raw: str) -> int:
+    guard = 0
+    for anchor in _anchor_ends(raw):
+        last = raw[anchor - 1] if anchor > 0 else ""
+        prev = raw[anchor - 2] if anchor > 1 else ""
+        if (last and last in "-^" and prev and prev in _EMOTICON_EYES) or (last == "_" and prev and prev in "^tT"):
+            guard = max(guard, len(raw) - anchor + 2)
+        elif last and last in _EMOTICON_SINGLE:
+            guard = max(guard, len(raw) - anchor + 1)
+    return guard
+
+
+def _raw_suffix_guard(raw: str, limit: int) -> int:
+    """Tag, email, phone and emoticon guards over the raw tail, capped at ``limit``."""
+    if not raw or limit <= 0:
+        return 0
+    email, phone = _run_guards(raw, limit)
+    others = max(phone, _emoticon_guard(raw))
+    tag = _html_tag_guard(raw, max(0, len(raw) - limit - 1))
+    if tag is None and others < limit:
+        # Only an unclosed tag opened before the window can still raise the guard
+        tag = _html_tag_guard(raw, 0)
+    others = max(others, tag or 0)
+
+    # A complete address anywhere in the tail swaps the partial guard for a
+    # fixed one; only pay for the full search when that changes the answer.
+    full_email = min(_EMAIL_FULL_GUARD, len(raw))
+    if (
+        min(max(others, full_email), limit) != min(max(others, email), limit)
+        and "@" in raw
+        and EMAIL_PATTERN.search(raw)
+    ):
+        email = full_email
+    return min(max(others, email), limit)
+
 
 def unstable_suffix_len(text: str) -> int:
     """Compute length of trailing unstable characters.
@@ -136,6 +315,11 @@ def compute_stable_and_tail_lengths(
 ) -> tuple[int, int]:
     """Compute how much of the sanitized text is stable vs tail to buffer.
 
+    Equivalent to taking the max of the individual ``*_suffix_len`` guards,
+    but folded into one bounded reverse scan per string: only guards that
+    can still change the capped result are resolved, so the work per push
+    stays proportional to ``max_tail`` instead of the whole tail.
+
     Returns (stable_len, tail_len) where:
     - stable_len: Characters safe to emit
     - tail_len: Characters to buffer for next chunk
@@ -143,17 +327,10 @@ def compute_stable_and_tail_lengths(
     if not sanitized:
         return 0, 0
 
-    unstable = unstable_suffix_len(sanitized)
-    html_guard = html_entity_suffix_len(sanitized)
-    html_tag_guard = html_tag_suffix_len(raw_tail)
-    email_guard = email_suffix_len(raw_tail)
-    phone_guard = phone_suffix_len(raw_tail)
-    emoticon_guard = emoticon_suffix_len(raw_tail)
+    limit = max(0, min(len(sanitized), max_tail))
+    guard = max(_sanitized_suffix_guard(sanitized, limit), _raw_suffix_guard(raw_tail, limit))
 
-    tail_len = min(
-        len(sanitized),
-        max(unstable, html_guard, html_tag_guard, email_guard, phone_guard, emoticon_guard, 0),
-    )
+    tail_len = min(len(sanitized), guard)
     stable_len = len(sanitized) - tail_len
 
     # Bound the retained tail to avoid unbounded buffering
@@ -0,0 +1,113 @@
+"""On-disk cache of serialized fast tokenizers.
+
+``AutoTokenizer.from_pretrained`` on a hub repo id resolves every tokenizer
+file against the hub, and a repo that only ships a slow tokenizer is
+converted to a fast one on every load. When ``TOKENIZER_CACHE_DIR`` is set,
+the loaded tokenizer is saved there once with ``save_pretrained`` (which
+writes the fast ``tokenizer.json``, the chat template and any remote code)
+and later process starts load that local copy instead.
+
+Cache entries are keyed by a digest of the source tokenizer files plus the
+transformers and tokenizers versions, so a changed tokenizer, template or
+library upgrade misses the cache instead of loading a stale copy. Sources
+that cannot be resolved to local files without network access are loaded
+directly and not cached.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+from typing import Any
+from pathlib import Path
+from collections.abc import Callable
+from huggingface_hub import try_to_load_from_cache
+from importlib.metadata import PackageNotFoundError, version
+
+logger = logging.getLogger(__name__)
+
+TokenizerLoader = Callable[[str], Any]
+
+# Files that can change how a tokenizer loads or renders its chat template.
+# Model weights are skipped; configs are small and cheap to hash.
+_SOURCE_SUFFIXES = frozenset({".json", ".model", ".txt", ".jinja", ".py", ".tiktoken", ".vocab"})
+_SERIALIZED_FILE = "tokenizer.json"
+_KEY_PACKAGES = ("transformers", "tokenizers")
+
+
+def _package_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "missing"
+
+
+def _resolve_source_dir(path_or_repo: str) -> Path | None:
+    """Return the local directory holding the tokenizer files, without network access."""
+    if os.path.isdir(path_or_repo):
+        return Path(path_or_repo)
+    try:
+        resolved = try_to_load_from_cache(path_or_repo, "tokenizer_config.json")
+    except ValueError:
+        return None
+    return Path(resolved).parent if isinstance(resolved, str) else None
+
+
+def _artifact_key(source_dir: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for package in _KEY_PACKAGES:
+        digest.update(f"{package}={_package_version(package)}\0".encode())
+    for file in sorted(source_dir.iterdir()):
+        if file.is_file() and file.suffix in _SOURCE_SUFFIXES:
+            digest.update(file.name.encode() + b"\0")
+            digest.update(hashlib.blake2b(file.read_bytes(), digest_size=16).digest())
+    return digest.hexdigest()
+
+
+def _store_artifact(hf_tok: Any, target: Path) -> None:
+    """Save ``hf_tok`` to ``target`` via a temporary directory and an atomic rename."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{target.name}-", dir=target.parent))
+    try:
+        hf_tok.save_pretrained(str(staging))
+        if not (staging / _SERIALIZED_FILE).is_file():
+            return
+        os.replace(staging, target)
+    except OSError as exc:
+        logger.warning("tokenizer cache: could not store %s: %s", target, exc)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def load_pretrained_tokenizer(path_or_repo: str, cache_dir: str, load: TokenizerLoader) -> tuple[Any, str]:
+    """Load a transformers tokenizer through the on-disk cache.
+
+    Args:
+        path_or_repo: Local tokenizer directory or Hugging Face repo id.
+        cache_dir: Cache root; empty disables the disk cache.
+        load: Loads a tokenizer from a path or repo id.
+
+    Returns:
+        The tokenizer and where it came from: ``"disk cache"`` or ``"source"``.
+    """
+    source_dir = _resolve_source_dir(path_or_repo) if cache_dir else None
+    if source_dir is None:
+        return load(path_or_repo), "source"
+
+    target = Path(cache_dir) / _artifact_key(source_dir)
+    if (target / _SERIALIZED_FILE).is_file():
+        try:
+            return load(str(target)), "disk cache"
+        except Exception as exc:  # noqa: BLE001 - a broken entry falls back to the source
+            logger.warning("tokenizer cache: ignoring unreadable entry %s: %s", target, exc)
+            shutil.rmtree(target, ignore_errors=True)
+
+    hf_tok = load(str(source_dir))
+    _store_artifact(hf_tok, target)
+    return hf_tok, "source"
+
+
+__all__ = ["TokenizerLoader", "load_pretrained_tokenizer"]
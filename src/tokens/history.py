@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal
+from .offsets import cut_to_token_budget
+from ..config.filters import WHITESPACE_TOKEN_PATTERN
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+from collections.abc import Callable, Iterable, Iterator
 
 if TYPE_CHECKING:
     from .tokenizer import FastTokenizer
 
 
+T = TypeVar("T")
+
 ToolHistoryOversizePolicy = Literal["keep_latest_whole", "trim_latest_tail"]
 
+# Candidates tokenized per batched call when scanning for the first fit.
+# Most scans stop within a few candidates, so a small window avoids
+# tokenizing candidates that are never looked at.
+_COUNT_BATCH_SIZE = 8
+# Any short non-empty text; special tokens are added around it once.
+_OVERHEAD_PROBE = "history"
+
 
 def _fallback_count_tokens(text: str, *, include_special_tokens: bool = False) -> int:
     count = len(text.split()) if text else 0
@@ -18,22 +30,44 @@ def _fallback_count_tokens(text: str, *, include_special_tokens: bool = False) -
     return count
 
 
-def _trim_text_by_token_count(
+def _trim_with_count(
     text: str,
     token_count: int,
     tokenizer: FastTokenizer | None,
     *,
     keep: Literal["start", "end"],
-) -> str:
-    if token_count <= 0 or not text:
-        return ""
+) -> tuple[str, int]:
     if tokenizer is not None:
-        return tokenizer.trim(text, max_tokens=token_count, keep=keep).strip()
-    tokens = text.split()
-    if len(tokens) <= token_count:
-        return text
-    kept = tokens[:token_count] if keep == "start" else tokens[-token_count:]
-    return " ".join(kept)
+        return tokenizer.trim_with_count(text, token_count, keep=keep)
+    spans = [match.span() for match in WHITESPACE_TOKEN_PATTERN.finditer(text)]
+    return cut_to_token_budget(text, spans, token_count, keep)
+
+
+def _count_many(
+    texts: list[str],
+    tokenizer: FastTokenizer | None,
+    *,
+    include_special_tokens: bool,
+) -> list[int]:
+    if tokenizer is None:
+        return [_fallback_count_tokens(text, include_special_tokens=include_special_tokens) for text in texts]
+    present = [text for text in texts if text]
+    counts = iter(tokenizer.count_many(present, add_special_tokens=include_special_tokens) if present else [])
+    return [next(counts) if text else 0 for text in texts]
+
+
+def _count_fitting_join(newest_first: list[str], budget: int, tool_tokenizer: FastTokenizer | None) -> tuple[int, int]:
+    """Exactly count growing joins of the newest texts; return how many fit and their tokens."""
+    candidates = ("\n".join(reversed(newest_first[:kept])) for kept in range(1, len(newest_first) + 1))
+    kept, kept_tokens = 0, 0
+    for _candidate, candidate_tokens in iter_token_counts(
+        candidates,
+        lambda batch: count_tool_tokens_many(batch, tool_tokenizer, include_special_tokens=True),
+    ):
+        if candidate_tokens > budget:
+            break
+        kept, kept_tokens = kept + 1, candidate_tokens
+    return kept, kept_tokens
 
 
 def count_chat_tokens(text: str, chat_tokenizer: FastTokenizer | None) -> int:
@@ -57,6 +91,132 @@ def count_tool_tokens(
     return _fallback_count_tokens(text, include_special_tokens=include_special_tokens)
 
 
+def count_chat_tokens_many(texts: list[str], chat_tokenizer: FastTokenizer | None) -> list[int]:
+    """Batched ``count_chat_tokens``: one tokenizer round trip for all texts."""
+    return _count_many(texts, chat_tokenizer, include_special_tokens=False)
+
+
+def count_tool_tokens_many(
+    texts: list[str],
+    tool_tokenizer: FastTokenizer | None,
+    *,
+    include_special_tokens: bool = False,
+) -> list[int]:
+    """Batched ``count_tool_tokens``: one tokenizer round trip for all texts."""
+    return _count_many(texts, tool_tokenizer, include_special_tokens=include_special_tokens)
+
+
+def special_tokens_overhead(tokenizer: FastTokenizer | None) -> int:
+    """Tokens ``include_special_tokens`` adds to any non-empty text."""
+    return count_tool_tokens(_OVERHEAD_PROBE, tokenizer, include_special_tokens=True) - count_tool_tokens(
+        _OVERHEAD_PROBE, tokenizer
+    )
+
+
+def joined_separator_tokens(
+    separator: str,
+    count_many: Callable[[list[str]], list[int]],
+    *,
+    left: str = _OVERHEAD_PROBE,
+    right: str = _OVERHEAD_PROBE,
+) -> int:
+    """Tokens ``separator`` adds between two joined texts, measured in context.
+
+    Pre-tokenizers often split a separator differently next to text than on
+    its own, so it is counted as the difference against a probe join.
+    """
+    joined, left_tokens, right_tokens = count_many([f"{left}{separator}{right}", left, right])
+    return joined - left_tokens - right_tokens
+
+
+def count_fitting_suffix(
+    item_tokens: list[int],
+    budget: int,
+    *,
+    separator_tokens: int,
+    overhead_tokens: int = 0,
+) -> int:
+    """Return how many newest items fit ``budget`` once joined.
+
+    A join of ``k`` items costs their token sum plus ``k - 1`` separators
+    plus ``overhead_tokens``, so the scan is integer arithmetic only.
+    """
+    total = overhead_tokens - separator_tokens
+    kept = 0
+    for tokens in reversed(item_tokens):
+        total += tokens + separator_tokens
+        if total > budget:
+            break
+        kept += 1
+    return kept
+
+
+def verify_fitting_join(
+    newest_first: list[str],
+    kept: int,
+    budget: int,
+    tool_tokenizer: FastTokenizer | None,
+) -> tuple[int, int]:
+    """Confirm that the newest ``kept`` texts fit ``budget`` once joined by newlines.
+
+    Per-text counts summed with a probed separator can miss merges across
+    the join, so the join (with special tokens) is counted exactly once. On
+    overshoot, fewer texts are searched with exact counts. Returns how many
+    texts fit and the exact token count of their join.
+    """
+    if kept <= 0:
+        return 0, 0
+    joined_tokens = count_tool_tokens(
+        "\n".join(reversed(newest_first[:kept])), tool_tokenizer, include_special_tokens=True
+    )
+    if joined_tokens <= budget:
+        return kept, joined_tokens
+    return _count_fitting_join(newest_first[: kept - 1], budget, tool_tokenizer)
+
+
+def iter_token_counts(
+    candidates: Iterable[str],
+    count_many: Callable[[list[str]], list[int]],
+    *,
+    batch_size: int = _COUNT_BATCH_SIZE,
+) -> Iterator[tuple[str, int]]:
+    """Yield ``(candidate, token_count)`` pairs, tokenizing in small batches.
+
+    Candidates are pulled lazily, so a caller that stops at the first fit
+    only pays for the batch containing it.
+    """
+    batch: list[str] = []
+    for candidate in candidates:
+        batch.append(candidate)
+        if len(batch) >= batch_size:
+            yield from zip(batch, count_many(batch), strict=True)
+            batch = []
+    if batch:
+        yield from zip(batch, count_many(batch), strict=True)
+
+
+def prepare_token_cut(
+    text: str,
+    tokenizer: FastTokenizer | None,
+    *,
+    keep: Literal["start", "end"],
+) -> tuple[int, Callable[[int], str]]:
+    """Tokenize ``text`` once for repeated trimming at different budgets.
+
+    Returns the token count of ``text`` and a function that cuts it to at
+    most ``n`` tokens (stripped). With offset support every cut is a string
+    slice; otherwise each cut falls back to ``tokenizer.trim``.
+    """
+    if tokenizer is None:
+        spans = [match.span() for match in WHITESPACE_TOKEN_PATTERN.finditer(text)]
+    elif tokenizer.supports_offsets:
+        spans = tokenizer.token_offsets(text)
+    else:
+        fallback = tokenizer
+        return fallback.count(text), lambda n: fallback.trim(text, max_tokens=n, keep=keep).strip()
+    return len(spans), lambda n: cut_to_token_budget(text, spans, n, keep)[0].strip()
+
+
 def trim_tool_text_to_budget(
     text: str,
     budget: int,
@@ -65,40 +225,22 @@ def trim_tool_text_to_budget(
     keep: Literal["start", "end"] = "end",
     include_special_tokens: bool = True,
 ) -> str:
-    """Trim one tool-history text so its token count fits inside ``budget``."""
+    """Trim one tool-history text so its token count fits inside ``budget``.
+
+    Special tokens add a fixed overhead, so the text is cut once at
+    ``budget - overhead`` tokens instead of searching over trim lengths.
+    """
     candidate = (text or "").strip()
     effective_budget = max(0, int(budget))
     if effective_budget <= 0 or not candidate:
         return ""
 
-    token_count = count_tool_tokens(candidate, tool_tokenizer, include_special_tokens=False)
-    if (
-        count_tool_tokens(
-            candidate,
-            tool_tokenizer,
-            include_special_tokens=include_special_tokens,
-        )
-        <= effective_budget
-    ):
+    with_special = count_tool_tokens(candidate, tool_tokenizer, include_special_tokens=include_special_tokens)
+    if with_special <= effective_budget:
         return candidate
-
-    lo = 1
-    hi = token_count
-    best = ""
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        trimmed = _trim_text_by_token_count(candidate, mid, tool_tokenizer, keep=keep)
-        trimmed_tokens = count_tool_tokens(
-            trimmed,
-            tool_tokenizer,
-            include_special_tokens=include_special_tokens,
-        )
-        if trimmed and trimmed_tokens <= effective_budget:
-            best = trimmed
-            lo = mid + 1
-        else:
-            hi = mid - 1
-    return best
+    overhead = with_special - count_tool_tokens(candidate, tool_tokenizer, include_special_tokens=False)
+    trimmed, _kept = _trim_with_count(candidate, effective_budget - overhead, tool_tokenizer, keep=keep)
+    return trimmed.strip()
 
 
 def build_tool_history(
@@ -107,48 +249,76 @@ def build_tool_history(
     tool_tokenizer: FastTokenizer | None,
     *,
     oversize_policy: ToolHistoryOversizePolicy = "trim_latest_tail",
+    text_tokens: list[int] | None = None,
 ) -> str:
-    selected_lines: list[str] = []
+    """Join the newest ``user_texts`` that fit ``budget`` with special tokens.
+
+    ``text_tokens`` optionally carries the per-text token counts (without
+    special tokens) aligned with ``user_texts``; the fit is then summed from
+    those counts and the chosen join is counted exactly once to confirm it,
+    instead of tokenizing each candidate join.
+    """
     effective_budget = max(1, int(budget))
+    newest_first = [stripped for text in reversed(user_texts) if (stripped := text.strip())]
+    if not newest_first:
+        return ""
 
-    for text in reversed(user_texts):
-        stripped = text.strip()
-        if not stripped:
-            continue
+    if text_tokens is not None:
+        counted = [tokens for text, tokens in zip(user_texts, text_tokens, strict=True) if text.strip()]
+        kept = count_fitting_suffix(
+            counted,
+            effective_budget,
+            separator_tokens=joined_separator_tokens("\n", lambda texts: count_tool_tokens_many(texts, tool_tokenizer)),
+            overhead_tokens=special_tokens_overhead(tool_tokenizer),
+        )
+        kept, _tokens = verify_fitting_join(newest_first, kept, effective_budget, tool_tokenizer)
+    else:
+        kept, _tokens = _count_fitting_join(newest_first, effective_budget, tool_tokenizer)
+    selected = "\n".join(reversed(newest_first[:kept]))
 
-        candidate_lines = [stripped] + selected_lines
-        candidate_text = "\n".join(candidate_lines)
-        candidate_tokens = count_tool_tokens(
-            candidate_text,
+    if selected:
+        return selected
+    if oversize_policy == "trim_latest_tail":
+        return trim_tool_text_to_budget(
+            newest_first[0],
+            effective_budget,
             tool_tokenizer,
+            keep="end",
             include_special_tokens=True,
         )
-        if candidate_tokens <= effective_budget:
-            selected_lines.insert(0, stripped)
-            continue
-
-        if not selected_lines:
-            if oversize_policy == "trim_latest_tail":
-                clipped = trim_tool_text_to_budget(
-                    stripped,
-                    effective_budget,
-                    tool_tokenizer,
-                    keep="end",
-                    include_special_tokens=True,
-                )
-                if clipped:
-                    selected_lines.insert(0, clipped)
-            else:
-                selected_lines.insert(0, stripped)
-        break
-
-    return "\n".join(selected_lines)
+    return newest_first[0]
+
+
+async def offload_token_work(
+    tokenizer: FastTokenizer | None,
+    fn: Callable[..., T],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    """Run tokenizer-bound ``fn`` on ``tokenizer``'s executor.
+
+    Without a tokenizer the helpers above fall back to whitespace counting,
+    which is cheap enough to run inline.
+    """
+    if tokenizer is None:
+        return fn(*args, **kwargs)
+    return await tokenizer.offload(fn, *args, **kwargs)
 
 
 __all__ = [
     "ToolHistoryOversizePolicy",
     "count_chat_tokens",
     "count_tool_tokens",
+    "count_chat_tokens_many",
+    "count_tool_tokens_many",
+    "special_tokens_overhead",
+    "joined_separator_tokens",
+    "count_fitting_suffix",
+    "verify_fitting_join",
+    "iter_token_counts",
+    "prepare_token_cut",
     "trim_tool_text_to_budget",
     "build_tool_history",
+    "offload_token_work",
 ]
@@ -0,0 +1,125 @@
+"""Content-addressed memo for token counts and token ids.
+
+Persona prompts, history turns and screen prefixes are re-counted on every
+turn even though their text rarely changes. TokenMemo remembers results by
+a BLAKE2b digest of the text plus the add-special-tokens flag, so no copy of
+the text is retained and identical strings from different sessions share
+one entry. Entries are evicted least-recently-used once the estimated
+footprint exceeds the configured byte cap.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from threading import Lock
+from collections import OrderedDict
+from ..telemetry.instruments import get_metrics
+
+_DIGEST_SIZE = 16
+# Approximate per-entry cost of the OrderedDict slot, key bytes object and
+# boxed value, independent of the token ids themselves.
+_ENTRY_OVERHEAD_BYTES = 200
+_ID_BYTES = 8
+
+_KIND_COUNT = b"c"
+_KIND_IDS = b"i"
+
+
+def _digest(kind: bytes, text: str, add_special_tokens: bool) -> bytes:
+    hasher = hashlib.blake2b(kind + (b"1" if add_special_tokens else b"0"), digest_size=_DIGEST_SIZE)
+    hasher.update(text.encode("utf-8", "surrogatepass"))
+    return hasher.digest()
+
+
+def _entry_bytes(value: int | tuple[int, ...]) -> int:
+    if isinstance(value, tuple):
+        return _ENTRY_OVERHEAD_BYTES + _ID_BYTES * len(value)
+    return _ENTRY_OVERHEAD_BYTES
+
+
+class TokenMemo:
+    """Bounded LRU memo of token counts and ids keyed on text digests."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Create a memo holding at most ``max_bytes`` of estimated entries."""
+        self._max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[bytes, int | tuple[int, ...]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated bytes currently held by memo entries."""
+        return self._size_bytes
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the memo."""
+        total = self._hits + self._misses
+        return self._hits / total if total else 0.0
+
+    def get_count(self, text: str, add_special_tokens: bool) -> tuple[bytes, int | None]:
+        """Return the lookup key and cached token count (``None`` on miss).
+
+        A cached id list for the same text also answers count lookups.
+        """
+        key = _digest(_KIND_COUNT, text, add_special_tokens)
+        cached = self._lookup(key)
+        if cached is None and not add_special_tokens:
+            cached = self._lookup(_digest(_KIND_IDS, text, False))
+        count = len(cached) if isinstance(cached, tuple) else cached
+        self._record("count", count is not None)
+        return key, count
+
+    def get_ids(self, text: str) -> tuple[bytes, list[int] | None]:
+        """Return the lookup key and a fresh copy of cached ids (``None`` on miss)."""
+        key = _digest(_KIND_IDS, text, False)
+        cached = self._lookup(key)
+        ids = list(cached) if isinstance(cached, tuple) else None
+        self._record("encode", ids is not None)
+        return key, ids
+
+    def put(self, key: bytes, value: int | list[int]) -> None:
+        """Store a count or id list under ``key``, evicting LRU entries as needed."""
+        stored: int | tuple[int, ...] = value if isinstance(value, int) else tuple(value)
+        cost = _entry_bytes(stored)
+        if cost > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= _entry_bytes(previous)
+            self._entries[key] = stored
+            self._size_bytes += cost
+            while self._size_bytes > self._max_bytes:
+                _old_key, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= _entry_bytes(evicted)
+
+    def clear(self) -> None:
+        """Drop every entry and reset hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _lookup(self, key: bytes) -> int | tuple[int, ...] | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _record(self, op: str, hit: bool) -> None:
+        metrics = get_metrics()
+        if hit:
+            self._hits += 1
+            metrics.token_memo_hits_total.add(1, {"op": op})
+        else:
+            self._misses += 1
+            metrics.token_memo_misses_total.add(1, {"op": op})
+
+
+__all__ = ["TokenMemo"]
@@ -0,0 +1,62 @@
+"""Cut text at token boundaries using character offset mappings.
+
+Trimming by ``decode(ids[:n])`` rebuilds text from token ids, which can
+alter whitespace and drift across byte-level BPE merges, so callers had to
+re-encode the result to confirm the fit. With an offset mapping from one
+encode the original string is sliced at a token boundary instead: the
+kept text is a verbatim substring and its token count is known exactly.
+
+Byte-level tokenizers can spread one character over several tokens that
+all report the same character span. A cut never lands inside such a
+group; the kept side shrinks to the nearest clean boundary instead.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+TokenSpan = tuple[int, int]
+
+
+def _splits_character(spans: list[TokenSpan], index: int) -> bool:
+    """Whether the boundary before ``spans[index]`` falls inside a character."""
+    return spans[index][0] < spans[index - 1][1]
+
+
+def cut_to_token_budget(
+    text: str,
+    spans: list[TokenSpan],
+    max_tokens: int,
+    keep: Literal["start", "end"] | str = "end",
+) -> tuple[str, int]:
+    """Slice ``text`` so that at most ``max_tokens`` of its tokens remain.
+
+    Args:
+        text: Original text that ``spans`` were computed from.
+        spans: ``(start, end)`` character offsets per token, in order.
+        max_tokens: Maximum number of tokens to keep.
+        keep: Keep the leading ("start") or trailing ("end") tokens.
+
+    Returns:
+        ``(kept_text, kept_tokens)`` where ``kept_text`` is a substring of
+        ``text`` covering exactly ``kept_tokens`` tokens of the encoding.
+    """
+    total = len(spans)
+    if max_tokens <= 0 or not text or not spans:
+        return "", 0
+    if total <= max_tokens:
+        return text, total
+
+    if keep == "start":
+        kept = max_tokens
+        while kept > 0 and _splits_character(spans, kept):
+            kept -= 1
+        return (text[: spans[kept - 1][1]] if kept else ""), kept
+
+    first = total - max_tokens
+    while first < total and _splits_character(spans, first):
+        first += 1
+    return (text[spans[first][0] :] if first < total else ""), total - first
+
+
+__all__ = ["TokenSpan", "cut_to_token_budget"]
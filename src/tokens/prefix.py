@@ -8,9 +8,9 @@ This module handles the screen prefix logic for chat sessions:
    - Used to adjust USER_UTT_MAX_TOKENS budget
 
 2. Prefix Stripping:
-   - Removes screen prefixes from user messages before storing in history
+   - Removes screen prefixes a client echoes into an incoming utterance
    - Handles both case-sensitive and case-insensitive matching
-   - Prevents prefixes from polluting conversation history
+   - The server's own prefix travels beside the utterance and is never stripped
 
 3. Effective Budget Calculation:
    - Computes available tokens for user messages after prefix reservation
@@ -64,11 +64,11 @@ def strip_screen_prefix(
     check_screen_prefix: str | None,
     screen_checked_prefix: str | None,
 ) -> str:
-    """Remove screen prefixes from text before storing in history.
+    """Remove screen prefixes from incoming user text when a turn is planned.
 
-    This prevents the internal "CHECK SCREEN:" or "ON THE SCREEN NOW:"
-    prefixes from appearing in the conversation history that's shown
-    to the model on subsequent turns.
+    This prevents a client-echoed "CHECK SCREEN:" or "ON THE SCREEN NOW:"
+    prefix from appearing in the conversation history that's shown to the
+    model on subsequent turns.
 
     Handles both exact and case-insensitive matching to catch variations.
 
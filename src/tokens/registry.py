@@ -1,16 +1,49 @@
-"""Central registry for configured tokenizer runtime dependencies."""
+"""Central registry for configured tokenizer runtime dependencies.
+
+Besides the configured chat/tool tokenizers, the registry keeps every
+FastTokenizer loaded through ``load_tokenizer`` so each distinct tokenizer
+is loaded once per process, however many components ask for it. Loads of
+different tokenizers still run in parallel; concurrent loads of the same
+one wait for the first.
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+from threading import Lock
+from .tokenizer import FastTokenizer
 
-if TYPE_CHECKING:
-    from .tokenizer import FastTokenizer
+logger = logging.getLogger(__name__)
 
 _STATE: dict[str, FastTokenizer | None] = {
     "chat_tokenizer": None,
     "tool_tokenizer": None,
 }
+_LOADED: dict[str, FastTokenizer] = {}
+_LOAD_LOCKS: dict[str, Lock] = {}
+_LOAD_LOCKS_GUARD = Lock()
+
+
+def load_tokenizer(path_or_repo: str) -> FastTokenizer:
+    """Return the process-wide FastTokenizer for ``path_or_repo``, loading it once.
+
+    The first load is logged with its wall time and whether it came from the
+    source files or the on-disk tokenizer cache.
+    """
+    with _LOAD_LOCKS_GUARD:
+        load_lock = _LOAD_LOCKS.setdefault(path_or_repo, Lock())
+    with load_lock:
+        tokenizer = _LOADED.get(path_or_repo)
+        if tokenizer is None:
+            tokenizer = FastTokenizer(path_or_repo)
+            _LOADED[path_or_repo] = tokenizer
+            logger.info(
+                "tokenizer: loaded %s from %s in %.2fs",
+                path_or_repo,
+                tokenizer.loaded_from,
+                tokenizer.load_seconds,
+            )
+        return tokenizer
 
 
 def configure_tokenizers(
@@ -40,11 +73,15 @@ def get_tool_tokenizer() -> FastTokenizer:
 
 
 def reset_tokenizers() -> None:
-    """Clear configured tokenizers (for tests/shutdown)."""
+    """Clear configured and loaded tokenizers (for tests/shutdown)."""
     configure_tokenizers(chat_tokenizer=None, tool_tokenizer=None)
+    with _LOAD_LOCKS_GUARD:
+        _LOADED.clear()
+        _LOAD_LOCKS.clear()
 
 
 __all__ = [
+    "load_tokenizer",
     "configure_tokenizers",
     "get_chat_tokenizer",
     "get_tool_tokenizer",
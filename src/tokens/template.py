@@ -0,0 +1,213 @@
+"""Segment-cached rendering of tokenizer chat templates.
+
+``apply_chat_template`` re-runs the Jinja template over the whole message
+list on every call, and prompt fitting renders one prompt per candidate
+history length. Most templates (ChatML, Llama 3, Qwen) render each message
+independently, so a prompt is just
+
+    head(system) + fragment(message) for each later message + generation tail
+
+ChatTemplateRenderer derives those pieces from the template itself by
+rendering against fixed probe messages, caches them by role and content,
+and assembles prompts by concatenation. Segmented assembly is only
+enabled after ``verify`` has checked it against full renders of several
+probe conversations, and only for prompts that start with a system message
+and end with a user message; everything else renders the full template.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from threading import Lock
+from collections import OrderedDict
+from collections.abc import Callable
+
+ChatMessageDict = dict[str, str]
+RenderFn = Callable[[list[ChatMessageDict], bool, dict[str, Any]], str]
+
+# Fragments are keyed on (role, content). Python caches str hashes, so a
+# lookup for a message seen before costs no rehash of its content.
+_FragmentKey = tuple[str, str]
+# Approximate per-entry cost of the OrderedDict slot, key tuple and str headers.
+_ENTRY_OVERHEAD_BYTES = 200
+
+_PROBE_SYSTEM: ChatMessageDict = {"role": "system", "content": "Probe system."}
+_PROBE_USER: ChatMessageDict = {"role": "user", "content": "Probe user."}
+
+# Conversations whose segmented assembly must equal a full render before the
+# fast path is trusted: plain turns, assistant-first history, multi-line and
+# non-ASCII content, and repeated roles at different positions.
+_VERIFY_CONVERSATIONS: tuple[tuple[tuple[str, str], ...], ...] = (
+    (("system", "You are terse."), ("user", "hi")),
+    (("system", "You are terse."), ("user", "hi"), ("assistant", "hello"), ("user", "how are you?")),
+    (("system", "Persona\n\nRuntime"), ("assistant", "Welcome back!"), ("user", "thanks")),
+    (
+        ("system", "Ünïcode persona — with dashes"),
+        ("user", "line one\nline two"),
+        ("assistant", "  padded reply  "),
+        ("user", "second"),
+        ("assistant", "third\n"),
+        ("user", "last one?"),
+    ),
+)
+
+
+def _entry_bytes(key: _FragmentKey, fragment: str) -> int:
+    return _ENTRY_OVERHEAD_BYTES + len(key[1]) + len(fragment)
+
+
+def _kwargs_key(template_kwargs: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((key, repr(value)) for key, value in template_kwargs.items()))
+
+
+def _strip_prefix(text: str, prefix: str) -> str:
+    if not text.startswith(prefix):
+        raise ValueError("chat template output is not prefix-stable")
+    return text[len(prefix) :]
+
+
+class ChatTemplateRenderer:
+    """Chat template renderer that reuses cached per-message fragments."""
+
+    def __init__(self, render_full: RenderFn, max_bytes: int) -> None:
+        """Wrap ``render_full(messages, add_generation_prompt, kwargs)``.
+
+        Args:
+            render_full: Renders a full template for the given messages.
+            max_bytes: Cap on the estimated fragment cache size; 0 disables
+                segmented rendering.
+        """
+        self._render_full = render_full
+        self._max_bytes = max(0, max_bytes)
+        self._fragments: OrderedDict[_FragmentKey, str] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = Lock()
+        self._verified_key: tuple[tuple[str, str], ...] | None = None
+        self._probe_head = ""
+        self._probe_user_fragment = ""
+        self._generation_tail = ""
+
+    @property
+    def segmented(self) -> bool:
+        """Whether the template passed ``verify`` and prompts are assembled."""
+        return self._verified_key is not None
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated bytes currently held by cached fragments."""
+        return self._size_bytes
+
+    def verify(self, template_kwargs: dict[str, Any]) -> bool:
+        """Enable segmented rendering if it reproduces full renders exactly.
+
+        Returns:
+            True when every probe conversation assembled from fragments is
+            identical to the full template render.
+        """
+        self._verified_key = None
+        self.clear()
+        if not self._max_bytes:
+            return False
+        try:
+            self._derive_anchors(template_kwargs)
+            for conversation in _VERIFY_CONVERSATIONS:
+                messages = [{"role": role, "content": content} for role, content in conversation]
+                if self._assemble(messages, template_kwargs) != self._render_full(messages, True, template_kwargs):
+                    self.clear()
+                    return False
+        except Exception:
+            self.clear()
+            return False
+        self._verified_key = _kwargs_key(template_kwargs)
+        return True
+
+    def render(
+        self,
+        messages: list[ChatMessageDict],
+        add_generation_prompt: bool,
+        template_kwargs: dict[str, Any],
+    ) -> str:
+        """Render ``messages``, assembling from fragments when verified."""
+        if self._can_assemble(messages, add_generation_prompt, template_kwargs):
+            try:
+                return self._assemble(messages, template_kwargs)
+            except ValueError:
+                pass
+        return self._render_full(messages, add_generation_prompt, template_kwargs)
+
+    def clear(self) -> None:
+        """Drop every cached fragment."""
+        with self._lock:
+            self._fragments.clear()
+            self._size_bytes = 0
+
+    def _can_assemble(
+        self,
+        messages: list[ChatMessageDict],
+        add_generation_prompt: bool,
+        template_kwargs: dict[str, Any],
+    ) -> bool:
+        return (
+            self._verified_key is not None
+            and add_generation_prompt
+            and bool(messages)
+            and messages[0]["role"] == "system"
+            and messages[-1]["role"] == "user"
+            and all(message["role"] != "system" for message in messages[1:])
+            and _kwargs_key(template_kwargs) == self._verified_key
+        )
+
+    def _derive_anchors(self, template_kwargs: dict[str, Any]) -> None:
+        probe_head = self._render_full([_PROBE_SYSTEM], False, template_kwargs)
+        with_user = self._render_full([_PROBE_SYSTEM, _PROBE_USER], False, template_kwargs)
+        prompt = self._render_full([_PROBE_SYSTEM, _PROBE_USER], True, template_kwargs)
+        self._probe_user_fragment = _strip_prefix(with_user, probe_head)
+        self._generation_tail = _strip_prefix(prompt, with_user)
+        self._probe_head = probe_head
+
+    def _assemble(self, messages: list[ChatMessageDict], template_kwargs: dict[str, Any]) -> str:
+        keys = [(message["role"], message["content"]) for message in messages]
+        with self._lock:
+            parts = [self._fragments.get(key) for key in keys]
+            for key, part in zip(keys, parts, strict=True):
+                if part is not None:
+                    self._fragments.move_to_end(key)
+        for index, part in enumerate(parts):
+            if part is None:
+                parts[index] = fragment = self._render_fragment(messages[index], template_kwargs)
+                self._store(keys[index], fragment)
+        parts.append(self._generation_tail)
+        return "".join(part or "" for part in parts)
+
+    def _render_fragment(self, message: ChatMessageDict, template_kwargs: dict[str, Any]) -> str:
+        """Render one message as it appears between its neighbours."""
+        role = message["role"]
+        if role == "system":
+            return self._render_full([message], False, template_kwargs)
+        if role == "user":
+            rendered = self._render_full([_PROBE_SYSTEM, message], False, template_kwargs)
+            return _strip_prefix(rendered, self._probe_head)
+        # Other roles are rendered with a following user turn, since the last
+        # message of a conversation is often rendered differently.
+        rendered = self._render_full([_PROBE_SYSTEM, message, _PROBE_USER], False, template_kwargs)
+        body = _strip_prefix(rendered, self._probe_head)
+        if not body.endswith(self._probe_user_fragment):
+            raise ValueError("chat template output is not suffix-stable")
+        return body[: len(body) - len(self._probe_user_fragment)]
+
+    def _store(self, key: _FragmentKey, fragment: str) -> None:
+        cost = _entry_bytes(key, fragment)
+        if cost > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._fragments.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= _entry_bytes(key, previous)
+            self._fragments[key] = fragment
+            self._size_bytes += cost
+            while self._size_bytes > self._max_bytes:
+                old_key, evicted = self._fragments.popitem(last=False)
+                self._size_bytes -= _entry_bytes(old_key, evicted)
+
+
+__all__ = ["ChatTemplateRenderer", "ChatMessageDict"]
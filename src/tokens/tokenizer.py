@@ -3,38 +3,171 @@
 This module provides the FastTokenizer class as a thin wrapper around
 ``transformers.AutoTokenizer`` only. Runtime-configured accessors for chat and
 tool tokenizers are in the registry module (src/tokens/registry.py).
+
+Every session shares the same FastTokenizer, so it keeps a pool of
+independent transformers tokenizer instances instead of serializing all
+calls on one lock. The tokenizer is loaded once and deep-copied to fill
+the pool; each call checks out one instance for its duration, and the time
+spent waiting for a free instance is recorded as
+``text_inference.tokenizer_pool_wait``.
+
+Counts and id lists are also memoized by text digest (see memo.py), so the
+persona, history turns and screen prefixes re-counted every turn are only
+tokenized once while they stay in the memo.
+
+Async callers must not tokenize on the event loop thread. Each tokenizer
+owns a small executor sized to its pool, and ``acount``/``aencode_ids``/
+``acount_many`` answer memo hits inline and ship misses to that executor.
+Composite work such as prompt fitting goes through ``offload``.
+
+Limit checks go through ``fits``, which consults a guaranteed length-based
+bound (estimate.py) and only tokenizes texts the bound cannot clear.
+
+Loading goes through the on-disk serialized tokenizer cache (artifacts.py)
+when ``TOKENIZER_CACHE_DIR`` is set; ``load_seconds`` and ``loaded_from``
+report how long the load took and where it came from.
+
+Chat templates are rendered through a ChatTemplateRenderer (template.py),
+which assembles prompts from cached per-message fragments once
+``verify_chat_template`` has confirmed the template is segment-separable.
 """
 
 from __future__ import annotations
 
 import os
-from typing import Any
-from threading import Lock
+import copy
+import time
+import asyncio
+from .memo import TokenMemo
+from functools import partial
+from typing import Any, TypeVar
+from .estimate import TokenEstimator
+from queue import Empty, SimpleQueue
+from contextlib import contextmanager
+from collections.abc import Callable, Iterator
+from ..config.deploy import TOKENIZER_CACHE_DIR
+from ..telemetry.instruments import get_metrics
+from .artifacts import load_pretrained_tokenizer
+from concurrent.futures import ThreadPoolExecutor
+from .offsets import TokenSpan, cut_to_token_budget
+from .template import ChatMessageDict, ChatTemplateRenderer
+from ..config.limits import TOKENIZER_POOL_SIZE, TOKEN_MEMO_MAX_BYTES, CHAT_TEMPLATE_CACHE_MAX_BYTES
 
 # Disable tokenizers parallelism before importing transformers/tokenizers.
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 from transformers import AutoTokenizer
 
+T = TypeVar("T")
+
+
+def _load_auto_tokenizer(path_or_repo: str) -> Any:
+    return AutoTokenizer.from_pretrained(
+        path_or_repo,
+        trust_remote_code=True,
+        local_files_only=os.path.exists(path_or_repo),
+    )
+
 
 class FastTokenizer:
-    """Thread-safe wrapper around a single transformers tokenizer instance."""
-
-    def __init__(self, path_or_repo: str):
-        """Create a tokenizer for counting/trimming from local path or HF repo."""
-        self._lock = Lock()
-        self._hf_tok = AutoTokenizer.from_pretrained(
-            path_or_repo,
-            trust_remote_code=True,
-            local_files_only=os.path.exists(path_or_repo),
-        )
+    """Thread-safe wrapper around a pool of transformers tokenizer instances."""
 
-    def _encode_ids_locked(self, text: str, *, add_special_tokens: bool = False) -> list[int]:
-        """Encode text with optional special tokens.
+    def __init__(
+        self,
+        path_or_repo: str,
+        *,
+        pool_size: int = TOKENIZER_POOL_SIZE,
+        memo_max_bytes: int = TOKEN_MEMO_MAX_BYTES,
+        cache_dir: str = TOKENIZER_CACHE_DIR,
+    ):
+        """Create a tokenizer for counting/trimming from local path or HF repo.
+
+        Args:
+            path_or_repo: Local tokenizer directory or Hugging Face repo id.
+            pool_size: Number of independent instances available to
+                concurrent callers.
+            memo_max_bytes: Byte cap for the count/ids memo; 0 disables it.
+            cache_dir: Root of the serialized tokenizer cache; empty
+                disables it (see artifacts.py).
 
-        Must be called while holding ``self._lock``.
+        Raises:
+            ValueError: If ``pool_size`` is smaller than 1.
         """
-        enc = self._hf_tok(
+        if pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+        started = time.perf_counter()
+        hf_tok, loaded_from = load_pretrained_tokenizer(path_or_repo, cache_dir, _load_auto_tokenizer)
+        self._initialize(hf_tok, pool_size=pool_size, memo_max_bytes=memo_max_bytes)
+        self._loaded_from = loaded_from
+        self._load_seconds = time.perf_counter() - started
+
+    def _initialize(self, hf_tok: Any, *, pool_size: int, memo_max_bytes: int) -> None:
+        """Seed the pool with ``hf_tok`` plus ``pool_size - 1`` deep copies."""
+        self._memo = TokenMemo(memo_max_bytes) if memo_max_bytes > 0 else None
+        self._loaded_from = "instance"
+        self._load_seconds = 0.0
+        self._hf_tok = hf_tok
+        self._pool_size = pool_size
+        self._pool: SimpleQueue[Any] = SimpleQueue()
+        self._pool.put(hf_tok)
+        for _ in range(pool_size - 1):
+            self._pool.put(copy.deepcopy(hf_tok))
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="tokenizer")
+        self._template_renderer = ChatTemplateRenderer(self._render_chat_template, CHAT_TEMPLATE_CACHE_MAX_BYTES)
+        self._estimator = TokenEstimator.verified(
+            lambda texts: [len(ids) for ids in self._encode_batch_with(hf_tok, texts, add_special_tokens=False)]
+        )
+
+    @contextmanager
+    def _checkout(self) -> Iterator[Any]:
+        """Borrow one pooled instance for the duration of the block."""
+        waited = 0.0
+        try:
+            hf_tok = self._pool.get_nowait()
+        except Empty:
+            started = time.perf_counter()
+            hf_tok = self._pool.get()
+            waited = time.perf_counter() - started
+        get_metrics().tokenizer_pool_wait.record(waited)
+        try:
+            yield hf_tok
+        finally:
+            self._pool.put(hf_tok)
+
+    @property
+    def pool_size(self) -> int:
+        """Number of pooled tokenizer instances."""
+        return self._pool_size
+
+    @property
+    def supports_offsets(self) -> bool:
+        """Whether the backend can report character offsets per token."""
+        return bool(getattr(self._hf_tok, "is_fast", False))
+
+    @property
+    def load_seconds(self) -> float:
+        """Wall time spent loading the tokenizer and filling the pool."""
+        return self._load_seconds
+
+    @property
+    def loaded_from(self) -> str:
+        """Where the tokenizer came from: ``"source"``, ``"disk cache"`` or ``"instance"``."""
+        return self._loaded_from
+
+    @property
+    def memo(self) -> TokenMemo | None:
+        """Count/ids memo, or ``None`` when memoization is disabled."""
+        return self._memo
+
+    @property
+    def estimator(self) -> TokenEstimator:
+        """Length-based count bound, verified against this tokenizer at startup."""
+        return self._estimator
+
+    @staticmethod
+    def _encode_ids_with(hf_tok: Any, text: str, *, add_special_tokens: bool = False) -> list[int]:
+        """Encode text with optional special tokens on a checked-out instance."""
+        enc = hf_tok(
             text,
             add_special_tokens=add_special_tokens,
             return_attention_mask=False,
@@ -45,6 +178,18 @@ class FastTokenizer:
             input_ids = input_ids[0]
         return list(input_ids)
 
+    @staticmethod
+    def _encode_batch_with(hf_tok: Any, texts: list[str], *, add_special_tokens: bool) -> list[list[int]]:
+        """Encode several texts in one backend call on a checked-out instance."""
+        enc = hf_tok(
+            texts,
+            add_special_tokens=add_special_tokens,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        input_ids = enc["input_ids"] if isinstance(enc, dict) else enc.input_ids
+        return [list(ids) for ids in input_ids]
+
     def count(self, text: str, *, add_special_tokens: bool = False) -> int:
         """Count the number of tokens in the text.
 
@@ -57,8 +202,41 @@ class FastTokenizer:
         """
         if not text and not add_special_tokens:
             return 0
-        with self._lock:
-            return len(self._encode_ids_locked(text, add_special_tokens=add_special_tokens))
+        if self._memo is None:
+            return self._count_uncached(text, add_special_tokens)
+        key, cached = self._memo.get_count(text, add_special_tokens)
+        if cached is not None:
+            return cached
+        return self._count_and_store(key, text, add_special_tokens)
+
+    async def acount(self, text: str, *, add_special_tokens: bool = False) -> int:
+        """Async ``count`` that tokenizes memo misses off the event loop."""
+        if not text and not add_special_tokens:
+            return 0
+        if self._memo is None:
+            return await self.offload(self._count_uncached, text, add_special_tokens)
+        key, cached = self._memo.get_count(text, add_special_tokens)
+        if cached is not None:
+            return cached
+        return await self.offload(self._count_and_store, key, text, add_special_tokens)
+
+    def fits(self, text: str, max_tokens: int) -> bool:
+        """Whether ``text`` has at most ``max_tokens`` tokens.
+
+        Texts whose guaranteed length bound is already inside the limit
+        skip tokenization; every other text is counted exactly.
+        """
+        return self._estimator.fits(text, max_tokens) or self.count(text) <= max_tokens
+
+    def _count_uncached(self, text: str, add_special_tokens: bool) -> int:
+        with self._checkout() as hf_tok:
+            return len(self._encode_ids_with(hf_tok, text, add_special_tokens=add_special_tokens))
+
+    def _count_and_store(self, key: bytes, text: str, add_special_tokens: bool) -> int:
+        count = self._count_uncached(text, add_special_tokens)
+        if self._memo is not None:
+            self._memo.put(key, count)
+        return count
 
     def trim(self, text: str, max_tokens: int, keep: str = "end") -> str:
         """Trim text to fit within max_tokens.
@@ -71,18 +249,46 @@ class FastTokenizer:
         Returns:
             Trimmed text fitting within max_tokens.
         """
+        return self.trim_with_count(text, max_tokens, keep=keep)[0]
+
+    def trim_with_count(self, text: str, max_tokens: int, keep: str = "end") -> tuple[str, int]:
+        """Trim text to ``max_tokens`` and report how many tokens were kept.
+
+        Fast tokenizers cut the original string at a token offset (see
+        offsets.py), so the result is a verbatim substring and the count
+        needs no re-encode. Tokenizers without offset support fall back to
+        decoding the kept ids and counting the decoded text.
+        """
         if max_tokens <= 0 or not text:
-            return ""
-        with self._lock:
-            ids = self._encode_ids_locked(text)
+            return "", 0
+        if self.supports_offsets:
+            return cut_to_token_budget(text, self.token_offsets(text), max_tokens, keep)
+        with self._checkout() as hf_tok:
+            ids = self._encode_ids_with(hf_tok, text)
             if len(ids) <= max_tokens:
-                return text
+                return text, len(ids)
             kept = ids[:max_tokens] if keep == "start" else ids[-max_tokens:]
-            return self._hf_tok.decode(
-                kept,
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=False,
+            decoded = hf_tok.decode(kept, skip_special_tokens=True, clean_up_tokenization_spaces=False)
+            return decoded, len(self._encode_ids_with(hf_tok, decoded))
+
+    def token_offsets(self, text: str) -> list[TokenSpan]:
+        """Return ``(start, end)`` character offsets for each token of ``text``.
+
+        Raises:
+            NotImplementedError: If the backend is not a fast tokenizer.
+        """
+        if not text:
+            return []
+        with self._checkout() as hf_tok:
+            enc = hf_tok(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                return_attention_mask=False,
+                return_token_type_ids=False,
             )
+        offsets = enc["offset_mapping"] if isinstance(enc, dict) else enc.offset_mapping
+        return [(int(start), int(end)) for start, end in offsets]
 
     def encode_ids(self, text: str) -> list[int]:
         """Return token ids for the provided text without special tokens.
@@ -95,17 +301,129 @@ class FastTokenizer:
         """
         if not text:
             return []
-        with self._lock:
-            return self._encode_ids_locked(text)
+        if self._memo is None:
+            return self._encode_ids_uncached(text)
+        key, cached = self._memo.get_ids(text)
+        if cached is not None:
+            return cached
+        return self._encode_ids_and_store(key, text)
+
+    async def aencode_ids(self, text: str) -> list[int]:
+        """Async ``encode_ids`` that tokenizes memo misses off the event loop."""
+        if not text:
+            return []
+        if self._memo is None:
+            return await self.offload(self._encode_ids_uncached, text)
+        key, cached = self._memo.get_ids(text)
+        if cached is not None:
+            return cached
+        return await self.offload(self._encode_ids_and_store, key, text)
+
+    def _encode_ids_uncached(self, text: str) -> list[int]:
+        with self._checkout() as hf_tok:
+            return self._encode_ids_with(hf_tok, text)
+
+    def _encode_ids_and_store(self, key: bytes, text: str) -> list[int]:
+        ids = self._encode_ids_uncached(text)
+        if self._memo is not None:
+            self._memo.put(key, ids)
+        return ids
+
+    def encode_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[list[int]]:
+        """Return token ids for each text, encoding memo misses in one batch.
+
+        Args:
+            texts: Texts to encode.
+            add_special_tokens: Whether to include tokenizer-added special tokens.
+
+        Returns:
+            One id list per input text, in input order.
+        """
+        results: list[list[int] | None] = [None] * len(texts)
+        keys: list[bytes | None] = [None] * len(texts)
+        pending: list[int] = []
+        for index, text in enumerate(texts):
+            if self._memo is not None and not add_special_tokens:
+                keys[index], results[index] = self._memo.get_ids(text)
+            if results[index] is None:
+                pending.append(index)
+        if pending:
+            with self._checkout() as hf_tok:
+                encoded = self._encode_batch_with(
+                    hf_tok,
+                    [texts[index] for index in pending],
+                    add_special_tokens=add_special_tokens,
+                )
+            for index, ids in zip(pending, encoded, strict=True):
+                results[index] = ids
+                key = keys[index]
+                if self._memo is not None and key is not None:
+                    self._memo.put(key, ids)
+        return [ids or [] for ids in results]
+
+    def count_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        """Count tokens for each text, tokenizing memo misses in one batch.
+
+        Args:
+            texts: Texts to tokenize and count.
+            add_special_tokens: Whether to include tokenizer-added special tokens.
+
+        Returns:
+            One token count per input text, in input order.
+        """
+        counts: list[int | None] = [None] * len(texts)
+        keys: list[bytes | None] = [None] * len(texts)
+        pending: list[int] = []
+        for index, text in enumerate(texts):
+            if not text and not add_special_tokens:
+                counts[index] = 0
+            elif self._memo is not None:
+                keys[index], counts[index] = self._memo.get_count(text, add_special_tokens)
+            if counts[index] is None:
+                pending.append(index)
+        if pending:
+            with self._checkout() as hf_tok:
+                encoded = self._encode_batch_with(
+                    hf_tok,
+                    [texts[index] for index in pending],
+                    add_special_tokens=add_special_tokens,
+                )
+            for index, ids in zip(pending, encoded, strict=True):
+                counts[index] = len(ids)
+                key = keys[index]
+                if self._memo is not None and key is not None:
+                    self._memo.put(key, len(ids))
+        return [count or 0 for count in counts]
+
+    async def acount_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        """Async ``count_many`` run on the tokenization executor."""
+        return await self.offload(self.count_many, texts, add_special_tokens=add_special_tokens)
+
+    async def offload(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run tokenizer-bound ``fn(*args, **kwargs)`` on the tokenization executor.
+
+        Use this for composite work (prompt fitting, history trimming) that
+        makes several tokenizer calls, so the event loop awaits one hop
+        instead of blocking on each call.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Stop the tokenization executor, dropping work that has not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     def get_transformers_tokenizer(self) -> Any:
-        """Return the underlying transformers tokenizer."""
-        with self._lock:
-            return self._hf_tok
+        """Return the primary transformers tokenizer instance.
+
+        The instance is shared with pooled callers, so use it for read-only
+        inspection (vocab, special tokens) rather than concurrent encoding.
+        """
+        return self._hf_tok
 
     def apply_chat_template(
         self,
-        messages: list[dict[str, str]],
+        messages: list[ChatMessageDict],
         add_generation_prompt: bool = True,
         **template_kwargs: Any,
     ) -> str:
@@ -123,10 +441,29 @@ class FastTokenizer:
         Raises:
             RuntimeError: If tokenizer has no chat template support.
         """
-        with self._lock:
-            if not hasattr(self._hf_tok, "apply_chat_template"):
-                raise RuntimeError("Tokenizer does not have apply_chat_template method")
-            return self._hf_tok.apply_chat_template(
+        if not hasattr(self._hf_tok, "apply_chat_template"):
+            raise RuntimeError("Tokenizer does not have apply_chat_template method")
+        return self._template_renderer.render(messages, add_generation_prompt, template_kwargs)
+
+    def verify_chat_template(self, **template_kwargs: Any) -> bool:
+        """Self-check the chat template and enable segment-cached rendering.
+
+        Returns:
+            True when prompts assembled from cached fragments match full
+            renders; otherwise every call keeps rendering the full template.
+        """
+        if not hasattr(self._hf_tok, "apply_chat_template"):
+            return False
+        return self._template_renderer.verify(template_kwargs)
+
+    def _render_chat_template(
+        self,
+        messages: list[ChatMessageDict],
+        add_generation_prompt: bool,
+        template_kwargs: dict[str, Any],
+    ) -> str:
+        with self._checkout() as hf_tok:
+            return hf_tok.apply_chat_template(
                 messages,
                 tokenize=False,
                 add_generation_prompt=add_generation_prompt,
@@ -36,10 +36,12 @@ from .defaults import (
     PROGRESS_BAR_WIDTH,
     IDLE_EXPECT_DEFAULT,
     DEFAULT_PERSONA_NAME,
+    PERF_LOOP_TURNS_DEFAULT,
     WARMUP_FALLBACK_MESSAGE,
     CANCEL_POST_WAIT_DEFAULT,
     CHAT_TEMPERATURE_DEFAULT,
     IDLE_NORMAL_WAIT_DEFAULT,
+    PERF_LOOP_TICK_MS_DEFAULT,
     BENCHMARK_DEFAULT_REQUESTS,
     BENCHMARK_FALLBACK_MESSAGE,
     CANCEL_NUM_CLIENTS_DEFAULT,
@@ -47,16 +49,22 @@ from .defaults import (
     BENCHMARK_BURST_MODE_DEFAULT,
     BENCHMARK_BURST_SIZE_DEFAULT,
     CANCEL_DRAIN_TIMEOUT_DEFAULT,
+    PERF_TOKENIZER_CALLS_DEFAULT,
     BENCHMARK_DEFAULT_CONCURRENCY,
     BENCHMARK_DEFAULT_TIMEOUT_SEC,
     CHAT_PRESENCE_PENALTY_DEFAULT,
+    PERF_HISTORY_MESSAGES_DEFAULT,
+    PERF_SANITIZER_ROUNDS_DEFAULT,
     CHAT_FREQUENCY_PENALTY_DEFAULT,
     HISTORY_BENCH_DEFAULT_REQUESTS,
+    PERF_TOKENIZER_THREADS_DEFAULT,
     CHAT_REPETITION_PENALTY_DEFAULT,
+    PERF_TOKENIZER_POOL_SIZE_DEFAULT,
     BENCHMARK_WINDOW_DURATION_DEFAULT,
     HISTORY_BENCH_DEFAULT_CONCURRENCY,
     HISTORY_BENCH_DEFAULT_TIMEOUT_SEC,
     CANCEL_DELAY_BEFORE_CANCEL_DEFAULT,
+    PERF_SANITIZER_CHUNK_CHARS_DEFAULT,
 )
 
 __all__ = [
@@ -85,6 +93,14 @@ __all__ = [
     "HISTORY_BENCH_DEFAULT_REQUESTS",
     "HISTORY_BENCH_DEFAULT_CONCURRENCY",
     "HISTORY_BENCH_DEFAULT_TIMEOUT_SEC",
+    "PERF_SANITIZER_ROUNDS_DEFAULT",
+    "PERF_SANITIZER_CHUNK_CHARS_DEFAULT",
+    "PERF_TOKENIZER_CALLS_DEFAULT",
+    "PERF_TOKENIZER_POOL_SIZE_DEFAULT",
+    "PERF_TOKENIZER_THREADS_DEFAULT",
+    "PERF_LOOP_TURNS_DEFAULT",
+    "PERF_LOOP_TICK_MS_DEFAULT",
+    "PERF_HISTORY_MESSAGES_DEFAULT",
     "PERSONA_VARIANTS",
     "CHAT_TEMPERATURE_DEFAULT",
     "CHAT_TOP_P_DEFAULT",
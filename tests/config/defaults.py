@@ -57,6 +57,16 @@ CANCEL_NUM_CLIENTS_DEFAULT = 3  # Number of concurrent clients
 CANCEL_DELAY_BEFORE_CANCEL_DEFAULT = 1.0  # Seconds to collect tokens before cancel
 CANCEL_DRAIN_TIMEOUT_DEFAULT = 2.0  # Seconds to verify no spurious messages after cancel
 
+# Offline perf benchmark defaults (tests/suites/integration/test_perf.py)
+PERF_SANITIZER_ROUNDS_DEFAULT = 20
+PERF_SANITIZER_CHUNK_CHARS_DEFAULT = 4
+PERF_TOKENIZER_CALLS_DEFAULT = 2000
+PERF_TOKENIZER_POOL_SIZE_DEFAULT = 4
+PERF_TOKENIZER_THREADS_DEFAULT = (1, 2, 4, 8)
+PERF_LOOP_TURNS_DEFAULT = 40
+PERF_LOOP_TICK_MS_DEFAULT = 1.0
+PERF_HISTORY_MESSAGES_DEFAULT = (100, 1000, 10000)
+
 # WebSocket defaults
 DEFAULT_WS_PATH = "/ws"
 
@@ -101,6 +111,14 @@ __all__ = [
     "CANCEL_NUM_CLIENTS_DEFAULT",
     "CANCEL_DELAY_BEFORE_CANCEL_DEFAULT",
     "CANCEL_DRAIN_TIMEOUT_DEFAULT",
+    "PERF_SANITIZER_ROUNDS_DEFAULT",
+    "PERF_SANITIZER_CHUNK_CHARS_DEFAULT",
+    "PERF_TOKENIZER_CALLS_DEFAULT",
+    "PERF_TOKENIZER_POOL_SIZE_DEFAULT",
+    "PERF_TOKENIZER_THREADS_DEFAULT",
+    "PERF_LOOP_TURNS_DEFAULT",
+    "PERF_LOOP_TICK_MS_DEFAULT",
+    "PERF_HISTORY_MESSAGES_DEFAULT",
     "DEFAULT_WS_PATH",
     "PROGRESS_BAR_WIDTH",
     "WS_MAX_QUEUE",
@@ -29,6 +29,7 @@ class StreamState:
     final_text: str = ""
     first_token_ts: float | None = None
     first_sentence_ts: float | None = None
+    text_sentence_ts: float | None = None
     first_3_words_ts: float | None = None
     toolcall_ttfb_ms: float | None = None
     toolcall_status: str | None = None
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Offline performance benchmarks for CPU-bound text paths (no server needed).
+
+Subcommands:
+- sanitizer: StreamingSanitizer cost per chunk and fast-path skip rates
+- tokenizer: FastTokenizer pool throughput and pool wait across thread counts
+- loop: event-loop block time per chat turn, inline vs tokenizer executor
+- history: chat-history trim time for large imported histories
+- seed: start-history import time for large client payloads
+- session: bytes kept alive per idle session
+
+Usage:
+  python3 tests/suites/integration/test_perf.py sanitizer
+  python3 tests/suites/integration/test_perf.py sanitizer --rounds 50 --chunk-chars 8
+  python3 tests/suites/integration/test_perf.py tokenizer --threads 1 2 4 8 --pool-size 4
+  python3 tests/suites/integration/test_perf.py tokenizer --tokenizer /path/to/model
+  python3 tests/suites/integration/test_perf.py loop --turns 40 --tick-ms 1
+  python3 tests/suites/integration/test_perf.py history --messages 100 1000 10000
+  python3 tests/suites/integration/test_perf.py seed --messages 100 1000 10000
+  python3 tests/suites/integration/test_perf.py session
+"""
+
+from __future__ import annotations
+
+import sys
+import argparse
+from pathlib import Path
+
+if __package__ in {None, ""}:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tests.support.helpers.setup import setup_repo_path  # noqa: E402
+from tests.config import (  # noqa: E402
+    PERF_LOOP_TURNS_DEFAULT,
+    PERF_LOOP_TICK_MS_DEFAULT,
+    PERF_TOKENIZER_CALLS_DEFAULT,
+    PERF_HISTORY_MESSAGES_DEFAULT,
+    PERF_SANITIZER_ROUNDS_DEFAULT,
+    PERF_TOKENIZER_THREADS_DEFAULT,
+    PERF_TOKENIZER_POOL_SIZE_DEFAULT,
+    PERF_SANITIZER_CHUNK_CHARS_DEFAULT,
+)
+from tests.support.logic.perf import (  # noqa: E402
+    run_sanitizer_bench,
+    run_tokenizer_bench,
+    run_event_loop_bench,
+    run_seed_import_bench,
+    print_sanitizer_report,
+    print_tokenizer_report,
+    run_history_trim_bench,
+    print_event_loop_report,
+    print_seed_import_report,
+    run_session_memory_bench,
+    print_history_trim_report,
+    print_session_memory_report,
+)
+
+setup_repo_path()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(add_help=True)
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    sanitizer = sub.add_parser("sanitizer", help="streaming sanitizer throughput and fast-path skip rates")
+    sanitizer.add_argument("--rounds", type=int, default=PERF_SANITIZER_ROUNDS_DEFAULT, help="corpus passes")
+    sanitizer.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=PERF_SANITIZER_CHUNK_CHARS_DEFAULT,
+        help="characters per streamed chunk",
+    )
+
+    tokenizer = sub.add_parser("tokenizer", help="tokenizer pool throughput across thread counts")
+    tokenizer.add_argument("--tokenizer", default=None, help="local path or HF repo (default: offline BPE)")
+    tokenizer.add_argument("--pool-size", type=int, default=PERF_TOKENIZER_POOL_SIZE_DEFAULT, help="pooled instances")
+    tokenizer.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=list(PERF_TOKENIZER_THREADS_DEFAULT),
+        help="thread counts to measure",
+    )
+    tokenizer.add_argument("--calls", type=int, default=PERF_TOKENIZER_CALLS_DEFAULT, help="count() calls per run")
+
+    loop = sub.add_parser("loop", help="event-loop block time per chat turn, inline vs offloaded")
+    loop.add_argument("--tokenizer", default=None, help="local path or HF repo (default: offline BPE)")
+    loop.add_argument("--turns", type=int, default=PERF_LOOP_TURNS_DEFAULT, help="chat turns per mode")
+    loop.add_argument("--tick-ms", type=float, default=PERF_LOOP_TICK_MS_DEFAULT, help="heartbeat interval")
+
+    history = sub.add_parser("history", help="chat-history trim time for large imported histories")
+    history.add_argument("--tokenizer", default=None, help="local path or HF repo (default: offline BPE)")
+    history.add_argument(
+        "--messages",
+        type=int,
+        nargs="+",
+        default=list(PERF_HISTORY_MESSAGES_DEFAULT),
+        help="imported history sizes to measure",
+    )
+
+    seed = sub.add_parser("seed", help="start-history import time for large client payloads")
+    seed.add_argument("--tokenizer", default=None, help="local path or HF repo (default: offline BPE)")
+    seed.add_argument(
+        "--messages",
+        type=int,
+        nargs="+",
+        default=list(PERF_HISTORY_MESSAGES_DEFAULT),
+        help="start history sizes to measure",
+    )
+
+    sub.add_parser("session", help="bytes kept alive per idle session")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.bench == "sanitizer":
+        print_sanitizer_report(run_sanitizer_bench(rounds=args.rounds, chunk_chars=args.chunk_chars))
+    elif args.bench == "tokenizer":
+        result = run_tokenizer_bench(
+            tokenizer_path=args.tokenizer,
+            pool_size=args.pool_size,
+            threads=args.threads,
+            calls=args.calls,
+        )
+        print_tokenizer_report(result)
+    elif args.bench == "loop":
+        result = run_event_loop_bench(tokenizer_path=args.tokenizer, turns=args.turns, tick_ms=args.tick_ms)
+        print_event_loop_report(result)
+    elif args.bench == "history":
+        print_history_trim_report(run_history_trim_bench(tokenizer_path=args.tokenizer, sizes=args.messages))
+    elif args.bench == "seed":
+        print_seed_import_report(run_seed_import_bench(tokenizer_path=args.tokenizer, sizes=args.messages))
+    elif args.bench == "session":
+        print_session_memory_report(run_session_memory_bench())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from src.state import ScreenPrefix
 from src.execution.chat.prompt_budget import fit_chat_prompt_to_budget
 from tests.support.messages.unit import CHAT_MESSAGES, ASSISTANT_FIRST_MESSAGES
 from tests.support.helpers.tokenizer import use_local_tokenizers, use_punctuation_aware_tokenizers
@@ -132,6 +133,25 @@ def test_fit_chat_prompt_to_budget_applies_chat_user_cap_before_prompt_fit() ->
         assert fit.prompt_tokens <= 20
 
 
+def test_fit_chat_prompt_to_budget_renders_prefix_segment_outside_fitted_user() -> None:
+    with use_local_tokenizers() as tokenizer:
+        prefix = ScreenPrefix(text="CHECK SCREEN:", tokens=2)
+        fit = fit_chat_prompt_to_budget(
+            "",
+            "",
+            [],
+            "hello can you help me plan a trip to lisbon next week",
+            tokenizer,
+            max_prompt_tokens=20,
+            max_user_tokens=6,
+            user_prefix=prefix,
+        )
+
+        assert fit.chat_user_utt == "hello can you help"
+        assert "<|im_start|>user\nCHECK SCREEN: hello can you help" in fit.prompt
+        assert fit.prompt_tokens <= 20
+
+
 def test_fit_chat_prompt_to_budget_rejects_non_empty_user_that_cannot_fit() -> None:
     with use_local_tokenizers() as tokenizer:
         try:
@@ -54,6 +54,8 @@ def test_fit_tool_input_to_budget_raises_when_budget_is_impossible() -> None:
 
 
 class _SpecialAwareTokenizer:
+    supports_offsets = False
+
     def count(self, text: str, *, add_special_tokens: bool = False) -> int:
         if not text.strip():
             return 0
@@ -62,6 +64,9 @@ class _SpecialAwareTokenizer:
             total += 2
         return total
 
+    def count_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        return [self.count(text, add_special_tokens=add_special_tokens) for text in texts]
+
     def trim(self, text: str, max_tokens: int, keep: str = "end") -> str:
         tokens = text.split()
         if max_tokens <= 0:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import Any, cast
+from src.state import HistoryStore
 from src.tokens import count_tokens_tool
 import src.tokens.history as history_tokens
 import src.handlers.session.history.ops as history_ops
@@ -31,7 +32,7 @@ def _history_config(
 
 
 def _make_state(handler: SessionHandler) -> SessionState:
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
     return state
 
@@ -134,7 +135,7 @@ def test_append_chat_turn_merges_consecutive_users_in_storage() -> None:
     with use_local_tokenizers():
         handler = _build_chat_only_handler()
         state = _make_state(handler)
-        state.chat_history_messages = [ChatMessage(role="user", content="seed")]
+        state.chat_history_messages = HistoryStore([ChatMessage(role="user", content="seed")])
 
         handler.append_chat_turn(state, "follow up", "reply")
 
@@ -296,10 +297,10 @@ def test_prepare_tool_turn_trims_current_user_tail_when_history_is_exhausted() -
 
 def test_trim_history_tool_only_drops_old_turns() -> None:
     with use_local_tokenizers():
-        state = SessionState(meta={})
-        state.tool_history_turns = [
+        state = SessionState()
+        state.tool_history_turns = HistoryStore(
             HistoryTurn(turn_id=f"t{i}", user=f"word{i} extra{i} more{i}", assistant="") for i in range(5)
-        ]
+        )
         history_ops.trim_tool_history(state, 6)
 
         assert state.tool_history_turns is not None
@@ -309,9 +310,9 @@ def test_trim_history_tool_only_drops_old_turns() -> None:
 
 def test_trim_history_tool_only_keeps_single_oversized_last_turn() -> None:
     with use_local_tokenizers() as tokenizer:
-        state = SessionState(meta={})
+        state = SessionState()
         long_text = "check the calendar for next tuesday flight times"
-        state.tool_history_turns = [HistoryTurn(turn_id="t1", user=long_text, assistant="")]
+        state.tool_history_turns = HistoryStore([HistoryTurn(turn_id="t1", user=long_text, assistant="")])
         history_ops.trim_tool_history(state, 3, tool_tokenizer=tokenizer)
 
         assert state.tool_history_turns is not None
@@ -321,11 +322,13 @@ def test_trim_history_tool_only_keeps_single_oversized_last_turn() -> None:
 
 def test_trim_history_tool_only_noop_when_under_budget() -> None:
     with use_local_tokenizers():
-        state = SessionState(meta={})
-        state.tool_history_turns = [
-            HistoryTurn(turn_id="t1", user="hi", assistant=""),
-            HistoryTurn(turn_id="t2", user="hello", assistant=""),
-        ]
+        state = SessionState()
+        state.tool_history_turns = HistoryStore(
+            [
+                HistoryTurn(turn_id="t1", user="hi", assistant=""),
+                HistoryTurn(turn_id="t2", user="hello", assistant=""),
+            ]
+        )
         history_ops.trim_tool_history(state, 100)
 
         assert state.tool_history_turns is not None
@@ -384,8 +387,8 @@ def test_append_chat_turn_trim_preserves_complete_recent_turns() -> None:
 
 def test_trim_chat_history_preserves_assistant_first_groups_as_whole_units() -> None:
     with use_local_tokenizers() as tokenizer:
-        state = SessionState(meta={})
-        state.chat_history_messages = list(ASSISTANT_FIRST_MESSAGES)
+        state = SessionState()
+        state.chat_history_messages = HistoryStore(ASSISTANT_FIRST_MESSAGES)
 
         history_ops.trim_chat_history(
             state,
@@ -430,6 +433,8 @@ def test_prepare_tool_turn_tool_only_keeps_single_oversized_turn_in_store() -> N
 
 
 class _SpecialAwareTokenizer:
+    supports_offsets = False
+
     def count(self, text: str, *, add_special_tokens: bool = False) -> int:
         if not text.strip():
             return 0
@@ -438,6 +443,9 @@ class _SpecialAwareTokenizer:
             total += 2
         return total
 
+    def count_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        return [self.count(text, add_special_tokens=add_special_tokens) for text in texts]
+
     def trim(self, text: str, max_tokens: int, keep: str = "end") -> str:
         tokens = text.split()
         if max_tokens <= 0:
@@ -447,6 +455,10 @@ class _SpecialAwareTokenizer:
         kept = tokens[:max_tokens] if keep == "start" else tokens[-max_tokens:]
         return " ".join(kept)
 
+    def trim_with_count(self, text: str, max_tokens: int, keep: str = "end") -> tuple[str, int]:
+        trimmed = self.trim(text, max_tokens, keep=keep)
+        return trimmed, len(trimmed.split())
+
     def encode_ids(self, text: str) -> list[int]:
         return list(range(len(text.split())))
 
@@ -0,0 +1,168 @@
+"""Unit tests for running history totals and in-place head eviction."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from src.state.history import HistoryStore
+from src.handlers.session.manager import SessionHandler
+from src.state.session import ChatMessage, HistoryTurn, SessionState
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+from src.handlers.session.history.counts import chat_separator_tokens, tool_separator_tokens
+from src.handlers.session.history import ops as history_ops, tool_turn_tokens, chat_message_tokens
+
+_CONFIG = HistoryRuntimeConfig(
+    deploy_chat=True,
+    deploy_tool=True,
+    chat_trigger_tokens=40,
+    chat_target_tokens=25,
+    default_tool_history_tokens=None,
+)
+_TOOL_BUDGET = 20
+
+
+def _turns(count: int) -> list[tuple[str, str]]:
+    return [
+        (f"question {i} about item{i}", "ok" if i % 3 else f"longer answer {i} with detail{i}") for i in range(count)
+    ]
+
+
+def _build_handler(tokenizer: Any) -> SessionHandler:
+    return SessionHandler(
+        chat_engine=None,
+        tool_history_budget=_TOOL_BUDGET,
+        chat_tokenizer=tokenizer,
+        tool_tokenizer=tokenizer,
+        history_config=_CONFIG,
+    )
+
+
+def _joined(counts: list[int], separator: int) -> int:
+    return sum(counts) + separator * (len(counts) - 1)
+
+
+def test_history_store_head_eviction_behaves_like_a_list() -> None:
+    store: HistoryStore[int] = HistoryStore(range(10))
+    reference = list(range(10))
+    for value in range(10, 1000):
+        store.extend((value, value))
+        reference.extend((value, value))
+        del store[:2]
+        del reference[:2]
+        store[-1] = reference[-1] = -value
+        assert store == reference and store[0] == reference[0] and store[3:6] == reference[3:6]
+        assert len(store._items) <= 2 * len(store) + 2
+    store.insert(0, 7)
+    reference.insert(0, 7)
+    del store[1]
+    del reference[1]
+    assert list(store) == reference and list(reversed(store)) == reference[::-1]
+
+
+def test_chat_appends_evict_in_place_like_plan_chat_trim() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _build_handler(tokenizer)
+    state = SessionState()
+    handler.initialize_session(state)
+    store = state.chat_history_messages
+    assert isinstance(store, HistoryStore)
+    reference: list[ChatMessage] = []
+
+    for user_text, assistant_text in _turns(30):
+        handler.append_chat_turn(state, user_text, assistant_text)
+        reference += [
+            ChatMessage(role="user", content=user_text),
+            ChatMessage(role="assistant", content=assistant_text),
+        ]
+        reference = history_ops.plan_chat_trim(reference, config=_CONFIG, chat_tokenizer=tokenizer) or reference
+        assert state.chat_history_messages is store
+        assert [(m.role, m.content) for m in store or []] == [(m.role, m.content) for m in reference]
+
+    assert len(store or []) < 60
+    total = state.chat_history_total
+    assert total is not None and total.store is store
+    counts = chat_message_tokens(store or [], tokenizer)
+    assert total.tokens == _joined(counts, chat_separator_tokens(tokenizer))
+
+
+def test_async_appends_keep_the_running_total_and_the_store() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _build_handler(tokenizer)
+    state = SessionState()
+    handler.initialize_session(state)
+    chat_store, tool_store = state.chat_history_messages, state.tool_history_turns
+
+    async def _append_all() -> None:
+        for index, (user_text, assistant_text) in enumerate(_turns(30)):
+            await handler.aappend_chat_turn(state, user_text, assistant_text)
+            await handler.aprepare_tool_turn(state, user_text, turn_id=f"t{index}")
+            chat_total, tool_total = state.chat_history_total, state.tool_history_total
+            assert chat_total is not None and chat_total.store is chat_store
+            assert chat_total.length == len(chat_store or [])
+            assert tool_total is not None and tool_total.store is tool_store
+            assert tool_total.length == len(tool_store or [])
+
+    asyncio.run(_append_all())
+
+    assert state.chat_history_messages is chat_store and len(chat_store or []) < 60
+    assert state.tool_history_turns is tool_store and len(tool_store or []) < 30
+    counts = chat_message_tokens(chat_store or [], tokenizer)
+    assert state.chat_history_total is not None
+    assert state.chat_history_total.tokens == _joined(counts, chat_separator_tokens(tokenizer))
+
+
+def test_chat_total_is_recounted_after_the_store_is_replaced() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    state = SessionState(chat_history_messages=HistoryStore())
+    for user_text, assistant_text in _turns(4):
+        (state.chat_history_messages or HistoryStore()).append(ChatMessage(role="user", content=user_text))
+        history_ops.trim_chat_history(state, config=_CONFIG, chat_tokenizer=tokenizer)
+        (state.chat_history_messages or HistoryStore()).append(ChatMessage(role="assistant", content=assistant_text))
+        history_ops.trim_chat_history(state, config=_CONFIG, chat_tokenizer=tokenizer)
+
+    state.chat_history_messages = HistoryStore([ChatMessage(role="user", content="fresh start")])
+    history_ops.trim_chat_history(state, config=_CONFIG, chat_tokenizer=tokenizer)
+
+    total = state.chat_history_total
+    assert total is not None and total.store is state.chat_history_messages
+    assert total.tokens == chat_message_tokens(state.chat_history_messages, tokenizer)[0]
+
+
+def test_tool_appends_evict_in_place_like_plan_tool_trim() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _build_handler(tokenizer)
+    state = SessionState()
+    handler.initialize_session(state)
+    store = state.tool_history_turns
+    reference: list[HistoryTurn] = []
+
+    for index, (user_text, _assistant) in enumerate(_turns(20)):
+        handler.prepare_tool_turn(state, user_text, turn_id=f"t{index}")
+        reference.append(HistoryTurn(turn_id=f"t{index}", user=user_text, assistant=""))
+        reference = history_ops.plan_tool_trim(reference, _TOOL_BUDGET, tool_tokenizer=tokenizer) or reference
+        assert state.tool_history_turns is store
+        assert [t.turn_id for t in store or []] == [t.turn_id for t in reference]
+
+    assert len(store or []) < 20
+    total = state.tool_history_total
+    assert total is not None
+    counts = tool_turn_tokens(store or [], tokenizer)
+    assert total.tokens == _joined(counts, tool_separator_tokens(tokenizer))
+
+
+def test_oversized_tool_turn_is_clipped_and_recounted() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    state = SessionState(tool_history_turns=HistoryStore([HistoryTurn(turn_id="t0", user="short one", assistant="")]))
+    history_ops.trim_tool_history(state, _TOOL_BUDGET, tool_tokenizer=tokenizer)
+    (state.tool_history_turns or HistoryStore()).append(
+        HistoryTurn(turn_id="t1", user=" ".join(f"word{i}" for i in range(40)), assistant="")
+    )
+
+    history_ops.trim_tool_history(state, _TOOL_BUDGET, tool_tokenizer=tokenizer)
+
+    turns = state.tool_history_turns or HistoryStore()
+    assert [t.turn_id for t in turns] == ["t1"]
+    total = state.tool_history_total
+    assert total is not None and total.store is turns
+    assert total.tokens == tool_turn_tokens(turns, tokenizer)[0]
@@ -0,0 +1,155 @@
+"""Unit tests for history trimming and tool fitting on the tokenizer executor."""
+
+from __future__ import annotations
+
+import pytest
+import asyncio
+import dataclasses
+from typing import Any
+from unittest import mock
+from src.state.history import HistoryStore
+from src.handlers.session.manager import SessionHandler
+from src.state.session import ChatMessage, SessionState
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+from src.handlers.session.history import controller as history_controller
+
+_CHAT_TURNS = [
+    ("hello how are you", "great"),
+    ("alpha bravo charlie", "one two"),
+    ("hello world", "three four"),
+    ("u1 u2 u3", "a1 a2"),
+]
+_TOOL_TEXTS = [f"word{i} extra{i} more{i}" for i in range(6)]
+
+
+def _build_handler(tokenizer: Any) -> SessionHandler:
+    return SessionHandler(
+        chat_engine=None,
+        tool_history_budget=6,
+        tool_input_budget=20,
+        chat_tokenizer=tokenizer,
+        tool_tokenizer=tokenizer,
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=True,
+            chat_trigger_tokens=10,
+            chat_target_tokens=6,
+            default_tool_history_tokens=None,
+        ),
+    )
+
+
+def _make_state(handler: SessionHandler) -> SessionState:
+    state = SessionState()
+    handler.initialize_session(state)
+    return state
+
+
+def _chat_pairs(state: SessionState) -> list[tuple[str, str]]:
+    return [(msg.role, msg.content) for msg in state.chat_history_messages or []]
+
+
+def test_async_chat_append_trims_like_sync_append() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=2)
+    handler = _build_handler(tokenizer)
+    sync_state = _make_state(handler)
+    async_state = _make_state(handler)
+
+    async def _append_all() -> None:
+        for user_text, assistant_text in _CHAT_TURNS:
+            await handler.aappend_chat_turn(async_state, user_text, assistant_text)
+
+    for user_text, assistant_text in _CHAT_TURNS:
+        handler.append_chat_turn(sync_state, user_text, assistant_text)
+    asyncio.run(_append_all())
+
+    assert len(_chat_pairs(sync_state)) < len(_CHAT_TURNS) * 2
+    assert _chat_pairs(async_state) == _chat_pairs(sync_state)
+
+
+def test_async_tool_turn_matches_sync_tool_turn() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=2)
+    handler = _build_handler(tokenizer)
+    sync_state = _make_state(handler)
+    async_state = _make_state(handler)
+
+    async def _prepare_all() -> list[tuple[str, str]]:
+        return [
+            await handler.aprepare_tool_turn(async_state, text, turn_id=f"t{i}") for i, text in enumerate(_TOOL_TEXTS)
+        ]
+
+    expected = [handler.prepare_tool_turn(sync_state, text, turn_id=f"t{i}") for i, text in enumerate(_TOOL_TEXTS)]
+
+    assert asyncio.run(_prepare_all()) == expected
+    assert async_state.tool_history_turns == sync_state.tool_history_turns
+
+
+def test_offloaded_chat_trim_is_dropped_when_store_changes() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _build_handler(tokenizer)
+    state = _make_state(handler)
+    for user_text, assistant_text in _CHAT_TURNS[:-1]:
+        handler.append_chat_turn(state, user_text, assistant_text)
+    real_offload = history_controller.offload_token_work
+
+    async def _racing_offload(*args: Any, **kwargs: Any) -> Any:
+        plan = await real_offload(*args, **kwargs)
+        state.chat_history_messages = HistoryStore([ChatMessage(role="user", content="newer store")])
+        return plan
+
+    with mock.patch.object(history_controller, "offload_token_work", _racing_offload):
+        asyncio.run(handler.aappend_chat_turn(state, *_CHAT_TURNS[-1]))
+
+    assert _chat_pairs(state) == [("user", "newer store")]
+
+
+def test_offloaded_chat_trim_is_dropped_when_an_entry_is_replaced() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _build_handler(tokenizer)
+    state = _make_state(handler)
+    for user_text, assistant_text in _CHAT_TURNS[:-1]:
+        handler.append_chat_turn(state, user_text, assistant_text)
+    real_offload = history_controller.offload_token_work
+
+    async def _racing_offload(*args: Any, **kwargs: Any) -> Any:
+        plan = await real_offload(*args, **kwargs)
+        messages = state.chat_history_messages or HistoryStore()
+        messages[-1] = ChatMessage(role="assistant", content="edited reply")
+        return plan
+
+    with mock.patch.object(history_controller, "offload_token_work", _racing_offload):
+        asyncio.run(handler.aappend_chat_turn(state, *_CHAT_TURNS[-1]))
+
+    assert _chat_pairs(state)[-1] == ("assistant", "edited reply")
+
+
+def test_chat_snapshot_shares_messages_and_ignores_later_edits() -> None:
+    handler = _build_handler(build_pooled_test_tokenizer(pool_size=1))
+    state = _make_state(handler)
+    handler.append_chat_turn(state, "hello world", "")
+    snapshot = handler.get_chat_messages(state)
+    assert snapshot[0] is (state.chat_history_messages or [])[0]
+
+    handler.append_chat_turn(state, "are you there", "yes")
+
+    assert [(msg.role, msg.content) for msg in snapshot] == [("user", "hello world")]
+    assert _chat_pairs(state)[0] == ("user", "hello world\n\nare you there")
+
+
+def test_chat_snapshot_is_shared_until_the_store_changes() -> None:
+    handler = _build_handler(build_pooled_test_tokenizer(pool_size=1))
+    state = _make_state(handler)
+    handler.append_chat_turn(state, "hello world", "hi there")
+
+    first = handler.get_chat_messages(state)
+    assert handler.get_chat_messages(state) is first
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first[0].content = "edited"  # type: ignore[misc]
+
+    handler.append_chat_turn(state, "are you there", "yes")
+    second = handler.get_chat_messages(state)
+
+    assert second is not first
+    assert [msg.content for msg in first] == ["hello world", "hi there"]
+    assert [msg.content for msg in second][-2:] == ["are you there", "yes"]
@@ -5,6 +5,7 @@ from __future__ import annotations
 from tests.support.messages.unit import ASSISTANT_FIRST_PAYLOAD, ASSISTANT_FIRST_MESSAGES
 from src.handlers.session.parsing import (
     parse_history_text,
+    parse_history_payload,
     parse_history_for_chat,
     parse_history_for_tool,
     parse_history_as_tuples,
@@ -194,3 +195,18 @@ def test_chat_trailing_user_preserved_as_user_message() -> None:
 
 def test_chat_empty_list() -> None:
     assert parse_history_for_chat([]) == []
+
+
+def test_payload_parse_matches_chat_and_tool_parsers() -> None:
+    messages = [
+        *ASSISTANT_FIRST_PAYLOAD,
+        {"role": "user", "content": " u1 "},
+        {"role": "USER", "content": "u2"},
+        {"role": "system", "content": "ignored"},
+        {"role": "assistant", "content": "a1"},
+        {"role": "user", "content": "   "},
+        "not a message",
+    ]
+    chat_entries, tool_texts = parse_history_payload(messages)
+    assert chat_entries == [(m.role, m.content) for m in parse_history_for_chat(messages)]
+    assert tool_texts == [turn.user for turn in parse_history_for_tool(messages)]
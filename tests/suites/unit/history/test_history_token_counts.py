@@ -0,0 +1,192 @@
+"""Unit tests for token counts cached on stored history entries."""
+
+from __future__ import annotations
+
+from typing import Any, cast
+from src.state.history import HistoryStore
+from src.tokens.history import build_tool_history
+from src.handlers.session.manager import SessionHandler
+from src.state.session import ChatMessage, HistoryTurn, SessionState
+from src.execution.tool.prompt_budget import fit_tool_input_to_budget
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from src.handlers.session.history import plan_chat_trim, plan_tool_trim, fit_tool_window, chat_message_tokens
+
+_CHAT_TURNS = [(f"question {i} about topic", f"answer {i} in detail here") for i in range(12)]
+
+
+class _RecordingTokenizer:
+    supports_offsets = False
+
+    def __init__(self) -> None:
+        self.counted: list[str] = []
+        self.counted_with_special: list[str] = []
+
+    def count(self, text: str, *, add_special_tokens: bool = False) -> int:
+        (self.counted_with_special if add_special_tokens else self.counted).append(text)
+        total = len(text.split())
+        return total + 2 if add_special_tokens and total else total
+
+    def count_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        return [self.count(text, add_special_tokens=add_special_tokens) for text in texts]
+
+    def trim_with_count(self, text: str, max_tokens: int, keep: str = "end") -> tuple[str, int]:
+        words = text.split()
+        kept = words[:max_tokens] if keep == "start" else words[len(words) - max_tokens :]
+        return " ".join(kept), len(kept)
+
+
+class _JoinMergingTokenizer(_RecordingTokenizer):
+    """Charges a newline followed by ``#`` three extra tokens, which per-line counts never see."""
+
+    def count(self, text: str, *, add_special_tokens: bool = False) -> int:
+        return super().count(text, add_special_tokens=add_special_tokens) + 3 * text.count("\n#")
+
+
+def _build_handler(tokenizer: Any, *, trigger: int = 60, target: int = 40) -> SessionHandler:
+    return SessionHandler(
+        chat_engine=None,
+        tool_history_budget=12,
+        tool_input_budget=40,
+        chat_tokenizer=cast(Any, tokenizer),
+        tool_tokenizer=cast(Any, tokenizer),
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=True,
+            chat_trigger_tokens=trigger,
+            chat_target_tokens=target,
+            default_tool_history_tokens=None,
+        ),
+    )
+
+
+def _make_state(handler: SessionHandler) -> SessionState:
+    state = SessionState()
+    handler.initialize_session(state)
+    return state
+
+
+def test_each_stored_chat_message_is_tokenized_once() -> None:
+    tokenizer = _RecordingTokenizer()
+    handler = _build_handler(tokenizer)
+    state = _make_state(handler)
+
+    for user_text, assistant_text in _CHAT_TURNS:
+        handler.append_chat_turn(state, user_text, assistant_text)
+
+    message_lines = [
+        text
+        for text in tokenizer.counted
+        if text.startswith(("User: ", "Assistant: ")) and "Probe" not in text and "\n\n" not in text
+    ]
+    assert len(message_lines) == len(set(message_lines)) == len(_CHAT_TURNS) * 2
+    stored = state.chat_history_messages or HistoryStore()
+    assert 0 < len(stored) < len(_CHAT_TURNS) * 2
+    assert sum(len(f"{m.role}: {m.content}".split()) for m in stored) <= 40
+
+
+class _JoinPenaltyTokenizer(_RecordingTokenizer):
+    """Counts transcripts of three or more lines higher than their summed parts."""
+
+    def count(self, text: str, *, add_special_tokens: bool = False) -> int:
+        penalty = 3 if text.count("\n\n") >= 2 else 0
+        return super().count(text, add_special_tokens=add_special_tokens) + penalty
+
+
+def test_chat_trim_verifies_the_kept_transcript_once() -> None:
+    tokenizer = _JoinPenaltyTokenizer()
+    messages: list[ChatMessage] = []
+    for i in range(6):
+        messages += [
+            ChatMessage(role="user", content=f"user {i}"),
+            ChatMessage(role="assistant", content=f"assistant {i}"),
+        ]
+    config = HistoryRuntimeConfig(
+        deploy_chat=True,
+        deploy_tool=False,
+        chat_trigger_tokens=20,
+        chat_target_tokens=12,
+        default_tool_history_tokens=None,
+    )
+
+    trimmed = plan_chat_trim(messages, config=config, chat_tokenizer=cast(Any, tokenizer))
+
+    assert [m.content for m in trimmed or []] == ["user 5", "assistant 5"]
+    transcripts = [text for text in tokenizer.counted if "\n\n" in text and "Probe" not in text]
+    assert transcripts == ["User: user 4\n\nAssistant: assistant 4\n\nUser: user 5\n\nAssistant: assistant 5"]
+
+
+def test_edited_content_invalidates_cached_count() -> None:
+    tokenizer = _RecordingTokenizer()
+    message = ChatMessage(role="user", content="one two")
+    assert chat_message_tokens([message], cast(Any, tokenizer)) == [3]
+
+    edited = ChatMessage(role="user", content="one two three four", chat_tokens=message.chat_tokens)
+    assert chat_message_tokens([edited], cast(Any, tokenizer)) == [5]
+    assert tokenizer.counted == ["User: one two", "User: one two three four"]
+
+
+def test_tool_trim_from_cached_counts_matches_exact_join() -> None:
+    tokenizer = _RecordingTokenizer()
+    turns = [HistoryTurn(turn_id=f"t{i}", user=f"word{i} extra{i} more{i}", assistant="") for i in range(6)]
+
+    trimmed = plan_tool_trim(turns, 12, tool_tokenizer=cast(Any, tokenizer))
+
+    assert [turn.turn_id for turn in trimmed or []] == ["t3", "t4", "t5"]
+    user_texts = [turn.user for turn in turns]
+    assert build_tool_history(
+        user_texts,
+        12,
+        cast(Any, tokenizer),
+        text_tokens=[turn.tool_tokens[1] for turn in turns if turn.tool_tokens],
+    ) == build_tool_history(user_texts, 12, cast(Any, tokenizer))
+
+
+def test_tool_window_fit_tokenizes_only_the_new_utterance() -> None:
+    tokenizer = _RecordingTokenizer()
+    turns = [HistoryTurn(turn_id=f"t{i}", user=f"word{i} extra{i} more{i}", assistant="") for i in range(6)]
+    plan_tool_trim(turns, 100, tool_tokenizer=cast(Any, tokenizer))
+    tokenizer.counted.clear()
+    tokenizer.counted_with_special.clear()
+
+    fitted = fit_tool_window(turns, "what is next", cast(Any, tokenizer), max_input_tokens=15)
+    assert not any("word" in text for text in tokenizer.counted)
+    assert [text for text in tokenizer.counted_with_special if "word" in text] == [
+        "word3 extra3 more3\nword4 extra4 more4\nword5 extra5 more5\nwhat is next"
+    ]
+
+    exact = fit_tool_input_to_budget(
+        [turn.user for turn in turns], "what is next", cast(Any, tokenizer), max_input_tokens=15
+    )
+    assert (
+        fitted.tool_user_history
+        == exact.tool_user_history
+        == "word3 extra3 more3\nword4 extra4 more4\nword5 extra5 more5"
+    )
+    assert (fitted.tool_user_utt, fitted.input_tokens) == (exact.tool_user_utt, exact.input_tokens)
+
+
+def test_tool_window_fit_is_counted_exactly_when_joins_do_not_add_up() -> None:
+    tokenizer = _JoinMergingTokenizer()
+    turns = [HistoryTurn(turn_id=f"t{i}", user=f"#tag{i} note{i}", assistant="") for i in range(6)]
+
+    fitted = fit_tool_window(turns, "#next one", cast(Any, tokenizer), max_input_tokens=14)
+
+    assembled = "\n".join(filter(None, [fitted.tool_user_history, fitted.tool_user_utt]))
+    assert fitted.input_tokens == tokenizer.count(assembled, add_special_tokens=True) <= 14
+    assert fitted.tool_user_history == "#tag4 note4\n#tag5 note5"
+    assert plan_tool_trim(turns, 14, tool_tokenizer=cast(Any, tokenizer)) == turns[-3:]
+    counts = [tokenizer.count(turn.user) for turn in turns]
+    history = build_tool_history([turn.user for turn in turns], 14, cast(Any, tokenizer), text_tokens=counts)
+    assert history == "\n".join(turn.user for turn in turns[-3:])
+
+
+def test_tool_turn_stores_count_from_the_fit() -> None:
+    tokenizer = _RecordingTokenizer()
+    handler = _build_handler(tokenizer)
+    state = _make_state(handler)
+
+    for i in range(5):
+        handler.prepare_tool_turn(state, f"tool request number {i}", turn_id=f"t{i}")
+
+    requests = [text for text in tokenizer.counted if text.startswith("tool request")]
+    assert len(requests) == len(set(requests)) == 5
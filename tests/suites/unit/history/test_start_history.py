@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+from unittest import mock
 from src.config import DEFAULT_CHECK_SCREEN_PREFIX
 from src.handlers.session.manager import SessionHandler
 from src.state.session import ChatMessage, SessionState
 from tests.support.helpers.tokenizer import use_local_tokenizers
 from src.handlers.session.history.settings import HistoryRuntimeConfig
 from src.messages.history import resolve_history, resolve_user_utterances
+from src.handlers.session.parsing import parse_history_for_chat, parse_history_for_tool
 from tests.support.messages.unit import (
     CHAT_MESSAGES,
     HISTORY_PAYLOAD,
@@ -57,7 +59,7 @@ def _build_session_handler(
 
 
 def _make_state(handler: SessionHandler) -> SessionState:
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
     return state
 
@@ -105,7 +107,7 @@ def test_resolve_history_trims_when_over_budget() -> None:
 
         assert state.chat_history_messages is not None
         assert len(state.chat_history_messages) < 6
-        assert isinstance(messages, list)
+        assert isinstance(messages, tuple)
 
 
 def test_resolve_user_utterances_normalizes_without_chat_trimming() -> None:
@@ -150,7 +152,7 @@ def test_resolve_history_preserves_assistant_first_seed_on_fresh_session() -> No
 
         messages = resolve_history(handler, state, {"history": ASSISTANT_FIRST_PAYLOAD[:4]})
 
-        assert messages == ASSISTANT_FIRST_MESSAGES[:4]
+        assert list(messages) == ASSISTANT_FIRST_MESSAGES[:4]
         assert state.chat_history_messages == ASSISTANT_FIRST_MESSAGES[:4]
         assert _history_turn_count(state) == 4
 
@@ -192,7 +194,7 @@ def test_resolve_history_tool_only_trims_at_import() -> None:
             tool_history_budget=10,
             tokenizer=tokenizer,
         )
-        state = SessionState(meta={})
+        state = SessionState()
         handler.initialize_session(state)
 
         msg = {"history": tool_turn_payloads() * 3}
@@ -212,7 +214,7 @@ def test_resolve_history_tool_only_crops_single_oversized_seed_turn() -> None:
             tool_history_budget=3,
             tokenizer=tokenizer,
         )
-        state = SessionState(meta={})
+        state = SessionState()
         handler.initialize_session(state)
 
         msg = {
@@ -235,14 +237,14 @@ def test_resolve_history_trims_assistant_first_seed_by_whole_groups() -> None:
 
         messages = resolve_history(handler, state, {"history": ASSISTANT_FIRST_PAYLOAD})
 
-        assert messages == ASSISTANT_FIRST_MESSAGES[-2:]
+        assert list(messages) == ASSISTANT_FIRST_MESSAGES[-2:]
         assert state.chat_history_messages == ASSISTANT_FIRST_MESSAGES[-2:]
 
 
 def test_resolve_history_both_modes_stores_chat_and_tool_separately() -> None:
     with use_local_tokenizers() as tokenizer:
         handler = _build_session_handler(deploy_chat=True, deploy_tool=True, tool_history_budget=8, tokenizer=tokenizer)
-        state = SessionState(meta={})
+        state = SessionState()
         handler.initialize_session(state)
 
         msg = {
@@ -271,7 +273,7 @@ def test_resolve_history_both_modes_preserves_assistant_first_chat_and_user_only
         handler = _build_session_handler(
             deploy_chat=True, deploy_tool=True, tool_history_budget=20, tokenizer=tokenizer
         )
-        state = SessionState(meta={})
+        state = SessionState()
         handler.initialize_session(state)
 
         resolve_history(handler, state, {"history": ASSISTANT_FIRST_PAYLOAD[:4]})
@@ -298,7 +300,34 @@ def test_resolve_history_merges_consecutive_users_on_import() -> None:
 
         messages = resolve_history(handler, state, msg)
 
-        assert messages == [
+        assert list(messages) == [
             ChatMessage(role="user", content="one\n\ntwo"),
             ChatMessage(role="assistant", content="reply"),
         ]
+
+
+def test_resolve_history_long_import_matches_record_path_and_counts_only_the_suffix() -> None:
+    payload = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} about topic{i}"} for i in range(400)
+    ]
+    with use_local_tokenizers() as tokenizer:
+        handler = _build_session_handler(
+            deploy_tool=True,
+            chat_trigger_tokens=60,
+            chat_target_tokens=40,
+            tool_history_budget=30,
+            tokenizer=tokenizer,
+        )
+        reference = _make_state(handler)
+        handler.set_mode_histories(
+            reference,
+            chat_messages=parse_history_for_chat(payload),
+            tool_turns=parse_history_for_tool(payload),
+        )
+        state = _make_state(handler)
+        with mock.patch.object(tokenizer, "count_many", wraps=tokenizer.count_many) as counted:
+            messages = resolve_history(handler, state, {"history": payload})
+
+        assert list(messages) == reference.chat_history_messages
+        assert [t.user for t in state.tool_history_turns or []] == [t.user for t in reference.tool_history_turns or []]
+        assert sum(len(call.args[0]) for call in counted.call_args_list) < len(payload)
@@ -17,7 +17,7 @@ def test_sanitize_prompt_with_limit_valid() -> None:
         invalid_error_code="invalid_prompt",
         too_long_error_code="prompt_too_long",
         max_tokens=100,
-        count_tokens_fn=lambda s: len(s.split()),
+        fits_tokens_fn=lambda s, limit: len(s.split()) <= limit,
     )
     assert result == "hello world"
 
@@ -30,7 +30,7 @@ def test_sanitize_prompt_with_limit_invalid_prompt() -> None:
             invalid_error_code="invalid_prompt",
             too_long_error_code="prompt_too_long",
             max_tokens=100,
-            count_tokens_fn=lambda s: len(s.split()),
+            fits_tokens_fn=lambda s, limit: len(s.split()) <= limit,
         )
 
 
@@ -42,7 +42,7 @@ def test_sanitize_prompt_with_limit_exceeds_tokens() -> None:
             invalid_error_code="invalid_prompt",
             too_long_error_code="prompt_too_long",
             max_tokens=2,
-            count_tokens_fn=lambda s: len(s.split()),
+            fits_tokens_fn=lambda s, limit: len(s.split()) <= limit,
         )
 
 
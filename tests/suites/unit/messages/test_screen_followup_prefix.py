@@ -20,7 +20,7 @@ def test_resolve_user_utterances_strips_followup_prefix_without_trimming() -> No
             default_tool_history_tokens=None,
         ),
     )
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
     chat_user, tool_user = message_history.resolve_user_utterances(
@@ -43,7 +43,7 @@ def test_session_handler_tracks_screen_followup_pending_state() -> None:
             default_tool_history_tokens=None,
         ),
     )
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
     assert state.screen_followup_pending is False
     handler.set_screen_followup_pending(state, True)
@@ -7,6 +7,7 @@ import pytest
 import asyncio
 import subprocess  # nosec B404
 import src.messages.turn as turn_mod
+from src.state.history import HistoryStore
 from src.config import DEFAULT_CHECK_SCREEN_PREFIX
 from src.handlers.session.manager import SessionHandler
 from src.state.session import ChatMessage, SessionState
@@ -71,7 +72,7 @@ def _build_tool_handler(*, tokenizer=None) -> SessionHandler:
 def test_bootstrap_start_imports_history_without_spawning_turn_state() -> None:
     with use_local_tokenizers() as tokenizer:
         handler = _build_chat_handler(chat_trigger_tokens=100, chat_target_tokens=80, tokenizer=tokenizer)
-        state = SessionState(meta={})
+        state = SessionState()
         ws = _NoopWS()
 
         ok = asyncio.run(
@@ -100,7 +101,7 @@ def test_bootstrap_start_imports_history_without_spawning_turn_state() -> None:
 def test_bootstrap_start_imports_assistant_first_history_without_reordering() -> None:
     with use_local_tokenizers() as tokenizer:
         handler = _build_chat_handler(chat_trigger_tokens=200, chat_target_tokens=160, tokenizer=tokenizer)
-        state = SessionState(meta={})
+        state = SessionState()
         ws = _NoopWS()
 
         ok = asyncio.run(
@@ -125,13 +126,15 @@ def test_bootstrap_start_imports_assistant_first_history_without_reordering() ->
 
 def test_plan_message_turn_preserves_committed_history_without_provisional_insert() -> None:
     handler = _build_chat_handler(chat_trigger_tokens=4, chat_target_tokens=2)
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
-    state.chat_history_messages = [
-        ChatMessage(role="user", content="hello can you help me plan a trip"),
-        ChatMessage(role="assistant", content="sure tell me your budget"),
-    ]
+    state.chat_history_messages = HistoryStore(
+        [
+            ChatMessage(role="user", content="hello can you help me plan a trip"),
+            ChatMessage(role="assistant", content="sure tell me your budget"),
+        ]
+    )
 
     plan = asyncio.run(
         turn_mod._plan_message_turn(
@@ -157,12 +160,14 @@ def test_plan_message_turn_preserves_committed_history_without_provisional_inser
 
 def test_plan_message_turn_keeps_full_history_when_prefix_only_input_normalizes_empty() -> None:
     handler = _build_chat_handler(chat_trigger_tokens=100, chat_target_tokens=80)
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
-    state.chat_history_messages = [
-        ChatMessage(role="user", content="hello can you help me plan a trip"),
-        ChatMessage(role="assistant", content="sure tell me your budget"),
-    ]
+    state.chat_history_messages = HistoryStore(
+        [
+            ChatMessage(role="user", content="hello can you help me plan a trip"),
+            ChatMessage(role="assistant", content="sure tell me your budget"),
+        ]
+    )
 
     plan = asyncio.run(
         turn_mod._plan_message_turn(
@@ -188,9 +193,9 @@ def test_plan_message_turn_keeps_full_history_when_prefix_only_input_normalizes_
 
 def test_plan_message_turn_preserves_assistant_first_committed_history() -> None:
     handler = _build_chat_handler(chat_trigger_tokens=200, chat_target_tokens=160)
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
-    state.chat_history_messages = ASSISTANT_FIRST_MESSAGES[:4]
+    state.chat_history_messages = HistoryStore(ASSISTANT_FIRST_MESSAGES[:4])
 
     plan = asyncio.run(
         turn_mod._plan_message_turn(
@@ -204,7 +209,7 @@ def test_plan_message_turn_preserves_assistant_first_committed_history() -> None
     assert plan is not None
     assert plan.history_turn_id is None
     assert state.chat_history_messages == ASSISTANT_FIRST_MESSAGES[:4]
-    assert plan.history_messages == ASSISTANT_FIRST_MESSAGES[:4]
+    assert list(plan.history_messages) == ASSISTANT_FIRST_MESSAGES[:4]
 
 
 def test_bootstrap_start_imports_tool_history_in_dual_mode_without_execution() -> None:
@@ -222,7 +227,7 @@ def test_bootstrap_start_imports_tool_history_in_dual_mode_without_execution() -
                 default_tool_history_tokens=20,
             ),
         )
-        state = SessionState(meta={})
+        state = SessionState()
         ws = _NoopWS()
 
         ok = asyncio.run(
@@ -266,7 +271,7 @@ def test_bootstrap_start_rejects_chat_only_fields_in_tool_only_mode(
 ) -> None:
     with use_local_tokenizers() as tokenizer:
         handler = _build_tool_handler(tokenizer=tokenizer)
-        state = SessionState(meta={})
+        state = SessionState()
         ws = _NoopWS()
 
         ok = asyncio.run(
@@ -286,15 +291,15 @@ def test_bootstrap_start_rejects_chat_only_fields_in_tool_only_mode(
         assert any("invalid_settings" in payload for payload in ws.sent)
         assert any(expected_fields in payload for payload in ws.sent)
         assert state.tool_history_turns == []
-        assert state.meta["chat_gender"] is None
-        assert state.meta["chat_personality"] is None
-        assert state.meta["chat_prompt"] is None
+        assert state.meta.chat_gender is None
+        assert state.meta.chat_personality is None
+        assert state.meta.chat_prompt is None
 
 
 def test_bootstrap_start_accepts_tool_only_start_without_chat_fields() -> None:
     with use_local_tokenizers() as tokenizer:
         handler = _build_tool_handler(tokenizer=tokenizer)
-        state = SessionState(meta={})
+        state = SessionState()
         ws = _NoopWS()
 
         ok = asyncio.run(
@@ -314,15 +319,15 @@ def test_bootstrap_start_accepts_tool_only_start_without_chat_fields() -> None:
         assert ws.sent[-1].startswith('{"type": "done"')
         assert state.tool_history_turns is not None
         assert [turn.user for turn in state.tool_history_turns] == ["check the calendar for next tuesday flight times"]
-        assert state.meta["chat_gender"] is None
-        assert state.meta["chat_personality"] is None
-        assert state.meta["chat_prompt"] is None
+        assert state.meta.chat_gender is None
+        assert state.meta.chat_personality is None
+        assert state.meta.chat_prompt is None
 
 
 def test_bootstrap_start_rejects_seed_history_that_cannot_fit_latest_turn() -> None:
     with use_local_tokenizers() as tokenizer:
         handler = _build_chat_handler(chat_trigger_tokens=200, chat_target_tokens=120, tokenizer=tokenizer)
-        state = SessionState(meta={})
+        state = SessionState()
         ws = _NoopWS()
         oversized_history = [{"role": "user", "content": " ".join(["hello"] * 7000)}]
 
@@ -0,0 +1,43 @@
+"""Unit tests for stateless document sanitization."""
+
+from __future__ import annotations
+
+import pytest
+from src.text.stream import StreamingSanitizer
+from src.text.document import sanitize_many, sanitize_text
+from tests.support.messages import STREAMING_SANITIZER_CASES
+
+
+def _stream_whole(text: str, splits: list[int]) -> str:
+    sanitizer = StreamingSanitizer()
+    out: list[str] = []
+    start = 0
+    for end in [*splits, len(text)]:
+        out.append(sanitizer.push(text[start:end]))
+        start = end
+    out.append(sanitizer.flush())
+    return "".join(out)
+
+
+@pytest.mark.parametrize("text,splits", STREAMING_SANITIZER_CASES)
+def test_sanitize_text_matches_streaming_output(text: str, splits: list[int]) -> None:
+    assert sanitize_text(text) == _stream_whole(text, splits)
+
+
+def test_sanitize_text_empty_input() -> None:
+    assert sanitize_text("") == ""
+
+
+def test_sanitize_many_serial_preserves_order() -> None:
+    texts = ["freestyle mode. hello there", "HTML <b>bold</b> text", ""]
+    assert sanitize_many(texts) == ["Hello there", "HTML bold text", ""]
+
+
+def test_sanitize_many_process_pool_matches_serial() -> None:
+    texts = [text for text, _splits in STREAMING_SANITIZER_CASES[:12]]
+    assert sanitize_many(texts, workers=2) == [sanitize_text(text) for text in texts]
+
+
+def test_sanitize_many_rejects_non_positive_workers() -> None:
+    with pytest.raises(ValueError, match="workers must be >= 1"):
+        sanitize_many(["hi"], workers=0)
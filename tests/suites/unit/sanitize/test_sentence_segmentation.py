@@ -0,0 +1,66 @@
+"""Unit tests for incremental sentence segmentation."""
+
+from __future__ import annotations
+
+import pytest
+from src.text.document import sanitize_text
+from src.text.sentences import SentenceSegmenter
+from tests.support.messages import STREAMING_SANITIZER_CASES
+
+
+def _segment(chunks: list[str]) -> list[str]:
+    segmenter = SentenceSegmenter()
+    sentences = [boundary.text for chunk in chunks for boundary in segmenter.push(chunk)]
+    last = segmenter.flush()
+    if last is not None:
+        sentences.append(last.text)
+    return sentences
+
+
+def test_segmenter_splits_on_terminal_punctuation() -> None:
+    assert _segment(["Hello there. How are", " you? I'm fine!"]) == [
+        "Hello there.",
+        "How are you?",
+        "I'm fine!",
+    ]
+
+
+def test_segmenter_waits_for_next_visible_char() -> None:
+    segmenter = SentenceSegmenter()
+    assert segmenter.push("Hello there.") == []
+    assert segmenter.push(" ") == []
+    completed = segmenter.push("Next")
+    assert [(b.index, b.text) for b in completed] == [(0, "Hello there.")]
+    assert segmenter.count == 1
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("Dr. Smith is here. Go", ["Dr. Smith is here.", "Go"]),
+        ("It costs 3. 5 dollars. Ok", ["It costs 3. 5 dollars.", "Ok"]),
+        ("Wait... What now? Yes", ["Wait... What now?", "Yes"]),
+        ("Wait… Then this. Ok", ["Wait… Then this.", "Ok"]),
+        ("J. R. R. Tolkien wrote it. Ok", ["J. R. R. Tolkien wrote it.", "Ok"]),
+        ("Apples, pears, etc. Are fine. Ok", ["Apples, pears, etc. Are fine.", "Ok"]),
+        ("Approx. three of them. Ok", ["Approx. three of them.", "Ok"]),
+        ("1. First item. 2. Second item.", ["1. First item.", "2. Second item."]),
+        ('He said "Stop." Then he left.', ['He said "Stop."', "Then he left."]),
+        ("Back in 2020. Then more", ["Back in 2020.", "Then more"]),
+    ],
+)
+def test_segmenter_boundary_rules(text: str, expected: list[str]) -> None:
+    assert _segment([text]) == expected
+
+
+@pytest.mark.parametrize("text,_splits", STREAMING_SANITIZER_CASES)
+def test_segmenter_is_chunking_invariant(text: str, _splits: list[int]) -> None:
+    clean = sanitize_text(text)
+    assert _segment(list(clean)) == _segment([clean])
+
+
+def test_segmenter_flush_on_empty_stream() -> None:
+    segmenter = SentenceSegmenter()
+    assert segmenter.push("") == []
+    assert segmenter.flush() is None
+    assert segmenter.count == 0
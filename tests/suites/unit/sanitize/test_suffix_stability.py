@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+import random
 from src.text.suffix import (
     email_suffix_len,
     phone_suffix_len,
@@ -150,3 +152,60 @@ def test_compute_max_tail_capping() -> None:
     stable, tail = compute_stable_and_tail_lengths(text, text, max_tail=10)
     assert tail <= 10
     assert stable + tail == len(text)
+
+
+# --- single-pass scan equivalence ---
+
+_PROPERTY_ALPHABET = [*"abcXxtT_^:=;8-<>&@.+()% 019\t\n/\\", *"abcd" * 3, "٣", "é", "²"]
+
+
+def _reference_stable_and_tail(raw_tail: str, sanitized: str, max_tail: int) -> tuple[int, int]:
+    if not sanitized:
+        return 0, 0
+    guard = max(
+        unstable_suffix_len(sanitized),
+        html_entity_suffix_len(sanitized),
+        html_tag_suffix_len(raw_tail),
+        email_suffix_len(raw_tail),
+        phone_suffix_len(raw_tail),
+        emoticon_suffix_len(raw_tail),
+        0,
+    )
+    tail_len = min(len(sanitized), guard)
+    stable_len = len(sanitized) - tail_len
+    if tail_len > max_tail:
+        return len(sanitized) - max_tail, max_tail
+    return stable_len, tail_len
+
+
+def _random_text(rng: random.Random, max_len: int) -> str:
+    return "".join(rng.choice(_PROPERTY_ALPHABET) for _ in range(rng.randint(0, max_len)))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_compute_matches_individual_guards(seed: int) -> None:
+    rng = random.Random(seed)  # noqa: S311 - deterministic fuzz inputs
+    for _ in range(2500):
+        raw = _random_text(rng, 150)
+        sanitized = raw if rng.random() < 0.5 else _random_text(rng, 150)
+        if rng.random() < 0.2:
+            raw = f"mail me@x.com {raw}"
+        if rng.random() < 0.2:
+            raw += " 1" * rng.randint(1, 60)
+        max_tail = rng.choice([0, 1, 3, 10, 16, 64, 300])
+        expected = _reference_stable_and_tail(raw, sanitized, max_tail)
+        assert compute_stable_and_tail_lengths(raw, sanitized, max_tail) == expected, (raw, sanitized, max_tail)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "see <div class='a' and then some more words to push the tag far back" * 2,
+        "call " + "1 " * 80,
+        "write to me@example.com or " + "x" * 100,
+        "entity &amp\n",
+        "ends with a newline user@host\n",
+    ],
+)
+def test_compute_matches_individual_guards_past_window(raw: str) -> None:
+    assert compute_stable_and_tail_lengths(raw, raw, 64) == _reference_stable_and_tail(raw, raw, 64)
@@ -10,9 +10,7 @@ from src.handlers.session.requests import is_request_cancelled, cancel_session_r
 
 
 def _make_state(**kwargs: object) -> SessionState:
-    defaults: dict[str, object] = {"meta": {}}
-    defaults.update(kwargs)
-    return SessionState(**defaults)  # type: ignore[arg-type]
+    return SessionState(**kwargs)  # type: ignore[arg-type]
 
 
 class _FakeTask:
@@ -0,0 +1,142 @@
+"""Unit tests for per-session memory accounting and idle history parking."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest import mock
+from src.state.session import SessionState
+from src.tokens.tokenizer import FastTokenizer
+from src.handlers.session.manager import SessionHandler
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+from src.handlers.session.memory import SessionMemoryBudget, session_bytes
+
+
+def _handler(tokenizer: FastTokenizer, budget: SessionMemoryBudget) -> SessionHandler:
+    return SessionHandler(
+        tool_history_budget=50,
+        chat_tokenizer=tokenizer,
+        tool_tokenizer=tokenizer,
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=True,
+            chat_trigger_tokens=500,
+            chat_target_tokens=400,
+            default_tool_history_tokens=None,
+        ),
+        memory_budget=budget,
+    )
+
+
+def _session(handler: SessionHandler, topic: str) -> SessionState:
+    state = SessionState()
+    handler.initialize_session(state)
+    handler.append_chat_turn(state, f"tell me about {topic}", f"{topic} is a long story with many parts")
+    handler.prepare_tool_turn(state, f"tell me about {topic}", turn_id=f"{topic}-1")
+    return state
+
+
+def _history(state: SessionState) -> tuple[list[str], list[str]]:
+    chat = [f"{m.role}: {m.content}" for m in state.chat_history_messages or []]
+    return chat, [t.user for t in state.tool_history_turns or []]
+
+
+def test_appends_are_measured_and_release_returns_the_bytes() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    budget = SessionMemoryBudget(budget_bytes=0, idle_s=0)
+    handler = _handler(tokenizer, budget)
+
+    first = _session(handler, "rivers")
+    second = _session(handler, "mountains")
+
+    assert first.memory_bytes == session_bytes(first)
+    assert budget.total_bytes == first.memory_bytes + second.memory_bytes
+    before = first.memory_bytes
+    handler.append_chat_turn(first, "and the deltas?", "deltas form where rivers meet the sea")
+    assert first.memory_bytes > before
+    assert budget.total_bytes == first.memory_bytes + second.memory_bytes
+
+    budget.release(first)
+    budget.release(second)
+    assert budget.total_bytes == 0
+    assert len(budget) == 0
+
+
+def test_idle_sessions_are_parked_over_budget_and_restored_with_cached_counts() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    budget = SessionMemoryBudget(budget_bytes=1, idle_s=0)
+    handler = _handler(tokenizer, budget)
+    idle = _session(handler, "rivers")
+    expected = _history(idle)
+    counts = [m.chat_tokens for m in idle.chat_history_messages or []]
+
+    active = _session(handler, "mountains")
+
+    assert idle.history_parked and not active.history_parked
+    assert _history(idle) == ([], [])
+    assert budget.total_bytes == idle.memory_bytes + active.memory_bytes
+    budget.restore(idle)
+    assert not idle.history_parked
+    assert _history(idle) == expected
+    assert [m.chat_tokens for m in idle.chat_history_messages or []] == counts
+
+
+def test_running_and_recent_sessions_stay_resident() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    budget = SessionMemoryBudget(budget_bytes=1, idle_s=3600)
+    handler = _handler(tokenizer, budget)
+    recent = _session(handler, "rivers")
+    running = _session(handler, "lakes")
+    running.lifecycle_state = "running"
+    running.memory_touched_at -= 7200
+
+    _session(handler, "mountains")
+
+    assert not recent.history_parked
+    assert not running.history_parked
+
+
+def test_relief_is_not_retried_before_a_session_can_turn_idle() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    budget = SessionMemoryBudget(budget_bytes=1, idle_s=3600)
+    handler = _handler(tokenizer, budget)
+    sessions = [_session(handler, topic) for topic in ("rivers", "lakes", "mountains")]
+
+    with mock.patch.object(SessionMemoryBudget, "_parkable", side_effect=AssertionError("rescanned")):
+        for state in sessions:
+            handler.append_chat_turn(state, "and then?", "then it went on")
+
+    assert not any(state.history_parked for state in sessions)
+
+
+def test_spilled_history_is_restored_without_blocking_the_loop(tmp_path: Path) -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    budget = SessionMemoryBudget(budget_bytes=1, idle_s=0, spill_path=str(tmp_path / "parked.sqlite3"))
+    handler = _handler(tokenizer, budget)
+    idle = _session(handler, "rivers")
+    expected = _history(idle)
+    _session(handler, "mountains")
+    assert idle.history_parked
+
+    asyncio.run(budget.arestore(idle))
+
+    assert _history(idle) == expected
+    asyncio.run(budget.arelease(idle))
+    budget.close()
+
+
+def test_parked_history_spills_to_disk_and_is_kept_for_resume(tmp_path: Path) -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    budget = SessionMemoryBudget(budget_bytes=1, idle_s=0, spill_path=str(tmp_path / "parked.sqlite3"))
+    handler = _handler(tokenizer, budget)
+    idle = _session(handler, "rivers")
+    expected = _history(idle)
+    _session(handler, "mountains")
+    assert idle.history_parked
+
+    budget.release(idle, keep_history=True)
+
+    assert _history(idle) == expected
+    assert not idle.history_parked
+    budget.close()
@@ -0,0 +1,80 @@
+"""Unit tests for typed, immutable session metadata."""
+
+from __future__ import annotations
+
+import sys
+import pytest
+from pathlib import Path
+from src.handlers.session.manager import SessionHandler
+from src.handlers.session.config import update_session_config
+from src.state.session import ChatMessage, HistoryTurn, SessionMeta, SessionState
+from src.handlers.session.snapshots import SessionSnapshotStore, capture_session_snapshot
+
+
+@pytest.mark.parametrize("cls", [SessionMeta, ChatMessage, HistoryTurn, SessionState])
+def test_session_records_are_slotted(cls: type) -> None:
+    assert "__slots__" in vars(cls)
+    assert "__dict__" not in vars(cls)
+
+
+def test_session_id_and_lock_are_created_on_first_use() -> None:
+    state = SessionState()
+    assert state._session_id is None and state._request_lock is None
+    assert state.session_id == state.session_id and len(state.session_id) == 32
+    assert state.request_lock is state.request_lock
+
+
+def test_history_records_are_frozen_with_interned_roles() -> None:
+    role = "".join(["assist", "ant"])
+    assert ChatMessage(role=role, content="hi").role is sys.intern("assistant")  # type: ignore[arg-type]
+    with pytest.raises(AttributeError):
+        HistoryTurn(turn_id="t1", user="hi", assistant="").user = "edited"  # type: ignore[misc]
+
+
+def test_initialize_session_keeps_client_id_and_resets_persona() -> None:
+    state = SessionState(meta=SessionMeta(client_id="client-1", chat_prompt="stale"))
+    meta = SessionHandler().initialize_session(state)
+    assert state.meta is meta
+    assert meta.client_id == "client-1"
+    assert meta.chat_prompt is None
+    assert meta.now_iso
+
+
+def test_config_update_replaces_meta_and_leaves_snapshot_intact() -> None:
+    state = SessionState(meta=SessionMeta(chat_prompt="persona", chat_sampling={"temperature": 0.7}))
+    snapshot = state.meta
+    update_session_config(state, count_prefix_tokens_fn=lambda _prefix: 0, chat_sampling={"temperature": 0.2})
+    assert state.meta is not snapshot
+    assert state.meta.chat_sampling == {"temperature": 0.2}
+    assert state.meta.chat_prompt == "persona"
+    assert snapshot.chat_sampling == {"temperature": 0.7}
+
+
+def test_meta_sampling_is_a_read_only_private_copy(tmp_path: Path) -> None:
+    state = SessionState()
+    overrides = {"temperature": 0.2}
+    update_session_config(state, count_prefix_tokens_fn=lambda _prefix: 0, chat_sampling=overrides)
+    overrides["temperature"] = 1.5
+    sampling = state.meta.chat_sampling
+    assert sampling == {"temperature": 0.2}
+    with pytest.raises(TypeError):
+        sampling["temperature"] = 1.0  # type: ignore[index]
+    store = SessionSnapshotStore(capacity=1, ttl_s=60, spill_path=str(tmp_path / "resume.sqlite3"))
+    store.save("spilled", capture_session_snapshot(state))
+    store.save("newer", capture_session_snapshot(SessionState()))
+    restored = store.take("spilled")
+    store.close()
+    assert restored is not None and restored.meta == state.meta
+
+
+def test_config_update_applies_nothing_when_prefix_count_fails() -> None:
+    state = SessionState()
+    snapshot = state.meta
+
+    def _fail(_prefix: str | None) -> int:
+        raise RuntimeError("tokenizer down")
+
+    with pytest.raises(RuntimeError):
+        update_session_config(state, count_prefix_tokens_fn=_fail, chat_gender="male", check_screen_prefix="LOOK:")
+    assert state.meta is snapshot
+    assert state.check_screen_prefix_tokens == 0
@@ -0,0 +1,182 @@
+"""Unit tests for resumable session snapshots."""
+
+from __future__ import annotations
+
+import json
+import time
+import asyncio
+from pathlib import Path
+from unittest import mock
+from typing import Any, cast
+from dataclasses import replace
+from src.tokens.tokenizer import FastTokenizer
+from src.handlers.websocket import message_loop
+from src.messages.resume import bootstrap_resume_turn
+from src.handlers.session.manager import SessionHandler
+from src.config.websocket import WS_ERROR_RESUME_UNAVAILABLE
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+from src.state.session import SessionMeta, SessionState, SessionSnapshot
+from src.handlers.session.history import tool_turn_tokens, chat_message_tokens
+from src.handlers.session.snapshots import SessionSnapshotStore, capture_session_snapshot
+
+
+def _handler(tokenizer: FastTokenizer) -> SessionHandler:
+    return SessionHandler(
+        tool_history_budget=50,
+        chat_tokenizer=tokenizer,
+        tool_tokenizer=tokenizer,
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=True,
+            chat_trigger_tokens=500,
+            chat_target_tokens=400,
+            default_tool_history_tokens=None,
+        ),
+    )
+
+
+def _dropped_session(handler: SessionHandler, tokenizer: FastTokenizer) -> SessionState:
+    state = SessionState(meta=SessionMeta(client_id="old-client"))
+    handler.initialize_session(state)
+    handler.append_chat_turn(state, "hello there", "hi, how can I help")
+    handler.append_chat_turn(state, "tell me a joke", "why did the chicken cross the road")
+    handler.prepare_tool_turn(state, "tell me a joke", turn_id="t1")
+    chat_message_tokens(state.chat_history_messages or [], tokenizer)
+    tool_turn_tokens(state.tool_history_turns or [], tokenizer)
+    return state
+
+
+class _RecordingWS:
+    def __init__(self) -> None:
+        self.sent: list[dict[str, Any]] = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+
+def _resume(handler: SessionHandler, store: SessionSnapshotStore, client_id: str) -> tuple[bool, SessionState, Any]:
+    ws = _RecordingWS()
+    state = SessionState(meta=SessionMeta(client_id=client_id))
+    resumed = asyncio.run(
+        bootstrap_resume_turn(
+            cast(Any, ws), {"resume_token": "tok"}, state, session_handler=handler, session_snapshots=store
+        )
+    )
+    return resumed, state, ws.sent[-1]
+
+
+def _snapshot(saved_at: float | None = None) -> SessionSnapshot:
+    snapshot = capture_session_snapshot(SessionState())
+    return snapshot if saved_at is None else replace(snapshot, saved_at=saved_at)
+
+
+def test_tokens_are_single_use_and_expire() -> None:
+    store = SessionSnapshotStore(capacity=4, ttl_s=60)
+    store.save("live", _snapshot())
+    store.save("stale", _snapshot(saved_at=time.time() - 120))
+
+    assert store.take("live") is not None
+    assert store.take("live") is None
+    assert store.take("stale") is None
+
+
+def test_lru_evicts_least_recently_saved_without_spill() -> None:
+    store = SessionSnapshotStore(capacity=2, ttl_s=60)
+    for token in ("a", "b", "c"):
+        store.save(token, _snapshot())
+
+    assert len(store) == 2
+    assert store.take("a") is None
+    assert store.take("c") is not None
+
+
+def test_evicted_sessions_spill_to_disk_with_cached_counts(tmp_path: Path) -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    state = _dropped_session(_handler(tokenizer), tokenizer)
+    store = SessionSnapshotStore(capacity=1, ttl_s=60, spill_path=str(tmp_path / "resume.sqlite3"))
+    store.save("first", capture_session_snapshot(state))
+    store.save("second", _snapshot())
+
+    restored = store.take("first")
+    store.close()
+
+    assert restored is not None
+    assert restored.meta == state.meta
+    assert [(m.role, m.content) for m in restored.chat_history_messages or ()] == [
+        (m.role, m.content) for m in state.chat_history_messages or []
+    ]
+    assert all(
+        m.chat_tokens is not None and m.chat_tokens[0] is m.content for m in restored.chat_history_messages or ()
+    )
+    assert [t.tool_tokens for t in restored.tool_history_turns or ()] == [
+        t.tool_tokens for t in state.tool_history_turns or []
+    ]
+
+
+def test_restore_skips_tokenization_and_keeps_new_client_id() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _handler(tokenizer)
+    dropped = _dropped_session(handler, tokenizer)
+    snapshot = capture_session_snapshot(dropped)
+    state = SessionState(meta=SessionMeta(client_id="new-client"))
+
+    with mock.patch.object(tokenizer, "_count_uncached", side_effect=AssertionError("tokenized")):
+        assert handler.restore_session(state, snapshot)
+        chat_message_tokens(state.chat_history_messages or [], tokenizer)
+
+    assert state.meta.client_id == "new-client"
+    assert state.meta.now_iso == dropped.meta.now_iso
+    assert state.chat_history_messages == dropped.chat_history_messages
+    assert state.check_screen_prefix_tokens == dropped.check_screen_prefix_tokens
+
+
+def test_restore_rejects_snapshot_from_other_models() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _handler(tokenizer)
+    snapshot = capture_session_snapshot(_dropped_session(handler, tokenizer))
+    state = SessionState()
+
+    assert not handler.restore_session(state, replace(snapshot, meta=replace(snapshot.meta, chat_model="other")))
+    assert state.chat_history_messages is None
+
+
+def test_resume_from_another_client_is_rejected_and_kept_for_the_owner() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    handler = _handler(tokenizer)
+    dropped = _dropped_session(handler, tokenizer)
+    dropped.meta = replace(dropped.meta, client_id="10.0.0.1:51000")
+    store = SessionSnapshotStore(capacity=4, ttl_s=60)
+    store.save("tok", capture_session_snapshot(dropped))
+
+    resumed, state, reply = _resume(handler, store, "10.0.0.2:51000")
+    assert not resumed
+    assert reply["code"] == WS_ERROR_RESUME_UNAVAILABLE
+    assert state.chat_history_messages is None
+
+    resumed, state, reply = _resume(handler, store, "10.0.0.1:52000")
+    assert resumed and reply["type"] == "done"
+    assert state.meta.client_id == "10.0.0.1:52000"
+    assert state.chat_history_messages == dropped.chat_history_messages
+
+
+def test_resume_counts_as_a_request() -> None:
+    metrics = mock.MagicMock()
+    with (
+        mock.patch.object(message_loop, "get_metrics", return_value=metrics),
+        mock.patch.object(message_loop, "handle_turn_message", mock.AsyncMock(return_value=True)),
+    ):
+        started = asyncio.run(
+            message_loop._handle_turn_command(
+                cast(Any, _RecordingWS()),
+                "resume",
+                {"type": "resume", "resume_token": "tok"},
+                SessionState(),
+                False,
+                session_handler=SessionHandler(),
+                runtime_deps=cast(Any, None),
+            )
+        )
+
+    assert started
+    metrics.requests_total.add.assert_called_once_with(1, {"status": "resumed"})
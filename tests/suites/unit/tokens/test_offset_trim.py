@@ -0,0 +1,73 @@
+"""Unit tests for offset-mapping based trimming."""
+
+from __future__ import annotations
+
+import pytest
+from src.tokens.offsets import cut_to_token_budget
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+from src.tokens.history import prepare_token_cut, trim_tool_text_to_budget
+
+_TEXT = "alpha  beta\tgamma delta"
+_SPANS = [(0, 5), (7, 11), (12, 17), (18, 23)]
+
+
+@pytest.mark.parametrize(
+    "max_tokens,keep,expected",
+    [
+        (2, "start", ("alpha  beta", 2)),
+        (2, "end", ("gamma delta", 2)),
+        (3, "end", ("beta\tgamma delta", 3)),
+        (4, "start", (_TEXT, 4)),
+        (9, "end", (_TEXT, 4)),
+        (0, "start", ("", 0)),
+    ],
+)
+def test_cut_keeps_verbatim_substring(max_tokens: int, keep: str, expected: tuple[str, int]) -> None:
+    assert cut_to_token_budget(_TEXT, _SPANS, max_tokens, keep) == expected
+
+
+def test_cut_never_splits_a_character_shared_by_tokens() -> None:
+    text = "hi 😀 yo"
+    # Byte-level BPE: the emoji spans two tokens that both map to (3, 4).
+    spans = [(0, 2), (3, 4), (3, 4), (5, 7)]
+    assert cut_to_token_budget(text, spans, 2, "start") == ("hi", 1)
+    assert cut_to_token_budget(text, spans, 3, "start") == ("hi 😀", 3)
+    assert cut_to_token_budget(text, spans, 2, "end") == ("yo", 1)
+    assert cut_to_token_budget(text, spans, 3, "end") == ("😀 yo", 3)
+
+
+def test_fast_tokenizer_trim_returns_original_text_and_exact_count() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    trimmed, kept = tokenizer.trim_with_count("a  b c d", 2, keep="start")
+    assert (trimmed, kept) == ("a  b", 2)
+    assert tokenizer.count(trimmed) == kept
+    assert tokenizer.trim("a b c d", 3, keep="end") == "b c d"
+
+
+def test_prepare_token_cut_encodes_once_for_repeated_cuts() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    calls = {"n": 0}
+    token_offsets = tokenizer.token_offsets
+
+    def _counting_offsets(text: str) -> list[tuple[int, int]]:
+        calls["n"] += 1
+        return token_offsets(text)
+
+    tokenizer.token_offsets = _counting_offsets  # type: ignore[method-assign]
+    total, cut = prepare_token_cut("a b c d e", tokenizer, keep="end")
+    assert total == 5
+    assert [cut(n) for n in (1, 3, 5)] == ["e", "c d e", "a b c d e"]
+    assert calls["n"] == 1
+
+
+def test_prepare_token_cut_without_tokenizer_uses_whitespace_spans() -> None:
+    total, cut = prepare_token_cut("one  two three", None, keep="start")
+    assert total == 3
+    assert cut(2) == "one  two"
+
+
+def test_tool_text_trim_reserves_special_token_overhead() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    overhead = tokenizer.count("a b", add_special_tokens=True) - tokenizer.count("a b")
+    trimmed = trim_tool_text_to_budget("a b c d e", 3 + overhead, tokenizer, keep="end")
+    assert trimmed == "c d e"
@@ -16,7 +16,7 @@ def test_strip_screen_prefix_handles_case_insensitive_match() -> None:
 
 
 def test_get_effective_user_utt_max_tokens_uses_state_and_clamps() -> None:
-    state = SessionState(meta={})
+    state = SessionState()
     state.check_screen_prefix_tokens = 9
     state.screen_checked_prefix_tokens = 2
 
@@ -0,0 +1,95 @@
+"""Unit tests for segment-cached chat template rendering."""
+
+from __future__ import annotations
+
+from typing import Any
+from src.tokens.template import ChatMessageDict, ChatTemplateRenderer
+
+_CONVERSATION: list[ChatMessageDict] = [
+    {"role": "system", "content": "Be kind."},
+    {"role": "user", "content": "hello"},
+    {"role": "assistant", "content": "hi there"},
+    {"role": "user", "content": "what now?"},
+]
+
+
+class _CountingTemplate:
+    def __init__(self, *, numbered: bool = False, think_on_last: bool = False) -> None:
+        self.calls = 0
+        self._numbered = numbered
+        self._think_on_last = think_on_last
+
+    def __call__(self, messages: list[ChatMessageDict], add_generation_prompt: bool, kwargs: dict[str, Any]) -> str:
+        self.calls += 1
+        parts = ["<s>"]
+        for index, message in enumerate(messages):
+            header = f"{message['role']}#{index}" if self._numbered else message["role"]
+            last_assistant = message["role"] == "assistant" and index == len(messages) - 1
+            body = (
+                f"<think></think>{message['content']}" if self._think_on_last and last_assistant else message["content"]
+            )
+            parts.append(f"<|{header}|>\n{body}<|end|>\n")
+        if add_generation_prompt:
+            parts.append("<|assistant|>\n" + ("<think></think>" if kwargs.get("enable_thinking") is False else ""))
+        return "".join(parts)
+
+
+def test_verified_template_assembles_identical_prompts_from_cache() -> None:
+    template = _CountingTemplate()
+    renderer = ChatTemplateRenderer(template, max_bytes=1 << 16)
+    assert renderer.verify({"enable_thinking": False})
+
+    first = renderer.render(_CONVERSATION, True, {"enable_thinking": False})
+    calls_after_first = template.calls
+    second = renderer.render(_CONVERSATION, True, {"enable_thinking": False})
+
+    assert first == second == template(_CONVERSATION, True, {"enable_thinking": False})
+    assert template.calls == calls_after_first + 1
+
+
+def test_position_dependent_template_falls_back_to_full_render() -> None:
+    template = _CountingTemplate(numbered=True)
+    renderer = ChatTemplateRenderer(template, max_bytes=1 << 16)
+
+    assert not renderer.verify({})
+    assert renderer.size_bytes == 0
+    assert renderer.render(_CONVERSATION, True, {}) == template(_CONVERSATION, True, {})
+
+
+def test_last_assistant_special_case_stays_exact() -> None:
+    template = _CountingTemplate(think_on_last=True)
+    renderer = ChatTemplateRenderer(template, max_bytes=1 << 16)
+    assert renderer.verify({})
+
+    warm = _CONVERSATION[:3]
+    assert renderer.render(_CONVERSATION, True, {}) == template(_CONVERSATION, True, {})
+    assert renderer.render(warm, True, {}) == template(warm, True, {})
+
+
+def test_unverified_kwargs_render_the_full_template() -> None:
+    template = _CountingTemplate()
+    renderer = ChatTemplateRenderer(template, max_bytes=1 << 16)
+    assert renderer.verify({"enable_thinking": False})
+
+    before = template.calls
+    prompt = renderer.render(_CONVERSATION, True, {"enable_thinking": True})
+
+    assert template.calls == before + 1
+    assert prompt == template(_CONVERSATION, True, {"enable_thinking": True})
+
+
+def test_zero_byte_cap_disables_segmented_rendering() -> None:
+    renderer = ChatTemplateRenderer(_CountingTemplate(), max_bytes=0)
+    assert not renderer.verify({})
+    assert not renderer.segmented
+
+
+def test_fragment_cache_stays_within_byte_cap() -> None:
+    template = _CountingTemplate()
+    renderer = ChatTemplateRenderer(template, max_bytes=1200)
+    assert renderer.verify({})
+
+    for turn in range(20):
+        conversation = [_CONVERSATION[0], {"role": "user", "content": f"message number {turn}"}]
+        assert renderer.render(conversation, True, {}) == template(conversation, True, {})
+        assert renderer.size_bytes <= 1200
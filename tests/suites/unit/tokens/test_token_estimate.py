@@ -0,0 +1,78 @@
+"""Unit tests for the guaranteed token-count bound used by limit checks."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+from unittest import mock
+from src.tokens.tokenizer import FastTokenizer
+from src.tokens.estimate import TokenEstimator, upper_bound
+from src.execution.chat.prompt_budget import _max_candidate_user
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+
+_DIGIT_SPLIT = re.compile(r"\d|[^\W\d]+|[^\w\s]")
+
+
+class _DigitSplittingTokenizer:
+    """Letter runs are one token and every digit is its own, as in Llama-style vocabularies."""
+
+    is_fast = True
+
+    def encode(self, text: str, add_special_tokens: bool = False) -> list[int]:
+        _ = add_special_tokens
+        return [hash(match.group()) for match in _DIGIT_SPLIT.finditer(text)]
+
+    def __call__(
+        self, text: str | list[str], *, return_offsets_mapping: bool = False, **_kwargs: Any
+    ) -> dict[str, Any]:
+        if isinstance(text, list):
+            return {"input_ids": [self.encode(item) for item in text]}
+        if return_offsets_mapping:
+            return {"input_ids": self.encode(text), "offset_mapping": [m.span() for m in _DIGIT_SPLIT.finditer(text)]}
+        return {"input_ids": self.encode(text)}
+
+
+def _digit_splitting_tokenizer() -> FastTokenizer:
+    fast = object.__new__(FastTokenizer)
+    fast._initialize(_DigitSplittingTokenizer(), pool_size=1, memo_max_bytes=0)
+    return fast
+
+
+def test_bound_never_undercounts_one_token_per_byte() -> None:
+    for text in ("plain ascii text", "café au lait", "日本語のテキスト", "emoji 🎉🎉 ok", "㍿ expands"):
+        assert upper_bound(text) >= len(text.encode("utf-8"))
+
+
+def test_estimator_is_disabled_when_a_probe_exceeds_the_bound() -> None:
+    estimator = TokenEstimator.verified(lambda texts: [2 * len(text) + 3 for text in texts])
+    assert not estimator.enabled
+    assert not estimator.fits("hi", 100)
+
+
+def test_short_text_fits_without_tokenizing() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    with mock.patch.object(tokenizer, "_count_uncached", side_effect=AssertionError("tokenized")):
+        assert tokenizer.fits("hello how are you", 100)
+    assert tokenizer.estimator.avoided_rate == 1.0
+
+
+def test_text_near_the_limit_is_counted_exactly() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    text = "a b c d"
+    assert upper_bound(text) > 4
+    with mock.patch.object(tokenizer, "_count_uncached", wraps=tokenizer._count_uncached) as counted:
+        assert tokenizer.fits(text, 4)
+        assert not tokenizer.fits(text, 3)
+    assert counted.call_count == 2
+    assert tokenizer.estimator.avoided_rate == 0.0
+
+
+def test_digit_runs_are_never_waved_through_the_limit() -> None:
+    tokenizer = _digit_splitting_tokenizer()
+    assert tokenizer.estimator.enabled
+    digits = "1234567890" * 1000
+    assert tokenizer.count(digits) == 10_000
+
+    assert not tokenizer.fits(digits, 7000)
+    capped = _max_candidate_user(digits, tokenizer, max_user_tokens=7000)
+    assert tokenizer.count(capped) <= 7000
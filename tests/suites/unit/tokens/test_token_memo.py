@@ -0,0 +1,68 @@
+"""Unit tests for the content-addressed token memo."""
+
+from __future__ import annotations
+
+from unittest import mock
+from src.tokens.memo import TokenMemo
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+
+
+def test_count_memo_hits_skip_tokenization() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1, memo_max_bytes=4096)
+    assert tokenizer.count("a b c") == 3
+    with mock.patch.object(tokenizer, "_count_uncached", side_effect=AssertionError("tokenized twice")):
+        assert tokenizer.count("a b c") == 3
+    assert tokenizer.memo is not None
+    assert tokenizer.memo.hit_rate == 0.5
+
+
+def test_memo_key_includes_special_token_flag() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1, memo_max_bytes=4096)
+    memo = TokenMemo(max_bytes=4096)
+    key, _ = memo.get_count("a b", add_special_tokens=False)
+    memo.put(key, 2)
+    assert memo.get_count("a b", add_special_tokens=True)[1] is None
+    assert memo.get_count("a b", add_special_tokens=False)[1] == 2
+    assert tokenizer.count("a b", add_special_tokens=True) == tokenizer.count("a b")
+
+
+def test_encode_ids_memo_returns_independent_copies() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1, memo_max_bytes=4096)
+    first = tokenizer.encode_ids("a b c")
+    first.append(99)
+    assert tokenizer.encode_ids("a b c") == first[:-1]
+
+
+def test_cached_ids_answer_count_lookups() -> None:
+    memo = TokenMemo(max_bytes=4096)
+    key, _ = memo.get_ids("a b c")
+    memo.put(key, [4, 5, 6])
+    assert memo.get_count("a b c", add_special_tokens=False)[1] == 3
+    assert memo.get_count("a b c", add_special_tokens=True)[1] is None
+
+
+def test_memo_evicts_least_recently_used_under_byte_cap() -> None:
+    memo = TokenMemo(max_bytes=600)
+    keys = []
+    for text in ("one", "two", "three"):
+        key, _ = memo.get_count(text, add_special_tokens=False)
+        memo.put(key, len(text))
+        keys.append(key)
+    assert memo.get_count("one", add_special_tokens=False)[1] == 3
+    key, _ = memo.get_count("four", add_special_tokens=False)
+    memo.put(key, 4)
+    assert memo.size_bytes <= 600
+    assert memo.get_count("two", add_special_tokens=False)[1] is None
+    assert memo.get_count("one", add_special_tokens=False)[1] == 3
+
+
+def test_memo_skips_entries_larger_than_cap() -> None:
+    memo = TokenMemo(max_bytes=300)
+    key, _ = memo.get_ids("long")
+    memo.put(key, list(range(100)))
+    assert memo.size_bytes == 0
+    assert memo.get_ids("long")[1] is None
+
+
+def test_disabled_memo_is_none() -> None:
+    assert build_pooled_test_tokenizer(pool_size=1).memo is None
@@ -0,0 +1,103 @@
+"""Unit tests for the on-disk tokenizer cache and per-process tokenizer loads."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+from pathlib import Path
+from unittest import mock
+from src.tokens import registry
+from transformers import PreTrainedTokenizerFast
+from tokenizers import Tokenizer, models, pre_tokenizers
+from src.tokens.artifacts import load_pretrained_tokenizer
+
+_UNK_TOKEN = "[UNK]"  # noqa: S105 - vocabulary token, not a secret
+_VOCAB = {_UNK_TOKEN: 0, "hello": 1, "world": 2, "again": 3}
+
+
+def _write_source(path: Path, *, chat_template: str = "{{ messages }}") -> Path:
+    backend = Tokenizer(models.WordLevel(vocab=_VOCAB, unk_token=_UNK_TOKEN))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    hf_tok = PreTrainedTokenizerFast(tokenizer_object=backend, unk_token=_UNK_TOKEN)
+    hf_tok.chat_template = chat_template
+    hf_tok.save_pretrained(str(path))
+    return path
+
+
+class _RecordingLoader:
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+
+    def __call__(self, path_or_repo: str) -> Any:
+        self.paths.append(path_or_repo)
+        return PreTrainedTokenizerFast.from_pretrained(path_or_repo)
+
+
+def test_second_load_comes_from_disk_cache(tmp_path: Path) -> None:
+    source = _write_source(tmp_path / "source")
+    cache_dir = tmp_path / "cache"
+    loader = _RecordingLoader()
+
+    first, first_origin = load_pretrained_tokenizer(str(source), str(cache_dir), loader)
+    second, second_origin = load_pretrained_tokenizer(str(source), str(cache_dir), loader)
+
+    assert (first_origin, second_origin) == ("source", "disk cache")
+    entries = [entry for entry in cache_dir.iterdir() if not entry.name.startswith(".")]
+    assert len(entries) == 1
+    assert loader.paths == [str(source), str(entries[0])]
+    assert second.encode("hello world again") == first.encode("hello world again")
+    assert second.chat_template == first.chat_template
+
+
+def test_changed_source_files_miss_the_cache(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    loader = _RecordingLoader()
+    load_pretrained_tokenizer(str(_write_source(tmp_path / "a")), str(cache_dir), loader)
+
+    source = _write_source(tmp_path / "b", chat_template="{{ messages | length }}")
+    loaded, origin = load_pretrained_tokenizer(str(source), str(cache_dir), loader)
+
+    assert origin == "source"
+    assert loaded.chat_template == "{{ messages | length }}"
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_empty_cache_dir_loads_source_without_writing(tmp_path: Path) -> None:
+    source = _write_source(tmp_path / "source")
+    loader = _RecordingLoader()
+
+    _loaded, origin = load_pretrained_tokenizer(str(source), "", loader)
+
+    assert origin == "source"
+    assert loader.paths == [str(source)]
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["source"]
+
+
+def test_each_tokenizer_loads_once_per_process() -> None:
+    created: list[str] = []
+
+    class _FakeTokenizer:
+        loaded_from = "source"
+        load_seconds = 0.0
+
+        def __init__(self, path_or_repo: str) -> None:
+            created.append(path_or_repo)
+
+    registry.reset_tokenizers()
+    try:
+        with mock.patch.object(registry, "FastTokenizer", _FakeTokenizer):
+            results: list[Any] = []
+            threads = [
+                threading.Thread(target=lambda: results.append(registry.load_tokenizer("org/chat"))) for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            tool = registry.load_tokenizer("org/tool")
+    finally:
+        registry.reset_tokenizers()
+
+    assert created == ["org/chat", "org/tool"]
+    assert all(result is results[0] for result in results)
+    assert tool is not results[0]
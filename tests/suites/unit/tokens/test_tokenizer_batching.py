@@ -0,0 +1,53 @@
+"""Unit tests for batched FastTokenizer counting and encoding."""
+
+from __future__ import annotations
+
+from unittest import mock
+from src.tokens.tokenizer import FastTokenizer
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+from src.tokens.history import count_tool_tokens, iter_token_counts, count_tool_tokens_many
+
+_TEXTS = ["a b c", "", "d", "a b c d e", "a b c"]
+
+
+def test_count_many_matches_single_counts() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    for special in (False, True):
+        expected = [tokenizer.count(text, add_special_tokens=special) for text in _TEXTS]
+        assert tokenizer.count_many(_TEXTS, add_special_tokens=special) == expected
+
+
+def test_encode_many_matches_encode_ids() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    assert tokenizer.encode_many(_TEXTS) == [tokenizer.encode_ids(text) for text in _TEXTS]
+
+
+def test_count_many_uses_one_backend_call_and_fills_memo() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1, memo_max_bytes=4096)
+    with mock.patch.object(FastTokenizer, "_encode_batch_with", wraps=FastTokenizer._encode_batch_with) as batch:
+        first = tokenizer.count_many(_TEXTS)
+        second = tokenizer.count_many(_TEXTS)
+    assert first == second == [3, 0, 1, 5, 3]
+    assert batch.call_count == 1
+    assert batch.call_args.args[1] == ["a b c", "d", "a b c d e", "a b c"]
+
+
+def test_tool_count_many_keeps_empty_texts_at_zero() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    counts = count_tool_tokens_many(_TEXTS, tokenizer, include_special_tokens=True)
+    assert counts == [count_tool_tokens(text, tokenizer, include_special_tokens=True) for text in _TEXTS]
+    assert counts[1] == 0
+
+
+def test_iter_token_counts_pulls_candidates_one_batch_at_a_time() -> None:
+    pulled: list[int] = []
+
+    def _candidates():
+        for index in range(10):
+            pulled.append(index)
+            yield "x " * index
+
+    counted = iter_token_counts(_candidates(), lambda batch: [len(text.split()) for text in batch], batch_size=3)
+    first_fit = next(index for index, (_text, tokens) in enumerate(counted) if tokens >= 4)
+    assert first_fit == 4
+    assert pulled == [0, 1, 2, 3, 4, 5]
@@ -0,0 +1,79 @@
+"""Unit tests for the FastTokenizer async facade and tokenization executor."""
+
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+from unittest import mock
+from src.tokens.history import offload_token_work
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+
+
+def test_async_facade_matches_sync_results() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=2)
+
+    async def _run() -> tuple[int, int, list[int], list[int]]:
+        return (
+            await tokenizer.acount("a b c d"),
+            await tokenizer.acount("a b", add_special_tokens=True),
+            await tokenizer.aencode_ids("a b c"),
+            await tokenizer.acount_many(["a", "", "a b c"]),
+        )
+
+    counted, special, ids, many = asyncio.run(_run())
+    assert counted == tokenizer.count("a b c d")
+    assert special == tokenizer.count("a b", add_special_tokens=True)
+    assert ids == tokenizer.encode_ids("a b c")
+    assert many == [1, 0, 3]
+
+
+def test_offload_runs_on_tokenizer_threads() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+
+    async def _thread_name() -> str:
+        return await tokenizer.offload(lambda: threading.current_thread().name)
+
+    assert asyncio.run(_thread_name()).startswith("tokenizer")
+
+
+def test_memo_hits_are_answered_without_executor_hop() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1, memo_max_bytes=4096)
+
+    async def _run() -> tuple[int, list[int]]:
+        await tokenizer.acount("a b c")
+        await tokenizer.aencode_ids("a b")
+        with mock.patch.object(tokenizer, "offload", side_effect=AssertionError("unexpected offload")):
+            return await tokenizer.acount("a b c"), await tokenizer.aencode_ids("a b")
+
+    assert asyncio.run(_run()) == (3, tokenizer.encode_ids("a b"))
+
+
+def test_offloaded_work_does_not_block_the_loop() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    ticks = 0
+
+    async def _ticker(stop: asyncio.Event) -> None:
+        nonlocal ticks
+        while not stop.is_set():
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    async def _run() -> None:
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_ticker(stop))
+        await tokenizer.offload(time.sleep, 0.1)
+        stop.set()
+        await ticker
+
+    asyncio.run(_run())
+    assert ticks >= 5
+
+
+def test_offload_token_work_runs_inline_without_tokenizer() -> None:
+    caller = threading.current_thread().name
+
+    async def _thread_name() -> str:
+        return await offload_token_work(None, lambda: threading.current_thread().name)
+
+    assert asyncio.run(_thread_name()) == caller
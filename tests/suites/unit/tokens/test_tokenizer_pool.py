@@ -0,0 +1,49 @@
+"""Unit tests for the FastTokenizer instance pool."""
+
+from __future__ import annotations
+
+import pytest
+import threading
+from src.tokens.tokenizer import FastTokenizer
+from concurrent.futures import ThreadPoolExecutor
+from tests.support.helpers.tokenizer import build_pooled_test_tokenizer
+
+
+def test_pool_holds_independent_instances() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=3)
+    with tokenizer._checkout() as first, tokenizer._checkout() as second, tokenizer._checkout() as third:
+        assert len({id(first), id(second), id(third)}) == 3
+    assert tokenizer.pool_size == 3
+
+
+def test_checkout_waits_for_a_returned_instance() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=1)
+    started = threading.Event()
+
+    def _count_after_signal() -> int:
+        started.set()
+        return tokenizer.count("a b c")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with tokenizer._checkout():
+            future = executor.submit(_count_after_signal)
+            assert started.wait(timeout=5)
+            assert not future.done()
+        assert future.result(timeout=5) == 3
+
+
+def test_concurrent_calls_match_serial_results() -> None:
+    tokenizer = build_pooled_test_tokenizer(pool_size=2)
+    texts = [" ".join(["a", "b", "c", "d"][: i % 4 + 1]) for i in range(64)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        counts = list(executor.map(tokenizer.count, texts))
+        trims = list(executor.map(lambda text: tokenizer.trim(text, 2, keep="start"), texts))
+    assert counts == [len(text.split()) for text in texts]
+    assert trims == [" ".join(text.split()[:2]) for text in texts]
+    with tokenizer._checkout(), tokenizer._checkout():
+        pass
+
+
+def test_pool_size_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="pool_size must be >= 1"):
+        FastTokenizer("unused", pool_size=0)
@@ -0,0 +1,45 @@
+"""Unit tests for the sharded connection registry and connection admission."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+from src.handlers.registry import ShardedRegistry
+from src.handlers.connections import ConnectionHandler
+
+
+def test_registry_rounds_shards_and_sums_them_lazily() -> None:
+    registry: ShardedRegistry[str, int] = ShardedRegistry(shards=5)
+    for index in range(64):
+        assert registry.add(f"session-{index}", index)
+
+    assert len(registry.shard_sizes()) == 8
+    assert sum(registry.shard_sizes()) == len(registry) == 64
+    assert sum(1 for size in registry.shard_sizes() if size) > 1
+    assert sorted(registry.values()) == list(range(64))
+
+
+def test_registry_add_and_discard_report_changes() -> None:
+    registry: ShardedRegistry[str, int] = ShardedRegistry(shards=2)
+    assert registry.add("a", 1)
+    assert not registry.add("a", 2)
+    assert registry["a"] == 1
+    assert registry.discard("a")
+    assert not registry.discard("a")
+    assert "a" not in registry
+
+
+def test_connection_slots_are_released_once_per_connection() -> None:
+    handler = ConnectionHandler(max_connections=2, acquire_timeout=0.01)
+    first, second, third, fourth = (cast(Any, object()) for _ in range(4))
+
+    async def _scenario() -> list[bool]:
+        results = [await handler.connect(first), await handler.connect(first), await handler.connect(second)]
+        results.append(await handler.connect(third))
+        await handler.disconnect(first)
+        await handler.disconnect(first)
+        results.append(await handler.connect(fourth))
+        return results
+
+    assert asyncio.run(_scenario()) == [True, True, True, False, True]
+    assert handler.get_capacity_info()["active"] == 2
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import json
 import asyncio
+from src.state import SentenceBoundary
 from fastapi import WebSocketDisconnect
 from src.state.session import SessionState
-from src.config import DEFAULT_CHECK_SCREEN_PREFIX
 from src.handlers.session.manager import SessionHandler
 from src.handlers.websocket.helpers import stream_chat_response
 from src.handlers.session.history.settings import HistoryRuntimeConfig
@@ -16,6 +17,14 @@ class _NoopWS:
         return None
 
 
+class _RecordingWS:
+    def __init__(self) -> None:
+        self.frames: list[dict] = []
+
+    async def send_text(self, text: str) -> None:
+        self.frames.append(json.loads(text))
+
+
 class _DisconnectAfterSecondSendWS:
     def __init__(self) -> None:
         self._send_count = 0
@@ -54,9 +63,17 @@ async def _two_chunk_stream():
     yield "beta"
 
 
+async def _sentence_stream():
+    yield "Hi there."
+    yield " How"
+    yield SentenceBoundary(index=0, text="Hi there.")
+    yield " are you?"
+    yield SentenceBoundary(index=1, text="How are you?")
+
+
 def test_stream_chat_response_skips_history_for_empty_output_without_provisional_turn() -> None:
     handler = _build_handler()
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
     out = asyncio.run(
@@ -76,7 +93,7 @@ def test_stream_chat_response_skips_history_for_empty_output_without_provisional
 
 def test_stream_chat_response_skips_history_for_error_before_visible_text() -> None:
     handler = _build_handler()
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
     try:
@@ -100,7 +117,7 @@ def test_stream_chat_response_skips_history_for_error_before_visible_text() -> N
 
 def test_stream_chat_response_commits_partial_history_after_disconnect_with_visible_text() -> None:
     handler = _build_handler()
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
     out = asyncio.run(
@@ -124,7 +141,7 @@ def test_stream_chat_response_commits_partial_history_after_disconnect_with_visi
 
 def test_stream_chat_response_skips_commit_when_history_user_is_empty() -> None:
     handler = _build_handler()
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
     out = asyncio.run(
@@ -142,9 +159,9 @@ def test_stream_chat_response_skips_commit_when_history_user_is_empty() -> None:
     assert state.chat_history_messages == []
 
 
-def test_stream_chat_response_does_not_persist_internal_screen_prefixes() -> None:
+def test_stream_chat_response_commits_the_user_segment_verbatim() -> None:
     handler = _build_handler()
-    state = SessionState(meta={})
+    state = SessionState()
     handler.initialize_session(state)
 
     out = asyncio.run(
@@ -152,8 +169,8 @@ def test_stream_chat_response_does_not_persist_internal_screen_prefixes() -> Non
             _NoopWS(),
             _two_chunk_stream(),
             state,
-            f"{DEFAULT_CHECK_SCREEN_PREFIX} hello",
-            history_user_utt=f"{DEFAULT_CHECK_SCREEN_PREFIX} hello can you help me plan a trip",
+            "hello",
+            history_user_utt="hello can you help me plan a trip",
             session_handler=handler,
         )
     )
@@ -164,3 +181,33 @@ def test_stream_chat_response_does_not_persist_internal_screen_prefixes() -> Non
         ("user", "hello can you help me plan a trip"),
         ("assistant", "alphabeta"),
     ]
+
+
+def test_stream_chat_response_sends_sentence_frames_outside_final_text() -> None:
+    handler = _build_handler()
+    state = SessionState()
+    handler.initialize_session(state)
+    ws = _RecordingWS()
+
+    out = asyncio.run(
+        stream_chat_response(
+            ws,
+            _sentence_stream(),
+            state,
+            "hello",
+            session_handler=handler,
+        )
+    )
+
+    assert out == "Hi there. How are you?"
+    assert [frame["type"] for frame in ws.frames] == [
+        "token",
+        "token",
+        "sentence",
+        "token",
+        "sentence",
+        "final",
+        "done",
+    ]
+    assert ws.frames[2] == {"type": "sentence", "index": 0, "text": "Hi there."}
+    assert ws.frames[4] == {"type": "sentence", "index": 1, "text": "How are you?"}
@@ -37,7 +37,7 @@ def _make_handler() -> SessionHandler:
 def test_spawn_session_task_cleans_up_after_success() -> None:
     async def scenario() -> None:
         ws = _NoopWS()
-        state = SessionState(meta={})
+        state = SessionState()
         handler = _make_handler()
 
         task = await spawn_session_task(
@@ -60,7 +60,7 @@ def test_spawn_session_task_cleans_up_after_success() -> None:
 def test_spawn_session_task_sends_internal_error_on_failure() -> None:
     async def scenario() -> None:
         ws = _NoopWS()
-        state = SessionState(meta={})
+        state = SessionState()
         handler = _make_handler()
 
         task = await spawn_session_task(
@@ -86,7 +86,7 @@ def test_spawn_session_task_sends_internal_error_on_failure() -> None:
 def test_spawn_session_task_swallows_expected_disconnect_errors() -> None:
     async def scenario() -> None:
         ws = _NoopWS()
-        state = SessionState(meta={})
+        state = SessionState()
         handler = _make_handler()
 
         task = await spawn_session_task(
@@ -6,8 +6,9 @@ import time
 import asyncio
 from collections import deque
 from types import SimpleNamespace
-from collections.abc import Callable
 import src.handlers.websocket.auth as auth_mod
+from src.handlers.registry import ShardedRegistry
+from collections.abc import Callable, MutableMapping
 from src.config.websocket import WS_RATE_LIMIT_WINDOW
 
 
@@ -21,7 +22,7 @@ def _run_auth(
     headers: dict[str, str],
     *,
     auth_config: auth_mod.AuthRuntimeConfig,
-    auth_failures: dict[str, deque[float]],
+    auth_failures: MutableMapping[str, deque[float]],
     now_fn: Callable[[], float] = time.monotonic,
 ) -> bool:
     ws = _FakeWebSocket(headers=headers)
@@ -90,3 +91,16 @@ def test_auth_throttles_repeated_failures() -> None:
 
     # Third attempt is throttled even with a valid key.
     assert _run_auth({"x-api-key": "secret"}, auth_config=config, auth_failures=failures, now_fn=fixed_now) is False
+
+
+def test_auth_forgets_clients_whose_failures_expired() -> None:
+    config = _auth_config(max_failures=2, window_seconds=10.0)
+    failures: ShardedRegistry[str, deque[float]] = ShardedRegistry(shards=4)
+    clock = [100.0]
+
+    assert _run_auth({"x-api-key": "bad"}, auth_config=config, auth_failures=failures, now_fn=lambda: clock[0]) is False
+    assert len(failures) == 1
+
+    clock[0] = 200.0
+    assert _run_auth({"x-api-key": "secret"}, auth_config=config, auth_failures=failures, now_fn=lambda: clock[0])
+    assert len(failures) == 0
@@ -9,8 +9,13 @@ import contextlib
 from typing import TypedDict
 from urllib.parse import urlsplit
 from tests.state import SessionContext
+from tests.state.metrics import StreamState
 from tests.support.helpers.websocket import (
     ws as ws_helpers,
+    stream as stream_helpers,
+    record_token,
+    record_sentence,
+    finalize_metrics,
     build_start_payload,
     build_message_payload,
     resolve_start_payload_mode,
@@ -256,3 +261,25 @@ def test_resolve_start_payload_mode_maps_deploy_settings(
         )
         == expected
     )
+
+
+def _clock_at(monkeypatch: pytest.MonkeyPatch, seconds: float) -> None:
+    monkeypatch.setattr(stream_helpers.time, "perf_counter", lambda: seconds)
+
+
+def test_first_sentence_timing_comes_from_the_sentence_frame(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = StreamState(sent_ts=10.0)
+    _clock_at(monkeypatch, 10.1)
+    assert "time_to_first_complete_sentence_ms" not in record_token(state, "Hello there. ")
+    _clock_at(monkeypatch, 10.3)
+    assert record_sentence(state)["time_to_first_complete_sentence_ms"] == pytest.approx(300.0)
+    _clock_at(monkeypatch, 10.5)
+    assert finalize_metrics(state)["time_to_first_complete_sentence_ms"] == pytest.approx(300.0)
+
+
+def test_first_sentence_timing_falls_back_to_token_text_without_frames(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = StreamState(sent_ts=10.0)
+    _clock_at(monkeypatch, 10.2)
+    record_token(state, "Hello there. ")
+    _clock_at(monkeypatch, 10.5)
+    assert finalize_metrics(state)["time_to_first_complete_sentence_ms"] == pytest.approx(200.0)
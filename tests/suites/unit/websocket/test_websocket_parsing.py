@@ -127,3 +127,10 @@ def test_message_payload_size_limit() -> None:
     huge = "x" * 70000
     with pytest.raises(ValueError, match="exceeds max size"):
         parse_client_message(huge)
+
+
+def test_resume_requires_token() -> None:
+    result = parse_client_message(json.dumps({"type": "resume", "v": WS_PROTOCOL_VERSION, "resume_token": "abc"}))
+    assert result == {"type": "resume", "v": WS_PROTOCOL_VERSION, "resume_token": "abc"}
+    with pytest.raises(ValueError, match="resume_token"):
+        parse_client_message(json.dumps({"type": "resume", "v": WS_PROTOCOL_VERSION}))
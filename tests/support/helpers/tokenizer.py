@@ -3,15 +3,17 @@
 from __future__ import annotations
 
 import re
-from threading import Lock
 from typing import Any, cast
 from functools import lru_cache
-from collections.abc import Iterator
 from contextlib import contextmanager
+from collections.abc import Callable, Iterator
 from src.tokens.tokenizer import FastTokenizer
+from src.tokens.offsets import cut_to_token_budget
 from tests.config.tokenizer import TEST_TOKENIZER_VOCAB
 from src.tokens.registry import reset_tokenizers, configure_tokenizers
 
+_WORD_PATTERN = re.compile(r"\S+")
+
 
 class _FakeTransformersTokenizer:
     def __init__(self, vocab: dict[str, int]) -> None:
@@ -19,20 +21,28 @@ class _FakeTransformersTokenizer:
         self._reverse_vocab = {idx: token for token, idx in vocab.items()}
         self._unk_id = vocab["[UNK]"]
 
+    is_fast = True
+
     def encode(self, text: str, add_special_tokens: bool = False) -> list[int]:
         _ = add_special_tokens
         return [self._vocab.get(token, self._unk_id) for token in text.split()]
 
     def __call__(
         self,
-        text: str,
+        text: str | list[str],
         *,
         add_special_tokens: bool = False,
         return_attention_mask: bool = False,
         return_token_type_ids: bool = False,
-    ) -> dict[str, list[int]]:
+        return_offsets_mapping: bool = False,
+    ) -> dict[str, Any]:
         _ = return_attention_mask
         _ = return_token_type_ids
+        if return_offsets_mapping and isinstance(text, str):
+            spans = [match.span() for match in _WORD_PATTERN.finditer(text)]
+            return {"input_ids": self.encode(text), "offset_mapping": spans}
+        if isinstance(text, list):
+            return {"input_ids": [self.encode(item, add_special_tokens=add_special_tokens) for item in text]}
         return {"input_ids": self.encode(text, add_special_tokens=add_special_tokens)}
 
     def decode(
@@ -48,8 +58,6 @@ class _FakeTransformersTokenizer:
 
 
 _PUNCT_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z0-9]+)?|[^\w\s]", re.UNICODE)
-_ATTACHED_PUNCT = {".", ",", "!", "?", ";", ":", "%", ")", "]", "}"}
-_OPENING_PUNCT = {"(", "[", "{", "/", "$", "#"}
 
 
 class _PunctuationAwareTokenizer:
@@ -70,36 +78,52 @@ class _PunctuationAwareTokenizer:
             self._reverse_vocab[token_id] = token
         return token_id
 
-    def _decode_tokens(self, tokens: list[str]) -> str:
-        if not tokens:
-            return ""
-
-        out = tokens[0]
-        for token in tokens[1:]:
-            if token in _ATTACHED_PUNCT or out[-1] in _OPENING_PUNCT:
-                out += token
-            else:
-                out += f" {token}"
-        return out
-
     def count(self, text: str, *, add_special_tokens: bool = False) -> int:
         token_count = len(self._tokenize(text))
         if add_special_tokens:
             return token_count + 2
         return token_count
 
+    def fits(self, text: str, max_tokens: int) -> bool:
+        return self.count(text) <= max_tokens
+
     def trim(self, text: str, max_tokens: int, keep: str = "end") -> str:
-        if max_tokens <= 0 or not text:
-            return ""
-        tokens = self._tokenize(text)
-        if len(tokens) <= max_tokens:
-            return text.strip()
-        kept = tokens[:max_tokens] if keep == "start" else tokens[-max_tokens:]
-        return self._decode_tokens(kept)
+        return self.trim_with_count(text, max_tokens, keep=keep)[0]
 
     def encode_ids(self, text: str) -> list[int]:
         return [self._token_id(token) for token in self._tokenize(text)]
 
+    @property
+    def supports_offsets(self) -> bool:
+        return True
+
+    def token_offsets(self, text: str) -> list[tuple[int, int]]:
+        return [match.span() for match in _PUNCT_TOKEN_PATTERN.finditer(text)]
+
+    def trim_with_count(self, text: str, max_tokens: int, keep: str = "end") -> tuple[str, int]:
+        return cut_to_token_budget(text, self.token_offsets(text), max_tokens, keep)
+
+    def count_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        return [self.count(text, add_special_tokens=add_special_tokens) for text in texts]
+
+    def encode_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[list[int]]:
+        encoded = [self.encode_ids(text) for text in texts]
+        if add_special_tokens:
+            return [[0, *ids, 1] for ids in encoded]
+        return encoded
+
+    async def acount(self, text: str, *, add_special_tokens: bool = False) -> int:
+        return self.count(text, add_special_tokens=add_special_tokens)
+
+    async def aencode_ids(self, text: str) -> list[int]:
+        return self.encode_ids(text)
+
+    async def acount_many(self, texts: list[str], *, add_special_tokens: bool = False) -> list[int]:
+        return self.count_many(texts, add_special_tokens=add_special_tokens)
+
+    async def offload(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        return fn(*args, **kwargs)
+
     def apply_chat_template(
         self,
         messages: list[dict[str, str]],
@@ -114,14 +138,21 @@ class _PunctuationAwareTokenizer:
         return "\n".join(lines)
 
 
-@lru_cache(maxsize=1)
-def _build_test_tokenizer() -> FastTokenizer:
+def build_pooled_test_tokenizer(pool_size: int, memo_max_bytes: int = 0) -> FastTokenizer:
     fast = object.__new__(FastTokenizer)
-    fast._lock = Lock()
-    fast._hf_tok = _FakeTransformersTokenizer(TEST_TOKENIZER_VOCAB)
+    fast._initialize(
+        _FakeTransformersTokenizer(TEST_TOKENIZER_VOCAB),
+        pool_size=pool_size,
+        memo_max_bytes=memo_max_bytes,
+    )
     return fast
 
 
+@lru_cache(maxsize=1)
+def _build_test_tokenizer() -> FastTokenizer:
+    return build_pooled_test_tokenizer(pool_size=2)
+
+
 @contextmanager
 def use_local_tokenizers() -> Iterator[FastTokenizer]:
     tokenizer = _build_test_tokenizer()
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from . import ws
-from .stream import record_token, consume_stream, create_tracker, record_toolcall, finalize_metrics
 from .message import iter_messages, parse_message, dispatch_message, bootstrap_session, send_initial_user_turn
 from .ws import recv_raw, ws_connect, with_api_key, send_client_end, connect_with_retries, build_api_key_headers
+from .stream import record_token, consume_stream, create_tracker, record_sentence, record_toolcall, finalize_metrics
 from .payloads import (
     build_end_payload,
     build_start_payload,
@@ -31,6 +31,7 @@ __all__ = [
     "iter_messages",
     "parse_message",
     "record_token",
+    "record_sentence",
     "record_toolcall",
     "recv_raw",
     "resolve_start_payload_mode",
@@ -60,17 +60,33 @@ def record_token(state: StreamState, chunk: str) -> dict[str, float | None]:
         state.first_3_words_ts = time.perf_counter()
         metrics["time_to_first_3_words_ms"] = _ms_since_sent(state, state.first_3_words_ts)
 
-    if state.first_sentence_ts is None and contains_complete_sentence(state.final_text):
-        state.first_sentence_ts = time.perf_counter()
-        metrics["time_to_first_complete_sentence_ms"] = _ms_since_sent(state, state.first_sentence_ts)
+    # Fallback only: servers that emit sentence frames own this timestamp
+    if state.text_sentence_ts is None and contains_complete_sentence(state.final_text):
+        state.text_sentence_ts = time.perf_counter()
 
     state.chunks += 1
     return metrics
 
 
+def record_sentence(state: StreamState) -> dict[str, float | None]:
+    """Record a server-side sentence boundary frame."""
+    metrics: dict[str, float | None] = {}
+    if state.first_sentence_ts is None:
+        state.first_sentence_ts = time.perf_counter()
+        metrics["time_to_first_complete_sentence_ms"] = _ms_since_sent(state, state.first_sentence_ts)
+    return metrics
+
+
 def finalize_metrics(state: StreamState, cancelled: bool = False) -> dict[str, Any]:
-    """Build the final metrics dict after streaming completes."""
+    """Build the final metrics dict after streaming completes.
+
+    First-sentence timing comes from the server's sentence frame; the
+    token-text check is used only when no sentence frame arrived.
+    """
     done_ts = time.perf_counter()
+    sentence_ts = state.first_sentence_ts
+    if sentence_ts is None:
+        sentence_ts = state.text_sentence_ts
     ttfb_ms = _ms_since_sent(state, state.first_token_ts)
     stream_ms = None
     if state.first_token_ts is not None:
@@ -83,7 +99,7 @@ def finalize_metrics(state: StreamState, cancelled: bool = False) -> dict[str, A
         "ttfb_toolcall_ms": round_ms(state.toolcall_ttfb_ms),
         "total_ms": round_ms(total_ms),
         "stream_ms": round_ms(stream_ms),
-        "time_to_first_complete_sentence_ms": round_ms(_ms_since_sent(state, state.first_sentence_ts)),
+        "time_to_first_complete_sentence_ms": round_ms(_ms_since_sent(state, sentence_ts)),
         "time_to_first_3_words_ms": round_ms(_ms_since_sent(state, state.first_3_words_ts)),
         "chunks": state.chunks,
         "chars": len(state.final_text),
@@ -110,6 +126,10 @@ async def consume_stream(ws, state: StreamState) -> str:
             record_token(state, msg.get("text", ""))
             continue
 
+        if msg_type == "sentence":
+            record_sentence(state)
+            continue
+
         if msg_type == "final":
             final_text = msg.get("text")
             if final_text:
@@ -132,6 +152,7 @@ __all__ = [
     "create_tracker",
     "record_toolcall",
     "record_token",
+    "record_sentence",
     "finalize_metrics",
     "consume_stream",
 ]
@@ -21,6 +21,7 @@ from tests.support.helpers.websocket import (
     with_api_key,
     iter_messages,
     create_tracker,
+    record_sentence,
     record_toolcall,
     send_client_end,
     finalize_metrics,
@@ -106,6 +107,10 @@ async def _consume_stream(
                 record_token(state, msg.get("text", ""))
                 continue
 
+            if msg_type == "sentence":
+                record_sentence(state)
+                continue
+
             if msg_type == "final":
                 normalized = msg.get("normalized_text")
                 if normalized:
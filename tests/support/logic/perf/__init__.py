@@ -0,0 +1,23 @@
+"""Offline CPU benchmarks for text and token hot paths."""
+
+from .seed import run_seed_import_bench, print_seed_import_report
+from .sanitizer import run_sanitizer_bench, print_sanitizer_report
+from .tokenizer import run_tokenizer_bench, print_tokenizer_report
+from .event_loop import run_event_loop_bench, print_event_loop_report
+from .history import run_history_trim_bench, print_history_trim_report
+from .session import run_session_memory_bench, print_session_memory_report
+
+__all__ = [
+    "run_sanitizer_bench",
+    "print_sanitizer_report",
+    "run_tokenizer_bench",
+    "print_tokenizer_report",
+    "run_event_loop_bench",
+    "print_event_loop_report",
+    "run_history_trim_bench",
+    "print_history_trim_report",
+    "run_seed_import_bench",
+    "print_seed_import_report",
+    "run_session_memory_bench",
+    "print_session_memory_report",
+]
@@ -0,0 +1,168 @@
+"""Offline event-loop block time per chat turn.
+
+Replays chat turns through SessionHandler and the exact prompt fitter twice:
+once calling the synchronous fitter, completion count and history append
+directly on the event loop ("inline", the pre-executor behaviour) and once
+through the tokenizer's async facade ("offloaded"). A heartbeat task ticks
+every ``tick_ms``; lateness beyond the tick is time the loop could not serve
+any other session. Reports mean and worst blocked time per turn next to the
+turn wall time. The token memo is disabled so every turn pays the full
+tokenization cost.
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+from typing import Any
+from src.state.session import SessionState
+from src.tokens.tokenizer import FastTokenizer
+from src.handlers.session.manager import SessionHandler
+from .tokenizer import bench_corpus, build_bench_tokenizer
+from tests.support.helpers.fmt import dim, bold, section_header
+from src.execution.chat.prompt_budget import fit_chat_prompt_to_budget
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+
+_MAX_PROMPT_TOKENS = 1024
+_CHAT_TRIGGER_TOKENS = 700
+_CHAT_TARGET_TOKENS = 500
+
+# (persona, user utterance, assistant reply)
+_Turn = tuple[str, str, str]
+
+
+class _Heartbeat:
+    """Ticks on the loop and accumulates lateness past each tick."""
+
+    def __init__(self, tick_s: float) -> None:
+        self._tick_s = tick_s
+        self.lags: list[float] = []
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(self._tick_s)
+            self.lags.append(max(0.0, time.perf_counter() - started - self._tick_s))
+
+
+def _build_session(tokenizer: FastTokenizer) -> tuple[SessionHandler, SessionState]:
+    handler = SessionHandler(
+        chat_tokenizer=tokenizer,
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=False,
+            chat_trigger_tokens=_CHAT_TRIGGER_TOKENS,
+            chat_target_tokens=_CHAT_TARGET_TOKENS,
+            default_tool_history_tokens=None,
+        ),
+    )
+    state = SessionState()
+    handler.initialize_session(state)
+    return handler, state
+
+
+async def _inline_turn(handler: SessionHandler, state: SessionState, tokenizer: FastTokenizer, turn: _Turn) -> None:
+    persona, user, reply = turn
+    fit = fit_chat_prompt_to_budget(
+        persona,
+        "",
+        handler.get_chat_messages(state),
+        user,
+        tokenizer,
+        max_prompt_tokens=_MAX_PROMPT_TOKENS,
+    )
+    await asyncio.sleep(0)
+    tokenizer.count(reply)
+    handler.append_chat_turn(state, fit.chat_user_utt, reply)
+
+
+async def _offloaded_turn(
+    handler: SessionHandler,
+    state: SessionState,
+    tokenizer: FastTokenizer,
+    turn: _Turn,
+) -> None:
+    persona, user, reply = turn
+    fit = await tokenizer.offload(
+        fit_chat_prompt_to_budget,
+        persona,
+        "",
+        handler.get_chat_messages(state),
+        user,
+        tokenizer,
+        max_prompt_tokens=_MAX_PROMPT_TOKENS,
+    )
+    await asyncio.sleep(0)
+    await tokenizer.acount(reply)
+    await handler.aappend_chat_turn(state, fit.chat_user_utt, reply)
+
+
+async def _measure(
+    turn_fn: Any,
+    tokenizer: FastTokenizer,
+    corpus: list[str],
+    turns: int,
+    tick_s: float,
+) -> dict[str, float]:
+    handler, state = _build_session(tokenizer)
+    persona = " ".join(corpus[:2])
+    heartbeat = _Heartbeat(tick_s)
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat.run(stop))
+    blocked: list[float] = []
+    worst_lag: list[float] = []
+    walls: list[float] = []
+    for idx in range(turns):
+        await asyncio.sleep(tick_s * 2)
+        heartbeat.lags.clear()
+        started = time.perf_counter()
+        turn = (persona, corpus[idx % len(corpus)], corpus[(idx + 3) % len(corpus)])
+        await turn_fn(handler, state, tokenizer, turn)
+        walls.append(time.perf_counter() - started)
+        await asyncio.sleep(tick_s * 2)
+        blocked.append(sum(heartbeat.lags))
+        worst_lag.append(max(heartbeat.lags, default=0.0))
+    stop.set()
+    await ticker
+    return {
+        "mean_blocked_ms": sum(blocked) / turns * 1e3,
+        "max_blocked_ms": max(blocked) * 1e3,
+        "max_lag_ms": max(worst_lag) * 1e3,
+        "mean_wall_ms": sum(walls) / turns * 1e3,
+    }
+
+
+def run_event_loop_bench(*, tokenizer_path: str | None, turns: int, tick_ms: float) -> dict[str, Any]:
+    """Measure event-loop block time per chat turn, inline vs offloaded."""
+    corpus = bench_corpus()
+    tokenizer = build_bench_tokenizer(tokenizer_path, corpus, 1)
+    tick_s = tick_ms / 1e3
+    try:
+        results = {
+            "inline": asyncio.run(_measure(_inline_turn, tokenizer, corpus, turns, tick_s)),
+            "offloaded": asyncio.run(_measure(_offloaded_turn, tokenizer, corpus, turns, tick_s)),
+        }
+    finally:
+        tokenizer.shutdown()
+    return {
+        "tokenizer": tokenizer_path or "offline byte-level BPE",
+        "turns": turns,
+        "tick_ms": tick_ms,
+        "results": results,
+    }
+
+
+def print_event_loop_report(result: dict[str, Any]) -> None:
+    """Print a human-readable event-loop block time summary."""
+    print(section_header("EVENT LOOP BLOCK TIME"))
+    print(f"{result['tokenizer']}: {result['turns']} chat turns, heartbeat every {result['tick_ms']:.1f}ms")
+    print(dim("mode        blocked/turn   worst turn   worst lag   wall/turn"))
+    for label, row in result["results"].items():
+        blocked = bold(f"{row['mean_blocked_ms']:>10.2f}ms")
+        print(
+            f"{label:<10} {blocked} {row['max_blocked_ms']:>10.2f}ms"
+            f" {row['max_lag_ms']:>9.2f}ms {row['mean_wall_ms']:>9.2f}ms"
+        )
+
+
+__all__ = ["run_event_loop_bench", "print_event_loop_report"]
@@ -0,0 +1,124 @@
+"""Offline chat-history trim cost for large imported histories.
+
+Builds the history benchmark's warm-history import at several sizes by
+cycling ``WARM_HISTORY`` and trims it to the chat history target three ways:
+
+- ``rerender``: reference for the old strategy, which dropped the oldest turn
+  and re-rendered and re-tokenized the whole transcript after every drop
+  (quadratic; only run up to ``_RERENDER_MAX_MESSAGES``)
+- ``import``: ``plan_chat_trim`` on freshly imported messages, so every
+  message is tokenized once in one batch
+- ``append``: ``plan_chat_trim`` after one appended exchange on the trimmed
+  store, the per-turn cost of a full suffix scan once counts are cached
+- ``evict``: the same append through ``trim_chat_history``, which checks
+  the store's running total and evicts head turns in place
+
+The token memo is disabled so every variant pays the full tokenization cost.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from src.state.history import HistoryStore
+from src.tokens.tokenizer import FastTokenizer
+from src.state.session import ChatMessage, SessionState
+from tests.support.messages.history import WARM_HISTORY
+from .tokenizer import bench_corpus, build_bench_tokenizer
+from tests.support.helpers.fmt import dim, bold, section_header
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from src.helpers.chat_history import group_chat_turns, flatten_chat_turns
+from src.handlers.session.history import plan_chat_trim, render_history, trim_chat_history
+
+_CHAT_TRIGGER_TOKENS = 3000
+_CHAT_TARGET_TOKENS = 2000
+_RERENDER_MAX_MESSAGES = 2000
+
+_CONFIG = HistoryRuntimeConfig(
+    deploy_chat=True,
+    deploy_tool=False,
+    chat_trigger_tokens=_CHAT_TRIGGER_TOKENS,
+    chat_target_tokens=_CHAT_TARGET_TOKENS,
+    default_tool_history_tokens=None,
+)
+
+
+def _imported_messages(count: int) -> list[ChatMessage]:
+    return [
+        ChatMessage(role="user" if item["role"] == "user" else "assistant", content=f"{item['content']} ({index})")
+        for index, item in enumerate(WARM_HISTORY[idx % len(WARM_HISTORY)] for idx in range(count))
+    ]
+
+
+def _rerender_trim(messages: list[ChatMessage], tokenizer: FastTokenizer) -> list[ChatMessage]:
+    turns = group_chat_turns(messages)
+    while len(turns) > 1 and tokenizer.count(render_history(flatten_chat_turns(turns))) > _CHAT_TARGET_TOKENS:
+        turns.pop(0)
+    return flatten_chat_turns(turns)
+
+
+def _timed(fn: Any, *args: Any, **kwargs: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1e3
+
+
+def _measure(tokenizer: FastTokenizer, count: int) -> dict[str, Any]:
+    rerender_ms: float | None = None
+    if count <= _RERENDER_MAX_MESSAGES:
+        reference, rerender_ms = _timed(_rerender_trim, _imported_messages(count), tokenizer)
+    kept, import_ms = _timed(
+        plan_chat_trim,
+        _imported_messages(count),
+        config=_CONFIG,
+        chat_tokenizer=tokenizer,
+        trigger_tokens=_CHAT_TARGET_TOKENS,
+    )
+    kept = kept or []
+    if rerender_ms is not None and [m.content for m in reference] != [m.content for m in kept]:
+        raise AssertionError(f"trim mismatch at {count} messages")
+    appended = [*kept, *_imported_messages(2)]
+    _result, append_ms = _timed(plan_chat_trim, appended, config=_CONFIG, chat_tokenizer=tokenizer)
+    state = SessionState(chat_history_messages=HistoryStore(kept))
+    trim_chat_history(state, config=_CONFIG, chat_tokenizer=tokenizer)
+    (state.chat_history_messages or HistoryStore()).extend(_imported_messages(2))
+    _result, evict_ms = _timed(trim_chat_history, state, config=_CONFIG, chat_tokenizer=tokenizer)
+    return {
+        "messages": count,
+        "kept": len(kept),
+        "rerender_ms": rerender_ms,
+        "import_ms": import_ms,
+        "append_ms": append_ms,
+        "evict_ms": evict_ms,
+    }
+
+
+def run_history_trim_bench(*, tokenizer_path: str | None, sizes: list[int]) -> dict[str, Any]:
+    """Measure chat-history trim time for imported histories of each size."""
+    tokenizer = build_bench_tokenizer(tokenizer_path, bench_corpus(), 1)
+    try:
+        rows = [_measure(tokenizer, count) for count in sizes]
+    finally:
+        tokenizer.shutdown()
+    return {
+        "tokenizer": tokenizer_path or "offline byte-level BPE",
+        "target_tokens": _CHAT_TARGET_TOKENS,
+        "rows": rows,
+    }
+
+
+def print_history_trim_report(result: dict[str, Any]) -> None:
+    """Print a human-readable history trim benchmark summary."""
+    print(section_header("HISTORY TRIM"))
+    print(f"{result['tokenizer']}: imported history trimmed to {result['target_tokens']} tokens")
+    print(dim("messages   kept    rerender      import      append       evict"))
+    for row in result["rows"]:
+        rerender = "skipped" if row["rerender_ms"] is None else f"{row['rerender_ms']:.1f}ms"
+        import_ms = bold(f"{row['import_ms']:>9.1f}ms")
+        print(
+            f"{row['messages']:>8} {row['kept']:>6} {rerender:>11} {import_ms} "
+            f"{row['append_ms']:>9.2f}ms {row['evict_ms']:>9.2f}ms"
+        )
+
+
+__all__ = ["run_history_trim_bench", "print_history_trim_report"]
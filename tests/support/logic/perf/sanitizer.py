@@ -0,0 +1,102 @@
+"""Offline StreamingSanitizer throughput and fast-path skip-rate benchmark.
+
+Streams the sanitizer regression corpus through StreamingSanitizer in small
+token-sized chunks. A timing pass measures per-chunk cost; a second pass
+wraps the fast-path probes in src.text.stream to report how often each
+normalization step returned its input untouched.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from unittest import mock
+from collections import Counter
+from contextlib import ExitStack
+from collections.abc import Callable
+from src.text import stream as stream_mod
+from src.text.stream import StreamingSanitizer
+from tests.support.messages import STREAMING_SANITIZER_CASES
+from tests.support.helpers.fmt import dim, bold, section_header
+
+_FAST_PATH_PROBES = (
+    "_needs_leading_capital",
+    "_needs_newline_token_strip",
+    "_needs_space_collapse",
+    "_needs_asterisk_strip",
+)
+
+
+def _chunk(text: str, chunk_chars: int) -> list[str]:
+    return [text[idx : idx + chunk_chars] for idx in range(0, len(text), chunk_chars)]
+
+
+def _stream_corpus(corpus: list[list[str]]) -> None:
+    for chunks in corpus:
+        sanitizer = StreamingSanitizer()
+        for chunk in chunks:
+            sanitizer.push(chunk)
+        sanitizer.flush()
+
+
+def _counting_probe(name: str, probe: Callable[..., bool], calls: Counter, skips: Counter) -> Callable[..., bool]:
+    def _wrapped(*args: Any) -> bool:
+        needed = probe(*args)
+        calls[name] += 1
+        if not needed:
+            skips[name] += 1
+        return needed
+
+    return _wrapped
+
+
+def _measure_skip_rates(corpus: list[list[str]]) -> dict[str, dict[str, float]]:
+    calls: Counter = Counter()
+    skips: Counter = Counter()
+    with ExitStack() as stack:
+        for name in _FAST_PATH_PROBES:
+            probe = getattr(stream_mod, name)
+            stack.enter_context(mock.patch.object(stream_mod, name, _counting_probe(name, probe, calls, skips)))
+        _stream_corpus(corpus)
+    return {
+        name: {
+            "calls": calls[name],
+            "skipped": skips[name],
+            "skip_rate": (skips[name] / calls[name]) if calls[name] else 0.0,
+        }
+        for name in _FAST_PATH_PROBES
+    }
+
+
+def run_sanitizer_bench(*, rounds: int, chunk_chars: int) -> dict[str, Any]:
+    """Run the sanitizer benchmark and return timing plus skip-rate stats."""
+    corpus = [_chunk(text, chunk_chars) for text, _splits in STREAMING_SANITIZER_CASES]
+    chunk_count = sum(len(chunks) for chunks in corpus)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        _stream_corpus(corpus)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "documents": len(corpus),
+        "chunks": chunk_count * rounds,
+        "elapsed_s": elapsed,
+        "us_per_chunk": (elapsed * 1e6) / max(1, chunk_count * rounds),
+        "fast_paths": _measure_skip_rates(corpus),
+    }
+
+
+def print_sanitizer_report(result: dict[str, Any]) -> None:
+    """Print a human-readable sanitizer benchmark summary."""
+    print(section_header("SANITIZER"))
+    per_chunk = bold(f"{result['us_per_chunk']:.1f}us")
+    print(
+        f"{result['documents']} documents, {result['chunks']} chunks in {result['elapsed_s']:.3f}s ({per_chunk}/chunk)"
+    )
+    print(dim("fast path                      calls   skipped   skip rate"))
+    for name, stats in result["fast_paths"].items():
+        print(f"{name:<28} {stats['calls']:>7} {stats['skipped']:>9} {stats['skip_rate']:>10.1%}")
+
+
+__all__ = ["run_sanitizer_bench", "print_sanitizer_report"]
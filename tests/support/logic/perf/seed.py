@@ -0,0 +1,116 @@
+"""Offline start-history import time for large client payloads.
+
+Imports a ``start`` history of several sizes, built by cycling
+``WARM_HISTORY``, into a chat+tool session and fits it to the chat context
+the way ``bootstrap_start_turn`` does, two ways:
+
+- ``records``: reference for the old path, which built a ``ChatMessage`` and
+  a ``HistoryTurn`` for every payload item and then trimmed the full stores
+- ``import``: ``resolve_history``, which parses the payload in one pass and
+  only counts and builds records for the newest messages that fit
+
+The token memo is disabled so both paths pay the full tokenization cost.
+"""
+
+from __future__ import annotations
+
+import time
+import asyncio
+from typing import Any
+from src.state.session import SessionState
+from src.tokens.tokenizer import FastTokenizer
+from src.messages.history import resolve_history
+from src.handlers.session.manager import SessionHandler
+from tests.support.messages.history import WARM_HISTORY
+from .tokenizer import bench_corpus, build_bench_tokenizer
+from tests.support.helpers.fmt import dim, bold, section_header
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from src.handlers.session.parsing import parse_history_for_chat, parse_history_for_tool
+from src.config import TOOL_HISTORY_TOKENS, TRIMMED_HISTORY_LENGTH, CHAT_HISTORY_MAX_TOKENS
+
+_STATIC_PREFIX = "You are a warm, attentive companion. " * 40
+# Tool history budget when TOOL_HISTORY_TOKENS is unset (the tool fallback default).
+_TOOL_HISTORY_FALLBACK_TOKENS = 1536
+
+
+def _handler(tokenizer: FastTokenizer) -> SessionHandler:
+    return SessionHandler(
+        tool_history_budget=TOOL_HISTORY_TOKENS or _TOOL_HISTORY_FALLBACK_TOKENS,
+        chat_tokenizer=tokenizer,
+        tool_tokenizer=tokenizer,
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=True,
+            chat_trigger_tokens=CHAT_HISTORY_MAX_TOKENS,
+            chat_target_tokens=TRIMMED_HISTORY_LENGTH,
+            default_tool_history_tokens=None,
+        ),
+    )
+
+
+def _payload(count: int) -> list[dict[str, str]]:
+    return [
+        {"role": item["role"], "content": f"{item['content']} ({index})"}
+        for index, item in enumerate(WARM_HISTORY[idx % len(WARM_HISTORY)] for idx in range(count))
+    ]
+
+
+def _import_records(handler: SessionHandler, state: SessionState, payload: list[dict[str, str]]) -> None:
+    handler.set_mode_histories(
+        state,
+        chat_messages=parse_history_for_chat(payload),
+        tool_turns=parse_history_for_tool(payload),
+    )
+
+
+def _import_payload(handler: SessionHandler, state: SessionState, payload: list[dict[str, str]]) -> None:
+    resolve_history(handler, state, {"history": payload})
+
+
+def _timed_import(handler: SessionHandler, importer: Any, count: int) -> tuple[SessionState, float]:
+    state = SessionState()
+    handler.initialize_session(state)
+    payload = _payload(count)
+    started = time.perf_counter()
+    importer(handler, state, payload)
+    asyncio.run(handler.fit_start_chat_history(state, static_prefix=_STATIC_PREFIX))
+    return state, (time.perf_counter() - started) * 1e3
+
+
+def _measure(handler: SessionHandler, count: int) -> dict[str, Any]:
+    reference, records_ms = _timed_import(handler, _import_records, count)
+    state, import_ms = _timed_import(handler, _import_payload, count)
+    if state.chat_history_messages != reference.chat_history_messages:
+        raise AssertionError(f"chat import mismatch at {count} messages")
+    if [t.user for t in state.tool_history_turns or []] != [t.user for t in reference.tool_history_turns or []]:
+        raise AssertionError(f"tool import mismatch at {count} messages")
+    return {
+        "messages": count,
+        "kept": len(state.chat_history_messages or []),
+        "records_ms": records_ms,
+        "import_ms": import_ms,
+    }
+
+
+def run_seed_import_bench(*, tokenizer_path: str | None, sizes: list[int]) -> dict[str, Any]:
+    """Measure start-history import time for payloads of each size."""
+    tokenizer = build_bench_tokenizer(tokenizer_path, bench_corpus(), 1)
+    try:
+        handler = _handler(tokenizer)
+        rows = [_measure(handler, count) for count in sizes]
+    finally:
+        tokenizer.shutdown()
+    return {"tokenizer": tokenizer_path or "offline byte-level BPE", "rows": rows}
+
+
+def print_seed_import_report(result: dict[str, Any]) -> None:
+    """Print a human-readable start-history import summary."""
+    print(section_header("START HISTORY IMPORT"))
+    print(f"{result['tokenizer']}: chat+tool session, fitted to the chat context")
+    print(dim("messages   kept     records      import"))
+    for row in result["rows"]:
+        import_ms = bold(f"{row['import_ms']:>9.1f}ms")
+        print(f"{row['messages']:>8} {row['kept']:>6} {row['records_ms']:>9.1f}ms {import_ms}")
+
+
+__all__ = ["run_seed_import_bench", "print_seed_import_report"]
@@ -0,0 +1,132 @@
+"""Offline per-session memory footprint.
+
+Builds idle sessions through SessionHandler the way ``start`` does and
+reports the bytes each one keeps alive, for three shapes:
+
+- ``empty``: a connected session before ``start`` fills in persona fields
+- ``typical``: persona prompt, sampling overrides and a short history
+- ``max-history``: chat history filled to ``CHAT_HISTORY_MAX_TOKENS``
+
+Sizes come from ``tracemalloc``: many sessions of a shape are kept alive
+at once and the traced growth is divided by their count, so instance
+dicts, per-message strings and list slack are all included. The client
+payload each session was built from is released before measuring, as it
+is after ``start`` returns.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import Any
+from collections.abc import Callable
+from src.state.session import SessionState
+from src.config.limits import CHAT_HISTORY_MAX_TOKENS
+from src.handlers.session.manager import SessionHandler
+from tests.support.messages.history import WARM_HISTORY
+from src.handlers.session.config import update_session_config
+from tests.support.helpers.fmt import dim, bold, section_header
+from src.handlers.session.history.settings import HistoryRuntimeConfig
+from src.handlers.session.history import tool_turn_tokens, chat_message_tokens
+from src.handlers.session.parsing import parse_history_for_chat, parse_history_for_tool
+
+_CHARS_PER_TOKEN = 4
+_TYPICAL_MESSAGES = 20
+_PERSONA_CHARS = 6000
+_SAMPLING = {"temperature": 0.7, "top_p": 0.9, "top_k": 40}
+_SESSIONS_PER_SHAPE = 200
+
+
+def _handler() -> SessionHandler:
+    return SessionHandler(
+        tool_history_budget=CHAT_HISTORY_MAX_TOKENS,
+        history_config=HistoryRuntimeConfig(
+            deploy_chat=True,
+            deploy_tool=True,
+            chat_trigger_tokens=CHAT_HISTORY_MAX_TOKENS * 2,
+            chat_target_tokens=CHAT_HISTORY_MAX_TOKENS * 2,
+            default_tool_history_tokens=None,
+        ),
+    )
+
+
+def _history_payload(messages: int | None) -> list[dict[str, str]]:
+    """Cycle WARM_HISTORY to ``messages`` items, or until the chat history token cap."""
+    payload: list[dict[str, str]] = []
+    chars = 0
+    while (messages is None and chars < CHAT_HISTORY_MAX_TOKENS * _CHARS_PER_TOKEN) or (
+        messages is not None and len(payload) < messages
+    ):
+        item = WARM_HISTORY[len(payload) % len(WARM_HISTORY)]
+        # Fresh strings per message, as JSON decoding produces them.
+        payload.append({"role": "".join(item["role"]), "content": f"{item['content']} ({len(payload)})"})
+        chars += len(payload[-1]["content"])
+    return payload
+
+
+def _build_session(handler: SessionHandler, history: list[dict[str, str]] | None) -> SessionState:
+    state = SessionState()
+    handler.initialize_session(state)
+    if history is None:
+        return state
+    update_session_config(
+        state,
+        count_prefix_tokens_fn=handler.count_prefix_tokens,
+        chat_gender="female",
+        chat_personality="warm",
+        chat_prompt=("You are a warm, attentive companion. " * (_PERSONA_CHARS // 38))[:_PERSONA_CHARS],
+        chat_sampling=dict(_SAMPLING),
+    )
+    handler.set_mode_histories(
+        state,
+        chat_messages=parse_history_for_chat(history),
+        tool_turns=parse_history_for_tool(history),
+    )
+    chat_message_tokens(state.chat_history_messages or [], None)
+    tool_turn_tokens(state.tool_history_turns or [], None)
+    return state
+
+
+def _bytes_per_session(
+    handler: SessionHandler,
+    payload: Callable[[], list[dict[str, str]] | None],
+) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        sessions = [_build_session(handler, payload()) for _ in range(_SESSIONS_PER_SHAPE)]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return retained // _SESSIONS_PER_SHAPE, len(sessions[0].chat_history_messages or [])
+
+
+def run_session_memory_bench() -> dict[str, Any]:
+    """Measure bytes kept alive per idle session for each session shape."""
+    handler = _handler()
+    _build_session(handler, _history_payload(_TYPICAL_MESSAGES))
+    shapes: dict[str, Callable[[], list[dict[str, str]] | None]] = {
+        "empty": lambda: None,
+        "typical": lambda: _history_payload(_TYPICAL_MESSAGES),
+        "max-history": lambda: _history_payload(None),
+    }
+    rows = []
+    for label, payload in shapes.items():
+        size, kept = _bytes_per_session(handler, payload)
+        rows.append({"shape": label, "messages": kept, "bytes": size})
+    return {"sessions": _SESSIONS_PER_SHAPE, "rows": rows}
+
+
+def print_session_memory_report(result: dict[str, Any]) -> None:
+    """Print a human-readable per-session memory summary."""
+    print(section_header("SESSION MEMORY"))
+    print(f"{result['sessions']} live sessions per shape")
+    print(dim("shape          messages   bytes/session"))
+    for row in result["rows"]:
+        size = bold(f"{row['bytes']:>15,}")
+        print(f"{row['shape']:<12} {row['messages']:>10} {size}")
+
+
+__all__ = ["run_session_memory_bench", "print_session_memory_report"]
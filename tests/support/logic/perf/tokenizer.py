@@ -0,0 +1,119 @@
+"""Offline FastTokenizer pool throughput benchmark.
+
+Hammers ``FastTokenizer.count`` from a growing number of threads, once with a
+single pooled instance (equivalent to the old global lock) and once with the
+requested pool size, and reports calls per second plus the mean and worst
+pool-wait per call. Uses ``--tokenizer`` when given; otherwise trains a small
+byte-level BPE tokenizer in memory so the benchmark runs fully offline while
+still exercising the Rust ``tokenizers`` backend. The token memo is disabled
+so repeated corpus texts reach the pooled instances every time.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from unittest import mock
+from types import SimpleNamespace
+from src.tokens.tokenizer import FastTokenizer
+from concurrent.futures import ThreadPoolExecutor
+from src.tokens import tokenizer as tokenizer_mod
+from tests.support.messages import STREAMING_SANITIZER_CASES
+from tests.support.helpers.fmt import dim, bold, section_header
+
+_OFFLINE_VOCAB_SIZE = 4000
+_TEXTS_PER_DOCUMENT = 6
+_UNK_TOKEN = "[UNK]"  # noqa: S105 - vocabulary token, not a secret
+_CHATML_TEMPLATE = (
+    "{% for message in messages %}<|im_start|>{{ message['role'] }}\n{{ message['content'] }}<|im_end|>\n"
+    "{% endfor %}{% if add_generation_prompt %}<|im_start|>assistant\n{% endif %}"
+)
+
+
+def bench_corpus() -> list[str]:
+    """Benchmark documents built from the streaming sanitizer cases."""
+    texts = [text for text, _splits in STREAMING_SANITIZER_CASES]
+    return [" ".join(texts[idx : idx + _TEXTS_PER_DOCUMENT]) for idx in range(0, len(texts), _TEXTS_PER_DOCUMENT)]
+
+
+def _train_offline_tokenizer(corpus: list[str]) -> Any:
+    from transformers import PreTrainedTokenizerFast  # noqa: PLC0415
+    from tokenizers import Tokenizer, models, decoders, trainers, pre_tokenizers  # noqa: PLC0415
+
+    backend = Tokenizer(models.BPE(unk_token=_UNK_TOKEN))
+    backend.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    backend.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(vocab_size=_OFFLINE_VOCAB_SIZE, special_tokens=[_UNK_TOKEN])
+    backend.train_from_iterator(corpus, trainer)
+    hf_tok = PreTrainedTokenizerFast(tokenizer_object=backend, unk_token=_UNK_TOKEN)
+    hf_tok.chat_template = _CHATML_TEMPLATE
+    return hf_tok
+
+
+def build_bench_tokenizer(path: str | None, corpus: list[str], pool_size: int) -> FastTokenizer:
+    """Load ``path`` or train an offline BPE on ``corpus``, with the token memo disabled."""
+    if path:
+        return FastTokenizer(path, pool_size=pool_size, memo_max_bytes=0)
+    fast = object.__new__(FastTokenizer)
+    fast._initialize(_train_offline_tokenizer(corpus), pool_size=pool_size, memo_max_bytes=0)
+    return fast
+
+
+def _run_threads(tokenizer: FastTokenizer, corpus: list[str], threads: int, calls: int) -> dict[str, float]:
+    waits: list[float] = []
+    recorder = SimpleNamespace(tokenizer_pool_wait=SimpleNamespace(record=waits.append))
+    workload = [corpus[idx % len(corpus)] for idx in range(calls)]
+    with (
+        mock.patch.object(tokenizer_mod, "get_metrics", return_value=recorder),
+        ThreadPoolExecutor(max_workers=threads) as executor,
+    ):
+        start = time.perf_counter()
+        list(executor.map(tokenizer.count, workload))
+        elapsed = time.perf_counter() - start
+    return {
+        "threads": threads,
+        "calls_per_s": calls / elapsed if elapsed else 0.0,
+        "mean_wait_us": (sum(waits) / len(waits)) * 1e6 if waits else 0.0,
+        "max_wait_us": max(waits, default=0.0) * 1e6,
+    }
+
+
+def run_tokenizer_bench(
+    *,
+    tokenizer_path: str | None,
+    pool_size: int,
+    threads: list[int],
+    calls: int,
+) -> dict[str, Any]:
+    """Measure FastTokenizer count throughput across thread counts."""
+    corpus = bench_corpus()
+    variants = {"single": 1, "pooled": pool_size}
+    results: dict[str, list[dict[str, float]]] = {}
+    for label, size in variants.items():
+        tokenizer = build_bench_tokenizer(tokenizer_path, corpus, size)
+        tokenizer.count(corpus[0])
+        results[label] = [_run_threads(tokenizer, corpus, count, calls) for count in threads]
+    return {
+        "tokenizer": tokenizer_path or "offline byte-level BPE",
+        "pool_size": pool_size,
+        "calls": calls,
+        "avg_chars": sum(len(text) for text in corpus) // len(corpus),
+        "results": results,
+    }
+
+
+def print_tokenizer_report(result: dict[str, Any]) -> None:
+    """Print a human-readable tokenizer pool benchmark summary."""
+    print(section_header("TOKENIZER POOL"))
+    print(f"{result['tokenizer']}: {result['calls']} count() calls per run, ~{result['avg_chars']} chars each")
+    print(dim("pool   threads     calls/s   mean wait    max wait"))
+    for label, rows in result["results"].items():
+        size = 1 if label == "single" else result["pool_size"]
+        for row in rows:
+            rate = bold(f"{row['calls_per_s']:>10.0f}")
+            mean_wait = f"{row['mean_wait_us']:.1f}us"
+            max_wait = f"{row['max_wait_us']:.1f}us"
+            print(f"{size:>4} {row['threads']:>9} {rate} {mean_wait:>11} {max_wait:>11}")
+
+
+__all__ = ["bench_corpus", "build_bench_tokenizer", "run_tokenizer_bench", "print_tokenizer_report"]